@@ -6,73 +6,55 @@ substantial coverage of the leaf nodes.
 """
 
 from collections import defaultdict
+from typing import TypedDict
 
 import pandas as pd
 
-print("=" * 80)
-print("METPO BRANCH COVERAGE ANALYSIS")
-print("=" * 80)
-
-# Load METPO template
-print("\nLoading METPO template...")
-df = pd.read_csv("../src/templates/metpo_sheet.tsv", sep="\t", header=0, skiprows=[1])
-
-# Create label->ID mapping
-label_to_id = {}
-id_to_label = {}
-for _, row in df.iterrows():
-    if isinstance(row["ID"], str) and row["ID"].startswith("METPO:"):
-        label_to_id[row["label"]] = row["ID"]
-        id_to_label[row["ID"]] = row["label"]
-
-# Build hierarchy using label-based parents
-children_map = defaultdict(list)
-for _, row in df.iterrows():
-    if not isinstance(row["ID"], str) or not row["ID"].startswith("METPO:"):
-        continue
+from metpo.utils.ontology_closure import ClosureIndex
+from metpo.utils.ontology_index import OntologyIndex
 
-    parent_str = row["parent classes (one strongly preferred)"]
-    if pd.notna(parent_str) and isinstance(parent_str, str):
-        parents = [p.strip() for p in parent_str.split("|")]
-        for parent_label in parents:
-            if parent_label in label_to_id:
-                parent_id = label_to_id[parent_label]
-                children_map[parent_id].append(row["ID"])
 
-print(f"Classes: {len(id_to_label)}")
-print(f"Parent nodes: {len(children_map)}")
+class Branch(TypedDict):
+    """A METPO parent class with its leaf descendants."""
 
+    id: str
+    label: str
+    total_desc: int
+    leaf_desc: int
+    leaf_bits: int
+    leaves: set[str]
 
-# Get all descendants recursively
-def get_descendants(node_id):
-    desc = set()
-    for child in children_map.get(node_id, []):
-        desc.add(child)
-        desc.update(get_descendants(child))
-    return desc
 
+print("=" * 80)
+print("METPO BRANCH COVERAGE ANALYSIS")
+print("=" * 80)
 
-# Find leaf nodes
-all_nodes = set(id_to_label.keys())
-parent_nodes = set(children_map.keys())
-leaf_nodes = all_nodes - parent_nodes
+# Load METPO hierarchy from the shared ontology index
+print("\nLoading METPO ontology index...")
+index = OntologyIndex.load()
+closure = ClosureIndex.from_ontology_index(index)
+id_to_label = {curie: index.label(curie) for curie in closure.nodes}
+parent_nodes = closure.internal_nodes()
 
-print(f"Leaf nodes: {len(leaf_nodes)}")
+print(f"Classes: {len(id_to_label)}")
+print(f"Parent nodes: {len(parent_nodes)}")
+print(f"Leaf nodes: {closure.leaf_bits.bit_count()}")
 
 # Identify major branches
-branches = []
+branches: list[Branch] = []
 for parent_id in sorted(parent_nodes):
-    descendants = get_descendants(parent_id)
-    leaf_desc = descendants & leaf_nodes
+    leaf_bits = closure.leaf_descendant_bits(parent_id)
+    leaf_count = leaf_bits.bit_count()
 
-    if len(leaf_desc) >= 5:  # At least 5 leaf descendants
+    if leaf_count >= 5:  # At least 5 leaf descendants
         branches.append(
             {
                 "id": parent_id,
                 "label": id_to_label[parent_id],
-                "total_desc": len(descendants),
-                "leaf_desc": len(leaf_desc),
-                "leaves": leaf_desc,
+                "total_desc": closure.descendant_bits(parent_id).bit_count(),
+                "leaf_desc": leaf_count,
+                "leaf_bits": leaf_bits,
+                "leaves": closure.members(leaf_bits),
             }
         )
 
@@ -88,6 +70,12 @@ hq_df = search_df[search_df["similarity_ratio"] >= 0.5]
 print(f"Total results: {len(search_df)}")
 print(f"High-quality matches (≥0.5): {len(hq_df)}")
 
+# Covered leaves per (branch, ontology) for all branches at once
+leaf_coverage = closure.branch_coverage(
+    {branch["id"]: branch["leaf_bits"] for branch in branches},
+    hq_df.groupby("match_ontology", sort=False)["metpo_id"].agg(set).to_dict(),
+)
+
 # Analyze each branch
 print("\n" + "=" * 80)
 print("COVERAGE BY BRANCH")
@@ -107,28 +95,22 @@ for branch in branches:
         continue
 
     # Coverage by ontology
-    ont_coverage = defaultdict(lambda: {"leaves": set(), "count": 0, "sims": []})
-
-    for _, row in branch_hq.iterrows():
-        ont = row["match_ontology"]
-        ont_coverage[ont]["leaves"].add(row["metpo_id"])
-        ont_coverage[ont]["count"] += 1
-        ont_coverage[ont]["sims"].append(row["similarity_ratio"])
+    covered = leaf_coverage[branch["id"]]
+    match_stats = branch_hq.groupby("match_ontology", sort=False)["similarity_ratio"].agg(
+        ["count", "mean"]
+    )
 
     # Calculate statistics
     stats = []
-    for ont, data in ont_coverage.items():
-        cov_pct = (len(data["leaves"]) / len(leaves)) * 100
-        avg_sim = sum(data["sims"]) / len(data["sims"])
-
+    for ont, data in match_stats.iterrows():
         stats.append(
             {
                 "ont": ont,
-                "covered": len(data["leaves"]),
+                "covered": covered[ont],
                 "total": len(leaves),
-                "pct": cov_pct,
-                "matches": data["count"],
-                "avg_sim": avg_sim,
+                "pct": (covered[ont] / len(leaves)) * 100,
+                "matches": int(data["count"]),
+                "avg_sim": data["mean"],
             }
         )
 
@@ -198,19 +180,14 @@ else:
         largest = branches[0]
         leaves = largest["leaves"]
         branch_hq = hq_df[hq_df["metpo_id"].isin(leaves)]
+        covered = leaf_coverage[largest["id"]]
+        mean_sims = branch_hq.groupby("match_ontology", sort=False)["similarity_ratio"].mean()
 
-        ont_cov = defaultdict(lambda: {"leaves": set(), "sims": []})
-        for _, row in branch_hq.iterrows():
-            ont_cov[row["match_ontology"]]["leaves"].add(row["metpo_id"])
-            ont_cov[row["match_ontology"]]["sims"].append(row["similarity_ratio"])
-
-        stats = [
-            (ont, len(d["leaves"]), sum(d["sims"]) / len(d["sims"])) for ont, d in ont_cov.items()
-        ]
-        stats.sort(key=lambda x: x[1], reverse=True)
+        partial = [(ont, covered[ont], avg) for ont, avg in mean_sims.items()]
+        partial.sort(key=lambda x: x[1], reverse=True)
 
         print(f"\n{largest['label']} ({len(leaves)} leaves):")
-        for ont, cov, avg in stats[:5]:
+        for ont, cov, avg in partial[:5]:
             pct = (cov / len(leaves)) * 100
             print(f"  {ont:<15} {cov}/{len(leaves):<7} {pct:>5.1f}% avg_sim={avg:.3f}")
 
@@ -5,7 +5,6 @@ for non-OLS ontologies based on distance metrics.
 """
 
 import click
-import pandas as pd
 
 from metpo.cli_common import distance_threshold_option
 
@@ -22,6 +21,8 @@ def main(sssom_file, distance_threshold):
     Example:
         uv run analyze-match-quality mappings.sssom.tsv
     """
+    import pandas as pd  # noqa: PLC0415
+
     df = pd.read_csv(sssom_file, sep="\t", comment="#")
 
     # Extract distance from comment field
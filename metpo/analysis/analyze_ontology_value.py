@@ -14,7 +14,6 @@ This helps identify:
 from collections import defaultdict
 
 import click
-import pandas as pd
 
 from metpo.utils.sssom_utils import extract_prefix, parse_sssom_curie_map
 
@@ -39,6 +38,8 @@ def extract_term_source(iri: str, curie_map: dict[str, str] | None = None) -> st
 def main(input):
     """Analyze unique value of each ontology source."""
 
+    import pandas as pd  # noqa: PLC0415
+
     print(f"Loading mappings from: {input}")
     df = pd.read_csv(input, sep="\t", comment="#")
     curie_map = parse_sssom_curie_map(input)
@@ -26,7 +26,6 @@ from pathlib import Path
 
 import click
 import Levenshtein
-import pandas as pd
 import requests
 from dotenv import load_dotenv
 
@@ -98,6 +97,8 @@ def search_bioportal(label: str, api_key: str | None, pagesize: int) -> list[dic
 
 def calculate_similarity(metpo_label: str, match_label: object) -> tuple[int | None, float | None]:
     """Return (Levenshtein distance, ratio) between two labels, or (None, None) if unlabeled."""
+    import pandas as pd  # noqa: PLC0415
+
     if match_label is None or pd.isna(match_label):
         return None, None
     left = str(metpo_label).lower()
@@ -164,6 +165,8 @@ def main(
     skip_bioportal: bool,
 ) -> None:
     """Query OLS4/BioPortal for each METPO label and rank aligning ontologies."""
+    import pandas as pd  # noqa: PLC0415
+
     api_key = None if skip_bioportal else _resolve_api_key()
     if not skip_bioportal and not api_key:
         click.echo(
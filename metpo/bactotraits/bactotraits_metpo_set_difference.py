@@ -9,12 +9,13 @@ Usage:
     uv run python src/scripts/bactotraits_metpo_set_difference.py --format yaml --output reports/bactotraits-metpo-set-diff.yaml
 """
 
-import csv
 from pathlib import Path
 
 import click
 import yaml
 
+from metpo.utils.ontology_reports import load_synonym_sources
+
 # File paths
 BACTOTRAITS_SOURCE_URI = (
     "https://ordar.otelo.univ-lorraine.fr/files/ORDAR-53/BactoTraits_databaseV2_Jun2022.csv"
@@ -32,28 +33,25 @@ def read_kg_microbe_headers(kg_microbe_file: Path) -> set[str]:
     return set(header)
 
 
-def read_metpo_bactotraits_synonyms(synonym_sources_tsv: Path) -> dict[str, dict]:
-    """Read synonyms attributed to BactoTraits from synonym-sources.tsv."""
-    if not synonym_sources_tsv.exists():
+def read_metpo_bactotraits_synonyms(synonym_sources_tsv: Path | None = None) -> dict[str, dict]:
+    """Read synonyms attributed to BactoTraits from synonym-sources rows.
+
+    Reads ``synonym_sources_tsv`` if given, otherwise generates the rows from
+    metpo.json in-process.
+    """
+    if synonym_sources_tsv is not None and not synonym_sources_tsv.exists():
         raise FileNotFoundError(f"Synonym sources file not found: {synonym_sources_tsv}")
 
     synonyms = {}
 
-    with Path(synonym_sources_tsv).open() as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        for row in reader:
-            src = row.get("?src", "").strip("<>")
-            syn_value = row.get("?synValue", "").strip('"')
-            entity = row.get("?entity", "").strip("<>")
-            entity_type = row.get("?entityType", "").strip('"')
-
-            if src == BACTOTRAITS_SOURCE_URI and syn_value:
-                if syn_value not in synonyms:
-                    synonyms[syn_value] = {
-                        "entity": entity,
-                        "entity_type": entity_type,
-                        "source": src,
-                    }
+    for row in load_synonym_sources(synonym_sources_tsv):
+        if row.source == BACTOTRAITS_SOURCE_URI and row.value:
+            if row.value not in synonyms:
+                synonyms[row.value] = {
+                    "entity": row.entity,
+                    "entity_type": row.entity_type,
+                    "source": row.source,
+                }
 
     return synonyms
 
@@ -202,8 +200,8 @@ def categorize_by_issue(
 @click.option(
     "--synonyms-file",
     type=click.Path(exists=True, path_type=Path),
-    default=Path("reports/synonym-sources.tsv"),
-    help="Path to the synonym-sources.tsv file.",
+    default=None,
+    help="Path to the synonym-sources.tsv file (default: generate from metpo.json in-process).",
 )
 def main(output_format, output, bactotraits_file, synonyms_file):
     """
@@ -15,7 +15,6 @@ Output:
 from datetime import UTC, datetime
 
 import click
-from pymongo import MongoClient
 
 
 def create_file_versions():
@@ -116,6 +115,8 @@ def create_file_versions():
 @click.option("--collection-name", default="file_versions", help="MongoDB collection name.")
 def main(host, port, db_name, collection_name):
     """Main execution function."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     print("=" * 80)
     print("BactoTraits File Versions Collection Generator")
     print("=" * 80)
@@ -8,7 +8,6 @@ Usage:
 """
 
 import click
-from pymongo import MongoClient
 
 
 @click.command()
@@ -19,6 +18,8 @@ from pymongo import MongoClient
 def main(host, port, db_name, collection_name):
     """Create simple files collection."""
 
+    from pymongo import MongoClient  # noqa: PLC0415
+
     files = [
         {
             "euphemism": "provider",
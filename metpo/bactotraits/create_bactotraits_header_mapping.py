@@ -18,7 +18,6 @@ import json
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
 
 
 def sanitize_field_name(field_name):
@@ -281,6 +280,8 @@ def create_field_mappings(provider_file, kg_microbe_file):
 @click.option("--mongo-uri", default="mongodb://localhost:27017/", help="MongoDB connection URI")
 def main(provider_file, kg_microbe_file, output_json, db_name, collection_name, mongo_uri):
     """Create BactoTraits field mappings collection and JSON export."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     print("=" * 80)
     print("BactoTraits Header Mapping Generator")
     print("=" * 80)
@@ -1,11 +1,17 @@
 """
-Download ontology from BioPortal with robust error handling.
+Download ontologies from BioPortal with resumable, checksummed transfers.
+
+Downloads stream to ``<output>.part`` and resume with HTTP Range after a
+dropped connection (see metpo.utils.downloads). Several ontologies download
+concurrently, with a cap on connections to BioPortal. Results are recorded
+in .ontology_manifest.json.
 
 Usage:
     download-ontology D3O --output external/ontologies/bioportal/D3O.owl
+    download-ontology D3O MPO OMP --output-dir external/ontologies/bioportal --skip-existing
 
 Exit codes:
-    0: Success (file downloaded and valid)
+    0: Success (every file downloaded and valid)
     1: Failure (any error)
 """
 
@@ -15,10 +21,19 @@ from datetime import UTC, datetime
 from pathlib import Path
 
 import click
-import requests
+
+from metpo.bactotraits.ontology_manifest import load_manifest, save_manifest
+from metpo.utils.downloads import (
+    DEFAULT_PER_HOST,
+    DEFAULT_RETRIES,
+    DownloadJob,
+    DownloadResult,
+    download_many,
+)
 
 LOG_PATH = Path(".ontology_fetch.log")
 MIN_FILE_SIZE = 1000  # Bytes - anything smaller is likely an error response
+BIOPORTAL_DOWNLOAD_URL = "https://data.bioontology.org/ontologies/{ontology_id}/download"
 
 
 def log_failure(ontology_id: str, file_size: int, message: str):
@@ -28,50 +43,113 @@ def log_failure(ontology_id: str, file_size: int, message: str):
         f.write(f"{timestamp} | FETCH_FAILED | {ontology_id} | {file_size} bytes | {message}\n")
 
 
+def record_result(manifest: dict, result: DownloadResult) -> None:
+    """Record a download outcome in the ontology manifest."""
+    entry = manifest["ontologies"].setdefault(result.name.upper(), {})
+    entry["source"] = "bioportal"
+    if not result.ok:
+        entry["status"] = "failed"
+        return
+    stat = result.path.stat()
+    entry["status"] = "success"
+    entry["fetched_at"] = datetime.now(UTC).isoformat()
+    entry["file_path"] = str(result.path)
+    entry["file_size_bytes"] = result.size
+    entry["file_sha256"] = result.sha256
+    manifest["artifacts"][str(result.path)] = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": result.sha256,
+    }
+
+
 @click.command()
-@click.argument("ontology_id")
-@click.option("--output", type=Path, required=True, help="Output file path")
-def main(ontology_id: str, output: Path):
-    """Download ontology from BioPortal."""
+@click.argument("ontology_ids", nargs=-1, required=True)
+@click.option("--output", type=Path, help="Output file path (one ontology)")
+@click.option(
+    "--output-dir", type=Path, help="Directory for <ONTOLOGY_ID>.owl files (several ontologies)"
+)
+@click.option("--sha256", help="Expected SHA-256 of the file (one ontology)")
+@click.option("--skip-existing", is_flag=True, help="Skip ontologies whose output already exists")
+@click.option("--workers", type=int, default=4, show_default=True, help="Concurrent downloads")
+@click.option(
+    "--per-host",
+    type=int,
+    default=DEFAULT_PER_HOST,
+    show_default=True,
+    help="Maximum concurrent connections to one host",
+)
+@click.option(
+    "--retries",
+    type=int,
+    default=DEFAULT_RETRIES,
+    show_default=True,
+    help="Resume attempts after a dropped connection",
+)
+@click.option(
+    "--base-url",
+    envvar="BIOPORTAL_DOWNLOAD_URL",
+    default=BIOPORTAL_DOWNLOAD_URL,
+    show_default=True,
+    help="Download URL template with an {ontology_id} placeholder",
+)
+def main(
+    ontology_ids: tuple[str, ...],
+    output: Path | None,
+    output_dir: Path | None,
+    sha256: str | None,
+    skip_existing: bool,
+    workers: int,
+    per_host: int,
+    retries: int,
+    base_url: str,
+):
+    """Download ontologies from BioPortal."""
     api_key = os.getenv("BIOPORTAL_API_KEY")
 
     if not api_key:
         click.echo("✗ BIOPORTAL_API_KEY environment variable not set", err=True)
         sys.exit(1)
 
-    # Ensure output directory exists
-    output.parent.mkdir(parents=True, exist_ok=True)
-
-    # Download
-    url = f"https://data.bioontology.org/ontologies/{ontology_id}/download"
-    click.echo(f"Downloading BioPortal ontology {ontology_id}...")
-
-    try:
-        response = requests.get(url, params={"apikey": api_key}, timeout=300)
-        response.raise_for_status()
-
-        # Write to file
-        output.write_bytes(response.content)
-        file_size = output.stat().st_size
-
-        # Check if successful
-        if file_size < MIN_FILE_SIZE:
-            click.echo(
-                f"✗ Failed to download {ontology_id} (empty or error response: {file_size} bytes)",
-                err=True,
-            )
-            log_failure(ontology_id, file_size, "File too small")
-            output.unlink(missing_ok=True)
-            sys.exit(1)
-
-        # Success
-        click.echo(f"✓ Successfully downloaded {ontology_id} ({file_size:,} bytes)")
+    if (output is None) == (output_dir is None):
+        raise click.UsageError("Give exactly one of --output or --output-dir")
+    if output is not None and len(ontology_ids) > 1:
+        raise click.UsageError("--output takes one ontology; use --output-dir for several")
+    if sha256 and len(ontology_ids) > 1:
+        raise click.UsageError("--sha256 takes one ontology")
+
+    jobs = [
+        DownloadJob(
+            name=ontology_id,
+            url=base_url.format(ontology_id=ontology_id),
+            dest=output if output is not None else output_dir / f"{ontology_id}.owl",
+            params={"apikey": api_key},
+            sha256=sha256,
+            min_size=MIN_FILE_SIZE,
+        )
+        for ontology_id in ontology_ids
+    ]
+    if skip_existing:
+        jobs = [job for job in jobs if not job.dest.exists()]
+    if not jobs:
+        click.echo("✓ All ontologies already downloaded")
         sys.exit(0)
 
-    except requests.exceptions.RequestException as e:
-        click.echo(f"✗ Failed to download {ontology_id}: {e}", err=True)
-        log_failure(ontology_id, 0, str(e))
-        sys.exit(1)
+    click.echo(f"Downloading {len(jobs)} BioPortal ontologies: {', '.join(j.name for j in jobs)}")
+    results = download_many(jobs, workers=workers, per_host=per_host, retries=retries)
+
+    manifest = load_manifest()
+    for result in results:
+        record_result(manifest, result)
+        if result.ok:
+            resumed = f", resumed at {result.resumed_from:,}" if result.resumed_from else ""
+            click.echo(f"✓ Successfully downloaded {result.name} ({result.size:,} bytes{resumed})")
+        else:
+            click.echo(f"✗ Failed to download {result.name}: {result.error}", err=True)
+            log_failure(result.name, result.size, result.error)
+    save_manifest(manifest)
+
+    sys.exit(0 if all(result.ok for result in results) else 1)
 
 
 if __name__ == "__main__":
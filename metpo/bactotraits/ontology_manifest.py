@@ -0,0 +1,83 @@
+"""Shared state for .ontology_manifest.json and incremental artifact fingerprints.
+
+The manifest keeps per-ontology status entries (see ``scan-manifest`` and
+``update-manifest``), plus an ``artifacts`` table that maps each downloaded
+ontology and extracted TSV to its fingerprint::
+
+    "artifacts": {
+        "data/pipeline/non-ols-terms/D3O.tsv": {
+            "size": 84213, "mtime_ns": 1730000000000000000,
+            "sha256": "...", "term_count": 283
+        }
+    }
+
+A file is read again only when its size or mtime no longer match the
+recorded fingerprint. Reading it computes the SHA-256 and counts lines in
+the same pass; both run in C, so files are fingerprinted in parallel
+threads. A rescan with nothing changed therefore costs one ``stat`` per
+file, and the manifest is not rewritten.
+"""
+
+import json
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from metpo.utils.files import file_fingerprint, is_unchanged, write_atomic
+
+MANIFEST_PATH = Path(".ontology_manifest.json")
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict:
+    """Load manifest or create if doesn't exist."""
+    if path.exists():
+        with path.open() as f:
+            manifest = json.load(f)
+        manifest.setdefault("ontologies", {})
+        manifest.setdefault("artifacts", {})
+        return manifest
+    return {
+        "_comment": "Tracking successful ontology fetches to avoid re-downloading",
+        "ontologies": {},
+        "artifacts": {},
+    }
+
+
+def save_manifest(manifest: dict, path: Path = MANIFEST_PATH) -> bool:
+    """Save manifest with pretty formatting; return False if the file was already identical."""
+    text = json.dumps(manifest, indent=2)
+    if path.exists() and path.read_text() == text:
+        return False
+    write_atomic(path, text)
+    return True
+
+
+def fingerprint(path: Path) -> dict:
+    """Size, mtime, SHA-256 and (for TSVs) term count of ``path``, from one read."""
+    result = file_fingerprint(path, count_lines=path.suffix == ".tsv")
+    if "lines" in result:
+        result["term_count"] = max(result.pop("lines") - 1, 0)  # header excluded
+    return result
+
+
+def refresh_fingerprints(
+    paths: Iterable[Path], artifacts: dict, workers: int = 0, rehash: bool = False
+) -> list[Path]:
+    """Update ``artifacts`` in place for ``paths``; return the paths that were re-read.
+
+    Files whose size and mtime match their recorded fingerprint are skipped
+    unless ``rehash`` is set. The rest are fingerprinted in parallel threads.
+    """
+    stale = [
+        path
+        for path in paths
+        if rehash or not is_unchanged(path, artifacts.get(str(path)), rehash=False)
+    ]
+    if not stale:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, result in zip(stale, pool.map(fingerprint, stale), strict=True):
+            artifacts[str(path)] = result
+    return stale
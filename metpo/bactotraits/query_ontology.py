@@ -1,8 +1,14 @@
 """
-Query ontology with ROBOT.
+Extract embedding terms (IRI, labels, synonyms, definitions) from an ontology file.
+
+Replaces ``robot query`` with sparql/extract_for_embeddings.rq: RDF/XML is
+streamed in Python (see metpo.utils.owl_terms), so no JVM or whole-graph
+load is needed, and ``extract-ontology-terms`` handles many ontologies in
+parallel processes.
 
 Usage:
-    query-ontology D3O --input external/ontologies/bioportal/D3O.owl --query sparql/extract_for_embeddings.rq --output data/pipeline/non-ols-terms/D3O.tsv
+    query-ontology D3O --input external/ontologies/bioportal/D3O.owl --output data/pipeline/non-ols-terms/D3O.tsv
+    extract-ontology-terms external/ontologies/bioportal/*.owl --output-dir data/pipeline/non-ols-terms
 
 Exit codes:
     0: Success (terms extracted)
@@ -11,14 +17,14 @@ Exit codes:
 Outputs term count to stdout on success for Make to capture.
 """
 
-import csv
-import subprocess
 import sys
 from datetime import UTC, datetime
 from pathlib import Path
 
 import click
 
+from metpo.utils.owl_terms import write_terms, write_terms_parallel
+
 LOG_PATH = Path(".robot_query.log")
 
 
@@ -29,25 +35,20 @@ def log_event(ontology_id: str, input_file: str, message: str, log_type: str = "
         f.write(f"{timestamp} | {log_type} | {ontology_id} | {input_file} | {message}\n")
 
 
-def count_tsv_terms(tsv_path: Path) -> int:
-    """Count rows in TSV (excluding header)."""
-    try:
-        with Path(tsv_path).open() as f:
-            return sum(1 for _ in csv.reader(f, delimiter="\t")) - 1
-    except Exception:
-        return 0
-
-
 @click.command()
 @click.argument("ontology_id")
 @click.option("--input", "input_file", type=Path, required=True, help="Input OWL/TTL file")
-@click.option("--query", "query_file", type=Path, required=True, help="SPARQL query file")
+@click.option(
+    "--query",
+    "query_file",
+    type=Path,
+    default=None,
+    hidden=True,
+    help="Ignored; the extractor implements sparql/extract_for_embeddings.rq natively",
+)
 @click.option("--output", "output_file", type=Path, required=True, help="Output TSV file")
-def main(ontology_id: str, input_file: Path, query_file: Path, output_file: Path):
-    """Query ontology with ROBOT."""
-
-    # Ensure output directory exists
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+def main(ontology_id: str, input_file: Path, query_file: Path | None, output_file: Path):
+    """Extract labels, synonyms and definitions from an ontology file."""
 
     # Check input exists
     if not input_file.exists():
@@ -55,62 +56,69 @@ def main(ontology_id: str, input_file: Path, query_file: Path, output_file: Path
         log_event(ontology_id, str(input_file), "Input file not found")
         sys.exit(1)
 
-    # Run ROBOT query
-    click.echo(f"Querying {ontology_id} with ROBOT...")
-
-    cmd = [
-        "robot",
-        "query",
-        "--input",
-        str(input_file),
-        "--query",
-        str(query_file),
-        str(output_file),
-    ]
+    click.echo(f"Extracting terms from {ontology_id}...")
 
     try:
-        # Run ROBOT
-        result = subprocess.run(
-            cmd,
-            check=False,
-            capture_output=True,
-            text=True,
-            timeout=600,  # 10 minute timeout
-        )
-
-        # Log ROBOT stderr if present
-        if result.stderr:
-            log_event(ontology_id, str(input_file), result.stderr, "ROBOT_OUTPUT")
-
-        # Check if output was created
-        if not output_file.exists():
-            click.echo(f"✗ ROBOT query failed for {ontology_id} (no output file created)", err=True)
-            log_event(ontology_id, str(input_file), "No output file created")
-            sys.exit(1)
-
-        # Check if output has content
-        term_count = count_tsv_terms(output_file)
-
-        if term_count == 0:
-            click.echo(f"✗ ROBOT query produced empty output for {ontology_id}", err=True)
-            log_event(ontology_id, str(input_file), "Empty output", "QUERY_EMPTY")
-            sys.exit(1)
-
-        # Success - output term count for Make to capture
-        click.echo(f"✓ Extracted {term_count} terms from {ontology_id}")
-        click.echo(f"TERM_COUNT={term_count}")  # Make can parse this
-        sys.exit(0)
-
-    except subprocess.TimeoutExpired:
-        click.echo(f"✗ ROBOT query timed out for {ontology_id}", err=True)
-        log_event(ontology_id, str(input_file), "Query timeout")
-        sys.exit(1)
-
+        term_count = write_terms(input_file, output_file)
     except Exception as e:
-        click.echo(f"✗ ROBOT query failed for {ontology_id}: {e}", err=True)
+        click.echo(f"✗ Term extraction failed for {ontology_id}: {e}", err=True)
         log_event(ontology_id, str(input_file), str(e))
         sys.exit(1)
 
+    if term_count == 0:
+        click.echo(f"✗ Term extraction produced empty output for {ontology_id}", err=True)
+        log_event(ontology_id, str(input_file), "Empty output", "QUERY_EMPTY")
+        sys.exit(1)
+
+    # Success - output term count for Make to capture
+    click.echo(f"✓ Extracted {term_count} terms from {ontology_id}")
+    click.echo(f"TERM_COUNT={term_count}")  # Make can parse this
+    sys.exit(0)
+
+
+@click.command()
+@click.argument(
+    "input_files", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path)
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("data/pipeline/non-ols-terms"),
+    show_default=True,
+    help="Directory for <ontology-id>.tsv outputs",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Parallel extraction processes (0 = CPU count)",
+)
+def extract_many(input_files: tuple[Path, ...], output_dir: Path, workers: int):
+    """Extract terms from several ontology files in parallel worker processes.
+
+    Each INPUT_FILE is written to OUTPUT_DIR/<file stem>.tsv. Exits 1 if any
+    ontology fails or yields no terms.
+    """
+    jobs = [(path, output_dir / f"{path.stem}.tsv") for path in input_files]
+    failed = 0
+    for input_file, term_count, error in write_terms_parallel(jobs, workers):
+        ontology_id = Path(input_file).stem
+        if error is not None:
+            click.echo(f"✗ {ontology_id}: {error}", err=True)
+            log_event(ontology_id, input_file, error)
+            failed += 1
+        elif term_count == 0:
+            click.echo(f"✗ {ontology_id}: empty output", err=True)
+            log_event(ontology_id, input_file, "Empty output", "QUERY_EMPTY")
+            failed += 1
+        else:
+            click.echo(f"✓ {ontology_id}: {term_count} terms")
+    click.echo(f"Extracted {len(jobs) - failed}/{len(jobs)} ontologies")
+    sys.exit(1 if failed else 0)
+
 
 if __name__ == "__main__":
     main()
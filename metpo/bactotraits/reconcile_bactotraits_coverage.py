@@ -3,7 +3,7 @@ Reconcile BactoTraits MongoDB field values against METPO synonyms attributed to
 
 This script:
 1. Connects to MongoDB and extracts unique values from specified BactoTraits fields
-2. Reads the SPARQL synonym-sources.tsv report
+2. Reads the synonym-sources report (generated in-process from metpo.json by default)
 3. Filters for synonyms attributed to BactoTraits (ORDaR repository)
 4. Reports which BactoTraits values are covered/missing in METPO
 
@@ -14,14 +14,15 @@ BactoTraits specifics:
 - We need to handle both underscore and period variations when matching
 """
 
-import csv
 import re
 import sys
 from pathlib import Path
 
 import click
 import yaml
-from pymongo import MongoClient
+
+from metpo.cli_common import profile_options, stage, telemetry_option
+from metpo.utils.ontology_reports import SynonymSource, load_synonym_sources
 
 BACTOTRAITS_SOURCE_URI = (
     "https://ordar.otelo.univ-lorraine.fr/files/ORDAR-53/BactoTraits_databaseV2_Jun2022.csv"
@@ -96,6 +97,8 @@ def get_bactotraits_field_values(
     :param collection_name: MongoDB collection name
     :return: Dict mapping normalized values to original values (to track if normalization occurred)
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient()
     db = client[db_name]
     collection = db[collection_name]
@@ -113,45 +116,48 @@ def get_bactotraits_field_values(
     return value_map
 
 
-def load_bactotraits_synonyms(tsv_path: str) -> dict[str, dict[str, str]]:
+def load_bactotraits_synonyms(
+    tsv_path: str | None = None, rows: list[SynonymSource] | None = None
+) -> dict[str, dict[str, str]]:
     """
-    Load synonyms attributed to BactoTraits source from synonym-sources.tsv.
+    Load synonyms attributed to BactoTraits source from synonym-sources rows.
 
-    :param tsv_path: Path to reports/synonym-sources.tsv
+    :param tsv_path: Path to reports/synonym-sources.tsv (None: generate from metpo.json in-process)
+    :param rows: Already loaded synonym-sources rows; overrides tsv_path
     :return: Dictionary mapping normalized synonym values to their METPO entity and predicate info
     """
     bactotraits_synonyms = {}
     entity_labels = {}
 
-    with Path(tsv_path).open() as f:
-        reader = csv.DictReader(f, delimiter="\t")
-
-        for row in reader:
-            entity = row.get("?entity", "").strip("<>")
-            entity_type = row.get("?entityType", "").strip('"')
-            pred = row.get("?synonymPred", "").strip("<>")
-            syn_value = row.get("?synValue", "").strip('"')
-            src = row.get("?src", "").strip("<>")
-
-            if entity and pred and syn_value:
-                if pred == "http://www.w3.org/2000/01/rdf-schema#label":
-                    entity_labels[entity] = syn_value
-
-                if src == BACTOTRAITS_SOURCE_URI:
-                    normalized_syn = normalize_whitespace(syn_value)
-                    # Generate punctuation variants for this synonym
-                    variants = normalize_punctuation_variants(normalized_syn)
-
-                    for variant in variants:
-                        if variant not in bactotraits_synonyms:
-                            bactotraits_synonyms[variant] = {
-                                "entity": entity,
-                                "entity_type": entity_type,
-                                "predicate": pred,
-                                "source": src,
-                                "label": None,
-                                "original_synonym": normalized_syn,  # Track original form
-                            }
+    if rows is None:
+        rows = load_synonym_sources(tsv_path)
+
+    for row in rows:
+        entity = row.entity
+        entity_type = row.entity_type
+        pred = row.predicate
+        syn_value = row.value
+        src = row.source
+
+        if entity and pred and syn_value:
+            if pred == "http://www.w3.org/2000/01/rdf-schema#label":
+                entity_labels[entity] = syn_value
+
+            if src == BACTOTRAITS_SOURCE_URI:
+                normalized_syn = normalize_whitespace(syn_value)
+                # Generate punctuation variants for this synonym
+                variants = normalize_punctuation_variants(normalized_syn)
+
+                for variant in variants:
+                    if variant not in bactotraits_synonyms:
+                        bactotraits_synonyms[variant] = {
+                            "entity": entity,
+                            "entity_type": entity_type,
+                            "predicate": pred,
+                            "source": src,
+                            "label": None,
+                            "original_synonym": normalized_syn,  # Track original form
+                        }
 
     for syn_value, info in bactotraits_synonyms.items():
         entity = info["entity"]
@@ -161,44 +167,47 @@ def load_bactotraits_synonyms(tsv_path: str) -> dict[str, dict[str, str]]:
     return bactotraits_synonyms
 
 
-def load_all_metpo_synonyms(tsv_path: str) -> dict[str, dict[str, str]]:
+def load_all_metpo_synonyms(
+    tsv_path: str | None = None, rows: list[SynonymSource] | None = None
+) -> dict[str, dict[str, str]]:
     """
     Load ALL synonyms from METPO regardless of source attribution.
 
-    :param tsv_path: Path to reports/synonym-sources.tsv
+    :param tsv_path: Path to reports/synonym-sources.tsv (None: generate from metpo.json in-process)
+    :param rows: Already loaded synonym-sources rows; overrides tsv_path
     :return: Dictionary mapping normalized synonym values to their METPO entity and predicate info
     """
     all_synonyms = {}
     entity_labels = {}
 
-    with Path(tsv_path).open() as f:
-        reader = csv.DictReader(f, delimiter="\t")
-
-        for row in reader:
-            entity = row.get("?entity", "").strip("<>")
-            entity_type = row.get("?entityType", "").strip('"')
-            pred = row.get("?synonymPred", "").strip("<>")
-            syn_value = row.get("?synValue", "").strip('"')
-            src = row.get("?src", "").strip("<>")
-
-            if entity and pred and syn_value:
-                if pred == "http://www.w3.org/2000/01/rdf-schema#label":
-                    entity_labels[entity] = syn_value
-
-                normalized_syn = normalize_whitespace(syn_value)
-                # Generate punctuation variants for this synonym
-                variants = normalize_punctuation_variants(normalized_syn)
-
-                for variant in variants:
-                    if variant not in all_synonyms:
-                        all_synonyms[variant] = {
-                            "entity": entity,
-                            "entity_type": entity_type,
-                            "predicate": pred,
-                            "source": src,
-                            "label": None,
-                            "original_synonym": normalized_syn,
-                        }
+    if rows is None:
+        rows = load_synonym_sources(tsv_path)
+
+    for row in rows:
+        entity = row.entity
+        entity_type = row.entity_type
+        pred = row.predicate
+        syn_value = row.value
+        src = row.source
+
+        if entity and pred and syn_value:
+            if pred == "http://www.w3.org/2000/01/rdf-schema#label":
+                entity_labels[entity] = syn_value
+
+            normalized_syn = normalize_whitespace(syn_value)
+            # Generate punctuation variants for this synonym
+            variants = normalize_punctuation_variants(normalized_syn)
+
+            for variant in variants:
+                if variant not in all_synonyms:
+                    all_synonyms[variant] = {
+                        "entity": entity,
+                        "entity_type": entity_type,
+                        "predicate": pred,
+                        "source": src,
+                        "label": None,
+                        "original_synonym": normalized_syn,
+                    }
 
     for syn_value, info in all_synonyms.items():
         entity = info["entity"]
@@ -218,6 +227,8 @@ def get_all_bactotraits_fields(
     :param collection_name: MongoDB collection name
     :return: List of all field names
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient()
     db = client[db_name]
     collection = db[collection_name]
@@ -239,6 +250,8 @@ def get_all_bactotraits_values_with_fields(
     :param collection_name: MongoDB collection name
     :return: Dict mapping normalized values to list of field names where they appear
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient()
     db = client[db_name]
     collection = db[collection_name]
@@ -268,6 +281,8 @@ def reconcile_all_field_names(
     :param tsv_path: Path to synonym-sources.tsv report
     :param output_format: Output format ('text' or 'yaml')
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     # Define field categories for reporting
     PERMANENTLY_EXCLUDED_FIELDS = {
         "Kingdom",
@@ -295,11 +310,14 @@ def reconcile_all_field_names(
     }
 
     # Get all sanitized field names from the main data collection
-    sanitized_fields = get_all_bactotraits_fields()
+    with stage("MongoDB query"):
+        sanitized_fields = get_all_bactotraits_fields()
 
     # Load METPO synonyms
-    bactotraits_synonyms = load_bactotraits_synonyms(tsv_path)
-    all_metpo_synonyms = load_all_metpo_synonyms(tsv_path)
+    with stage("METPO synonyms"):
+        synonym_rows = load_synonym_sources(tsv_path)
+        bactotraits_synonyms = load_bactotraits_synonyms(rows=synonym_rows)
+        all_metpo_synonyms = load_all_metpo_synonyms(rows=synonym_rows)
 
     # 2. Get value counts for each field using sanitized names
     data_collection = db["bactotraits"]
@@ -491,8 +509,10 @@ def reconcile_coverage(
     :param tsv_path: Path to synonym-sources.tsv report
     :param output_format: Output format ('text' or 'yaml')
     """
-    bactotraits_value_map = get_bactotraits_field_values(field_path)
-    bactotraits_synonyms = load_bactotraits_synonyms(tsv_path)
+    with stage("MongoDB query"):
+        bactotraits_value_map = get_bactotraits_field_values(field_path)
+    with stage("METPO synonyms"):
+        bactotraits_synonyms = load_bactotraits_synonyms(tsv_path)
 
     covered_entries = []
     missing_entries = []
@@ -609,8 +629,8 @@ def reconcile_coverage(
 @click.option(
     "--tsv",
     type=click.Path(exists=True),
-    default="reports/synonym-sources.tsv",
-    help="Path to synonym-sources.tsv report",
+    default=None,
+    help="Path to synonym-sources.tsv report (default: generate from metpo.json in-process)",
 )
 @click.option(
     "--format",
@@ -622,15 +642,18 @@ def reconcile_coverage(
 @click.option(
     "--output", type=click.Path(), help="Output file path. If not specified, prints to stdout."
 )
+@profile_options()
+@telemetry_option()
 def main(mode, field, tsv, output_format, output):
     """Reconcile BactoTraits MongoDB field values against METPO synonyms."""
     try:
-        if mode == "field_names":
-            reconcile_all_field_names(tsv, output_format, output)
-        else:  # values mode
-            if not field:
-                raise click.UsageError("--field is required for 'values' mode")
-            reconcile_coverage(field, tsv, output_format, output)
+        with stage(mode):
+            if mode == "field_names":
+                reconcile_all_field_names(tsv, output_format, output)
+            else:  # values mode
+                if not field:
+                    raise click.UsageError("--field is required for 'values' mode")
+                reconcile_coverage(field, tsv, output_format, output)
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -3,19 +3,20 @@ Reconcile Madin MongoDB field values against METPO synonyms attributed to Madin
 
 This script:
 1. Connects to MongoDB and extracts unique values from a specified Madin field
-2. Reads the SPARQL synonym-sources.tsv report
+2. Reads the synonym-sources report (generated in-process from metpo.json by default)
 3. Filters for synonyms attributed to https://github.com/jmadin/bacteria_archaea_traits
 4. Reports which Madin values are covered/missing in METPO
 """
 
-import csv
 import re
 import sys
 from pathlib import Path
 
 import click
 import yaml
-from pymongo import MongoClient
+
+from metpo.cli_common import profile_options, stage, telemetry_option
+from metpo.utils.ontology_reports import load_synonym_sources
 
 MADIN_SOURCE_URI = "https://github.com/jmadin/bacteria_archaea_traits"
 
@@ -59,6 +60,8 @@ def get_madin_field_values(
     :param collection_name: MongoDB collection name
     :return: Dict mapping normalized values to original values (to track if normalization occurred)
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient()
     db = client[db_name]
     collection = db[collection_name]
@@ -74,40 +77,37 @@ def get_madin_field_values(
     return value_map
 
 
-def load_madin_synonyms(tsv_path: str) -> dict[str, dict[str, str]]:
+def load_madin_synonyms(tsv_path: str | None = None) -> dict[str, dict[str, str]]:
     """
-    Load synonyms attributed to Madin source from synonym-sources.tsv.
+    Load synonyms attributed to Madin source from synonym-sources rows.
 
-    :param tsv_path: Path to reports/synonym-sources.tsv
+    :param tsv_path: Path to reports/synonym-sources.tsv (None: generate from metpo.json in-process)
     :return: Dictionary mapping normalized synonym values to their METPO entity and predicate info
     """
     madin_synonyms = {}
     entity_labels = {}
 
-    with Path(tsv_path).open() as f:
-        reader = csv.DictReader(f, delimiter="\t")
-
-        for row in reader:
-            entity = row.get("?entity", "").strip("<>")
-            entity_type = row.get("?entityType", "").strip('"')
-            pred = row.get("?synonymPred", "").strip("<>")
-            syn_value = row.get("?synValue", "").strip('"')
-            src = row.get("?src", "").strip("<>")
-
-            if entity and pred and syn_value:
-                if pred == "http://www.w3.org/2000/01/rdf-schema#label":
-                    entity_labels[entity] = syn_value
-
-                if src == MADIN_SOURCE_URI:
-                    normalized_syn = normalize_whitespace(syn_value)
-                    if normalized_syn not in madin_synonyms:
-                        madin_synonyms[normalized_syn] = {
-                            "entity": entity,
-                            "entity_type": entity_type,
-                            "predicate": pred,
-                            "source": src,
-                            "label": None,
-                        }
+    for row in load_synonym_sources(tsv_path):
+        entity = row.entity
+        entity_type = row.entity_type
+        pred = row.predicate
+        syn_value = row.value
+        src = row.source
+
+        if entity and pred and syn_value:
+            if pred == "http://www.w3.org/2000/01/rdf-schema#label":
+                entity_labels[entity] = syn_value
+
+            if src == MADIN_SOURCE_URI:
+                normalized_syn = normalize_whitespace(syn_value)
+                if normalized_syn not in madin_synonyms:
+                    madin_synonyms[normalized_syn] = {
+                        "entity": entity,
+                        "entity_type": entity_type,
+                        "predicate": pred,
+                        "source": src,
+                        "label": None,
+                    }
 
     for syn_value, info in madin_synonyms.items():
         entity = info["entity"]
@@ -125,6 +125,8 @@ def get_all_madin_fields(db_name: str = "madin", collection_name: str = "madin")
     :param collection_name: MongoDB collection name
     :return: List of all field names
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient()
     db = client[db_name]
     collection = db[collection_name]
@@ -146,6 +148,8 @@ def get_all_madin_values_with_fields(
     :param collection_name: MongoDB collection name
     :return: Dict mapping normalized values to list of field names where they appear
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient()
     db = client[db_name]
     collection = db[collection_name]
@@ -174,8 +178,12 @@ def reconcile_all_field_names(
     :param tsv_path: Path to synonym-sources.tsv report
     :param output_format: Output format ('text' or 'yaml')
     """
-    madin_fields = get_all_madin_fields()
-    madin_synonyms = load_madin_synonyms(tsv_path)
+    from pymongo import MongoClient  # noqa: PLC0415
+
+    with stage("MongoDB query"):
+        madin_fields = get_all_madin_fields()
+    with stage("METPO synonyms"):
+        madin_synonyms = load_madin_synonyms(tsv_path)
 
     # Get value counts for each field
     client = MongoClient()
@@ -296,8 +304,10 @@ def reconcile_coverage(
     :param tsv_path: Path to synonym-sources.tsv report
     :param output_format: Output format ('text' or 'yaml')
     """
-    madin_value_map = get_madin_field_values(field_path)
-    madin_synonyms = load_madin_synonyms(tsv_path)
+    with stage("MongoDB query"):
+        madin_value_map = get_madin_field_values(field_path)
+    with stage("METPO synonyms"):
+        madin_synonyms = load_madin_synonyms(tsv_path)
 
     covered_entries = []
     missing_entries = []
@@ -395,8 +405,10 @@ def verify_madin_synonyms(
     :param tsv_path: Path to synonym-sources.tsv report
     :param output_format: Output format ('text' or 'yaml')
     """
-    value_to_fields = get_all_madin_values_with_fields()
-    madin_synonyms = load_madin_synonyms(tsv_path)
+    with stage("MongoDB query"):
+        value_to_fields = get_all_madin_values_with_fields()
+    with stage("METPO synonyms"):
+        madin_synonyms = load_madin_synonyms(tsv_path)
 
     verified_entries = []
     unverified_entries = []
@@ -509,9 +521,13 @@ def generate_integrated_report(
     :param output_format: Output format ('text' or 'yaml')
     :param output_file: Output file path (None = stdout)
     """
-    madin_synonyms = load_madin_synonyms(tsv_path)
-    value_to_fields = get_all_madin_values_with_fields()
-    madin_fields = get_all_madin_fields()
+    from pymongo import MongoClient  # noqa: PLC0415
+
+    with stage("METPO synonyms"):
+        madin_synonyms = load_madin_synonyms(tsv_path)
+    with stage("MongoDB query"):
+        value_to_fields = get_all_madin_values_with_fields()
+        madin_fields = get_all_madin_fields()
 
     client = MongoClient()
     db = client["madin"]
@@ -783,8 +799,8 @@ def generate_integrated_report(
 @click.option(
     "--tsv",
     type=click.Path(exists=True),
-    default="reports/synonym-sources.tsv",
-    help="Path to synonym-sources.tsv report",
+    default=None,
+    help="Path to synonym-sources.tsv report (default: generate from metpo.json in-process)",
 )
 @click.option(
     "--format",
@@ -796,19 +812,22 @@ def generate_integrated_report(
 @click.option(
     "--output", type=click.Path(), help="Output file path. If not specified, prints to stdout."
 )
+@profile_options()
+@telemetry_option()
 def main(mode, field, tsv, output_format, output):
     """Reconcile Madin MongoDB field values against METPO synonyms."""
     try:
-        if mode == "field_names":
-            reconcile_all_field_names(tsv, output_format, output)
-        elif mode == "verify_synonyms":
-            verify_madin_synonyms(tsv, output_format, output)
-        elif mode == "integrated":
-            generate_integrated_report(tsv, output_format, output)
-        else:  # values mode
-            if not field:
-                raise click.UsageError("--field is required for 'values' mode")
-            reconcile_coverage(field, tsv, output_format, output)
+        with stage(mode):
+            if mode == "field_names":
+                reconcile_all_field_names(tsv, output_format, output)
+            elif mode == "verify_synonyms":
+                verify_madin_synonyms(tsv, output_format, output)
+            elif mode == "integrated":
+                generate_integrated_report(tsv, output_format, output)
+            else:  # values mode
+                if not field:
+                    raise click.UsageError("--field is required for 'values' mode")
+                reconcile_coverage(field, tsv, output_format, output)
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
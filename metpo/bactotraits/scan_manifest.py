@@ -1,122 +1,118 @@
 """
 Scan external/ontologies/ directories and update manifest with current state.
 
+Only files whose size or mtime changed since the last scan are re-read (see
+metpo.bactotraits.ontology_manifest); they are fingerprinted in parallel.
+When nothing changed, the scan only stats the files and leaves the manifest
+untouched.
+
 Usage:
     scan-manifest
 """
 
-import csv
-import json
+import time
 from datetime import UTC, datetime
 from pathlib import Path
 
 import click
 
-MANIFEST_PATH = Path(".ontology_manifest.json")
-NON_OLS_DIR = Path("non-ols")
-TSV_DIR = Path("notebooks/non-ols-terms")
-
-
-def load_manifest():
-    """Load manifest or create if doesn't exist."""
-    if MANIFEST_PATH.exists():
-        with Path(MANIFEST_PATH).open() as f:
-            return json.load(f)
-    return {
-        "_comment": "Tracking successful ontology fetches to avoid re-downloading",
-        "ontologies": {},
-    }
-
-
-def save_manifest(manifest):
-    """Save manifest with pretty formatting."""
-    with Path(MANIFEST_PATH).open("w") as f:
-        json.dump(manifest, f, indent=2)
-
-
-def count_tsv_terms(tsv_path: Path) -> int:
-    """Count rows in TSV (excluding header)."""
-    try:
-        with Path(tsv_path).open() as f:
-            return sum(1 for _ in csv.reader(f, delimiter="\t")) - 1
-    except Exception:
-        return 0
+from metpo.bactotraits.ontology_manifest import (
+    MANIFEST_PATH,
+    load_manifest,
+    refresh_fingerprints,
+    save_manifest,
+)
+
+ONTOLOGY_DIRS = (Path("external/ontologies/bioportal"), Path("external/ontologies/manual"))
+TSV_DIR = Path("data/pipeline/non-ols-terms")
+MANUAL_ONTOLOGIES = ("PATO", "N4L_MERGED")
+
+
+def ontology_id(file_path: Path) -> str:
+    """Ontology ID from a filename (e.g., meo.v.1.0.ttl -> MEO)."""
+    ont_id = file_path.stem.upper()
+    if "." in ont_id and ont_id.split(".")[0]:
+        ont_id = ont_id.split(".")[0]
+    return ont_id
+
+
+def update_entry(entry: dict, file_path: Path, tsv_path: Path, artifacts: dict) -> None:
+    """Fill an ontology entry from the recorded fingerprints of its file and TSV."""
+    ont_id = ontology_id(file_path)
+    file_size = artifacts[str(file_path)]["size"]
+    entry["file_path"] = str(file_path)
+    entry["file_size_bytes"] = file_size
+    entry["file_sha256"] = artifacts[str(file_path)]["sha256"]
+    entry["source"] = "manual" if ont_id in MANUAL_ONTOLOGIES else "bioportal"
+
+    # Determine status based on file size
+    entry["status"] = "empty" if file_size < 1000 else "success"
+
+    tsv = artifacts.get(str(tsv_path))
+    if tsv is not None:
+        entry["tsv_path"] = str(tsv_path)
+        entry["tsv_size_bytes"] = tsv["size"]
+        entry["term_count"] = tsv["term_count"]
+        entry["robot_query_status"] = "success" if tsv["term_count"] else "empty"
+    else:
+        entry["robot_query_status"] = "not_run"
+
+    # Update timestamp only if not already set
+    if "fetched_at" not in entry:
+        entry["fetched_at"] = datetime.fromtimestamp(
+            artifacts[str(file_path)]["mtime_ns"] / 1e9, tz=UTC
+        ).isoformat()
 
 
 @click.command()
 @click.option("--verbose", is_flag=True, help="Show detailed output")
-def main(verbose: bool):
+@click.option(
+    "--workers", type=int, default=0, show_default=True, help="Parallel readers (0 = CPU count)"
+)
+@click.option("--rehash", is_flag=True, help="Re-read every file even if its size and mtime match")
+def main(verbose: bool, workers: int, rehash: bool):
     """Scan directories and update manifest with current state."""
+    start = time.perf_counter()
     manifest = load_manifest()
+    artifacts = manifest["artifacts"]
 
     click.echo("Scanning external/ontologies/ directories...")
 
-    # Scan OWL and TTL files
-    files_found = 0
-    for ext in ["*.owl", "*.ttl"]:
-        for file_path in NON_OLS_DIR.glob(ext):
-            files_found += 1
-            # Extract ontology ID from filename
-            ont_id = file_path.stem.upper()
-
-            # Handle versioned files (e.g., meo.v.1.0.ttl -> MEO)
-            if "." in ont_id and ont_id.split(".")[0]:
-                ont_id = ont_id.split(".")[0]
-
-            # Skip some obvious non-ontology files
-            if ont_id in ["PATO", "N4L_MERGED"]:
-                # These might be manually added, keep them
-                pass
-
-            if ont_id not in manifest["ontologies"]:
-                manifest["ontologies"][ont_id] = {}
-
-            entry = manifest["ontologies"][ont_id]
-
-            # Update file info
-            file_size = file_path.stat().st_size
-            entry["file_path"] = str(file_path)
-            entry["file_size_bytes"] = file_size
-            entry["source"] = "manual" if ont_id in ["PATO", "N4L_MERGED"] else "bioportal"
-
-            # Determine status based on file size
-            if file_size < 1000:
-                entry["status"] = "empty"
-            else:
-                entry["status"] = "success"
-
-            # Check for corresponding TSV
-            tsv_path = TSV_DIR / f"{ont_id}.tsv"
-            if tsv_path.exists():
-                entry["tsv_path"] = str(tsv_path)
-                entry["tsv_size_bytes"] = tsv_path.stat().st_size
-                term_count = count_tsv_terms(tsv_path)
-                entry["term_count"] = term_count
-
-                if term_count == 0:
-                    entry["robot_query_status"] = "empty"
-                else:
-                    entry["robot_query_status"] = "success"
-            else:
-                entry["robot_query_status"] = "not_run"
-
-            # Update timestamp only if not already set
-            if "fetched_at" not in entry:
-                entry["fetched_at"] = datetime.fromtimestamp(
-                    file_path.stat().st_mtime, tz=UTC
-                ).isoformat()
-
-            if verbose:
-                click.echo(
-                    f"  {ont_id}: {entry['status']} "
-                    f"({file_size:,} bytes, "
-                    f"robot: {entry.get('robot_query_status', 'unknown')})"
-                )
-
-    save_manifest(manifest)
-
-    click.echo(f"\n✓ Scanned {files_found} files")
-    click.echo(f"✓ Manifest updated: {MANIFEST_PATH}")
+    # Scan OWL and TTL files and the TSV extracted from each
+    pairs = [
+        (file_path, TSV_DIR / f"{file_path.stem}.tsv")
+        for directory in ONTOLOGY_DIRS
+        for ext in ["*.owl", "*.ttl"]
+        for file_path in sorted(directory.glob(ext))
+    ]
+    paths = [file_path for file_path, _ in pairs]
+    paths += [tsv_path for _, tsv_path in pairs if tsv_path.exists()]
+    for stale in [key for key in artifacts if not Path(key).exists()]:
+        del artifacts[stale]
+    reread = refresh_fingerprints(paths, artifacts, workers=workers, rehash=rehash)
+
+    for file_path, tsv_path in pairs:
+        ont_id = ontology_id(file_path)
+        entry = manifest["ontologies"].setdefault(ont_id, {})
+        update_entry(entry, file_path, tsv_path, artifacts)
+
+        if verbose:
+            click.echo(
+                f"  {ont_id}: {entry['status']} "
+                f"({entry['file_size_bytes']:,} bytes, "
+                f"robot: {entry.get('robot_query_status', 'unknown')})"
+            )
+
+    written = save_manifest(manifest)
+
+    click.echo(
+        f"\n✓ Scanned {len(pairs)} files ({len(reread)} re-read) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    if written:
+        click.echo(f"✓ Manifest updated: {MANIFEST_PATH}")
+    else:
+        click.echo(f"✓ Manifest unchanged: {MANIFEST_PATH}")
 
     # Summary
     statuses = {}
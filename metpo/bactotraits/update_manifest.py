@@ -6,30 +6,16 @@ Usage:
     update-manifest --ontology D3O --robot-status failed --tsv data/pipeline/non-ols-terms/D3O.tsv
 """
 
-import json
 from datetime import UTC, datetime
 from pathlib import Path
 
 import click
 
-MANIFEST_PATH = Path(".ontology_manifest.json")
-
-
-def load_manifest():
-    """Load manifest or create if doesn't exist."""
-    if MANIFEST_PATH.exists():
-        with Path(MANIFEST_PATH).open() as f:
-            return json.load(f)
-    return {
-        "_comment": "Tracking successful ontology fetches to avoid re-downloading",
-        "ontologies": {},
-    }
-
-
-def save_manifest(manifest):
-    """Save manifest with pretty formatting."""
-    with Path(MANIFEST_PATH).open("w") as f:
-        json.dump(manifest, f, indent=2)
+from metpo.bactotraits.ontology_manifest import (
+    load_manifest,
+    refresh_fingerprints,
+    save_manifest,
+)
 
 
 @click.command()
@@ -76,8 +62,10 @@ def main(
 
     # Update file info
     if file_path and file_path.exists():
+        refresh_fingerprints([file_path], manifest["artifacts"])
         entry["file_path"] = str(file_path)
-        entry["file_size_bytes"] = file_path.stat().st_size
+        entry["file_size_bytes"] = manifest["artifacts"][str(file_path)]["size"]
+        entry["file_sha256"] = manifest["artifacts"][str(file_path)]["sha256"]
         if entry["file_size_bytes"] < 1000:  # < 1KB likely error
             entry["status"] = "empty"
 
@@ -89,7 +77,10 @@ def main(
     if tsv_path:
         entry["tsv_path"] = str(tsv_path)
         if tsv_path.exists():
-            entry["tsv_size_bytes"] = tsv_path.stat().st_size
+            refresh_fingerprints([tsv_path], manifest["artifacts"])
+            entry["tsv_size_bytes"] = manifest["artifacts"][str(tsv_path)]["size"]
+            if term_count is None:
+                term_count = manifest["artifacts"][str(tsv_path)]["term_count"]
             if entry["tsv_size_bytes"] == 0:
                 entry["robot_query_status"] = "empty"
         else:
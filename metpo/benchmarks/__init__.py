@@ -0,0 +1 @@
+"""Synthetic-scale benchmarks for METPO commands."""
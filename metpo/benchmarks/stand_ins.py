@@ -0,0 +1,317 @@
+"""Local stand-ins for the OLS4, Ollama, OpenAI and BioPortal APIs.
+
+:class:`StandInServer` answers, on one local port:
+
+- ``GET /ols4/api/search?q=...&rows=N`` -- OLS4 search results (``response.docs``)
+- ``GET /ols4/api/ontologies/{onto}/terms/{iri}/parents`` and ``.../children``
+  -- OLS4 hierarchy pages (``_embedded.terms``) over a synthetic tree in which
+  term ``n`` is a child of ``n // TREE_FANOUT``
+- ``POST /api/embeddings`` -- Ollama embeddings; texts that share words get
+  similar vectors
+- ``POST /v1/chat/completions`` -- OpenAI-compatible chat completions that
+  answer a definition prompt with a genus-differentia definition; every
+  ``rate_limit_every``-th request gets a 429 instead
+- ``GET /bioportal/search?q=...`` -- BioPortal search (``collection``)
+- ``GET /bioportal/ontologies/{acronym}/download`` -- a generated ontology file
+  of ``download_bytes`` bytes, with HTTP Range support
+
+Responses are deterministic. Each one is delayed by ``latency`` seconds to
+model the network, and requests are counted per API.
+
+Commands that reach these APIs through libraries that cannot be redirected
+are patched with the ``route_*`` functions (see ``metpo.benchmarks.suite``).
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metpo.benchmarks.synthetic import CLAUSES, TREE_FANOUT, synthetic_label
+
+EMBEDDING_DIM = 64
+OBO_PREFIX = "http://purl.obolibrary.org/obo/"
+OLS_TERMS_PATH = re.compile(r"^/ols4/api/ontologies/([^/]+)/terms/([^/]+)/(parents|children)$")
+DOWNLOAD_PATH = re.compile(r"^/bioportal/ontologies/([^/]+)/download$")
+PROMPT_TERM = re.compile(r'^TERM: \S+ "(.*)"$', re.MULTILINE)
+PROMPT_PARENTS = re.compile(r"^PARENT CLASS\(ES\): (.*)$", re.MULTILINE)
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+def embedding(text: str, dim: int = EMBEDDING_DIM) -> list[float]:
+    """Deterministic bag-of-words vector: each word adds +/-1 to one hashed dimension."""
+    vector = [0.0] * dim
+    for word in text.lower().split():
+        h = _digest(word)
+        vector[h % dim] += 1.0 if h >> 32 & 1 else -1.0
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def search_docs(query: str, rows: int) -> list[dict]:
+    """OLS4-style search docs for ``query``: the query itself, then related labels."""
+    seed = _digest(query)
+    docs = []
+    for i in range(rows):
+        local_id = (seed >> 8) % TREE_FANOUT**6 + i
+        ontology = ("micro", "pato", "go", "omp", "upheno")[(seed + i) % 5]
+        label = query if i == 0 else f"{query} {synthetic_label(local_id).split()[0]}"
+        docs.append(
+            {
+                "iri": f"{OBO_PREFIX}{ontology.upper()}_{local_id:07d}",
+                "obo_id": f"{ontology.upper()}:{local_id:07d}",
+                "short_form": f"{ontology.upper()}_{local_id:07d}",
+                "label": label,
+                "description": [f"A quality that {CLAUSES[(seed + i) % len(CLAUSES)]}."],
+                "ontology_name": ontology,
+            }
+        )
+    return docs
+
+
+def hierarchy_terms(iri: str, relation: str) -> list[dict]:
+    """Parents or children of an OBO IRI in the synthetic tree."""
+    match = re.search(r"/([A-Za-z]+)_(\d+)$", iri)
+    if not match:
+        return []
+    prefix, number = match[1], int(match[2])
+    if relation == "parents":
+        numbers = [number // TREE_FANOUT] if number else []
+    else:
+        numbers = [n for n in range(number * TREE_FANOUT, (number + 1) * TREE_FANOUT) if n]
+    return [
+        {
+            "iri": f"{OBO_PREFIX}{prefix}_{n:07d}",
+            "obo_id": f"{prefix}:{n:07d}",
+            "label": synthetic_label(n),
+        }
+        for n in numbers
+    ]
+
+
+def chat_answer(messages: list[dict]) -> str:
+    """A definition for the term in the last user message of a definition prompt."""
+    prompt = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    label = match[1] if (match := PROMPT_TERM.search(prompt)) else "term"
+    parents = match[1] if (match := PROMPT_PARENTS.search(prompt)) else ""
+    genus = parents.split(", ")[0] if parents and not parents.startswith("[") else "quality"
+    return f"A {genus} that {CLAUSES[_digest(label) % len(CLAUSES)]}."
+
+
+def ontology_payload(acronym: str, size: int) -> bytes:
+    """An RDF/XML-looking ontology file of exactly ``size`` bytes."""
+    head = f'<?xml version="1.0"?>\n<rdf:RDF xml:base="http://example.org/{acronym}">\n'
+    line = f"  <owl:Class><rdfs:label>{acronym} term</rdfs:label></owl:Class>\n"
+    tail = "</rdf:RDF>\n"
+    body = head + line * max(0, (size - len(head) - len(tail)) // len(line) + 1)
+    return (body[: max(0, size - len(tail))] + tail).encode()[:size]
+
+
+class StandInServer(ThreadingHTTPServer):
+    """OLS4, Ollama, OpenAI and BioPortal stand-ins served from a background thread.
+
+    Args:
+        latency: Seconds to wait before answering each request
+        download_bytes: Size of each BioPortal ontology download
+        embedding_dim: Length of the embedding vectors
+        rate_limit_every: Answer every Nth chat request with a 429 (0: never)
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        download_bytes: int = 256 * 1024,
+        embedding_dim: int = EMBEDDING_DIM,
+        rate_limit_every: int = 0,
+    ):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.latency = latency
+        self.download_bytes = download_bytes
+        self.embedding_dim = embedding_dim
+        self.rate_limit_every = rate_limit_every
+        self.requests: Counter[str] = Counter()
+        self.lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def ols_search_url(self) -> str:
+        return f"{self.url}/ols4/api/search"
+
+    @property
+    def embed_url(self) -> str:
+        return f"{self.url}/api/embeddings"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def bioportal_download_url(self) -> str:
+        return f"{self.url}/bioportal/ontologies/{{ontology_id}}/download"
+
+    def count(self, api: str) -> int:
+        with self.lock:
+            self.requests[api] += 1
+            return self.requests[api]
+
+    def __enter__(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients wait for a delayed ACK (about 40 ms) on every request
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        if url.path == "/ols4/api/search":
+            self.server.count("ols_search")
+            docs = search_docs(query.get("q", ""), int(query.get("rows", 10)))
+            self._send_json({"response": {"numFound": len(docs), "docs": docs}})
+        elif match := OLS_TERMS_PATH.match(url.path):
+            self.server.count("ols_hierarchy")
+            iri = urllib.parse.unquote(urllib.parse.unquote(match[2]))
+            self._send_json({"_embedded": {"terms": hierarchy_terms(iri, match[3])}})
+        elif url.path == "/bioportal/search":
+            self.server.count("bioportal_search")
+            docs = search_docs(query.get("q", ""), int(query.get("pagesize", 10)))
+            ontologies = f"{self.server.url}/bioportal/ontologies"
+            collection = [
+                {
+                    "@id": doc["iri"],
+                    "prefLabel": doc["label"],
+                    "definition": doc["description"],
+                    "links": {"ontology": f"{ontologies}/{doc['ontology_name'].upper()}"},
+                }
+                for doc in docs
+            ]
+            self._send_json({"collection": collection})
+        elif match := DOWNLOAD_PATH.match(url.path):
+            self.server.count("bioportal_download")
+            self._send_download(ontology_payload(match[1], self.server.download_bytes))
+        else:
+            self.send_error(404)
+
+    def _send_download(self, body: bytes) -> None:
+        start = 0
+        if requested := self.headers.get("Range"):
+            start = min(int(requested.removeprefix("bytes=").split("-")[0]), len(body))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/rdf+xml")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/api/embeddings":
+            self.server.count("embeddings")
+            vector = embedding(payload.get("prompt", ""), self.server.embedding_dim)
+            self._send_json({"embedding": vector})
+        elif self.path == "/v1/chat/completions":
+            n = self.server.count("chat_completions")
+            if self.server.rate_limit_every and n % self.server.rate_limit_every == 0:
+                self.send_error(429, "Rate limit reached")
+                return
+            message = {"role": "assistant", "content": chat_answer(payload.get("messages", []))}
+            self._send_json(
+                {
+                    "object": "chat.completion",
+                    "model": payload.get("model", ""),
+                    "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+                }
+            )
+        else:
+            self.send_error(404)
+
+
+class OlsHierarchyAdapter:
+    """The part of an OAK adapter that sibling lookups use, answered by an OLS4 API."""
+
+    def __init__(self, base_url: str, ontology: str):
+        self.base_url = base_url.rstrip("/")
+        self.ontology = ontology
+
+    def _terms(self, curie: str, relation: str) -> list[str]:
+        iri = OBO_PREFIX + curie.replace(":", "_", 1)
+        # OLS4 expects the IRI double URL-encoded in the path
+        encoded = urllib.parse.quote(urllib.parse.quote(iri, safe=""), safe="")
+        url = f"{self.base_url}/ols4/api/ontologies/{self.ontology}/terms/{encoded}/{relation}"
+        with urllib.request.urlopen(url, timeout=20) as response:
+            terms = json.load(response).get("_embedded", {}).get("terms", [])
+        return [term["obo_id"] for term in terms if term.get("obo_id")]
+
+    def label(self, curie: str) -> str:
+        return curie
+
+    def hierarchical_parents(self, curie: str, isa_only: bool = True) -> list[str]:
+        return self._terms(curie, "parents")
+
+    def incoming_relationships(self, curie: str):
+        for child in self._terms(curie, "children"):
+            yield "rdfs:subClassOf", child
+
+
+def route_sibling_lookups(base_url: str) -> None:
+    """Answer analyze-sibling-coherence's external sibling lookups from an OLS4 API at ``base_url``.
+
+    OAK adapters pick their endpoints internally, so instead of redirecting
+    them this swaps the helper's adapter factory for :class:`OlsHierarchyAdapter`.
+    """
+    from metpo.pipeline.analyze_sibling_coherence import (  # noqa: PLC0415
+        ExternalOntologyHelper,
+    )
+
+    def get_adapter(helper, ontology_prefix, iri_for_fallback):
+        prefix = ontology_prefix or helper._extract_ontology_prefix_from_iri(iri_for_fallback)
+        if not prefix:
+            return None
+        if prefix not in helper.adapter_cache:
+            helper.adapter_cache[prefix] = OlsHierarchyAdapter(base_url, prefix.lower())
+        return helper.adapter_cache[prefix]
+
+    ExternalOntologyHelper._get_adapter = get_adapter  # type: ignore[method-assign]
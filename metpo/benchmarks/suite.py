@@ -0,0 +1,333 @@
+"""Throughput and peak-memory benchmarks for the hot METPO commands.
+
+Each benchmark writes synthetic inputs at a multiple of the current data
+sizes (see :mod:`metpo.benchmarks.synthetic`). It then runs the command
+through ``metpo <command>`` in a fresh interpreter, with every API pointed at a
+:class:`~metpo.benchmarks.stand_ins.StandInServer`. The child's wall time,
+CPU time and peak RSS come from ``wait4``, so interpreter start-up and
+imports count, as they do for users.
+
+Results are compared against a JSON baseline from an earlier run at the same
+scale. A benchmark regresses when its throughput falls, or its peak memory
+grows, by more than the tolerance.
+
+Some commands cost more than linear time per item or make one request per
+term. These benchmarks set ``max_scale`` and run at that scale instead, so
+the suite stays usable at 100x and 1000x. The scale actually used is
+recorded with each result.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import metpo
+from metpo.benchmarks import synthetic
+from metpo.benchmarks.stand_ins import StandInServer
+
+REPO_ROOT = Path(metpo.__file__).resolve().parents[1]
+BASELINE_DIR = REPO_ROOT / "benchmark-baselines"
+DOWNLOAD_ONTOLOGIES = ("D3O", "MPO", "OMP", "MICRO", "FLOPO", "OBA", "MCO", "N4L")
+DOWNLOAD_BYTES = 256 * 1024  # per ontology at scale 1
+# Run a command with an API patched to the stand-in, then dispatch like `metpo`
+PATCHED_CHILD = (
+    "import sys; from metpo.benchmarks import stand_ins; stand_ins.{patch}({url!r}); "
+    "from metpo.cli import main; sys.argv[0] = 'metpo'; main()"
+)
+
+
+@dataclass
+class Prepared:
+    """Arguments for one benchmark run and the number of items it processes."""
+
+    args: list[str]
+    items: int
+
+
+@dataclass
+class Benchmark:
+    """One command to benchmark.
+
+    Args:
+        name: The ``metpo`` subcommand
+        prepare: Writes inputs to a directory for a scale; returns the arguments
+        unit: What ``items`` counts
+        ok_returncodes: Exit codes of a successful run (QC commands exit 1 on findings)
+        max_scale: Cap on the scale; larger scales run at this one
+        patch: ``stand_ins`` function called with the server URL before the command runs
+        env: Extra environment variables
+    """
+
+    name: str
+    prepare: Callable[[Path, float, StandInServer], Prepared]
+    unit: str = "rows"
+    ok_returncodes: tuple[int, ...] = (0,)
+    max_scale: float | None = None
+    patch: str | None = None
+    env: dict[str, str] = field(default_factory=dict)
+
+    def effective_scale(self, scale: float) -> float:
+        return min(scale, self.max_scale) if self.max_scale else scale
+
+
+@dataclass
+class Measurement:
+    returncode: int
+    wall: float
+    cpu: float
+    peak_rss: int  # bytes
+
+
+def metpo_classes() -> list[tuple[str, str]]:
+    """``(id, label)`` of the non-deprecated METPO classes, from the cached ontology index."""
+    from metpo.utils.ontology_index import (  # noqa: PLC0415
+        DEFAULT_ONTOLOGY_JSON,
+        OntologyIndex,
+    )
+
+    index = OntologyIndex.load(DEFAULT_ONTOLOGY_JSON)
+    return [
+        (curie, label)
+        for curie, label, kind, deprecated in zip(
+            index.ids, index.labels, index.types, index.deprecated, strict=True
+        )
+        if kind == "CLASS" and not deprecated and curie.startswith("METPO:1")
+    ]
+
+
+def _classes_template(work_dir: Path, scale: float) -> tuple[Path, int]:
+    path = work_dir / "metpo_sheet.tsv"
+    return path, synthetic.write_robot_template(path, synthetic.scaled_rows("classes", scale))
+
+
+def prepare_cross_ontology_search(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    template, terms = _classes_template(work_dir, scale)
+    args = ["-i", str(template), "-o", str(work_dir / "matches.tsv")]
+    args += ["--ols-url", server.ols_search_url, "--embed-url", server.embed_url]
+    return Prepared(args, terms)
+
+
+def prepare_analyze_matches(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    path = work_dir / "mappings.sssom.tsv"
+    rows = synthetic.write_sssom(path, synthetic.scaled_rows("sssom", scale))
+    return Prepared(["-i", str(path)], rows)
+
+
+def prepare_sibling_coherence(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    # Mappings come from real METPO classes, so METPO siblings resolve in the
+    # real hierarchy. Only the mappings grow with the scale, not METPO itself.
+    path = work_dir / "mappings.sssom.tsv"
+    rows = synthetic.write_sssom(
+        path, synthetic.scaled_rows("sssom", scale), subjects=metpo_classes()
+    )
+    return Prepared(["-i", str(path), "-o", str(work_dir / "coherence.csv")], rows)
+
+
+def prepare_proposal_lint(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    template, rows = _classes_template(work_dir, scale)
+    return Prepared([str(template), "--mode", "draft", "--warn-only"], rows)
+
+
+def prepare_qc_sheets(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    classes, class_rows = _classes_template(work_dir, scale)
+    properties = work_dir / "metpo-properties.tsv"
+    property_rows = synthetic.write_robot_template(
+        properties, synthetic.scaled_rows("properties", scale), kind="properties"
+    )
+    return Prepared(["-m", str(classes), "-p", str(properties)], class_rows + property_rows)
+
+
+def prepare_best_definitions(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    template, terms = _classes_template(work_dir, scale)
+    subjects = synthetic.template_terms(terms)
+    mappings = work_dir / "mappings.sssom.tsv"
+    synthetic.write_sssom(mappings, synthetic.scaled_rows("sssom", scale), subjects=subjects)
+    api_results = work_dir / "api_results.tsv"
+    synthetic.write_api_results(
+        api_results, synthetic.scaled_rows("api_results", scale), subjects=subjects
+    )
+    args = ["-m", str(mappings), "-a", str(api_results), "-t", str(template)]
+    args += ["-o", str(work_dir / "candidates.tsv"), "-b", str(work_dir / "best.tsv")]
+    return Prepared(args, terms)
+
+
+def prepare_llm_definitions(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    template, terms = _classes_template(work_dir, scale)
+    args = ["-t", str(template), "-b", str(work_dir / "best.tsv")]
+    args += ["-c", str(work_dir / "candidates.tsv"), "-o", str(work_dir / "proposed.tsv")]
+    # Uncached, so every run pays for every request
+    args += ["--base-url", server.openai_base_url, "--workers", "8", "--no-cache"]
+    return Prepared(args, terms)
+
+
+def prepare_download(work_dir: Path, scale: float, server: StandInServer) -> Prepared:
+    server.download_bytes = max(1000, round(DOWNLOAD_BYTES * scale))
+    args = [*DOWNLOAD_ONTOLOGIES, "--output-dir", str(work_dir / "ontologies")]
+    args += ["--base-url", server.bioportal_download_url]
+    return Prepared(args, server.download_bytes * len(DOWNLOAD_ONTOLOGIES))
+
+
+BENCHMARKS = {
+    bench.name: bench
+    for bench in (
+        # One OLS search and up to --rows embedding requests per term
+        Benchmark(
+            "cross-ontology-search", prepare_cross_ontology_search, unit="terms", max_scale=1
+        ),
+        Benchmark("analyze-matches", prepare_analyze_matches),
+        Benchmark(
+            "analyze-sibling-coherence",
+            prepare_sibling_coherence,
+            patch="route_sibling_lookups",
+        ),
+        Benchmark("metpo-proposal-lint", prepare_proposal_lint),
+        Benchmark("qc-metpo-sheets", prepare_qc_sheets, ok_returncodes=(0, 1)),
+        # Rereads both mapping files once per term, so time grows with terms x mappings
+        Benchmark(
+            "find-best-definitions-comprehensive",
+            prepare_best_definitions,
+            unit="terms",
+            max_scale=1,
+        ),
+        # One chat completion per term, 8 in flight
+        Benchmark("propose-definitions-with-llm", prepare_llm_definitions, unit="terms"),
+        Benchmark(
+            "download-ontology",
+            prepare_download,
+            unit="bytes",
+            env={"BIOPORTAL_API_KEY": "benchmark"},
+        ),
+    )
+}
+
+
+def command_argv(bench: Benchmark, args: list[str], server: StandInServer) -> list[str]:
+    if bench.patch:
+        code = PATCHED_CHILD.format(patch=bench.patch, url=server.url)
+        return [sys.executable, "-c", code, bench.name, *args]
+    return [sys.executable, "-m", "metpo.cli", bench.name, *args]
+
+
+def measure(argv: list[str], cwd: Path, env: dict[str, str]) -> Measurement:
+    """Run ``argv`` to completion; output goes to ``stdout.log``/``stderr.log`` in ``cwd``."""
+    with (cwd / "stdout.log").open("wb") as out, (cwd / "stderr.log").open("wb") as err:
+        start = time.perf_counter()
+        process = subprocess.Popen(argv, cwd=cwd, env=env, stdout=out, stderr=err)
+        # wait4 reports the resource usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return Measurement(process.returncode, wall, usage.ru_utime + usage.ru_stime, peak_rss)
+
+
+def run_benchmark(
+    bench: Benchmark, scale: float, server: StandInServer, work_dir: Path, repeat: int = 1
+) -> dict:
+    """Run one benchmark ``repeat`` times and return its fastest run.
+
+    Raises:
+        RuntimeError: If the command exits with an unexpected code
+    """
+    scale = bench.effective_scale(scale)
+    bench_dir = work_dir / bench.name
+    bench_dir.mkdir(parents=True, exist_ok=True)
+    prepared = bench.prepare(bench_dir, scale, server)
+    argv = command_argv(bench, prepared.args, server)
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.getenv("PYTHONPATH")])),
+        **bench.env,
+    }
+
+    runs = []
+    for _ in range(repeat):
+        requests_before = server.requests.total()
+        run = measure(argv, bench_dir, env)
+        if run.returncode not in bench.ok_returncodes:
+            msg = f"{bench.name} exited with {run.returncode}; see {bench_dir / 'stderr.log'}"
+            raise RuntimeError(msg)
+        runs.append((run, server.requests.total() - requests_before))
+    best, requests = min(runs, key=lambda pair: pair[0].wall)
+    return {
+        "scale": scale,
+        "items": prepared.items,
+        "unit": bench.unit,
+        "wall_s": round(best.wall, 4),
+        "cpu_s": round(best.cpu, 4),
+        "peak_rss_mib": round(best.peak_rss / 2**20, 1),
+        "items_per_s": round(prepared.items / best.wall, 2),
+        "api_requests": requests,
+    }
+
+
+def run_suite(
+    names: list[str],
+    scale: float,
+    work_dir: Path,
+    latency: float = 0.0,
+    repeat: int = 1,
+    progress: Callable[[str, dict], None] | None = None,
+) -> dict:
+    """Run the named benchmarks against one stand-in server; return a results document."""
+    results: dict[str, dict] = {}
+    with StandInServer(latency=latency) as server:
+        for name in names:
+            results[name] = run_benchmark(BENCHMARKS[name], scale, server, work_dir, repeat)
+            if progress:
+                progress(name, results[name])
+    return {
+        "scale": scale,
+        "latency_s": latency,
+        "python": platform.python_version(),
+        "platform": f"{platform.system()} {platform.machine()}",
+        "cpus": os.cpu_count(),
+        "benchmarks": results,
+    }
+
+
+def baseline_path(scale: float) -> Path:
+    return BASELINE_DIR / f"scale-{scale:g}.json"
+
+
+def load_baseline(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(results: dict, path: Path) -> None:
+    """Write ``results`` to ``path``, keeping baseline entries for benchmarks that did not run."""
+    existing = load_baseline(path) or {}
+    benchmarks = existing.get("benchmarks", {})
+    benchmarks.update(results["benchmarks"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {**results, "benchmarks": dict(sorted(benchmarks.items()))}
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of ``results`` against ``baseline``, one message each."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base or base["scale"] != result["scale"]:
+            continue
+        if result["items_per_s"] < base["items_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['items_per_s']:g} {result['unit']}/s "
+                f"< baseline {base['items_per_s']:g} - {tolerance:.0%}"
+            )
+        if result["peak_rss_mib"] > base["peak_rss_mib"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak RSS {result['peak_rss_mib']:g} MiB "
+                f"> baseline {base['peak_rss_mib']:g} MiB + {tolerance:.0%}"
+            )
+    return regressions
@@ -0,0 +1,400 @@
+"""Deterministic synthetic inputs at a multiple of METPO's current data sizes.
+
+``scale=1`` reproduces the row counts of the real files (see BASE_ROWS);
+the benchmark suite uses 10, 100 and 1000. Every generator takes a seed and
+writes the same bytes for the same arguments, so runs at one scale are
+comparable across machines and commits.
+
+The files keep the shapes the commands rely on:
+
+- SSSOM: the ``#`` metadata block and the columns of
+  data/mappings/metpo_mappings_combined_relaxed.sssom.tsv; some object
+  labels carry a ``"label; definition"`` document
+- ROBOT templates: the header and directive rows of the classes and
+  properties sheets; parents form a tree over earlier rows, and a few labels
+  are repeated so QC has clashes to report
+- trait tables: a BactoTraits-style wide table of 0/1/fractional trait
+  columns keyed by ``Bacdive_ID``
+- API search results: the columns of
+  data/ontology_assessments/phase1_high_quality_matches.tsv
+"""
+
+import csv
+import random
+from collections.abc import Sequence
+from pathlib import Path
+
+BASE_ROWS = {
+    "sssom": 3011,  # metpo_mappings_combined_relaxed.sssom.tsv
+    "classes": 291,  # src/templates/metpo_sheet.tsv
+    "properties": 113,  # src/templates/metpo-properties.tsv
+    "traits": 19455,  # BactoTraits release used by import-bactotraits
+    "api_results": 1000,  # phase1_high_quality_matches.tsv
+}
+MAPPINGS_PER_SUBJECT = 13  # about 3011 mappings over 228 METPO terms
+DUPLICATE_LABEL_EVERY = 97  # every Nth template row repeats the previous label
+TREE_FANOUT = 8
+
+SSSOM_COLUMNS = [
+    "subject_id",
+    "subject_label",
+    "predicate_id",
+    "object_id",
+    "object_label",
+    "mapping_justification",
+    "confidence",
+    "similarity_score",
+    "similarity_measure",
+    "mapping_tool",
+    "subject_source",
+    "object_source",
+    "comment",
+]
+SSSOM_HEADER = """\
+# curie_map:
+#   METPO: http://purl.obolibrary.org/obo/METPO_
+#   skos: http://www.w3.org/2004/02/skos/core#
+#   semapv: https://w3id.org/semapv/vocab/
+# mapping_set_id: metpo-synthetic-benchmark
+# mapping_tool: synthetic
+# comment: Synthetic mappings generated by metpo.benchmarks.synthetic
+"""
+CLASS_HEADER = [
+    [
+        "ID",
+        "label",
+        "TYPE",
+        "parent classes (one strongly preferred)",
+        "definition",
+        "definition source",
+        "term editor",
+        "comment",
+        "confirmed exact synonym",
+        "bactotraits related synonym",
+        "Bactotraits synonym source",
+    ],
+    [
+        "ID",
+        "LABEL",
+        "TYPE",
+        "SC % SPLIT=|",
+        "A IAO:0000115",
+        ">AI IAO:0000119 SPLIT=|",
+        "A IAO:0000117 SPLIT=|",
+        "A rdfs:comment",
+        "A oboInOwl:hasExactSynonym SPLIT=|",
+        "A oboInOwl:hasRelatedSynonym SPLIT=|",
+        ">AI IAO:0000119",
+    ],
+]
+PROPERTY_HEADER = [
+    [
+        "ID",
+        "label",
+        "TYPE",
+        "non-materialized comment",
+        "DOMAIN",
+        "RANGE",
+        "parent property",
+        "biolink equivalent",
+        "description",
+        "synonym property and value TUPLES",
+        "synonym source",
+        "assay outcome",
+    ],
+    [
+        "ID",
+        "LABEL",
+        "TYPE",
+        "",
+        "DOMAIN",
+        "RANGE",
+        "SP %",
+        "AI skos:closeMatch",
+        "A IAO:0000115",
+        "AP SPLIT=|",
+        ">AI IAO:0000119",
+        "",
+    ],
+]
+API_RESULT_COLUMNS = [
+    "metpo_id",
+    "metpo_label",
+    "source",
+    "match_label",
+    "match_iri",
+    "match_ontology",
+    "match_definition",
+    "levenshtein_distance",
+    "similarity_ratio",
+]
+
+QUALIFIERS = (
+    "aerobic",
+    "anaerobic",
+    "microaerophilic",
+    "motile",
+    "non-motile",
+    "halophilic",
+    "halotolerant",
+    "thermophilic",
+    "mesophilic",
+    "psychrophilic",
+    "acidophilic",
+    "alkaliphilic",
+    "spore-forming",
+    "gram-positive",
+    "gram-negative",
+    "rod-shaped",
+    "coccus-shaped",
+    "nitrate-reducing",
+    "catalase-positive",
+    "oxidase-negative",
+    "chemoorganotrophic",
+    "phototrophic",
+    "saccharolytic",
+    "proteolytic",
+)
+NOUNS = (
+    "phenotype",
+    "growth",
+    "metabolism",
+    "respiration",
+    "cell shape",
+    "temperature range",
+    "temperature optimum",
+    "pH optimum",
+    "pH range",
+    "salinity tolerance",
+    "motility",
+    "fermentation",
+    "GC content",
+    "cell length",
+    "pigmentation",
+    "sporulation",
+    "oxygen preference",
+    "carbon source utilization",
+    "enzyme activity",
+    "colony morphology",
+)
+CLAUSES = (
+    "is observed when an organism grows under the stated conditions",
+    "describes the capacity of a microbial cell to persist in the environment",
+    "is measured in pure culture on a defined medium",
+    "characterizes how an organism responds to a change in its surroundings",
+    "is reported for type strains in the primary literature",
+)
+ONTOLOGIES = ("MICRO", "UPHENO", "MPO", "FLOPO", "OBA", "OMP", "GO", "PATO", "ECOCORE", "MEO")
+PROPERTY_VERBS = ("has", "exhibits", "produces", "degrades", "requires", "tolerates")
+PREDICATES = ("skos:exactMatch", "skos:closeMatch", "skos:relatedMatch")
+STRAIN_COLUMNS = [
+    "Bacdive_ID",
+    "culture collection codes",
+    "Kingdom",
+    "Phylum",
+    "Class",
+    "Order",
+    "Family",
+    "Genus",
+    "Species",
+]
+# Binned trait columns, named as in the BactoTraits release
+TRAIT_COLUMNS = " ".join(
+    [
+        "pHO_<=6 pHO_6_to_7 pHO_7_to_8 pHO_>8 pHR_<=4 pHR_4_to_6 pHd_<=1 pHd_1_to_2 pHd_>2",
+        "TO_<=10 TO_10_to_22 TO_22_to_27 TO_27_to_30 TO_30_to_34 TO_34_to_40 TO_>40",
+        "Tmax_<=30 Tmax_>45 Tmin_<=10 Tmin_>20 NaO_<=1 NaO_1_to_3 NaO_3_to_8 NaO_>8",
+        "NaR_<=1 NaR_>8 Ox_anaerobic Ox_aerobic Ox_facultative_aerobe Ox_microaerophile",
+        "G_negative G_positive motile non-motile spore no_spore S_rod S_coccus S_spiral",
+        "S_filament S_vibrio S_ovoid Pigment_yellow Pigment_orange Pigment_red Pigment_white",
+        "GC_<=42.65 GC_42.65_57.0 GC_57.0_66.3 GC_>66.3 Len_<=1.3 Len_1.3_to_2 Len_2_to_3",
+        "Len_>3 TR_aerobic_chemoheterotroph TR_anaerobic_chemoheterotroph TR_phototroph",
+    ]
+).split()
+
+
+def scaled_rows(kind: str, scale: float) -> int:
+    """Row count for ``kind`` (a BASE_ROWS key) at ``scale`` times the current size."""
+    return max(1, round(BASE_ROWS[kind] * scale))
+
+
+def synthetic_label(i: int) -> str:
+    """Unique, human-looking label for row ``i``."""
+    qualifier = QUALIFIERS[i % len(QUALIFIERS)]
+    noun = NOUNS[(i // len(QUALIFIERS)) % len(NOUNS)]
+    cycle = i // (len(QUALIFIERS) * len(NOUNS))
+    return f"{qualifier} {noun}" + (f" {cycle + 1}" if cycle else "")
+
+
+def synthetic_definition(label: str, genus: str, rng: random.Random) -> str:
+    return f"A {genus} that {rng.choice(CLAUSES)}, distinguishing {label} organisms."
+
+
+def template_terms(rows: int, kind: str = "classes") -> list[tuple[str, str]]:
+    """``(id, label)`` of the terms :func:`write_robot_template` writes for ``rows``."""
+    first = 1000000 if kind == "classes" else 2000000
+    return [(f"METPO:{first + i:07d}", _template_label(i, kind)) for i in range(rows)]
+
+
+def _template_label(i: int, kind: str) -> str:
+    if i and i % DUPLICATE_LABEL_EVERY == 0:
+        i -= 1  # a deliberate label clash with the previous row
+    if kind == "properties":
+        return f"{PROPERTY_VERBS[i % len(PROPERTY_VERBS)]} {synthetic_label(i)}"
+    return synthetic_label(i)
+
+
+def write_robot_template(path: Path, rows: int, kind: str = "classes", seed: int = 0) -> int:
+    """Write a ROBOT template of ``rows`` classes or properties; return the row count."""
+    if kind not in ("classes", "properties"):
+        raise ValueError(f"Unknown template kind: {kind}")
+    rng = random.Random(seed)
+    terms = template_terms(rows, kind)
+    with Path(path).open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+        writer.writerows(CLASS_HEADER if kind == "classes" else PROPERTY_HEADER)
+        for i, (term_id, label) in enumerate(terms):
+            # Parents form a tree over earlier rows with the first row as its root
+            parent = terms[(i - 1) // TREE_FANOUT][1] if i else ""
+            definition = synthetic_definition(label, parent or "quality", rng)
+            if kind == "classes":
+                writer.writerow(
+                    [
+                        term_id,
+                        label,
+                        "owl:Class",
+                        parent,
+                        definition,
+                        f"PMID:{rng.randrange(10_000_000, 40_000_000)}",
+                        "Synthetic Curator",
+                        "",
+                        label.replace("-", " ") if i % 3 == 0 else "",
+                        f"{label.split()[0]}_{i}" if i % 5 == 0 else "",
+                        "https://bactotraits.univ-lyon1.fr/" if i % 5 == 0 else "",
+                    ]
+                )
+            else:
+                writer.writerow(
+                    [
+                        term_id,
+                        label,
+                        "owl:ObjectProperty",
+                        "",
+                        "microbe",
+                        "chemical entity",
+                        parent,
+                        "",
+                        definition,
+                        "",
+                        "",
+                        "",
+                    ]
+                )
+    return rows
+
+
+def write_sssom(
+    path: Path,
+    rows: int,
+    subjects: Sequence[tuple[str, str]] | None = None,
+    seed: int = 0,
+) -> int:
+    """Write an SSSOM TSV of ``rows`` mappings; return the row count.
+
+    Args:
+        path: Output file
+        rows: Number of mappings
+        subjects: ``(id, label)`` pairs to map from, cycled through; by default
+            ``rows / MAPPINGS_PER_SUBJECT`` synthetic METPO terms
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    if subjects is None:
+        subjects = template_terms(max(1, rows // MAPPINGS_PER_SUBJECT))
+    with Path(path).open("w", encoding="utf-8", newline="") as f:
+        f.write(SSSOM_HEADER)
+        writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+        writer.writerow(SSSOM_COLUMNS)
+        for i in range(rows):
+            subject_id, subject_label = subjects[(i // MAPPINGS_PER_SUBJECT) % len(subjects)]
+            rank = i % MAPPINGS_PER_SUBJECT + 1
+            ontology = rng.choice(ONTOLOGIES)
+            local_id = rng.randrange(1, TREE_FANOUT**6)
+            similarity = max(0.0, 1.0 - rank * 0.02 - rng.random() * 0.1)
+            object_label = rng.choice((subject_label, synthetic_label(local_id)))
+            if rng.random() < 0.3:  # embedding documents carry the definition after ";"
+                genus = synthetic_label(local_id // TREE_FANOUT)
+                object_label += "; " + synthetic_definition(object_label, genus, rng)
+            writer.writerow(
+                [
+                    subject_id,
+                    subject_label,
+                    PREDICATES[min(rank, 3) - 1],
+                    f"http://purl.obolibrary.org/obo/{ontology}_{local_id:07d}",
+                    object_label,
+                    "semapv:SemanticSimilarityThresholdMatching",
+                    f"{(1 + similarity) / 2:.6f}",
+                    f"{similarity:.6f}",
+                    "cosine_similarity",
+                    "synthetic",
+                    "METPO",
+                    ontology.lower(),
+                    f"Embedding cosine distance: {1 - similarity:.4f}, Rank: {rank}",
+                ]
+            )
+    return rows
+
+
+def write_api_results(
+    path: Path, rows: int, subjects: Sequence[tuple[str, str]], seed: int = 0
+) -> int:
+    """Write OLS/BioPortal search matches (phase1 format) for ``subjects``; return the row count."""
+    rng = random.Random(seed)
+    with Path(path).open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+        writer.writerow(API_RESULT_COLUMNS)
+        for i in range(rows):
+            metpo_id, metpo_label = subjects[i % len(subjects)]
+            ontology = rng.choice(ONTOLOGIES)
+            local_id = rng.randrange(1, TREE_FANOUT**6)
+            match_label = rng.choice((metpo_label, synthetic_label(local_id)))
+            ratio = 1.0 if match_label == metpo_label else round(rng.uniform(0.5, 0.95), 4)
+            writer.writerow(
+                [
+                    metpo_id,
+                    metpo_label,
+                    rng.choice(("OLS", "BioPortal")),
+                    match_label,
+                    f"http://purl.obolibrary.org/obo/{ontology}_{local_id:07d}",
+                    ontology.lower(),
+                    synthetic_definition(match_label, "quality", rng) if rng.random() < 0.7 else "",
+                    rng.randrange(0, 12),
+                    ratio,
+                ]
+            )
+    return rows
+
+
+def write_trait_table(path: Path, rows: int, seed: int = 0) -> int:
+    """Write a BactoTraits-style trait table of ``rows`` strains; return the row count."""
+    rng = random.Random(seed)
+    with Path(path).open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+        writer.writerow(STRAIN_COLUMNS + TRAIT_COLUMNS)
+        for i in range(rows):
+            genus = f"Genus{rng.randrange(rows // 10 + 1)}"
+            taxonomy = [
+                "Bacteria",
+                f"Phylum{i % 30}",
+                f"Class{i % 60}",
+                f"Order{i % 120}",
+                f"Family{i % 400}",
+                genus,
+                f"{genus} species{i}",
+            ]
+            traits = [
+                rng.choices(("", "0", "1", "0.5", "0.333"), weights=(50, 30, 15, 3, 2))[0]
+                for _ in TRAIT_COLUMNS
+            ]
+            writer.writerow([str(100000 + i), f"DSM {i}|ATCC {i}", *taxonomy, *traits])
+    return rows
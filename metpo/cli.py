@@ -0,0 +1,142 @@
+"""Unified ``metpo`` command that dispatches to every METPO console script.
+
+``metpo <command> ...`` runs the same click command as the standalone script
+of that name, so ``metpo categorize-ontologies -i catalog.csv`` and
+``categorize-ontologies -i catalog.csv`` are equivalent.
+
+Subcommands are resolved lazily from the ``[project.scripts]`` table: the
+module behind a command is imported only when that command runs. ``metpo
+--help`` reads each command's one-line summary from its source with ``ast``
+instead of importing it. As a result, listing commands and running light ones
+skips the pandas, pymongo and matplotlib imports that heavier commands
+need.
+
+When run from a source checkout, its ``pyproject.toml`` (recognized by
+``[project].name = "metpo"``) is read directly, so commands added since the
+last ``uv sync`` are available. Otherwise the installed package's entry
+points are used.
+"""
+
+import importlib
+import importlib.util
+import inspect
+import re
+import tomllib
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, distribution
+from pathlib import Path
+
+import click
+
+from metpo import __version__
+
+PYPROJECT = Path(__file__).resolve().parents[1] / "pyproject.toml"
+GROUP_NAME = "metpo"
+# def <name>(<signature>) -> <annotation>: followed by a triple-quoted docstring. The
+# signature may span lines but stops at the next unindented line other than ")".
+DOCSTRING_PATTERN = (
+    r"^(?:async )?def {name}\((?:(?!\n[^\s)]).)*?\)\s*(?:->[^:\n]*)?:\s*\n"
+    r"\s*(?P<q>\"\"\"|\'\'\')(?P<doc>.*?)(?P=q)"
+)
+# A module docstring: the first statement, after any comments or blank lines.
+MODULE_DOCSTRING_PATTERN = (
+    r"\A(?:\s*#[^\n]*\n|\s*\n)*\s*[rR]?(?P<q>\"\"\"|\'\'\')(?P<doc>.*?)(?P=q)"
+)
+
+
+def _checkout_scripts() -> dict[str, str] | None:
+    """``[project.scripts]`` of the METPO source checkout, or None when not run from one."""
+    if not PYPROJECT.exists():
+        return None
+    with PYPROJECT.open("rb") as f:
+        project = tomllib.load(f).get("project", {})
+    if project.get("name") != GROUP_NAME:
+        return None
+    return project.get("scripts", {})
+
+
+@lru_cache(maxsize=1)
+def command_targets() -> dict[str, str]:
+    """Map command names to their ``module:function`` entry point targets."""
+    scripts = _checkout_scripts()
+    if scripts is None:
+        try:
+            entry_points = list(distribution("metpo").entry_points)
+        except PackageNotFoundError:
+            entry_points = []
+        scripts = {ep.name: ep.value for ep in entry_points if ep.group == "console_scripts"}
+    return {
+        name: target
+        for name, target in scripts.items()
+        if name != GROUP_NAME and target.startswith("metpo.")
+    }
+
+
+def short_help(target: str, limit: int = 45) -> str:
+    """First docstring line of the function behind ``target``, read without importing it.
+
+    Only the ``def`` line and the docstring after it are matched; parsing
+    every module with ``ast`` would cost more than the imports it saves.
+    A function without a docstring falls back to the module docstring.
+    """
+    module_name, _, attr = target.partition(":")
+    try:
+        spec = importlib.util.find_spec(module_name)
+        source = Path(spec.origin).read_text(encoding="utf-8")
+    except (ImportError, AttributeError, TypeError, OSError, ValueError):
+        return ""
+    pattern = DOCSTRING_PATTERN.format(name=re.escape(attr))
+    match = re.search(pattern, source, re.MULTILINE | re.DOTALL) or re.match(
+        MODULE_DOCSTRING_PATTERN, source, re.DOTALL
+    )
+    if not match:
+        return ""
+    first = inspect.cleandoc(match["doc"]).split("\n", 1)[0].strip()
+    if len(first) <= limit:
+        return first
+    return first[: limit - 2].rsplit(" ", 1)[0].rstrip(" ,;:") + "..."
+
+
+class LazyGroup(click.Group):
+    """Click group whose subcommands are imported on first use."""
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(command_targets())
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        target = command_targets().get(cmd_name)
+        if target is None:
+            return None
+        module_name, _, attr = target.partition(":")
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            raise click.ClickException(
+                f"'{cmd_name}' needs the optional dependency '{e.name}' (see `make install-all`)"
+            ) from e
+        return getattr(module, attr)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        # Mirror click's layout: names wider than 30 columns get their own line
+        width = min(max(map(len, command_targets()), default=0), 30)
+        limit = formatter.width - 6 - width
+        rows = [
+            (name, short_help(target, limit)) for name, target in sorted(command_targets().items())
+        ]
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, context_settings={"help_option_names": ["-h", "--help"]})
+@click.version_option(__version__, prog_name=GROUP_NAME)
+def main():
+    """METPO ontology tools.
+
+    Every command is also installed as its own script, e.g. `metpo qc-metpo-sheets`
+    is the same as `qc-metpo-sheets`.
+    """
+
+
+if __name__ == "__main__":
+    main()
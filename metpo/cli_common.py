@@ -15,8 +15,16 @@ Example:
         pass
 """
 
+import functools
+from pathlib import Path
+
 import click
 
+# stage is re-exported so commands take options and stages from one module
+from metpo.utils.profiling import ProfileSession, print_report, stage  # noqa: F401
+from metpo.utils.telemetry import ENV_VAR as TELEMETRY_ENV_VAR
+from metpo.utils.telemetry import TelemetryRecorder
+
 # =============================================================================
 # File I/O Options
 # =============================================================================
@@ -305,3 +313,114 @@ def format_option(default="text", formats=None, help_text="Output format"):
         default=default,
         help=help_text,
     )
+
+
+# =============================================================================
+# Profiling Options
+# =============================================================================
+
+
+def profile_options():
+    """Add the ``--profile`` family of options to a command.
+
+    Apply below ``@click.command()``. When any of the options is given, the
+    command runs inside a :class:`metpo.utils.profiling.ProfileSession`. Stage
+    timings from ``stage("...")`` blocks, and any cProfile/tracemalloc data,
+    are printed to stderr at the end, so stdout stays clean for pipelines.
+
+    Options added:
+        --profile: cProfile the command and report stage and function timings
+        --profile-memory: Trace allocations (peak, per-stage peak, top lines)
+        --profile-output PREFIX: Also write PREFIX.pstats, PREFIX.collapsed
+            (flame graph input) and PREFIX.stages.json
+
+    Example:
+        @click.command()
+        @profile_options()
+        def my_command():
+            with stage("load"):
+                ...
+
+    Returns:
+        Decorator that adds the options and wraps the command callback
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, profile, profile_memory, profile_output, **kwargs):
+            if not (profile or profile_memory or profile_output):
+                return func(*args, **kwargs)
+            session = ProfileSession(
+                cpu_profile=profile or profile_output is not None,
+                memory=profile_memory,
+                output_prefix=profile_output,
+            )
+            try:
+                with session:
+                    return func(*args, **kwargs)
+            finally:
+                print_report(session)
+
+        options = [
+            click.option(
+                "--profile",
+                is_flag=True,
+                default=False,
+                help="Profile with cProfile and print stage and function timings to stderr",
+            ),
+            click.option(
+                "--profile-memory",
+                is_flag=True,
+                default=False,
+                help="Trace memory allocations (peak and top allocating lines)",
+            ),
+            click.option(
+                "--profile-output",
+                type=click.Path(dir_okay=False, path_type=Path),
+                default=None,
+                help="Write PREFIX.pstats, PREFIX.collapsed and PREFIX.stages.json",
+            ),
+        ]
+        for option in reversed(options):
+            wrapper = option(wrapper)
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# Telemetry Options
+# =============================================================================
+
+
+def telemetry_option():
+    """Add ``--telemetry PATH`` (or ``$METPO_TELEMETRY``) to a command.
+
+    Apply below ``@click.command()``. When a path is given, the command runs
+    inside a :class:`metpo.utils.telemetry.TelemetryRecorder`. Its counters,
+    latency histograms and ``stage("...")`` spans are appended to the file
+    as JSON lines; ``summarize-telemetry`` reports them.
+
+    Returns:
+        Decorator that adds the option and wraps the command callback
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, telemetry, **kwargs):
+            if telemetry is None:
+                return func(*args, **kwargs)
+            command = click.get_current_context().command_path
+            with TelemetryRecorder(telemetry, command=command):
+                return func(*args, **kwargs)
+
+        return click.option(
+            "--telemetry",
+            type=click.Path(dir_okay=False, path_type=Path),
+            envvar=TELEMETRY_ENV_VAR,
+            default=None,
+            help="Append run telemetry as JSON lines to this file, e.g. local/telemetry.jsonl "
+            f"(env: {TELEMETRY_ENV_VAR})",
+        )(wrapper)
+
+    return decorator
@@ -8,7 +8,6 @@ Looks for cases where:
 """
 
 import click
-import pandas as pd
 
 
 @click.command()
@@ -28,6 +27,8 @@ import pandas as pd
 )
 def main(results_file: str, mappings_file: str):
     """Analyze coherence results to find strong alignments."""
+    import pandas as pd  # noqa: PLC0415
+
     results_csv = results_file
     matches_csv = mappings_file
 
@@ -1,5 +1,4 @@
 import click
-import pandas as pd
 
 from metpo.cli_common import distance_threshold_option, input_csv_option
 
@@ -13,6 +12,8 @@ from metpo.cli_common import distance_threshold_option, input_csv_option
 )
 def main(input_file: str, distance_threshold: float):
     """Analyzes METPO term match quality from an SSSOM TSV file."""
+    import pandas as pd  # noqa: PLC0415
+
     input_csv = input_file or "../metpo_relevant_mappings.sssom.tsv"
     good_match_threshold = distance_threshold
 
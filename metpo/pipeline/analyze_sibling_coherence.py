@@ -2,9 +2,7 @@ import os
 import re
 
 import click
-import pandas as pd
 from dotenv import find_dotenv, load_dotenv
-from oaklib import get_adapter
 from tqdm import tqdm
 
 from metpo.cli_common import (
@@ -12,7 +10,12 @@ from metpo.cli_common import (
     distance_threshold_option,
     input_csv_option,
     output_option,
+    profile_options,
+    stage,
+    telemetry_option,
 )
+from metpo.utils import telemetry
+from metpo.utils.ontology_index import DEFAULT_ONTOLOGY_JSON, OntologyIndex, iri_to_curie
 
 
 class ExternalOntologyHelper:
@@ -74,6 +77,8 @@ class ExternalOntologyHelper:
 
     def _get_adapter(self, ontology_prefix: str, iri_for_fallback: str):
         """Get an OAKLib adapter for the external ontology."""
+        from oaklib import get_adapter  # noqa: PLC0415
+
         if not ontology_prefix:
             ontology_prefix = self._extract_ontology_prefix_from_iri(iri_for_fallback)
 
@@ -160,13 +165,15 @@ class ExternalOntologyHelper:
                 if self.debug:
                     print(f"    Warning: Term not found or label unavailable for {curie}")
 
-            parents = list(adapter.hierarchical_parents(curie, isa_only=True))
+            with telemetry.timed("external.parents"):
+                parents = list(adapter.hierarchical_parents(curie, isa_only=True))
             if self.debug:
                 print(f"    Parents: {len(parents)}")
 
             siblings = set()
             for parent in parents:
-                incoming = list(adapter.incoming_relationships(parent))
+                with telemetry.timed("external.children"):
+                    incoming = list(adapter.incoming_relationships(parent))
                 children = [subj for pred, subj in incoming if "subClassOf" in pred]
                 if self.debug:
                     print(f"      Parent has {len(children)} children")
@@ -182,6 +189,7 @@ class ExternalOntologyHelper:
 
             return siblings_iris
         except Exception as e:
+            telemetry.count("external.failures")
             if self.debug:
                 print(f"    Error getting siblings: {type(e).__name__}: {e}")
             return set()
@@ -191,6 +199,8 @@ class OaklibHierarchy:
     METPO_BASE_IRI = "https://w3id.org/metpo/"
 
     def __init__(self, ontology_path: str, debug: bool = False):
+        from oaklib import get_adapter  # noqa: PLC0415
+
         self.debug = debug
         if self.debug:
             print(f"Initializing OAKLib adapter for: {ontology_path}")
@@ -246,6 +256,39 @@ class OaklibHierarchy:
         return siblings
 
 
+class IndexHierarchy:
+    """METPO hierarchy backed by the cached ontology index (same interface as OaklibHierarchy)."""
+
+    def __init__(self, ontology_json: str, debug: bool = False):
+        self.debug = debug
+        self.index = OntologyIndex.load(ontology_json)
+        if self.debug:
+            print(f"Loaded ontology index for {ontology_json} ({len(self.index)} terms).")
+
+    def _lookup(self, curie: str, relatives) -> set[str]:
+        curie = iri_to_curie(curie)
+        return set(relatives(curie)) if curie in self.index else set()
+
+    def get_parents(self, curie: str) -> set[str]:
+        """Get direct parents of a term."""
+        return self._lookup(curie, self.index.parents)
+
+    def get_children(self, curie: str) -> set[str]:
+        """Get direct children of a term."""
+        return self._lookup(curie, self.index.children)
+
+    def get_siblings(self, curie: str) -> set[str]:
+        """Get siblings of a term (terms sharing the same parent)."""
+        curie = iri_to_curie(curie)
+        siblings = set()
+        for parent_curie in self.get_parents(curie):
+            siblings.update(self.get_children(parent_curie))
+        siblings.discard(curie)
+        if self.debug:
+            print(f"  Debug: Siblings for {curie}: {siblings}")
+        return siblings
+
+
 @click.command()
 @input_csv_option(
     required=False, help_text="Path to the SSSOM TSV file containing METPO term mappings"
@@ -253,8 +296,15 @@ class OaklibHierarchy:
 @click.option(
     "--metpo-owl",
     type=click.Path(exists=True, dir_okay=False, path_type=str),
-    default="../src/ontology/metpo.owl",
-    help="Path to the METPO OWL file for hierarchy parsing.",
+    default=None,
+    help="Parse the METPO hierarchy from this OWL file with OAKLib instead of --metpo-json.",
+)
+@click.option(
+    "--metpo-json",
+    type=click.Path(exists=True, dir_okay=False, path_type=str),
+    default=str(DEFAULT_ONTOLOGY_JSON),
+    show_default=True,
+    help="METPO OBO Graphs JSON, read through the cached ontology index.",
 )
 @distance_threshold_option(
     default=0.9, help_text="Distance threshold below which a match is considered 'good'"
@@ -264,8 +314,19 @@ class OaklibHierarchy:
     default="../data/coherence/sibling_coherence_analysis_output.csv",
     help_text="Path to save coherence results CSV",
 )
-def main(input_file: str, metpo_owl: str, distance_threshold: float, debug: bool, output: str):
+@profile_options()
+@telemetry_option()
+def main(
+    input_file: str,
+    metpo_owl: str | None,
+    metpo_json: str,
+    distance_threshold: float,
+    debug: bool,
+    output: str,
+):
     """Analyzes sibling coherence for METPO term mappings from SSSOM TSV."""
+    import pandas as pd  # noqa: PLC0415
+
     input_csv = input_file or "../metpo_relevant_mappings.sssom.tsv"
     good_match_threshold = distance_threshold
     output_csv = output
@@ -277,7 +338,8 @@ def main(input_file: str, metpo_owl: str, distance_threshold: float, debug: bool
     print(f"Loading mappings from: {input_csv}")
     try:
         # Read SSSOM TSV (skip metadata lines starting with #)
-        df = pd.read_csv(input_csv, sep="\t", comment="#")
+        with stage("load mappings"):
+            df = pd.read_csv(input_csv, sep="\t", comment="#")
     except FileNotFoundError:
         print(f"Error: Input file not found at {input_csv}")
         return
@@ -303,7 +365,12 @@ def main(input_file: str, metpo_owl: str, distance_threshold: float, debug: bool
     print(f"Using good match threshold: {good_match_threshold}")
 
     # Initialize METPO hierarchy parser
-    metpo_hierarchy = OaklibHierarchy(metpo_owl, debug=debug)
+    metpo_hierarchy: OaklibHierarchy | IndexHierarchy
+    with stage("load METPO hierarchy"):
+        if metpo_owl:
+            metpo_hierarchy = OaklibHierarchy(metpo_owl, debug=debug)
+        else:
+            metpo_hierarchy = IndexHierarchy(metpo_json, debug=debug)
 
     # Initialize external ontology helper
     external_helper = ExternalOntologyHelper(debug=debug)
@@ -332,7 +399,8 @@ def main(input_file: str, metpo_owl: str, distance_threshold: float, debug: bool
             )
 
         # Get METPO siblings
-        metpo_siblings = metpo_hierarchy.get_siblings(metpo_id)
+        with stage("METPO siblings"):
+            metpo_siblings = metpo_hierarchy.get_siblings(metpo_id)
 
         if debug:
             print(f"  METPO siblings: {len(metpo_siblings)}")
@@ -341,7 +409,10 @@ def main(input_file: str, metpo_owl: str, distance_threshold: float, debug: bool
         if debug:
             print(f"  Fetching siblings from external ontology ({match_ontology})...")
 
-        external_siblings = external_helper.get_siblings(match_iri, ontology_prefix=match_ontology)
+        with stage("external siblings"):
+            external_siblings = external_helper.get_siblings(
+                match_iri, ontology_prefix=match_ontology
+            )
 
         if debug:
             print(f"  External siblings: {len(external_siblings)}")
@@ -449,7 +520,8 @@ def main(input_file: str, metpo_owl: str, distance_threshold: float, debug: bool
         print("  No terms with low coherence found!")
 
     # Save results to CSV
-    summary_df.to_csv(output_csv, index=False)
+    with stage("write results"):
+        summary_df.to_csv(output_csv, index=False)
     print(f"\n✓ Full results saved to: {output_csv}")
 
 
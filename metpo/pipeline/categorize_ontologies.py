@@ -1,160 +1,59 @@
 """
 Categorize ontologies by relevance to microbial phenotypes and size.
 
-Uses keyword-based scoring learned from domain expert feedback patterns.
+Uses keyword-based scoring learned from domain expert feedback patterns. The
+keyword groups and weights live in ontology_relevance.yaml and are compiled by
+metpo.utils.keyword_scoring.
 """
 
 import csv
+from functools import lru_cache
 from pathlib import Path
 
 import click
 
 from metpo.cli_common import input_csv_option
+from metpo.utils.keyword_scoring import KeywordScorer
 
+DEFAULT_CONFIG = Path(__file__).with_name("ontology_relevance.yaml")
 
-def score_ontology(onto):
+
+@lru_cache(maxsize=8)
+def load_scorer(config_path: str | Path = DEFAULT_CONFIG) -> KeywordScorer:
+    """Compile the keyword groups and rules in ``config_path`` (cached per path)."""
+    return KeywordScorer.from_config(config_path)
+
+
+def score_ontology(onto, scorer: KeywordScorer | None = None):
     """
     Score ontology relevance to microbial phenotypes.
     Returns: (category, score, reason)
 
-    Scoring patterns learned from expert feedback:
-    - Bacterial/prokaryotic focus = highest priority
-    - Phenotype/trait/quality = core relevance
-    - Resistance/interaction/microscopy = highly relevant
-    - Environmental/flora = useful for conditions
-    - Fungal = lower priority but still relevant if small
-    - Anatomy/clinical/taxonomy/chemical = not relevant
-    - Size matters but can be overridden by high relevance
+    Keyword groups, weights, size adjustments and category thresholds come
+    from ontology_relevance.yaml (patterns learned from expert feedback).
     """
-    title_desc = (onto["title"] + " " + onto["description"]).lower()
-    count = onto["count"]
-
-    score = 0
-    reasons = []
-
-    # HIGHEST PRIORITY: Bacterial/prokaryotic/microbial phenotypes
-    if any(kw in title_desc for kw in ["microb", "prokaryot", "bacteri", "archae"]):
-        score += 15
-        reasons.append("bacterial/microbial")
-
-    if (
-        any(kw in title_desc for kw in ["phenotype", "trait", "character"])
-        and "microb" in title_desc
-    ):
-        score += 10
-        reasons.append("microbial phenotype focus")
-
-    # HIGH PRIORITY: Phenotype/trait/quality/attribute ontologies
-    phenotype_terms = ["phenotype", "trait", "quality", "attribute", "character"]
-    if any(kw in title_desc for kw in phenotype_terms):
-        score += 12
-        reasons.append("phenotype-centric")
-
-    # HIGH PRIORITY: Resistance, host-microbe interaction, pathogen
-    if any(kw in title_desc for kw in ["resistance", "antibiotic", "antimicrob"]):
-        score += 14
-        reasons.append("antimicrobial resistance")
-
-    if any(kw in title_desc for kw in ["pathogen", "host", "interaction"]):
-        score += 12
-        reasons.append("pathogen/host interaction")
-
-    # MODERATE-HIGH: Microscopy, cellular phenotypes
-    if any(kw in title_desc for kw in ["microscopy", "cellular microscopy"]):
-        score += 13
-        reasons.append("cellular microscopy")
-
-    if "cell" in title_desc and "phenotype" in title_desc:
-        score += 11
-        reasons.append("cellular phenotype")
+    scorer = scorer or load_scorer()
+    return scorer.score(onto["title"] + " " + onto["description"], onto["count"])
 
-    # MODERATE: Environmental/ecological (useful for growth conditions)
-    if any(kw in title_desc for kw in ["environment", "ecology", "flora", "habitat"]):
-        score += 9
-        reasons.append("environmental conditions")
-
-    # MODERATE: Population, community, biolink
-    if any(kw in title_desc for kw in ["population", "community", "biolink"]):
-        score += 9
-        reasons.append("population/community")
-
-    # MODERATE: Experimental conditions, evidence
-    if any(kw in title_desc for kw in ["experimental", "condition", "evidence", "conclusion"]):
-        score += 8
-        reasons.append("experimental/evidence")
-
-    # MODERATE: Unified/integrated phenotype ontologies
-    if "unified" in title_desc and "phenotype" in title_desc:
-        score += 10
-        reasons.append("unified phenotype coverage")
-
-    # SIZE ADJUSTMENT: Lower priority for very large ontologies unless highly relevant
-    if count > 200000:
-        if score >= 14:
-            reasons.append("large but highly relevant")
-        else:
-            score -= 5
-            reasons.append("very large")
-
-    if count > 500000:
-        if score >= 15:
-            reasons.append("huge but critically relevant")
-        else:
-            score -= 10
-            reasons.append("too large")
-
-    # FUNGAL: Lower priority than bacterial
-    if any(kw in title_desc for kw in ["yeast", "fungi", "fungal", "ascomycete"]):
-        if count < 5000:
-            score -= 1
-            reasons.append("fungal (small, acceptable)")
-        else:
-            score -= 6
-            reasons.append("fungal (lower priority than bacterial)")
-
-    # ANATOMY: Not phenotype-centric
-    if "anatomy" in title_desc and "phenotype" not in title_desc:
-        score -= 8
-        reasons.append("anatomy not phenotype")
-
-    # STRONGLY NEGATIVE: Clearly unrelated domains
-    irrelevant = [
-        "disease",
-        "drug",
-        "clinical",
-        "human phenotype",
-        "mammal",
-        "zebrafish",
-        "geographic",
-        "lipid",
-        "chemical entities",
-        "protein ontology",
-        "food",
-        "taxonomy",
-        "genes and genomes",
-        "transcription",
-        "cell line",
-        "developmental stages",
-    ]
-    if any(kw in title_desc for kw in irrelevant):
-        score -= 12
-        reasons.append("unrelated domain")
-
-    # Categorize based on score
-    if score >= 10:
-        category = "very_appealing"
-    elif score <= -5:
-        category = "not_appealing"
-    else:
-        category = "in_between"
 
-    return category, score, "; ".join(reasons) if reasons else "no keywords matched"
+def score_ontologies(ontologies, scorer: KeywordScorer | None = None):
+    """Score a whole catalog: each text is matched once, then the rules run on group bitmasks."""
+    scorer = scorer or load_scorer()
+    masks = scorer.match_many(onto["title"] + " " + onto["description"] for onto in ontologies)
+    return scorer.score_masks(masks, (onto["count"] for onto in ontologies))
 
 
 @click.command()
 @input_csv_option(required=False, help_text="Input ontology catalog CSV")
 @click.option("--output-prefix", default="ontologies", help="Output file prefix")
-def main(input_file, output_prefix):
+@click.option(
+    "--config",
+    "config_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_CONFIG,
+    help="Keyword scoring config (default: ontology_relevance.yaml next to this script)",
+)
+def main(input_file, output_prefix, config_path):
     """Categorize ontologies by relevance to microbial phenotypes."""
     input_csv = input_file or "ontology_catalog.csv"
 
@@ -176,8 +75,8 @@ def main(input_file, output_prefix):
     # Score and categorize all ontologies
     categorized = {"very_appealing": [], "in_between": [], "not_appealing": []}
 
-    for onto in ontologies:
-        category, score, reason = score_ontology(onto)
+    scores = score_ontologies(ontologies, load_scorer(config_path))
+    for onto, (category, score, reason) in zip(ontologies, scores, strict=True):
         onto["score"] = score
         onto["reason"] = reason
         categorized[category].append(onto)
@@ -35,6 +35,9 @@ from pathlib import Path
 
 import click
 
+from metpo.cli_common import profile_options, stage, telemetry_option
+from metpo.utils import telemetry
+
 OLS_SEARCH = "https://www.ebi.ac.uk/ols4/api/search"
 # Default embedding backend: free, local, runs on CPU/GPU-capable hardware. Nothing paid, no API
 # key. Both the endpoint and the model are CLI-parameterized so anyone can point at
@@ -46,15 +49,16 @@ DEFAULT_EMBED_MODEL = "nomic-embed-text"
 _EMBED_CACHE = {}
 
 
-def ols_candidates(label, rows=20):
+def ols_candidates(label, rows=20, ols_url=OLS_SEARCH):
     """Lexical candidate classes from OLS4 for a label (IRI, curie, label, def, ontology)."""
     q = urllib.parse.urlencode({"q": label, "type": "class", "rows": rows})
-    req = urllib.request.Request(f"{OLS_SEARCH}?{q}", headers={"Accept": "application/json"})
+    req = urllib.request.Request(f"{ols_url}?{q}", headers={"Accept": "application/json"})
     try:
-        with urllib.request.urlopen(req, timeout=20) as r:
+        with telemetry.timed("ols.search"), urllib.request.urlopen(req, timeout=20) as r:
             docs = json.load(r).get("response", {}).get("docs", [])
     except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as e:
         # A transient OLS outage should skip this term, not abort the whole run.
+        telemetry.count("ols.failures")
         print(f"warning: OLS query failed for {label!r}: {e}", file=sys.stderr)
         return []
     out = []
@@ -83,9 +87,10 @@ def embed(text, model, embed_url=DEFAULT_EMBED_URL):
     body = json.dumps({"model": model, "prompt": text}).encode()
     req = urllib.request.Request(embed_url, data=body, headers={"Content-Type": "application/json"})
     try:
-        with urllib.request.urlopen(req, timeout=20) as r:
+        with telemetry.timed("embedding.request"), urllib.request.urlopen(req, timeout=20) as r:
             return json.load(r).get("embedding")
     except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as e:
+        telemetry.count("embedding.failures")
         print(
             f"warning: embedding request failed for model={model!r} at {embed_url!r}: {e}",
             file=sys.stderr,
@@ -97,10 +102,12 @@ def _get_cached_embedding(text, model, embed_url):
     normalized = text.strip()
     key = (model, embed_url, normalized)
     if key not in _EMBED_CACHE:
+        telemetry.count("embedding.cache_misses")
         v = embed(normalized, model, embed_url)
         if v is not None:
             _EMBED_CACHE[key] = v
         return v
+    telemetry.count("embedding.cache_hits")
     return _EMBED_CACHE[key]
 
 
@@ -236,6 +243,13 @@ def write_matches(rows, output):
     show_default=True,
     help="Ollama-compatible /api/embeddings endpoint (point at a remote host or other local server to run elsewhere).",
 )
+@click.option(
+    "--ols-url",
+    envvar="OLS_SEARCH_URL",
+    default=OLS_SEARCH,
+    show_default=True,
+    help="OLS4-compatible /api/search endpoint (e.g. a mirror or a local stand-in).",
+)
 @click.option(
     "--no-embeddings",
     is_flag=True,
@@ -248,6 +262,8 @@ def write_matches(rows, output):
     type=float,
     help="Drop matches below this cosine similarity.",
 )
+@profile_options()
+@telemetry_option()
 def main(
     metpo_tsv,
     label,
@@ -257,6 +273,7 @@ def main(
     top_n,
     model,
     embed_url,
+    ols_url,
     no_embeddings,
     min_similarity,
 ):
@@ -269,11 +286,13 @@ def main(
     if not metpo_tsv and not label:
         raise click.UsageError("Provide --metpo-tsv or --label.")
 
-    terms = load_terms(metpo_tsv, label, definition)
+    with stage("load terms"):
+        terms = load_terms(metpo_tsv, label, definition)
 
     use_embeddings = False
     if not no_embeddings:
-        use_embeddings = embed("test", model, embed_url) is not None
+        with stage("probe embeddings"):
+            use_embeddings = embed("test", model, embed_url) is not None
         if not use_embeddings:
             click.echo(
                 f"WARNING: embedding model '{model}' unavailable at {embed_url}; "
@@ -285,9 +304,10 @@ def main(
 
     out_rows = []
     for t in terms:
-        cands = rank_candidates(
-            t, ols_candidates(t["label"], rows=rows), use_embeddings, model, embed_url
-        )
+        with stage("OLS search"):
+            cands = ols_candidates(t["label"], rows=rows, ols_url=ols_url)
+        with stage("rank candidates"):
+            cands = rank_candidates(t, cands, use_embeddings, model, embed_url)
         for c in cands[:top_n]:
             if c["similarity"] < min_similarity:
                 continue
@@ -304,7 +324,8 @@ def main(
                 }
             )
 
-    write_matches(out_rows, output)
+    with stage("write matches"):
+        write_matches(out_rows, output)
     if output:
         click.echo(
             f"Wrote {len(out_rows)} matches for {len(terms)} terms to {output} "
@@ -1,20 +1,191 @@
-"""Fetch ontology names from OLS4 API and merge with size data."""
+"""Fetch ontology names from OLS4 API and merge with size data.
+
+The OLS catalog is cached as JSON lines in
+``data/ontology_assessments/cache/ols_ontologies_complete.jsonl``, one
+flattened record per ontology. A refresh fetches page 0 to learn
+``totalPages``, then fetches the remaining pages concurrently under a
+request-rate limit, so it takes about two round trips. Fetched records are
+merged into the cache by ``ontologyId``: a record replaces the cached one
+only when its ``updated`` timestamp (or content) differs. Ontologies that
+OLS no longer lists are kept. ``--offline`` skips the API and uses the cache.
+"""
 
 import csv
+import json
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 import requests
 
 from metpo.cli_common import input_csv_option, output_option
+from metpo.utils.files import write_atomic
+
+OLS_ONTOLOGIES_URL = "https://www.ebi.ac.uk/ols4/api/ontologies"
+DEFAULT_CATALOG_CACHE = Path("data/ontology_assessments/cache/ols_ontologies_complete.jsonl")
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_WORKERS = 4
+PAGE_RETRIES = 2
+
+# Cached record fields, in file order
+CONFIG_FIELDS = ("id", "title", "description", "homepage", "version")
+TOP_LEVEL_FIELDS = ("numberOfTerms", "numberOfProperties", "numberOfIndividuals", "status")
+TRAILING_FIELDS = ("updated",)
+CONFIG_TRAILING_FIELDS = ("preferredPrefix", "mailingList", "tracker")
+
+
+class RateLimiter:
+    """Space request starts at least ``interval`` seconds apart across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def flatten_ontology(onto: dict) -> dict:
+    """Flatten an OLS ``/api/ontologies`` entry into a cache record."""
+    config = onto.get("config") or {}
+    record = {"ontologyId": onto["ontologyId"]}
+    record.update({name: config.get(name) for name in CONFIG_FIELDS})
+    record.update({name: onto.get(name) for name in TOP_LEVEL_FIELDS})
+    record.update({name: onto.get(name) for name in TRAILING_FIELDS})
+    record.update({name: config.get(name) for name in CONFIG_TRAILING_FIELDS})
+    return record
+
+
+def get_page(
+    page: int, page_size: int = DEFAULT_PAGE_SIZE, session: requests.Session | None = None
+) -> dict:
+    """Return one page of the OLS ontology listing."""
+    response = (session or requests).get(
+        OLS_ONTOLOGIES_URL, params={"page": page, "size": page_size}, timeout=30
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_catalog(
+    fetch: Callable[[int], dict] = get_page,
+    workers: int = DEFAULT_WORKERS,
+    api_delay: float = 0.2,
+) -> tuple[list[dict], list[int]]:
+    """Fetch every catalog page: page 0 first, then the rest concurrently.
+
+    Args:
+        fetch: Function returning the JSON of one page
+        workers: Maximum concurrent requests
+        api_delay: Minimum seconds between request starts
+
+    Returns:
+        Tuple of (flattened records, page numbers that failed after retries)
+    """
+    limiter = RateLimiter(api_delay)
+
+    def fetch_with_retry(page: int) -> dict | None:
+        for attempt in range(PAGE_RETRIES + 1):
+            limiter.wait()
+            try:
+                return fetch(page)
+            except (requests.exceptions.RequestException, ValueError):
+                if attempt == PAGE_RETRIES:
+                    return None
+        return None
+
+    first = fetch_with_retry(0)
+    if first is None:
+        return [], [0]
+    total_pages = first["page"]["totalPages"]
+    pages = {0: first}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        rest = range(1, total_pages)
+        pages.update(zip(rest, pool.map(fetch_with_retry, rest), strict=True))
+
+    records: list[dict] = []
+    failed = []
+    for page in range(total_pages):
+        data = pages[page]
+        if data is None:
+            failed.append(page)
+            continue
+        records.extend(
+            flatten_ontology(onto) for onto in data.get("_embedded", {}).get("ontologies", [])
+        )
+    return records, failed
+
+
+def load_catalog_cache(path: Path = DEFAULT_CATALOG_CACHE) -> dict[str, dict]:
+    """Cached catalog records keyed by ``ontologyId`` (empty if there is no cache)."""
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        records = (json.loads(line) for line in f if line.strip())
+        return {record["ontologyId"]: record for record in records}
+
+
+def merge_catalog(cached: dict[str, dict], fetched: list[dict]) -> tuple[dict[str, dict], dict]:
+    """Merge fetched records into the cached catalog.
+
+    A fetched record replaces the cached one when ``updated`` or any other
+    field differs; new ontologies are appended, so cache order is stable.
+    Returns the merged catalog and added/updated/unchanged counts.
+    """
+    merged = dict(cached)
+    stats = {"added": 0, "updated": 0, "unchanged": 0}
+    for record in fetched:
+        previous = merged.get(record["ontologyId"])
+        if previous is None:
+            stats["added"] += 1
+        elif previous == record:
+            stats["unchanged"] += 1
+            continue
+        else:
+            stats["updated"] += 1
+        merged[record["ontologyId"]] = record
+    return merged, stats
+
+
+def write_catalog_cache(catalog: dict[str, dict], path: Path = DEFAULT_CATALOG_CACHE) -> bool:
+    """Write the catalog as JSON lines in catalog order; False if the file is unchanged."""
+    text = "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for record in catalog.values()
+    )
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    write_atomic(path, text)
+    return True
 
 
 @click.command()
 @input_csv_option(required=False, help_text="Input CSV with ontology sizes")
 @output_option(default="ontology_catalog.csv", help_text="Output merged catalog CSV")
-@click.option("--api-delay", default=0.5, type=float, help="Delay between API requests (seconds)")
-def main(input_file, output, api_delay):
+@click.option(
+    "--api-delay", default=0.2, type=float, help="Minimum delay between API requests (seconds)"
+)
+@click.option("--workers", default=DEFAULT_WORKERS, type=int, help="Concurrent page requests")
+@click.option("--page-size", default=DEFAULT_PAGE_SIZE, type=int, help="Ontologies per page")
+@click.option(
+    "--cache",
+    "cache_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_CATALOG_CACHE,
+    show_default=True,
+    help="JSONL catalog cache merged with each fetch",
+)
+@click.option("--offline", is_flag=True, help="Use the cached catalog without calling OLS")
+def main(input_file, output, api_delay, workers, page_size, cache_path, offline):
     """Fetch ontology names from OLS4 API and merge with size data."""
     sizes_csv = input_file or "../data/ontology_assessments/ontology_sizes.csv"
     output_csv = output
@@ -28,47 +199,35 @@ def main(input_file, output, api_delay):
 
     print(f"Loaded {len(sizes)} ontology sizes from local data")
 
-    # Fetch ontology names from OLS4 API
-    print("\nFetching ontology metadata from OLS4 API...")
-    ontology_info = {}
-
-    page = 0
-    total_pages = None
-
-    while total_pages is None or page < total_pages:
-        url = f"https://www.ebi.ac.uk/ols4/api/ontologies?page={page}&size=20"
-        print(f"  Fetching page {page}...", end="")
-
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-
-            if total_pages is None:
-                total_pages = data["page"]["totalPages"]
-                print(f" (total pages: {total_pages})")
-            else:
-                print()
-
-            # Extract ontology info
-            for onto in data["_embedded"]["ontologies"]:
-                onto_id = onto["ontologyId"].lower()
-                title = onto.get("config", {}).get("title", "Unknown")
-                description = onto.get("config", {}).get("description", "")
-
-                ontology_info[onto_id] = {
-                    "title": title,
-                    "description": description[:200] if description else "",
-                }
+    catalog = load_catalog_cache(cache_path)
+    print(f"Loaded {len(catalog)} cached OLS catalog records from {cache_path}")
 
-            page += 1
-            time.sleep(api_delay)  # Be nice to the API
+    if not offline:
+        print("\nFetching ontology metadata from OLS4 API...")
+        start = time.perf_counter()
+        with requests.Session() as session:
+            records, failed = fetch_catalog(
+                lambda page: get_page(page, page_size, session), workers, api_delay
+            )
+        catalog, stats = merge_catalog(catalog, records)
+        print(
+            f"  {len(records)} records in {time.perf_counter() - start:.1f}s: "
+            f"{stats['added']} added, {stats['updated']} updated, {stats['unchanged']} unchanged"
+        )
+        if failed:
+            print(f"  Warning: pages {failed} failed; cached records kept for those ontologies")
+        if write_catalog_cache(catalog, cache_path):
+            print(f"  ✓ Updated {cache_path}")
 
-        except Exception as e:
-            print(f" Error: {e}")
-            break
+    ontology_info = {}
+    for onto_id, record in catalog.items():
+        description = record.get("description") or ""
+        ontology_info[onto_id.lower()] = {
+            "title": record.get("title") or "Unknown",
+            "description": description[:200],
+        }
 
-    print(f"\nFetched metadata for {len(ontology_info)} ontologies from OLS4")
+    print(f"\nCatalog metadata for {len(ontology_info)} ontologies from OLS4")
 
     # Merge data and write output
     print("\nCreating merged CSV...")
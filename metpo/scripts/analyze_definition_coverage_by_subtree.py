@@ -11,9 +11,12 @@ from pathlib import Path
 
 import click
 
+from metpo.utils.ontology_closure import ClosureIndex
+from metpo.utils.ontology_index import DEFAULT_ONTOLOGY_JSON, OntologyIndex
+
 
 def load_metpo_hierarchy(tsv_path: str) -> dict:
-    """Load METPO terms with parent-child relationships."""
+    """Load METPO terms with parent-child relationships from a template TSV."""
     terms = {}
     parent_to_children = defaultdict(list)
 
@@ -43,6 +46,28 @@ def load_metpo_hierarchy(tsv_path: str) -> dict:
     return terms, parent_to_children
 
 
+def load_metpo_hierarchy_from_index(index: OntologyIndex) -> tuple[dict, dict]:
+    """Load non-deprecated METPO classes from the ontology index.
+
+    Returns the same structures as :func:`load_metpo_hierarchy`.
+    """
+    terms = {}
+    parent_to_children = defaultdict(list)
+    for term_id in index.terms():
+        definition = index.definition(term_id)
+        parent_list = [index.label(parent) or parent for parent in index.parents(term_id)]
+        terms[term_id] = {
+            "id": term_id,
+            "label": index.label(term_id),
+            "definition": definition,
+            "has_definition": bool(definition),
+            "parents": parent_list,
+        }
+        for parent in parent_list:
+            parent_to_children[parent].append(term_id)
+    return terms, parent_to_children
+
+
 def find_parent_id_by_label(terms: dict, parent_label: str) -> str:
     """Find term ID by label."""
     for term_id, term_data in terms.items():
@@ -52,8 +77,27 @@ def find_parent_id_by_label(terms: dict, parent_label: str) -> str:
 
 
 def analyze_coverage(terms: dict, parent_to_children: dict) -> list:
-    """Analyze definition coverage for each parent class."""
+    """Analyze definition coverage for each parent class.
+
+    Direct-children coverage is reported alongside coverage of the whole
+    subtree, which is read from a precomputed closure rather than walked per
+    parent.
+    """
     results = []
+    label_to_id: dict[str, str] = {}
+    for term_id, term_data in terms.items():
+        label_to_id.setdefault(term_data["label"], term_id)
+    closure = ClosureIndex.from_children_map(
+        {
+            label_to_id[label]: child_ids
+            for label, child_ids in parent_to_children.items()
+            if label in label_to_id
+        },
+        nodes=terms,
+    )
+    defined_bits = closure.bits(
+        term_id for term_id, term_data in terms.items() if term_data["has_definition"]
+    )
 
     for parent_label, child_ids in parent_to_children.items():
         # Skip if no children
@@ -66,7 +110,7 @@ def analyze_coverage(terms: dict, parent_to_children: dict) -> list:
         coverage_pct = (children_with_defs / total_children) * 100 if total_children > 0 else 0
 
         # Find parent term ID
-        parent_id = find_parent_id_by_label(terms, parent_label)
+        parent_id = label_to_id.get(parent_label)
         parent_has_def = (
             terms.get(parent_id, {}).get("has_definition", False) if parent_id else False
         )
@@ -85,6 +129,14 @@ def analyze_coverage(terms: dict, parent_to_children: dict) -> list:
             if terms.get(cid, {}).get("has_definition")
         ][:5]  # Limit to 5 examples
 
+        # Whole subtree: the children and all of their descendants
+        subtree_bits = closure.bits(child_ids)
+        for cid in child_ids:
+            if cid in closure:
+                subtree_bits |= closure.descendant_bits(cid)
+        total_descendants = subtree_bits.bit_count()
+        descendants_with_defs = (subtree_bits & defined_bits).bit_count()
+
         results.append(
             {
                 "parent_label": parent_label,
@@ -96,6 +148,11 @@ def analyze_coverage(terms: dict, parent_to_children: dict) -> list:
                 "stragglers": " | ".join(stragglers) if stragglers else "",
                 "straggler_count": len(stragglers),
                 "example_defined_children": " | ".join(examples),
+                "total_descendants": total_descendants,
+                "descendants_with_definitions": descendants_with_defs,
+                "descendant_coverage_percent": round(
+                    descendants_with_defs / total_descendants * 100 if total_descendants else 0, 1
+                ),
             }
         )
 
@@ -103,11 +160,18 @@ def analyze_coverage(terms: dict, parent_to_children: dict) -> list:
 
 
 @click.command()
+@click.option(
+    "--metpo-json",
+    type=click.Path(exists=True, dir_okay=False),
+    default=str(DEFAULT_ONTOLOGY_JSON),
+    show_default=True,
+    help="METPO OBO Graphs JSON, read through the cached ontology index",
+)
 @click.option(
     "--metpo-tsv",
     type=click.Path(exists=True),
-    default="src/templates/metpo_sheet_improved.tsv",
-    help="Path to METPO template TSV file",
+    default=None,
+    help="Read the hierarchy from this METPO template TSV instead of --metpo-json",
 )
 @click.option(
     "--output",
@@ -127,7 +191,7 @@ def analyze_coverage(terms: dict, parent_to_children: dict) -> list:
     default="coverage",
     help="Sort results by: coverage (desc), stragglers (asc), or total children (desc)",
 )
-def main(metpo_tsv: str, output: str, min_children: int, sort_by: str):
+def main(metpo_json: str, metpo_tsv: str | None, output: str, min_children: int, sort_by: str):
     """
     Analyze definition coverage by parent class.
 
@@ -138,8 +202,12 @@ def main(metpo_tsv: str, output: str, min_children: int, sort_by: str):
         uv run analyze-definition-coverage-by-subtree
         uv run analyze-definition-coverage-by-subtree --sort-by stragglers --min-children 5
     """
-    click.echo(f"Loading METPO hierarchy from {metpo_tsv}...")
-    terms, parent_to_children = load_metpo_hierarchy(metpo_tsv)
+    if metpo_tsv:
+        click.echo(f"Loading METPO hierarchy from {metpo_tsv}...")
+        terms, parent_to_children = load_metpo_hierarchy(metpo_tsv)
+    else:
+        click.echo(f"Loading METPO hierarchy from {metpo_json}...")
+        terms, parent_to_children = load_metpo_hierarchy_from_index(OntologyIndex.load(metpo_json))
 
     click.echo(f"Analyzing definition coverage for {len(parent_to_children)} parent classes...")
     results = analyze_coverage(terms, parent_to_children)
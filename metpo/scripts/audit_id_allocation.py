@@ -5,14 +5,16 @@ ID reuse. See https://github.com/berkeleybop/metpo/issues/374
 """
 
 import re
-import subprocess
 from collections import defaultdict
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 
 import click
 
+from metpo.utils.git_history import GitTemplateHistory
+
 TEMPLATE_PATHS = [
     "src/templates/metpo_sheet.tsv",
     "src/templates/metpo-properties.tsv",
@@ -70,48 +72,6 @@ def labels_from_entity_extracts(extracts_dir: Path, numeric_ids: set[str]) -> di
     return labels
 
 
-def extract_ids_from_git_ref(ref: str, template_path: str, *, cwd: Path | None = None) -> set[str]:
-    """Extract METPO numeric IDs from a template at a given git ref."""
-    try:
-        result = subprocess.run(
-            ["git", "show", f"{ref}:{template_path}"],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=cwd,
-        )
-    except subprocess.CalledProcessError:
-        return set()
-    ids = set()
-    for line in result.stdout.splitlines():
-        match = re.match(r"METPO:(\d+)", line)
-        if match:
-            ids.add(match.group(1))
-    return ids
-
-
-def get_label_from_git(
-    ref: str, template_path: str, metpo_id: str, *, cwd: Path | None = None
-) -> str:
-    """Look up a label for a METPO ID from a template at a given git ref."""
-    try:
-        result = subprocess.run(
-            ["git", "show", f"{ref}:{template_path}"],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=cwd,
-        )
-    except subprocess.CalledProcessError:
-        return ""
-    prefix = f"METPO:{metpo_id}"
-    for line in result.stdout.splitlines():
-        parts = line.split("\t")
-        if parts and parts[0].strip() == prefix and len(parts) > 1:
-            return parts[1].strip()
-    return ""
-
-
 @dataclass
 class AuditResult:
     """Results of an ID allocation audit."""
@@ -128,8 +88,12 @@ class AuditResult:
         return self.current_class_ids | self.current_prop_ids
 
 
-def collect_ids(repo_root: Path) -> AuditResult:
-    """Collect all METPO IDs from every known source."""
+def collect_ids(repo_root: Path, history: GitTemplateHistory | None = None) -> AuditResult:
+    """Collect all METPO IDs from every known source.
+
+    Tagged templates are read through ``history`` (a blob-cached git reader);
+    one is opened on ``repo_root`` if not given.
+    """
     result = AuditResult()
 
     # Current templates
@@ -148,22 +112,15 @@ def collect_ids(repo_root: Path) -> AuditResult:
 
     # Tagged releases
     click.echo("Scanning tagged releases...", err=True)
-    tags_out = subprocess.run(
-        ["git", "tag", "--sort=creatordate"],
-        capture_output=True,
-        text=True,
-        check=True,
-        cwd=repo_root,
-    )
-    for raw_tag in tags_out.stdout.strip().splitlines():
-        tag = raw_tag.strip()
-        if not tag:
-            continue
-        ids = set()
-        for tmpl in TEMPLATE_PATHS:
-            ids |= extract_ids_from_git_ref(tag, tmpl, cwd=repo_root)
-        if ids:
-            result.release_ids[tag] = ids
+    with nullcontext(history) if history else GitTemplateHistory(repo_root) as git:
+        for tag in git.tags():
+            ids = set()
+            for tmpl in TEMPLATE_PATHS:
+                snapshot = git.snapshot(tag, tmpl)
+                if snapshot is not None:
+                    ids |= snapshot.ids
+            if ids:
+                result.release_ids[tag] = ids
 
     # Compute union and burned
     result.all_ids = set(result.current_ids)
@@ -193,6 +150,7 @@ def resolve_burned_prop_labels(
     extracts_dir: Path | None = None,
     *,
     cwd: Path | None = None,
+    history: GitTemplateHistory | None = None,
 ) -> dict[str, str]:
     """Find the last known label for each burned property ID.
 
@@ -200,13 +158,15 @@ def resolve_burned_prop_labels(
     to BioPortal entity extract TSVs for IDs that never appeared in a tagged release.
     """
     labels: dict[str, str] = {}
-    for pid in era3_props:
-        for tag in reversed(list(release_ids.keys())):
-            if pid in release_ids[tag]:
-                label = get_label_from_git(tag, "src/templates/metpo-properties.tsv", pid, cwd=cwd)
-                if label:
-                    labels[pid] = f"{label} (last in {tag})"
-                    break
+    with nullcontext(history) if history else GitTemplateHistory(cwd or Path.cwd()) as git:
+        for pid in era3_props:
+            for tag in reversed(list(release_ids.keys())):
+                if pid in release_ids[tag]:
+                    snapshot = git.snapshot(tag, "src/templates/metpo-properties.tsv")
+                    label = snapshot.label(pid) if snapshot else ""
+                    if label:
+                        labels[pid] = f"{label} (last in {tag})"
+                        break
 
     # Fall back to entity extract TSVs for IDs with no tag label
     unlabeled = set(era3_props) - set(labels)
@@ -233,12 +193,14 @@ def build_provenance(
     return dict(prov)
 
 
-def format_report(audit: AuditResult, *, cwd: Path | None = None) -> str:
+def format_report(
+    audit: AuditResult, *, cwd: Path | None = None, history: GitTemplateHistory | None = None
+) -> str:
     """Format the audit result as a markdown report."""
     extracts_dir = (cwd or Path.cwd()) / "metadata/ontology/historical_submissions/entity_extracts"
     classified = classify_burned(audit.burned_ids)
     prop_labels = resolve_burned_prop_labels(
-        classified["era3_props"], audit.release_ids, extracts_dir, cwd=cwd
+        classified["era3_props"], audit.release_ids, extracts_dir, cwd=cwd, history=history
     )
     provenance = build_provenance(audit.burned_ids, audit.submission_ids, audit.release_ids)
 
@@ -321,8 +283,9 @@ def format_report(audit: AuditResult, *, cwd: Path | None = None) -> str:
 def main(output: str | None) -> None:
     """Audit all METPO IDs ever allocated and report active vs burned."""
     repo_root = Path(__file__).resolve().parent.parent.parent
-    audit = collect_ids(repo_root)
-    report = format_report(audit, cwd=repo_root)
+    with GitTemplateHistory(repo_root) as history:
+        audit = collect_ids(repo_root, history)
+        report = format_report(audit, cwd=repo_root, history=history)
 
     if output:
         Path(output).write_text(report, encoding="utf-8")
@@ -15,7 +15,6 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 import click
-from oaklib import get_adapter
 
 
 @dataclass
@@ -133,6 +132,8 @@ def verify_chebi_labels_via_oak(
 
     Returns {curie: label_or_None}.
     """
+    from oaklib import get_adapter  # noqa: PLC0415
+
     adapter = get_adapter("sqlite:obo:chebi")
     labels: dict[str, str | None] = {}
 
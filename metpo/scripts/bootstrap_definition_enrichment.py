@@ -5,7 +5,9 @@ ontologies and assessing their quality and reuse.
 This script:
 1. Finds high-confidence SSSOM mappings for METPO terms
 2. Fetches actual definitions from source ontologies (via local OWL or APIs)
-3. Measures term "importance" via reuse across ontologies (PageRank proxy)
+3. Measures term "importance" via reuse across ontologies: PageRank over the
+   local mapping and term-dump graph (see metpo.utils.term_importance), or
+   the older per-IRI OLS usage count
 4. Assesses definition quality against Seppälä-Ruttenberg-Smith guidelines
 5. Generates prioritized recommendations
 """
@@ -19,6 +21,13 @@ from urllib.parse import quote
 import click
 import requests
 
+from metpo.utils.ontology_index import DEFAULT_ONTOLOGY_JSON
+from metpo.utils.term_importance import (
+    DEFAULT_IMPORTANCE_CACHE,
+    DEFAULT_TERM_DUMP_DIR,
+    TermImportance,
+)
+
 
 def read_sssom_mappings(sssom_path: Path, min_confidence: float) -> dict[str, list[dict]]:
     """Read SSSOM mappings and organize by METPO term, filtering by confidence."""
@@ -203,10 +212,50 @@ def assess_definition_quality_detailed(definition: str) -> dict[str, any]:
     "--fetch-from-ols/--no-fetch", default=True, help="Fetch additional metadata from OLS API"
 )
 @click.option("--top-n", type=int, default=20, help="Number of top mappings to analyze in detail")
-def main(mappings: Path, output: Path, min_confidence: float, fetch_from_ols: bool, top_n: int):
+@click.option(
+    "--importance",
+    type=click.Choice(["pagerank", "degree", "ols"]),
+    default="pagerank",
+    show_default=True,
+    help="Term importance: offline PageRank or weighted degree over the local mapping graph, "
+    "or an OLS usage count per fetched IRI",
+)
+@click.option(
+    "--term-dumps",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=DEFAULT_TERM_DUMP_DIR,
+    help="Directory of extract-ontology-terms TSVs added to the importance graph",
+)
+@click.option(
+    "--metpo-json",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_ONTOLOGY_JSON,
+    help="METPO OBO Graphs JSON whose xrefs are added to the importance graph (skipped if missing)",
+)
+@click.option(
+    "--importance-cache",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_IMPORTANCE_CACHE,
+    help="Cache of offline importance scores (rebuilt when an input changes)",
+)
+def main(
+    mappings: Path,
+    output: Path,
+    min_confidence: float,
+    fetch_from_ols: bool,
+    top_n: int,
+    importance: str,
+    term_dumps: Path,
+    metpo_json: Path,
+    importance_cache: Path,
+):
     """
     Bootstrap METPO definition enrichment by fetching real definitions
     and assessing quality with PageRank-like term importance.
+
+    By default, importance is PageRank over a graph built from every SSSOM
+    file next to --mappings and the --term-dumps TSVs, so no API calls are
+    needed to rank candidates.
     """
     click.echo(f"Reading SSSOM mappings from {mappings}...")
     click.echo(f"Minimum confidence: {min_confidence}")
@@ -240,6 +289,18 @@ def main(mappings: Path, output: Path, min_confidence: float, fetch_from_ols: bo
 
     click.echo(f"\nFound {len(candidates)} candidate definitions from SSSOM file")
 
+    if importance != "ols" and candidates:
+        mapping_sets = {mappings, *mappings.parent.glob("*.sssom.tsv")}
+        scores = TermImportance.load(
+            mapping_sets, term_dumps.glob("*.tsv"), metpo_json, cache_path=importance_cache
+        )
+        click.echo(f"Ranked {len(candidates)} candidates by {importance} over {len(scores)} nodes")
+        for candidate in candidates:
+            source = candidate["source_iri"]
+            candidate["ontology_usage_count"] = scores.usage_count(source)
+            value = scores.score(source) if importance == "pagerank" else scores.degree_of(source)
+            candidate["importance"] = round(value, 4)
+
     # Fetch additional data from OLS for top candidates
     if fetch_from_ols and candidates:
         click.echo(f"\nFetching additional metadata from OLS for top {top_n} candidates...")
@@ -265,13 +326,16 @@ def main(mappings: Path, output: Path, min_confidence: float, fetch_from_ols: bo
                     candidate["definition"] = ols_def
                     candidate["definition_source"] = "ols"
 
-                # Count usage across ontologies
-                usage_count = count_ontology_usage_ols(candidate["source_iri"])
-                candidate["ontology_usage_count"] = usage_count
+                if importance == "ols":
+                    # Count usage across ontologies
+                    candidate["ontology_usage_count"] = count_ontology_usage_ols(
+                        candidate["source_iri"]
+                    )
 
-                click.echo(f" ✓ (used in {usage_count} ontologies)")
+                click.echo(f" ✓ (used in {candidate['ontology_usage_count']} ontologies)")
             else:
-                candidate["ontology_usage_count"] = 0
+                if importance == "ols":
+                    candidate["ontology_usage_count"] = 0
                 click.echo(" ✗ (not found in OLS)")
 
     # Assess quality of all definitions
@@ -288,6 +352,7 @@ def main(mappings: Path, output: Path, min_confidence: float, fetch_from_ols: bo
         quality_score = {"excellent": 4, "good": 3, "adequate": 2, "poor": 1, "missing": 0}
         return (
             quality_score.get(c["quality_overall"], 0),
+            c.get("importance", 0),
             c.get("ontology_usage_count", 0),
             c["confidence"],
         )
@@ -306,6 +371,7 @@ def main(mappings: Path, output: Path, min_confidence: float, fetch_from_ols: bo
             "match_type",
             "confidence",
             "ontology_usage_count",
+            "importance",
             "quality_overall",
             "quality_length",
             "quality_has_genus",
@@ -5,19 +5,56 @@ Reads from local MongoDB `metatraits.genome_traits` and resolves trait names thr
 
 This is a demonstration utility for external implementers. It intentionally does not
 call the MetaTraits API.
+
+With ``--export`` the whole collection is exported instead of a ``--limit`` sample:
+the collection is split into ``_id`` ranges, each range is streamed by a worker
+process through a batched projection cursor straight into per-partition KGX
+JSONL/TSV files, and the partitions are merged (with node deduplication) at the end.
+Memory stays bounded by the batch size and the set of 64-bit node hashes.
 """
 
 from __future__ import annotations
 
 import csv
+import hashlib
+import json
+import os
 import re
+import shutil
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 import click
-from kgx.sink import JsonlSink, TsvSink
-from kgx.transformer import Transformer
-from pymongo import MongoClient
+
+RECORD_PROJECTION = {
+    "_id": 0,
+    "name": 1,
+    "majority_label": 1,
+    "percentages": 1,
+    "ontologies": 1,
+    "is_ai": 1,
+    "genome_accession": 1,
+}
+
+# Column order matches what kgx.sink.TsvSink writes for these property sets.
+NODE_COLUMNS = ["id", "category", "name"]
+EDGE_COLUMNS = [
+    "subject",
+    "predicate",
+    "object",
+    "agent_type",
+    "knowledge_level",
+    "majority_label",
+    "primary_knowledge_source",
+    "trait_name",
+]
+KGX_LIST_DELIMITER = "|"
+
+# Split points sampled per partition when computing _id ranges.
+SAMPLES_PER_PARTITION = 32
 
 
 def load_resolution_table(path: Path) -> dict[str, dict[str, str]]:
@@ -120,6 +157,10 @@ def write_kgx(
     output_prefix: Path,
     output_format: Literal["tsv", "jsonl"],
 ) -> tuple[Path, Path]:
+    # kgx loads the Biolink model on import; only the --limit demo path needs it.
+    from kgx.sink import JsonlSink, TsvSink  # noqa: PLC0415
+    from kgx.transformer import Transformer  # noqa: PLC0415
+
     output_prefix.parent.mkdir(parents=True, exist_ok=True)
 
     transformer = Transformer()
@@ -156,6 +197,227 @@ def write_kgx(
     return nodes_path, edges_path
 
 
+def node_key(curie: str) -> int:
+    """Return a 64-bit hash of a node id for compact deduplication."""
+    return int.from_bytes(hashlib.blake2b(curie.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _kgx_value(value: object) -> str:
+    if isinstance(value, list | tuple | set):
+        value = KGX_LIST_DELIMITER.join(str(v) for v in value)
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+def format_kgx_line(
+    record: Mapping[str, object], columns: list[str], output_format: Literal["tsv", "jsonl"]
+) -> str:
+    """Serialize one node or edge record as a KGX TSV row or JSONL line."""
+    if output_format == "jsonl":
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    return "\t".join(_kgx_value(record[c]) if c in record else "" for c in columns) + "\n"
+
+
+def kgx_paths(output_prefix: Path, output_format: str) -> tuple[Path, Path]:
+    """Return the (nodes, edges) file paths KGX uses for an output prefix."""
+    return (
+        output_prefix.with_name(f"{output_prefix.name}_nodes.{output_format}"),
+        output_prefix.with_name(f"{output_prefix.name}_edges.{output_format}"),
+    )
+
+
+def stream_records_to_kgx(
+    records: Iterable[dict],
+    table: dict[str, dict[str, str]],
+    nodes_out,
+    edges_out,
+    output_format: Literal["tsv", "jsonl"],
+) -> dict[str, int]:
+    """Map records to edges and write nodes/edges as they are produced.
+
+    Nodes are deduplicated within the stream by 64-bit hash; duplicates across
+    partitions are removed by :func:`merge_partitions`.
+    """
+    seen: set[int] = set()
+    stats = {"records": 0, "edges": 0, "nodes": 0, "missing_mapping": 0, "dropped": 0}
+    for record in records:
+        stats["records"] += 1
+        row = table.get(str(record.get("name", "")).strip())
+        if not row:
+            stats["missing_mapping"] += 1
+            continue
+        edge = map_record_to_edge(record, row)
+        if edge is None:
+            stats["dropped"] += 1
+            continue
+        edges_out.write(format_kgx_line(edge, EDGE_COLUMNS, output_format))
+        stats["edges"] += 1
+        for curie, category in (
+            (str(edge["subject"]), ["biolink:Genome"]),
+            (str(edge["object"]), object_category(str(edge["object"]))),
+        ):
+            key = node_key(curie)
+            if key not in seen:
+                seen.add(key)
+                nodes_out.write(
+                    format_kgx_line(
+                        {"id": curie, "category": category}, NODE_COLUMNS, output_format
+                    )
+                )
+                stats["nodes"] += 1
+    return stats
+
+
+def compute_id_partitions(coll, partitions: int) -> list[tuple[Any, Any]]:
+    """Split a collection into roughly equal ``[lo, hi)`` ``_id`` ranges.
+
+    Split points are quantiles of a random ``$sample`` of ``_id`` values, so no
+    full scan is needed. ``None`` marks an open bound.
+    """
+    if partitions <= 1:
+        return [(None, None)]
+    sample = coll.aggregate(
+        [
+            {"$sample": {"size": partitions * SAMPLES_PER_PARTITION}},
+            {"$project": {"_id": 1}},
+        ]
+    )
+    ids = sorted({doc["_id"] for doc in sample})
+    step = len(ids) / partitions
+    bounds = sorted({ids[int(i * step)] for i in range(1, partitions)}) if ids else []
+    return list(pairwise([None, *bounds, None]))
+
+
+def id_range_filter(lo: Any, hi: Any) -> dict:
+    """Return a Mongo filter selecting ``lo <= _id < hi`` (open where None)."""
+    bound = {}
+    if lo is not None:
+        bound["$gte"] = lo
+    if hi is not None:
+        bound["$lt"] = hi
+    return {"_id": bound} if bound else {}
+
+
+def _export_partition(
+    mongo_uri: str,
+    db_name: str,
+    collection: str,
+    lo: Any,
+    hi: Any,
+    table: dict[str, dict[str, str]],
+    part_prefix: Path,
+    output_format: Literal["tsv", "jsonl"],
+    batch_size: int,
+) -> dict[str, int]:
+    """Worker: stream one ``_id`` range into its own nodes/edges files."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
+    client: MongoClient[dict[str, Any]] = MongoClient(mongo_uri)
+    try:
+        cursor = (
+            client[db_name][collection]
+            .find(id_range_filter(lo, hi), RECORD_PROJECTION)
+            .batch_size(batch_size)
+        )
+        nodes_path, edges_path = kgx_paths(part_prefix, output_format)
+        with (
+            nodes_path.open("w", encoding="utf-8") as nodes_out,
+            edges_path.open("w", encoding="utf-8") as edges_out,
+        ):
+            return stream_records_to_kgx(cursor, table, nodes_out, edges_out, output_format)
+    finally:
+        client.close()
+
+
+def merge_partitions(
+    part_prefixes: list[Path], output_prefix: Path, output_format: Literal["tsv", "jsonl"]
+) -> tuple[Path, Path, int]:
+    """Concatenate partition edges and deduplicated partition nodes into final KGX files.
+
+    Partition files are removed after merging. Returns (nodes_path, edges_path, node_count).
+    """
+    nodes_path, edges_path = kgx_paths(output_prefix, output_format)
+    seen: set[int] = set()
+    with (
+        nodes_path.open("w", encoding="utf-8") as nodes_out,
+        edges_path.open("w", encoding="utf-8") as edges_out,
+    ):
+        if output_format == "tsv":
+            nodes_out.write("\t".join(NODE_COLUMNS) + "\n")
+            edges_out.write("\t".join(EDGE_COLUMNS) + "\n")
+        for part_prefix in part_prefixes:
+            part_nodes, part_edges = kgx_paths(part_prefix, output_format)
+            with part_edges.open(encoding="utf-8") as src:
+                shutil.copyfileobj(src, edges_out, 1024 * 1024)
+            with part_nodes.open(encoding="utf-8") as src:
+                for line in src:
+                    node_id = (
+                        json.loads(line)["id"]
+                        if output_format == "jsonl"
+                        else line.split("\t", 1)[0]
+                    )
+                    key = node_key(node_id)
+                    if key not in seen:
+                        seen.add(key)
+                        nodes_out.write(line)
+            part_nodes.unlink()
+            part_edges.unlink()
+    return nodes_path, edges_path, len(seen)
+
+
+def export_collection(
+    mongo_uri: str,
+    db_name: str,
+    collection: str,
+    table: dict[str, dict[str, str]],
+    output_prefix: Path,
+    output_format: Literal["tsv", "jsonl"],
+    workers: int,
+    partitions: int,
+    batch_size: int,
+) -> tuple[Path, Path, dict[str, int]]:
+    """Export a whole collection to KGX using partitioned parallel cursors."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
+    output_prefix.parent.mkdir(parents=True, exist_ok=True)
+    client: MongoClient[dict[str, Any]] = MongoClient(mongo_uri)
+    try:
+        ranges = compute_id_partitions(client[db_name][collection], partitions)
+    finally:
+        client.close()
+
+    part_prefixes = [
+        output_prefix.with_name(f"{output_prefix.name}.part-{i:04d}") for i in range(len(ranges))
+    ]
+    totals = {"records": 0, "edges": 0, "missing_mapping": 0, "dropped": 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _export_partition,
+                mongo_uri,
+                db_name,
+                collection,
+                lo,
+                hi,
+                table,
+                part_prefix,
+                output_format,
+                batch_size,
+            )
+            for (lo, hi), part_prefix in zip(ranges, part_prefixes, strict=True)
+        ]
+        for future in futures:
+            for key, value in future.result().items():
+                if key in totals:
+                    totals[key] += value
+
+    nodes_path, edges_path, node_count = merge_partitions(
+        part_prefixes, output_prefix, output_format
+    )
+    totals["nodes"] = node_count
+    totals["partitions"] = len(ranges)
+    return nodes_path, edges_path, totals
+
+
 @click.command()
 @click.option("--mongo-uri", default="mongodb://localhost:27017", show_default=True)
 @click.option("--db", "db_name", default="metatraits", show_default=True)
@@ -180,6 +442,25 @@ def write_kgx(
     default=Path("data/mappings/demo_metatraits_mongo_kgx"),
     show_default=True,
 )
+@click.option(
+    "--export",
+    "export_all",
+    is_flag=True,
+    help="Export the full collection with partitioned parallel cursors (ignores --limit)",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=0,
+    help="Worker processes for --export (default: CPU count)",
+)
+@click.option(
+    "--partitions",
+    type=int,
+    default=0,
+    help="_id range partitions for --export (default: 4 per worker)",
+)
+@click.option("--batch-size", type=int, default=5000, show_default=True, help="Cursor batch size")
 def main(
     mongo_uri: str,
     db_name: str,
@@ -188,24 +469,44 @@ def main(
     limit: int,
     output_format: Literal["tsv", "jsonl"],
     output_prefix: Path,
+    export_all: bool,
+    workers: int,
+    partitions: int,
+    batch_size: int,
 ) -> None:
+    from pymongo import MongoClient  # noqa: PLC0415
+
     table = load_resolution_table(resolution_table)
 
-    client = MongoClient(mongo_uri)
+    if export_all:
+        workers = workers or os.cpu_count() or 1
+        nodes_path, edges_path, totals = export_collection(
+            mongo_uri,
+            db_name,
+            collection,
+            table,
+            output_prefix,
+            output_format,
+            workers=workers,
+            partitions=partitions or 4 * workers,
+            batch_size=batch_size,
+        )
+        click.echo(
+            f"Exported {totals['records']} records from {db_name}.{collection} "
+            f"in {totals['partitions']} partitions with {workers} workers"
+        )
+        click.echo(f"Mapped nodes: {totals['nodes']}")
+        click.echo(f"Mapped edges: {totals['edges']}")
+        click.echo(f"Missing trait mapping rows: {totals['missing_mapping']}")
+        click.echo(f"Dropped after mapping (no predicate/object): {totals['dropped']}")
+        click.echo(f"Wrote nodes: {nodes_path}")
+        click.echo(f"Wrote edges: {edges_path}")
+        return
+
+    client: MongoClient[dict[str, Any]] = MongoClient(mongo_uri)
     coll = client[db_name][collection]
 
-    cursor = coll.find(
-        {},
-        {
-            "_id": 0,
-            "name": 1,
-            "majority_label": 1,
-            "percentages": 1,
-            "ontologies": 1,
-            "is_ai": 1,
-            "genome_accession": 1,
-        },
-    ).limit(limit)
+    cursor = coll.find({}, RECORD_PROJECTION).limit(limit)
 
     edges: list[dict[str, object]] = []
     nodes: dict[str, dict[str, object]] = {}
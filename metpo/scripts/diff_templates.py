@@ -6,18 +6,31 @@ Compares template TSV files by METPO ID, reporting:
 - Cell-level diffs for common IDs (optional)
 
 Sources can be local files, git refs, or the live Google Sheet.
+
+Every row is fingerprinted by a hash of its normalized cells when it is
+loaded. Rows with equal fingerprints are skipped without comparing cells, so
+cell-level diffs are only computed for IDs whose content changed. Any number
+of sources, e.g. a range of release tags plus HEAD and the live sheet, can be
+diffed in one run. Git revisions are read straight from the object store and
+each distinct template blob is parsed once.
 """
 
 import csv
+import fnmatch
+import hashlib
+import io
 import os
 import subprocess
 import tempfile
-import urllib.request
+from dataclasses import dataclass
+from itertools import pairwise
 from pathlib import Path
 
 import click
 
-from metpo.sheets_config import SHEET_GIDS, SPREADSHEET_ID, TEMPLATE_PATHS
+from metpo.sheets_config import TEMPLATE_PATHS
+from metpo.utils.git_history import GitTemplateHistory
+from metpo.utils.sheet_sync import DEFAULT_SHEETS_DIR, sync_sheets
 
 _temp_files: list[Path] = []
 
@@ -26,24 +39,20 @@ def resolve_source(source: str, template: str) -> Path:
     """Resolve a source specifier to a local file path.
 
     Accepts:
-        - "gsheet" — download live Google Sheet
+        - "gsheet" — sync the live Google Sheet into downloads/sheets/
         - "HEAD", "main", tag names, commit hashes — extract from git
         - file path — use directly
     """
     if source == "gsheet":
-        gid = SHEET_GIDS[template]
-        url = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?exportFormat=tsv&gid={gid}"
-        fd, name = tempfile.mkstemp(suffix=".tsv")
-        os.close(fd)
-        tmp = Path(name)
-        _temp_files.append(tmp)
-        urllib.request.urlretrieve(url, tmp)
-        return tmp
+        (synced,) = sync_sheets(DEFAULT_SHEETS_DIR, [template])
+        if synced.status == "failed":
+            raise click.ClickException(f"Cannot download '{template}' sheet: {synced.error}")
+        return synced.path
 
     # Try as git ref
     git_path = TEMPLATE_PATHS[template]
     try:
-        result = subprocess.run(
+        shown = subprocess.run(
             ["git", "show", f"{source}:{git_path}"],
             capture_output=True,
             text=True,
@@ -53,7 +62,7 @@ def resolve_source(source: str, template: str) -> Path:
         os.close(fd)
         tmp = Path(name)
         _temp_files.append(tmp)
-        tmp.write_text(result.stdout, encoding="utf-8")
+        tmp.write_text(shown.stdout, encoding="utf-8")
         return tmp
     except subprocess.CalledProcessError:
         pass
@@ -68,6 +77,145 @@ def resolve_source(source: str, template: str) -> Path:
     raise click.BadParameter(f"Cannot resolve '{source}' as gsheet, git ref, or file path")
 
 
+@dataclass
+class TemplateVersion:
+    """One source's template rows keyed by METPO ID, with per-row fingerprints."""
+
+    name: str
+    digest: str  # SHA-256 of the whole file
+    headers: list[str]
+    rows: dict[str, list[str]]
+    fingerprints: dict[str, bytes]
+
+    def label(self, metpo_id: str) -> str:
+        row = self.rows[metpo_id]
+        return row[1].strip() if len(row) > 1 else ""
+
+    @property
+    def labels(self) -> dict[str, str]:
+        return {mid: self.label(mid) for mid in self.rows}
+
+
+def row_fingerprint(row: list[str]) -> bytes:
+    """Hash a row's stripped cells, ignoring trailing empty cells.
+
+    Two rows have equal fingerprints exactly when a cell-by-cell comparison
+    (missing cells counting as empty) finds no difference.
+    """
+    cells = [cell.strip() for cell in row]
+    while cells and not cells[-1]:
+        cells.pop()
+    return hashlib.blake2b("\x1f".join(cells).encode("utf-8"), digest_size=16).digest()
+
+
+def parse_template(name: str, text: str) -> TemplateVersion:
+    """Parse template TSV text into a fingerprinted TemplateVersion."""
+    headers: list[str] = []
+    rows: dict[str, list[str]] = {}
+    for row in csv.reader(io.StringIO(text), delimiter="\t"):
+        if not row:
+            continue
+        if not headers:
+            headers = [c.strip() for c in row]
+        if row[0].strip().startswith("METPO:"):
+            rows[row[0].strip()] = row
+    fingerprints = {mid: row_fingerprint(row) for mid, row in rows.items()}
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return TemplateVersion(name, digest, headers, rows, fingerprints)
+
+
+def read_version(name: str, path: Path) -> TemplateVersion:
+    """Load a template file as a TemplateVersion."""
+    return parse_template(name, Path(path).read_text(encoding="utf-8"))
+
+
+def is_ref_like(source: str) -> bool:
+    """Whether a source may name a git ref, i.e. it is neither "gsheet" nor an existing path."""
+    return source != "gsheet" and not Path(source).exists()
+
+
+def load_version(
+    source: str,
+    template: str,
+    history: GitTemplateHistory,
+    cache: dict | None = None,
+    *,
+    missing_ok: bool = False,
+) -> TemplateVersion:
+    """Load a source as a TemplateVersion without temporary files.
+
+    Sources resolve like resolve_source: "gsheet", then a git ref (read through
+    ``history``), then a file path. Existing paths are read directly without
+    consulting git. ``cache`` maps content digests to parsed versions so
+    identical blobs are parsed once across sources. With ``missing_ok`` a ref
+    that lacks the template (e.g. a tag older than the template) loads as an
+    empty version instead of raising.
+    """
+    if not is_ref_like(source):
+        text = resolve_source(source, template).read_text(encoding="utf-8")
+    else:
+        blob = history.read_text(source, TEMPLATE_PATHS[template])
+        if blob is not None:
+            text = blob[1]
+        elif missing_ok:
+            text = ""
+        else:
+            text = resolve_source(source, template).read_text(encoding="utf-8")
+    if cache is None:
+        return parse_template(source, text)
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if digest not in cache:
+        cache[digest] = parse_template(source, text)
+    parsed = cache[digest]
+    return TemplateVersion(source, digest, parsed.headers, parsed.rows, parsed.fingerprints)
+
+
+@dataclass
+class TemplateDiff:
+    """ID-keyed differences between two template versions."""
+
+    only_a: list[str]
+    only_b: list[str]
+    common: list[str]
+    label_changes: list[tuple[str, str, str]]
+    changed: list[str]  # common IDs whose row fingerprints differ
+
+
+def diff_versions(a: TemplateVersion, b: TemplateVersion) -> TemplateDiff:
+    """Diff two versions by ID; identical files short-circuit to an empty diff."""
+    common = sorted(a.rows.keys() & b.rows.keys())
+    if a.digest == b.digest:
+        return TemplateDiff([], [], common, [], [])
+    changed = [mid for mid in common if a.fingerprints[mid] != b.fingerprints[mid]]
+    label_changes = [
+        (mid, a.label(mid), b.label(mid)) for mid in changed if a.label(mid) != b.label(mid)
+    ]
+    return TemplateDiff(
+        sorted(a.rows.keys() - b.rows.keys()),
+        sorted(b.rows.keys() - a.rows.keys()),
+        common,
+        label_changes,
+        changed,
+    )
+
+
+def cell_diffs_for(
+    a: TemplateVersion, b: TemplateVersion, ids: list[str]
+) -> list[tuple[str, str, str, str]]:
+    """Return (ID, column, old, new) for each differing cell of ``ids``; headers come from b."""
+    diffs = []
+    for mid in ids:
+        ra = a.rows.get(mid, [])
+        rb = b.rows.get(mid, [])
+        for col in range(max(len(ra), len(rb))):
+            va = ra[col].strip() if col < len(ra) else ""
+            vb = rb[col].strip() if col < len(rb) else ""
+            if va != vb:
+                col_name = b.headers[col] if col < len(b.headers) else f"col[{col}]"
+                diffs.append((mid, col_name, va[:60], vb[:60]))
+    return diffs
+
+
 def load_ids(path: Path) -> dict[str, str]:
     """Load METPO IDs and labels from a TSV, skipping header rows."""
     ids = {}
@@ -105,22 +253,11 @@ def load_headers(path: Path) -> list[str]:
     return []
 
 
-def _print_cell_diffs(path_a: Path, path_b: Path, common: list[str], max_cell_diffs: int) -> int:
-    """Print cell-level diffs for common IDs between two template files. Returns diff count."""
-    headers = load_headers(path_b)
-    rows_a = load_full_rows(path_a)
-    rows_b = load_full_rows(path_b)
-    diffs = []
-    for mid in common:
-        ra = rows_a.get(mid, [])
-        rb = rows_b.get(mid, [])
-        max_cols = max(len(ra), len(rb))
-        for col in range(max_cols):
-            va = ra[col].strip() if col < len(ra) else ""
-            vb = rb[col].strip() if col < len(rb) else ""
-            if va != vb:
-                col_name = headers[col] if col < len(headers) else f"col[{col}]"
-                diffs.append((mid, col_name, va[:60], vb[:60]))
+def _print_cell_diffs(
+    a: TemplateVersion, b: TemplateVersion, changed: list[str], max_cell_diffs: int
+) -> int:
+    """Print cell-level diffs for changed IDs between two versions. Returns diff count."""
+    diffs = cell_diffs_for(a, b, changed)
     if diffs:
         click.echo(f"\n  ~~~ Cell-level diffs ({len(diffs)} cells across common IDs) ~~~")
         for mid, col_name, va, vb in diffs[:max_cell_diffs]:
@@ -130,64 +267,103 @@ def _print_cell_diffs(path_a: Path, path_b: Path, common: list[str], max_cell_di
     return len(diffs)
 
 
-def compare(
-    name_a: str,
-    path_a: Path,
-    name_b: str,
-    path_b: Path,
+def report_diff(
+    a: TemplateVersion,
+    b: TemplateVersion,
     *,
     cell_diffs: bool = False,
     max_cell_diffs: int = 50,
 ) -> dict:
-    """Compare two template files by METPO ID. Returns summary dict."""
-    ids_a = load_ids(path_a)
-    ids_b = load_ids(path_b)
-
-    only_a = sorted(set(ids_a) - set(ids_b))
-    only_b = sorted(set(ids_b) - set(ids_a))
-    common = sorted(set(ids_a) & set(ids_b))
-
-    label_changes = [(mid, ids_a[mid], ids_b[mid]) for mid in common if ids_a[mid] != ids_b[mid]]
+    """Print the diff between two versions. Returns summary dict."""
+    diff = diff_versions(a, b)
+    name_a, name_b = a.name, b.name
 
     click.echo(f"\n{'=' * 70}")
-    click.echo(f"  {name_a} ({len(ids_a)} IDs) vs {name_b} ({len(ids_b)} IDs)")
+    click.echo(f"  {name_a} ({len(a.rows)} IDs) vs {name_b} ({len(b.rows)} IDs)")
     click.echo(f"{'=' * 70}")
     click.echo(
-        f"  Common: {len(common)}  |  Only in {name_a}: {len(only_a)}"
-        f"  |  Only in {name_b}: {len(only_b)}"
+        f"  Common: {len(diff.common)}  |  Only in {name_a}: {len(diff.only_a)}"
+        f"  |  Only in {name_b}: {len(diff.only_b)}"
     )
 
-    if only_a:
-        click.echo(f"\n  --- Only in {name_a} ({len(only_a)}) ---")
-        for mid in only_a:
-            click.echo(f"    {mid}\t{ids_a[mid]}")
+    if diff.only_a:
+        click.echo(f"\n  --- Only in {name_a} ({len(diff.only_a)}) ---")
+        for mid in diff.only_a:
+            click.echo(f"    {mid}\t{a.label(mid)}")
 
-    if only_b:
-        click.echo(f"\n  +++ Only in {name_b} ({len(only_b)}) +++")
-        for mid in only_b:
-            click.echo(f"    {mid}\t{ids_b[mid]}")
+    if diff.only_b:
+        click.echo(f"\n  +++ Only in {name_b} ({len(diff.only_b)}) +++")
+        for mid in diff.only_b:
+            click.echo(f"    {mid}\t{b.label(mid)}")
 
-    if label_changes:
-        click.echo(f"\n  ~~~ Label changes ({len(label_changes)}) ~~~")
-        for mid, la, lb in label_changes:
+    if diff.label_changes:
+        click.echo(f"\n  ~~~ Label changes ({len(diff.label_changes)}) ~~~")
+        for mid, la, lb in diff.label_changes:
             click.echo(f"    {mid}: '{la}' -> '{lb}'")
 
     cell_diff_count = 0
-    if cell_diffs and common:
-        cell_diff_count = _print_cell_diffs(path_a, path_b, common, max_cell_diffs)
+    if cell_diffs and diff.changed:
+        cell_diff_count = _print_cell_diffs(a, b, diff.changed, max_cell_diffs)
 
-    if not only_a and not only_b and not label_changes and not cell_diff_count:
+    if not diff.only_a and not diff.only_b and not diff.label_changes and not cell_diff_count:
         click.echo("\n  IDs and labels are identical.")
 
     return {
-        "only_a": only_a,
-        "only_b": only_b,
-        "common": len(common),
-        "label_changes": len(label_changes),
+        "only_a": diff.only_a,
+        "only_b": diff.only_b,
+        "common": len(diff.common),
+        "label_changes": len(diff.label_changes),
         "cell_diffs": cell_diff_count,
+        "changed_rows": len(diff.changed),
     }
 
 
+def compare(
+    name_a: str,
+    path_a: Path,
+    name_b: str,
+    path_b: Path,
+    *,
+    cell_diffs: bool = False,
+    max_cell_diffs: int = 50,
+) -> dict:
+    """Compare two template files by METPO ID. Returns summary dict."""
+    return report_diff(
+        read_version(name_a, path_a),
+        read_version(name_b, path_b),
+        cell_diffs=cell_diffs,
+        max_cell_diffs=max_cell_diffs,
+    )
+
+
+def summarize_history(versions: list[TemplateVersion]) -> list[dict]:
+    """Return per-step drift counts for consecutive versions."""
+    steps = []
+    for a, b in pairwise(versions):
+        diff = diff_versions(a, b)
+        steps.append(
+            {
+                "from": a.name,
+                "to": b.name,
+                "ids": len(b.rows),
+                "added": len(diff.only_b),
+                "removed": len(diff.only_a),
+                "label_changes": len(diff.label_changes),
+                "changed_rows": len(diff.changed),
+            }
+        )
+    return steps
+
+
+def _print_summary(steps: list[dict]) -> None:
+    click.echo(f"\n  {'from':<24} {'to':<24} {'IDs':>5} {'+':>5} {'-':>5} {'label':>6} {'rows':>5}")
+    for step in steps:
+        click.echo(
+            f"  {step['from']:<24} {step['to']:<24} {step['ids']:>5} {step['added']:>5}"
+            f" {step['removed']:>5} {step['label_changes']:>6} {step['changed_rows']:>5}"
+        )
+
+
 @click.command()
 @click.option(
     "--source-a",
@@ -201,6 +377,24 @@ def compare(
     default="HEAD",
     help="Second source: 'gsheet', git ref (HEAD, main, tag), or file path",
 )
+@click.option(
+    "--source",
+    "-s",
+    "sources",
+    multiple=True,
+    help="N-way mode: diff consecutive sources in the given order (repeatable)",
+)
+@click.option(
+    "--tags",
+    "tag_pattern",
+    default=None,
+    help="N-way mode: prepend all tags matching this glob, oldest first (e.g. '2025-*' or '*')",
+)
+@click.option(
+    "--summary",
+    is_flag=True,
+    help="N-way mode: print one line of drift counts per step instead of full diffs",
+)
 @click.option(
     "--template",
     "-t",
@@ -213,6 +407,9 @@ def compare(
 def main(
     source_a: str,
     source_b: str,
+    sources: tuple[str, ...],
+    tag_pattern: str | None,
+    summary: bool,
     template: str,
     cell_diffs: bool,
     max_cell_diffs: int,
@@ -220,6 +417,8 @@ def main(
     """Diff METPO ROBOT templates across sources.
 
     Compare templates between Google Sheets, git refs, and local files.
+    With --source and/or --tags, every consecutive pair of sources is diffed
+    in one run.
 
     Examples:
 
@@ -234,30 +433,43 @@ def main(
 
         # Two local files
         diff-templates -a src/templates/metpo_sheet.tsv -b /tmp/old_sheet.tsv -t classes
+
+        # Drift across every release, then HEAD and the live sheet
+        diff-templates --tags '*' -s HEAD -s gsheet --summary
     """
     templates = ["classes", "properties"] if template == "both" else [template]
 
-    try:
-        for tmpl in templates:
-            click.echo(f"\n{'#' * 70}")
-            click.echo(f"# {tmpl.upper()} TEMPLATE ({TEMPLATE_PATHS[tmpl]})")
-            click.echo(f"{'#' * 70}")
-
-            path_a = resolve_source(source_a, tmpl)
-            path_b = resolve_source(source_b, tmpl)
-
-            compare(
-                source_a,
-                path_a,
-                source_b,
-                path_b,
-                cell_diffs=cell_diffs,
-                max_cell_diffs=max_cell_diffs,
-            )
-    finally:
-        for tmp in _temp_files:
-            tmp.unlink(missing_ok=True)
-        _temp_files.clear()
+    with GitTemplateHistory(Path.cwd(), cache_path=None) as history:
+        chain = list(sources)
+        tags: list[str] = []
+        if tag_pattern:
+            tags = [t for t in history.tags() if fnmatch.fnmatch(t, tag_pattern)]
+            chain = tags + chain
+        if not chain:
+            chain = [source_a, source_b]
+        if len(chain) < 2:
+            raise click.BadParameter("N-way mode needs at least two sources")
+
+        try:
+            for tmpl in templates:
+                click.echo(f"\n{'#' * 70}")
+                click.echo(f"# {tmpl.upper()} TEMPLATE ({TEMPLATE_PATHS[tmpl]})")
+                click.echo(f"{'#' * 70}")
+
+                parsed: dict[str, TemplateVersion] = {}
+                versions = [
+                    load_version(source, tmpl, history, parsed, missing_ok=source in tags)
+                    for source in chain
+                ]
+                if summary:
+                    _print_summary(summarize_history(versions))
+                    continue
+                for a, b in pairwise(versions):
+                    report_diff(a, b, cell_diffs=cell_diffs, max_cell_diffs=max_cell_diffs)
+        finally:
+            for tmp in _temp_files:
+                tmp.unlink(missing_ok=True)
+            _temp_files.clear()
 
 
 if __name__ == "__main__":
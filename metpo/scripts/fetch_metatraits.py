@@ -2,60 +2,200 @@
 
 This scraper targets the /traits catalog, which exposes ontology CURIE links
 that are not present in the MetaTraits API or bulk taxonomy exports.
+
+The catalog is fetched conditionally (ETag / If-Modified-Since) against a local
+cache and parsed in one streaming pass as the response body arrives.
 """
 
 import csv
 import html as html_lib
 import json
-import re
+from collections.abc import Iterable, Iterator
+from html.parser import HTMLParser
 from pathlib import Path
+from typing import Any, cast
 
 import click
 import requests
 
-CARD_START_PATTERN = r'<div class="card mb-3" id="'
+from metpo.utils.files import write_atomic
 
+DEFAULT_CACHE_DIR = Path("local/metatraits_cache")
+CHUNK_SIZE = 64 * 1024
+CAPTURE_END_TAGS = {"name": "h4", "type": "span", "description": "p", "ref": "a"}
 
-def _extract_first(pattern: str, text: str) -> str:
-    match = re.search(pattern, text, re.DOTALL)
-    return match.group(1).strip() if match else ""
 
+class TraitCardParser(HTMLParser):
+    """Incremental tokenizer that collects trait cards as HTML is fed in.
 
-def extract_traits(html: str) -> list[dict[str, object]]:
-    """Extract trait card content from MetaTraits HTML."""
-    card_starts = [m.start() for m in re.finditer(CARD_START_PATTERN, html)]
-    traits: list[dict[str, object]] = []
-
-    for idx, start in enumerate(card_starts):
-        end = card_starts[idx + 1] if idx + 1 < len(card_starts) else len(html)
-        section = html[start:end]
-
-        card_id = _extract_first(r'id="([^"]+)"', section)
-        name = _extract_first(r"<h4[^>]*>(.*?)</h4>", section)
-        trait_type = _extract_first(r'rounded-pill">(.*?)</span>', section)
-
-        description_html = _extract_first(r'<p class="card-text[^\"]*">(.*?)</p>', section)
-        # Strip tags and decode HTML entities so downstream matching uses plain text.
-        description = html_lib.unescape(re.sub(r"<[^>]+>", "", description_html)).strip()
-
-        ontology_refs = []
-        for href, curie in re.findall(r'class="btn btn-cta" href=([^>]+)>([^<]+)</a>', section):
-            ontology_refs.append({"curie": curie.strip(), "url": href.strip()})
-
-        if not card_id or not name:
-            continue
-
-        traits.append(
-            {
-                "card_id": card_id,
-                "name": name,
-                "type": trait_type,
-                "ontology_refs": ontology_refs,
-                "description": description,
+    Each ``<div class="card mb-3" id="...">`` starts a new card; the card is
+    complete when the next one starts or the document ends. Within a card the
+    first ``<h4>``, the first ``*rounded-pill`` span and the first ``card-text``
+    paragraph give name, type and description, and every ``btn btn-cta`` link
+    gives an ontology reference. Each field is the text of all descendants of
+    its element, so captures may nest (e.g. a pill inside the heading).
+    Entity references are kept verbatim in names and types, and decoded in
+    descriptions.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.completed: list[dict[str, Any]] = []
+        self._card: dict[str, Any] | None = None
+        self._captures: dict[str, list[str]] = {}  # open fields -> text so far
+        self._href = ""
+
+    def _finish_card(self) -> None:
+        card = self._card
+        self._card = None
+        self._captures = {}
+        if card and card["card_id"] and card["name"]:
+            self.completed.append(card)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attr = {key: value or "" for key, value in attrs}
+        css = attr.get("class", "")
+        if tag == "div" and css == "card mb-3" and "id" in attr:
+            self._finish_card()
+            self._card = {
+                "card_id": attr["id"].strip(),
+                "name": None,
+                "type": None,
+                "ontology_refs": [],
+                "description": None,
             }
-        )
+            return
+        if self._card is None:
+            return
+        if tag == "h4":
+            self._start_capture("name")
+        elif tag == "span" and css.endswith("rounded-pill"):
+            self._start_capture("type")
+        elif tag == "p" and css.startswith("card-text"):
+            self._start_capture("description")
+        elif tag == "a" and css == "btn btn-cta" and "ref" not in self._captures:
+            self._href = attr.get("href", "")
+            self._captures["ref"] = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._card is None:
+            return
+        for field in reversed(self._captures):
+            if CAPTURE_END_TAGS[field] == tag:
+                break
+        else:
+            return
+        text = "".join(self._captures.pop(field)).strip()
+        if field == "ref":
+            if text:
+                self._card["ontology_refs"].append({"curie": text, "url": self._href.strip()})
+        elif field == "description":
+            self._card["description"] = html_lib.unescape(text).strip()
+        else:
+            self._card[field] = text
+
+    def _start_capture(self, field: str) -> None:
+        """Open ``field`` unless it is already open or was captured earlier in the card."""
+        assert self._card is not None
+        if field not in self._captures and self._card[field] is None:
+            self._captures[field] = []
+
+    def handle_data(self, data: str) -> None:
+        for buffer in self._captures.values():
+            buffer.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        self.handle_data(f"&#{name};")
+
+    def close(self) -> None:
+        super().close()
+        self._finish_card()
+
+
+def iter_traits(chunks: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Yield trait cards from HTML text chunks in a single streaming pass."""
+    parser = TraitCardParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _drain(parser)
+    parser.close()
+    yield from _drain(parser)
+
+
+def _drain(parser: TraitCardParser) -> Iterator[dict[str, Any]]:
+    while parser.completed:
+        card = parser.completed.pop(0)
+        yield {
+            "card_id": card["card_id"],
+            "name": card["name"],
+            "type": card["type"] or "",
+            "ontology_refs": card["ontology_refs"],
+            "description": card["description"] or "",
+        }
 
-    return traits
+
+def extract_traits(html: str) -> list[dict[str, Any]]:
+    """Extract trait card content from MetaTraits HTML."""
+    return list(iter_traits([html]))
+
+
+def fetch_traits(
+    url: str,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    session: requests.Session | None = None,
+    force: bool = False,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Fetch and parse the catalog, skipping the parse when the page is unchanged.
+
+    The request carries ``If-None-Match`` / ``If-Modified-Since`` from the last
+    successful fetch; on ``304 Not Modified`` the cached trait records are
+    returned. Otherwise the chunked response body is parsed as it streams in.
+    A 304 to a request that carried no validators has nothing to reuse and
+    raises ``requests.HTTPError``.
+
+    Returns:
+        Tuple of (traits, served_from_cache)
+    """
+    http = session or requests
+    meta_path = cache_dir / "meta.json" if cache_dir else None
+    traits_path = cache_dir / "traits.json" if cache_dir else None
+
+    headers = {}
+    meta: dict[str, str] = {}
+    if meta_path and meta_path.exists() and traits_path.exists() and not force:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("url") == url:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+    with http.get(url, headers=headers, timeout=60, stream=True) as response:
+        if response.status_code == 304:
+            if not headers:
+                raise requests.HTTPError(
+                    f"304 Not Modified for {url} without a cached copy", response=response
+                )
+            return json.loads(traits_path.read_text(encoding="utf-8")), True
+        response.raise_for_status()
+        if response.encoding is None:
+            response.encoding = "utf-8"
+        # With an encoding set, decode_unicode yields str chunks
+        chunks = cast(Iterator[str], response.iter_content(CHUNK_SIZE, decode_unicode=True))
+        traits = list(iter_traits(chunks))
+        validators = {
+            "url": url,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+        }
+
+    if cache_dir and (validators["etag"] or validators["last_modified"]):
+        write_atomic(traits_path, json.dumps(traits))
+        write_atomic(meta_path, json.dumps(validators, indent=2))
+    return traits, False
 
 
 @click.command()
@@ -74,17 +214,25 @@ def extract_traits(html: str) -> list[dict[str, object]]:
     show_default=True,
     help="MetaTraits traits catalog URL",
 )
-def main(output: str, fmt: str | None, url: str) -> None:
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_CACHE_DIR,
+    show_default=True,
+    help="Cache for ETag/Last-Modified validators and parsed cards",
+)
+@click.option("--force", is_flag=True, help="Ignore the cache and re-download the catalog")
+def main(output: str, fmt: str | None, url: str, cache_dir: Path, force: bool) -> None:
     """Fetch and parse MetaTraits trait cards from the traits catalog page."""
     if fmt is None:
         fmt = "json" if output.endswith(".json") else "tsv"
 
     click.echo(f"Fetching {url} ...")
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-
-    traits = extract_traits(response.text)
-    click.echo(f"Extracted {len(traits)} trait cards")
+    traits, cached = fetch_traits(url, cache_dir=cache_dir, force=force)
+    if cached:
+        click.echo(f"Catalog not modified; reusing {len(traits)} cached trait cards")
+    else:
+        click.echo(f"Extracted {len(traits)} trait cards")
 
     outpath = Path(output)
     outpath.parent.mkdir(parents=True, exist_ok=True)
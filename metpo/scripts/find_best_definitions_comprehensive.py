@@ -19,7 +19,6 @@ from difflib import SequenceMatcher
 from pathlib import Path
 
 import click
-import pandas as pd
 
 # Ontology quality tiers for prioritization
 ONTOLOGY_TIERS = {
@@ -174,6 +173,8 @@ def load_sssom_candidates(sssom_path: Path, metpo_label: str) -> list[dict]:
 
 def load_api_candidates(api_results_path: Path, metpo_id: str) -> list[dict]:
     """Load candidate definitions from OLS/BioPortal API search results."""
+    import pandas as pd  # noqa: PLC0415
+
     candidates = []
 
     try:
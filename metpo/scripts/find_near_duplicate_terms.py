@@ -0,0 +1,424 @@
+"""All-pairs near-duplicate detection over embeddings of METPO terms.
+
+Exact label clashes are caught by ``qc-metpo-sheets``. Two classes with
+reworded labels, or a synonym of one that paraphrases another, are not. This
+module embeds every label, synonym and definition of every METPO term (plus
+stub labels that differ from the released ones) and compares every text with
+every other text.
+
+The comparison is a blocked matrix multiply over L2-normalized vectors: rows
+are processed ``block_size`` at a time against the whole matrix. Peak memory
+is therefore ``block_size x n`` similarities rather than ``n x n``. Within a
+block, the best ``k`` columns of each row are picked with ``argpartition``.
+Matches between texts of the same term are masked out. Text-level matches are
+then folded into a per-term heap that keeps each term's ``k`` most similar
+other terms. A pair's score is the best similarity between any text of one
+term and any text of the other.
+
+Embeddings come from the same Ollama-compatible backend as
+``cross-ontology-search`` and are cached on disk (``.npz``), keyed by model and
+endpoint. A re-run after editing a few terms only embeds the changed texts.
+"""
+
+import csv
+import heapq
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import click
+import numpy as np
+
+from metpo.cli_common import profile_options, stage, telemetry_option
+from metpo.pipeline.cross_ontology_search import DEFAULT_EMBED_MODEL, DEFAULT_EMBED_URL, embed
+from metpo.utils import telemetry
+from metpo.utils.files import atomic_open
+from metpo.utils.ontology_index import DEFAULT_ONTOLOGY_JSON, OntologyIndex, cache_path_for
+
+DEFAULT_STUBS = Path("src/templates/stubs.tsv")
+DEFAULT_EMBEDDING_CACHE = Path("local/term_embeddings.npz")
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_TOP_K = 5
+DEFAULT_BLOCK_SIZE = 1024
+DEFAULT_WORKERS = 8
+DEFAULT_OUTPUT = Path("reports/near_duplicate_terms.tsv")
+STUB_SUBTREE = "(stubs)"
+SUMMARY_GROUPS = 20
+COLUMNS = [
+    "subtree",
+    "similarity",
+    "term_a",
+    "label_a",
+    "matched_a",
+    "text_a",
+    "term_b",
+    "label_b",
+    "matched_b",
+    "text_b",
+]
+
+
+class TermText(NamedTuple):
+    """One embedded text of a term."""
+
+    term: str
+    kind: str  # label, synonym, definition or stub label
+    text: str
+
+
+class DuplicatePair(NamedTuple):
+    """Two terms whose most similar texts score at or above the threshold."""
+
+    similarity: float
+    term_a: TermText
+    term_b: TermText
+
+
+def term_texts(index: OntologyIndex, stubs: str | Path | None = None) -> list[TermText]:
+    """Labels, synonyms and definitions of non-deprecated METPO terms, plus stub labels.
+
+    A stub row only adds a text when its label differs from the released
+    label, or when its ID is not in the ontology at all.
+    """
+    texts = []
+    for curie in index.terms(term_type=None):
+        texts.append(TermText(curie, "label", index.label(curie)))
+        texts.extend(TermText(curie, "synonym", s.text) for s in index.synonyms(curie))
+        texts.append(TermText(curie, "definition", index.definition(curie)))
+    if stubs is not None:
+        with Path(stubs).open(encoding="utf-8") as f:
+            for row in list(csv.reader(f, delimiter="\t"))[2:]:
+                if len(row) < 2 or not row[0].strip() or not row[1].strip():
+                    continue
+                curie, label = row[0].strip(), row[1].strip()
+                if curie not in index or index.label(curie) != label:
+                    texts.append(TermText(curie, "stub label", label))
+    # One entry per distinct text of a term; a synonym equal to the label adds nothing
+    seen = set()
+    unique = []
+    for item in texts:
+        key = (item.term, item.text.strip().lower())
+        if item.text.strip() and key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def load_embedding_cache(path: str | Path, model: str, embed_url: str) -> dict[str, np.ndarray]:
+    """Return cached ``text -> vector`` for this model and endpoint (empty if none match)."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with np.load(path, allow_pickle=False) as data:
+        if str(data["model"]) != model or str(data["embed_url"]) != embed_url:
+            return {}
+        return dict(zip(data["texts"].tolist(), data["vectors"], strict=True))
+
+
+def save_embedding_cache(
+    path: str | Path, model: str, embed_url: str, vectors: dict[str, np.ndarray]
+) -> None:
+    """Write ``text -> vector`` for one model and endpoint to ``path``."""
+    texts = list(vectors)
+    matrix = np.array([vectors[text] for text in texts], dtype=np.float32)
+    with atomic_open(path, "wb") as f:
+        np.savez(f, model=model, embed_url=embed_url, texts=np.array(texts), vectors=matrix)
+
+
+def embed_texts(
+    texts: Iterable[str],
+    model: str,
+    embed_url: str,
+    workers: int = DEFAULT_WORKERS,
+    cached: dict[str, np.ndarray] | None = None,
+) -> dict[str, np.ndarray]:
+    """Embed distinct texts concurrently, reusing ``cached`` vectors.
+
+    Returns ``text -> vector`` for every text that has an embedding; texts the
+    endpoint failed on are left out.
+    """
+    vectors = dict(cached or {})
+    distinct = list(dict.fromkeys(texts))
+    missing = [text for text in distinct if text not in vectors]
+    telemetry.count("embedding.cache_hits", len(distinct) - len(missing))
+    telemetry.count("embedding.cache_misses", len(missing))
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as pool:
+            for text, vector in zip(
+                missing, pool.map(lambda text: embed(text, model, embed_url), missing), strict=True
+            ):
+                if vector is not None:
+                    vectors[text] = np.asarray(vector, dtype=np.float32)
+    return vectors
+
+
+def blocked_top_k(
+    vectors: np.ndarray,
+    owners: Sequence[int],
+    k: int = DEFAULT_TOP_K,
+    threshold: float = DEFAULT_THRESHOLD,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[tuple[int, int, float]]:
+    """Yield ``(row, column, cosine)`` for each row's ``k`` best matches at or above ``threshold``.
+
+    Rows with the same owner never match each other. Only one
+    ``block_size x n`` block of similarities exists at a time.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.where(norms == 0, 1, norms)
+    owner_of = np.asarray(owners)
+    n = len(matrix)
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+    for start in range(0, n, block_size):
+        block = matrix[start : start + block_size] @ matrix.T
+        block[owner_of[start : start + block_size, None] == owner_of[None, :]] = -np.inf
+        best = np.argpartition(block, n - k, axis=1)[:, n - k :]
+        scores = np.take_along_axis(block, best, axis=1)
+        for row, column in zip(*np.nonzero(scores >= threshold), strict=True):
+            yield start + int(row), int(best[row, column]), float(scores[row, column])
+
+
+def find_near_duplicates(
+    texts: Sequence[TermText],
+    vectors: dict[str, np.ndarray],
+    threshold: float = DEFAULT_THRESHOLD,
+    k: int = DEFAULT_TOP_K,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> list[DuplicatePair]:
+    """Return term pairs scoring at least ``threshold``, most similar first.
+
+    Each term keeps at most ``k`` partner terms (a heap of its best matches),
+    and each unordered pair is reported once.
+    """
+    texts = [item for item in texts if item.text in vectors]
+    if not texts:
+        return []
+    terms = list(dict.fromkeys(item.term for item in texts))
+    owner_of = {term: i for i, term in enumerate(terms)}
+    owners = [owner_of[item.term] for item in texts]
+    matrix = np.stack([vectors[item.text] for item in texts])
+
+    # term -> {partner term -> (similarity, own text, partner text)}
+    best: dict[int, dict[int, tuple[float, int, int]]] = {}
+    for row, column, score in blocked_top_k(matrix, owners, k, threshold, block_size):
+        partners = best.setdefault(owners[row], {})
+        previous = partners.get(owners[column])
+        if previous is None or score > previous[0]:
+            partners[owners[column]] = (score, row, column)
+
+    pairs: dict[tuple[int, int], tuple[float, int, int]] = {}
+    for term, partners in best.items():
+        for partner, (score, row, column) in heapq.nlargest(
+            k, partners.items(), key=lambda item: item[1][0]
+        ):
+            key = (min(term, partner), max(term, partner))
+            if key not in pairs or score > pairs[key][0]:
+                # Keep term_a as the lower-numbered term so output order is stable
+                pairs[key] = (score, row, column) if term < partner else (score, column, row)
+    found = [DuplicatePair(score, texts[a], texts[b]) for score, a, b in pairs.values()]
+    return sorted(found, key=lambda pair: (-pair.similarity, pair.term_a.term, pair.term_b.term))
+
+
+def subtree_labels(index: OntologyIndex, terms: Iterable[str]) -> dict[str, str]:
+    """Label of the top-level branch of each term (the ancestor just below a METPO root).
+
+    The branch follows each term's first METPO parent. Terms not in the
+    ontology (new stubs) are grouped under ``STUB_SUBTREE``.
+    """
+    branches: dict[str, str] = {}
+    for curie in terms:
+        if curie not in index:
+            branches[curie] = STUB_SUBTREE
+            continue
+        path = [curie]
+        while True:
+            parents = [p for p in index.parents(path[-1]) if p.startswith("METPO:")]
+            if not parents or parents[0] in path:
+                break
+            path.append(parents[0])
+        branch = path[-2] if len(path) > 1 else path[-1]
+        branches[curie] = index.label(branch) or branch
+    return branches
+
+
+def subtree_group(branches: dict[str, str], pair: DuplicatePair) -> str:
+    """Group name of a pair: its shared branch, or both branches when they differ."""
+    a, b = branches[pair.term_a.term], branches[pair.term_b.term]
+    return a if a == b else " | ".join(sorted((a, b)))
+
+
+def write_pairs(
+    pairs: Sequence[DuplicatePair],
+    labels: dict[str, str],
+    branches: dict[str, str],
+    output: Path,
+) -> None:
+    """Write pairs as TSV, grouped by subtree and most similar first within a group."""
+    rows = sorted(pairs, key=lambda pair: (subtree_group(branches, pair), -pair.similarity))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter="\t")
+        writer.writerow(COLUMNS)
+        for pair in rows:
+            a, b = pair.term_a, pair.term_b
+            writer.writerow(
+                [
+                    subtree_group(branches, pair),
+                    f"{pair.similarity:.4f}",
+                    a.term,
+                    labels.get(a.term, ""),
+                    a.kind,
+                    a.text,
+                    b.term,
+                    labels.get(b.term, ""),
+                    b.kind,
+                    b.text,
+                ]
+            )
+
+
+@click.command()
+@click.option(
+    "--metpo-json",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_ONTOLOGY_JSON,
+    show_default=True,
+    help="METPO OBO Graphs JSON",
+)
+@click.option(
+    "--stubs",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_STUBS,
+    show_default=True,
+    help="Stubs template whose labels are compared too (skipped if missing)",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_OUTPUT,
+    show_default=True,
+    help="Candidate pairs TSV",
+)
+@click.option(
+    "--threshold",
+    "-t",
+    type=click.FloatRange(-1, 1),
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Report pairs with at least this cosine similarity",
+)
+@click.option(
+    "--top-k",
+    "-k",
+    type=click.IntRange(min=1),
+    default=DEFAULT_TOP_K,
+    show_default=True,
+    help="Most similar partner terms kept per term",
+)
+@click.option(
+    "--block-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BLOCK_SIZE,
+    show_default=True,
+    help="Texts compared against all others per matrix multiply (bounds memory)",
+)
+@click.option(
+    "--model",
+    default=DEFAULT_EMBED_MODEL,
+    show_default=True,
+    help="Embedding model served by the endpoint",
+)
+@click.option(
+    "--embed-url",
+    default=DEFAULT_EMBED_URL,
+    show_default=True,
+    help="Ollama-compatible /api/embeddings endpoint",
+)
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_WORKERS,
+    show_default=True,
+    help="Embedding requests in flight",
+)
+@click.option(
+    "--cache",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_EMBEDDING_CACHE,
+    show_default=True,
+    help="Embedding cache (.npz), reused while the model and endpoint are unchanged",
+)
+@click.option("--no-cache", is_flag=True, help="Neither read nor write the embedding cache")
+@profile_options()
+@telemetry_option()
+def main(
+    metpo_json: Path,
+    stubs: Path,
+    output: Path,
+    threshold: float,
+    top_k: int,
+    block_size: int,
+    model: str,
+    embed_url: str,
+    workers: int,
+    cache: Path,
+    no_cache: bool,
+):
+    """Find near-duplicate METPO terms by embedding similarity of labels, synonyms and definitions.
+
+    Examples:
+
+        uv run find-near-duplicate-terms
+
+        uv run find-near-duplicate-terms -t 0.85 -k 10 --embed-url http://gpu-host:11434/api/embeddings
+    """
+    with stage("load terms"):
+        # Only the repository's metpo.json shares local/metpo_index.bin
+        index = OntologyIndex.load(metpo_json, cache_path=cache_path_for(metpo_json))
+        texts = term_texts(index, stubs if stubs.exists() else None)
+
+    with stage("embed", items=len(texts)):
+        cached = {} if no_cache else load_embedding_cache(cache, model, embed_url)
+        vectors = embed_texts((item.text for item in texts), model, embed_url, workers, cached)
+        if not no_cache and len(vectors) > len(cached):
+            save_embedding_cache(cache, model, embed_url, vectors)
+    embedded = sum(1 for item in texts if item.text in vectors)
+    if not embedded:
+        msg = f"No embeddings from model {model!r} at {embed_url}; is the server running?"
+        raise click.ClickException(msg)
+    if embedded < len(texts):
+        click.echo(f"WARNING: {len(texts) - embedded} texts could not be embedded", err=True)
+
+    with stage("compare", items=embedded):
+        pairs = find_near_duplicates(texts, vectors, threshold, top_k, block_size)
+
+    terms = {item.term for item in texts}
+    labels = {item.term: item.text for item in texts if item.kind == "stub label"}
+    labels.update((curie, index.label(curie)) for curie in terms if curie in index)
+    branches = subtree_labels(index, terms)
+    with stage("write pairs"):
+        write_pairs(pairs, labels, branches, output)
+
+    groups: dict[str, int] = {}
+    for pair in pairs:
+        group = subtree_group(branches, pair)
+        groups[group] = groups.get(group, 0) + 1
+    click.echo(
+        f"Compared {embedded} texts of {len(terms)} terms; "
+        f"{len(pairs)} pairs at similarity >= {threshold} written to {output}"
+    )
+    ranked = sorted(groups.items(), key=lambda item: (-item[1], item[0]))
+    for group, count in ranked[:SUMMARY_GROUPS]:
+        click.echo(f"  {group}: {count}")
+    if len(ranked) > SUMMARY_GROUPS:
+        click.echo(f"  ... and {len(ranked) - SUMMARY_GROUPS} more subtree groups")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,11 +12,13 @@ See https://github.com/berkeleybop/metpo/issues/374
 """
 
 import re
-import subprocess
+from contextlib import nullcontext
 from pathlib import Path
 
 import click
 
+from metpo.utils.git_history import GitTemplateHistory
+
 TEMPLATE_PATHS = [
     "src/templates/metpo_sheet.tsv",
     "src/templates/metpo-properties.tsv",
@@ -48,27 +50,9 @@ def extract_ids_from_entity_extract(path: Path) -> set[str]:
     return ids
 
 
-def extract_ids_from_git_ref(ref: str, template_path: str, *, cwd: Path | None = None) -> set[str]:
-    """Extract METPO numeric IDs from a template at a given git ref."""
-    try:
-        result = subprocess.run(
-            ["git", "show", f"{ref}:{template_path}"],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=cwd,
-        )
-    except subprocess.CalledProcessError:
-        return set()
-    ids = set()
-    for line in result.stdout.splitlines():
-        match = re.match(r"METPO:(\d+)", line)
-        if match:
-            ids.add(match.group(1))
-    return ids
-
-
-def collect_all_ids(repo_root: Path) -> tuple[set[str], set[str]]:
+def collect_all_ids(
+    repo_root: Path, history: GitTemplateHistory | None = None
+) -> tuple[set[str], set[str]]:
     """Collect current and all-ever IDs. Returns (current_ids, all_ids)."""
     current_ids: set[str] = set()
     for tmpl in TEMPLATE_PATHS:
@@ -83,19 +67,12 @@ def collect_all_ids(repo_root: Path) -> tuple[set[str], set[str]]:
             all_ids |= extract_ids_from_entity_extract(f)
 
     # Tagged releases
-    tags_out = subprocess.run(
-        ["git", "tag", "--sort=creatordate"],
-        capture_output=True,
-        text=True,
-        check=True,
-        cwd=repo_root,
-    )
-    for raw_tag in tags_out.stdout.strip().splitlines():
-        tag = raw_tag.strip()
-        if not tag:
-            continue
-        for tmpl in TEMPLATE_PATHS:
-            all_ids |= extract_ids_from_git_ref(tag, tmpl, cwd=repo_root)
+    with nullcontext(history) if history else GitTemplateHistory(repo_root) as git:
+        for tag in git.tags():
+            for tmpl in TEMPLATE_PATHS:
+                snapshot = git.snapshot(tag, tmpl)
+                if snapshot is not None:
+                    all_ids |= snapshot.ids
 
     return current_ids, all_ids
 
@@ -124,51 +101,34 @@ def _labels_from_extracts(extracts_dir: Path) -> dict[str, tuple[str, str, str]]
     return labels
 
 
-def _labels_from_tags(repo_root: Path) -> dict[str, tuple[str, str | None, str]]:
+def _labels_from_tags(
+    repo_root: Path, history: GitTemplateHistory | None = None
+) -> dict[str, tuple[str, str | None, str]]:
     """Collect labels from tagged releases (higher priority — overwrites).
 
     Returns owl_type=None when the template column is not a real owl: type
     (e.g., old templates had parent CURIEs in column 3).
     """
     labels: dict[str, tuple[str, str | None, str]] = {}
-    tags_out = subprocess.run(
-        ["git", "tag", "--sort=creatordate"],
-        capture_output=True,
-        text=True,
-        check=True,
-        cwd=repo_root,
-    )
-    for raw_tag in tags_out.stdout.strip().splitlines():
-        tag = raw_tag.strip()
-        if not tag:
-            continue
-        for tmpl in TEMPLATE_PATHS:
-            try:
-                result = subprocess.run(
-                    ["git", "show", f"{tag}:{tmpl}"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    cwd=repo_root,
-                )
-            except subprocess.CalledProcessError:
-                continue
-            for line in result.stdout.splitlines():
-                parts = line.split("\t")
-                if not parts or not parts[0].strip().startswith("METPO:"):
+    with nullcontext(history) if history else GitTemplateHistory(repo_root) as git:
+        for tag in git.tags():
+            for tmpl in TEMPLATE_PATHS:
+                snapshot = git.snapshot(tag, tmpl)
+                if snapshot is None:
                     continue
-                numeric_id = parts[0].strip().replace("METPO:", "")
-                label = parts[1].strip() if len(parts) > 1 else ""
-                raw_type = parts[2].strip() if len(parts) > 2 else ""
-                # Old templates had parent CURIEs in column 3, not owl:Type.
-                # Return None so collect_labels can preserve the extract's type.
-                owl_type = raw_type if raw_type.startswith("owl:") else None
-                if label:
-                    labels[numeric_id] = (label, owl_type, f"tag:{tag}")
+                for row_id, label, raw_type in snapshot.rows:
+                    numeric_id = row_id.replace("METPO:", "")
+                    # Old templates had parent CURIEs in column 3, not owl:Type.
+                    # Return None so collect_labels can preserve the extract's type.
+                    owl_type = raw_type if raw_type.startswith("owl:") else None
+                    if label:
+                        labels[numeric_id] = (label, owl_type, f"tag:{tag}")
     return labels
 
 
-def collect_labels(repo_root: Path) -> dict[str, tuple[str, str, str]]:
+def collect_labels(
+    repo_root: Path, history: GitTemplateHistory | None = None
+) -> dict[str, tuple[str, str, str]]:
     """Collect last-known label, OWL type, and source for every METPO ID.
 
     Returns dict of numeric_id → (label, owl_type, source).
@@ -177,7 +137,7 @@ def collect_labels(repo_root: Path) -> dict[str, tuple[str, str, str]]:
     extracts_dir = repo_root / "metadata/ontology/historical_submissions/entity_extracts"
     labels = _labels_from_extracts(extracts_dir)
     # Tag labels take priority, but only update type if the tag provides a real owl: type
-    for numeric_id, (label, owl_type, source) in _labels_from_tags(repo_root).items():
+    for numeric_id, (label, owl_type, source) in _labels_from_tags(repo_root, history).items():
         if numeric_id in labels and owl_type is None:
             # Keep the extract's type, just update label and source
             _, existing_type, _ = labels[numeric_id]
@@ -230,14 +190,15 @@ def main(output: str) -> None:
     """Generate ROBOT template for all deprecated METPO IDs."""
     repo_root = Path(__file__).resolve().parent.parent.parent
 
-    click.echo("Collecting IDs from all sources...", err=True)
-    current_ids, all_ids = collect_all_ids(repo_root)
-    burned_ids = all_ids - current_ids
+    with GitTemplateHistory(repo_root) as history:
+        click.echo("Collecting IDs from all sources...", err=True)
+        current_ids, all_ids = collect_all_ids(repo_root, history)
+        burned_ids = all_ids - current_ids
 
-    click.echo(f"Found {len(burned_ids)} burned IDs", err=True)
+        click.echo(f"Found {len(burned_ids)} burned IDs", err=True)
 
-    click.echo("Collecting labels...", err=True)
-    labels = collect_labels(repo_root)
+        click.echo("Collecting labels...", err=True)
+        labels = collect_labels(repo_root, history)
 
     # Build ROBOT template rows
     rows: list[list[str]] = []
@@ -3,18 +3,20 @@
 import csv
 from collections import Counter
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from pymongo import MongoClient
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
 
 def get_sample_values(
-    coll: Collection, field: str, limit: int = 20
+    coll: "Collection", field: str, limit: int = 20
 ) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
     """Get sample values and categorize by comma presence.
 
@@ -45,7 +47,7 @@ def get_sample_values(
     return single_examples, comma_examples
 
 
-def count_field_values(coll: Collection, field: str) -> Counter:
+def count_field_values(coll: "Collection", field: str) -> Counter:
     """Count occurrences of each field value."""
     counter: Counter = Counter()
     cursor = coll.find(
@@ -59,7 +61,7 @@ def count_field_values(coll: Collection, field: str) -> Counter:
     return counter
 
 
-def unpack_comma_separated(coll: Collection, field: str) -> Counter:
+def unpack_comma_separated(coll: "Collection", field: str) -> Counter:
     """Unpack comma-separated values and count individual items."""
     counter: Counter = Counter()
     cursor = coll.find(
@@ -132,6 +134,8 @@ def save_to_tsv(shape_counter: Counter, total: int, output_path: Path) -> None:
 )
 def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None) -> None:
     """Analyze cell_shape field."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
@@ -3,7 +3,6 @@
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
 from rich.table import Table
 
 from metpo.scripts.madin.utils import (
@@ -66,6 +65,8 @@ def display_top_sources(source_counter: dict, total: int, top_n: int = 30) -> No
 )
 def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None) -> None:
     """Analyze isolation_source field."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
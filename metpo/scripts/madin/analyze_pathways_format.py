@@ -3,18 +3,19 @@
 import csv
 from collections import Counter
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import click
-from pymongo import MongoClient
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
 
-def analyze_samples(coll: Collection, field: str, limit: int = 20) -> dict[str, Any]:
+def analyze_samples(coll: "Collection", field: str, limit: int = 20) -> dict[str, Any]:
     """Analyze sample values for comma presence.
 
     Returns dict with single_examples, comma_examples, and counts.
@@ -69,7 +70,7 @@ def print_sample_results(sample_data: dict[str, Any]) -> None:
             console.print(f"      {display}")
 
 
-def get_length_distribution(coll: Collection) -> list[dict]:
+def get_length_distribution(coll: "Collection") -> list[dict]:
     """Get pathway string length distribution."""
     pipeline = [
         {"$match": {"pathways": {"$type": "string", "$ne": "NA"}}},
@@ -86,7 +87,7 @@ def get_length_distribution(coll: Collection) -> list[dict]:
     return list(coll.aggregate(pipeline))
 
 
-def count_individual_pathways(coll: Collection) -> Counter:
+def count_individual_pathways(coll: "Collection") -> Counter:
     """Unpack comma-separated pathways and count individual ones."""
     pathway_counter: Counter = Counter()
     cursor = coll.find({"pathways": {"$exists": True, "$nin": [None, "NA"]}}, {"pathways": 1})
@@ -143,6 +144,8 @@ def save_results(pathway_counter: Counter, output_path: Path) -> None:
 @click.option("--output-tsv", help="Optional: Save results to TSV file", type=click.Path())
 def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None) -> None:
     """Analyze pathways field format."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
@@ -2,18 +2,19 @@
 
 import csv
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import click
-from pymongo import MongoClient
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
 
-def get_ref_id_type_counts(coll: Collection) -> list[dict]:
+def get_ref_id_type_counts(coll: "Collection") -> list[dict]:
     """Get counts of different data types in ref_id field."""
     return list(
         coll.aggregate(
@@ -25,7 +26,7 @@ def get_ref_id_type_counts(coll: Collection) -> list[dict]:
     )
 
 
-def analyze_samples(coll: Collection) -> dict[str, Any]:
+def analyze_samples(coll: "Collection") -> dict[str, Any]:
     """Analyze sample ref_id values for comma presence."""
     samples = list(
         coll.find(
@@ -70,7 +71,7 @@ def print_sample_analysis(sample_data: dict[str, Any]) -> None:
             console.print(f"    {org[:40]}: {ref}")
 
 
-def count_comma_ref_ids(coll: Collection) -> int:
+def count_comma_ref_ids(coll: "Collection") -> int:
     """Count string ref_ids that contain commas."""
     string_ref_ids = list(
         coll.find({"ref_id": {"$type": "string", "$ne": "NA"}}, {"ref_id": 1}).limit(100)
@@ -78,7 +79,7 @@ def count_comma_ref_ids(coll: Collection) -> int:
     return sum(1 for doc in string_ref_ids if "," in doc.get("ref_id", ""))
 
 
-def get_longest_ref_ids(coll: Collection) -> list[dict]:
+def get_longest_ref_ids(coll: "Collection") -> list[dict]:
     """Get the longest ref_id string values."""
     return list(
         coll.aggregate(
@@ -111,7 +112,7 @@ def display_longest_refs_table(longest_refs: list[dict]) -> None:
     console.print(table)
 
 
-def analyze_comma_separated_refs(coll: Collection) -> None:
+def analyze_comma_separated_refs(coll: "Collection") -> None:
     """Analyze comma-separated ref_id values."""
     console.print("\n[bold]Analyzing comma-separated ref_ids:[/bold]")
 
@@ -162,6 +163,8 @@ def save_longest_refs_tsv(longest_refs: list[dict], output_path: Path) -> None:
 )
 def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None) -> None:
     """Analyze ref_id field format."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
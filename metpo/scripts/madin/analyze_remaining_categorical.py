@@ -3,13 +3,15 @@
 import csv
 from collections import Counter
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from pymongo import MongoClient
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
 FIELDS_TO_ANALYZE = [
@@ -22,7 +24,7 @@ FIELDS_TO_ANALYZE = [
 ]
 
 
-def analyze_field(coll: Collection, field_name: str) -> tuple[Counter, int]:
+def analyze_field(coll: "Collection", field_name: str) -> tuple[Counter, int]:
     """Analyze a single categorical field.
 
     Returns:
@@ -45,7 +47,7 @@ def analyze_field(coll: Collection, field_name: str) -> tuple[Counter, int]:
 
 
 def display_field_results(
-    coll: Collection,
+    coll: "Collection",
     field_name: str,
     value_counter: Counter,
     has_field: int,
@@ -136,6 +138,8 @@ def save_results(results: dict, output_dir: Path) -> None:
 @click.option("--output-dir", help="Optional: Directory to save TSV files", type=click.Path())
 def cli(mongo_uri: str, database: str, collection: str, output_dir: str | None) -> None:
     """Analyze remaining categorical fields."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
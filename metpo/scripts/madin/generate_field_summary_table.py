@@ -9,7 +9,6 @@ from collections import Counter
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
 from rich.console import Console
 from rich.table import Table
 
@@ -414,6 +413,8 @@ def print_summary_statistics(results: list[dict]) -> None:
 )
 def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None) -> None:
     """Generate field summary table for madin collection."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     output_path = (
         Path(output_tsv) if output_tsv else get_madin_output_dir() / "madin_field_summary.tsv"
     )
@@ -9,7 +9,6 @@ from collections import Counter
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
 from rich.console import Console
 
 
@@ -174,6 +173,8 @@ def cli(
     output_dir: str | None,
 ) -> None:
     """Generate value distribution reports for categorical and list fields."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     # Set defaults using project paths
     if field_summary is None:
         field_summary_path = get_madin_output_dir() / "madin_field_summary.tsv"
@@ -3,13 +3,14 @@
 import csv
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from pymongo import MongoClient
-from pymongo.collection import Collection
-from pymongo.errors import ConnectionFailure, OperationFailure
 from rich.console import Console
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
@@ -46,7 +47,7 @@ def read_references_csv(ref_path: Path) -> list[dict]:
     raise ValueError(f"Could not read file with any of these encodings: {ENCODINGS}")
 
 
-def insert_documents(coll: Collection, documents: list[dict]) -> int:
+def insert_documents(coll: "Collection", documents: list[dict]) -> int:
     """Insert documents into MongoDB and create index."""
     logger.info("Inserting documents into MongoDB...")
     result = coll.insert_many(documents, ordered=False)
@@ -62,7 +63,7 @@ def insert_documents(coll: Collection, documents: list[dict]) -> int:
     return inserted_count
 
 
-def check_duplicates(coll: Collection) -> None:
+def check_duplicates(coll: "Collection") -> None:
     """Check for duplicate ref_ids in collection."""
     pipeline = [
         {"$group": {"_id": "$ref_id", "count": {"$sum": 1}}},
@@ -78,7 +79,7 @@ def check_duplicates(coll: Collection) -> None:
         console.print("[green]No duplicate ref_ids found[/green]")
 
 
-def show_verification(coll: Collection) -> None:
+def show_verification(coll: "Collection") -> None:
     """Show verification info and sample references."""
     total_docs = coll.count_documents({})
     console.print("\n[bold]Verification:[/bold]")
@@ -112,6 +113,9 @@ def cli(
     mongo_uri: str, database: str, collection: str, references_file: str, drop_existing: bool
 ) -> None:
     """Load madin references from CSV into MongoDB."""
+    from pymongo import MongoClient  # noqa: PLC0415
+    from pymongo.errors import ConnectionFailure, OperationFailure  # noqa: PLC0415
+
     try:
         ref_path = Path(references_file)
         if not ref_path.exists():
@@ -10,8 +10,6 @@ from collections import Counter
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure
 from rich.console import Console
 from rich.table import Table
 
@@ -39,6 +37,8 @@ def analyze_unpacked_substrates(
     Returns:
         Tuple of (substrate_counts, total_docs, docs_with_substrates)
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     logger.info(f"Connecting to MongoDB: {database_name}.{collection_name}")
 
     client = MongoClient(connection_string)
@@ -180,6 +180,8 @@ def cli(
     output_tsv: str | None,
 ) -> None:
     """Analyze individual carbon substrates after unpacking comma-separated lists."""
+    from pymongo.errors import ConnectionFailure, OperationFailure  # noqa: PLC0415
+
     try:
         # Analyze substrates
         substrate_counts, total_docs, docs_with_substrates = analyze_unpacked_substrates(
@@ -8,8 +8,6 @@ import logging
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure
 from rich.console import Console
 from rich.table import Table
 
@@ -43,6 +41,8 @@ def analyze_field_values(
     Returns:
         Tuple of (most_common, rarest) as lists of (value, count) tuples
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     logger.info(f"Connecting to MongoDB: {database_name}.{collection_name}")
 
     client = MongoClient(connection_string)
@@ -181,6 +181,9 @@ def cli(
     output_tsv: str | None,
 ) -> None:
     """Analyze value distribution for a specific field in MongoDB collection."""
+    from pymongo import MongoClient  # noqa: PLC0415
+    from pymongo.errors import ConnectionFailure, OperationFailure  # noqa: PLC0415
+
     try:
         # Get total doc count
         client = MongoClient(mongo_uri)
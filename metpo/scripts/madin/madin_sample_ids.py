@@ -4,7 +4,6 @@ import csv
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
 from rich.console import Console
 
 console = Console()
@@ -44,6 +43,8 @@ def cli(
     output_tsv: str | None,
 ) -> None:
     """Sample tax_id and ref_id values to understand their format."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
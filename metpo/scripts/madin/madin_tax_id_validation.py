@@ -1,19 +1,26 @@
 """Validate tax_id consistency with NCBI Taxonomy."""
 
 import csv
+from collections import Counter
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import click
-from pymongo import MongoClient
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+from metpo.scripts.madin.verify_ncbi_taxids import compare_names
+from metpo.utils.ncbi_taxonomy import TaxonomyIndex
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
+MATCH_TYPES = {"✓": "exact", "~": "partial", "✗": "no"}
+
 
-def get_tax_id_type_counts(coll: Collection) -> list[dict]:
+def get_tax_id_type_counts(coll: "Collection") -> list[dict]:
     """Get counts of different data types in tax_id field."""
     return list(
         coll.aggregate(
@@ -25,7 +32,7 @@ def get_tax_id_type_counts(coll: Collection) -> list[dict]:
     )
 
 
-def get_anomaly_counts(coll: Collection) -> dict[str, int]:
+def get_anomaly_counts(coll: "Collection") -> dict[str, int]:
     """Get counts of various tax_id anomalies."""
     return {
         "string_tax_ids": coll.count_documents({"tax_id": {"$type": "string"}}),
@@ -44,7 +51,7 @@ def print_anomaly_counts(counts: dict[str, int]) -> None:
     console.print(f"  Tax_id > 10,000,000: {counts['large_tax_ids']:,}")
 
 
-def compare_tax_ids(coll: Collection) -> tuple[int, int, list[dict]]:
+def compare_tax_ids(coll: "Collection") -> tuple[int, int, list[dict]]:
     """Compare tax_id and species_tax_id fields."""
     both_fields = list(
         coll.find(
@@ -94,7 +101,7 @@ def display_different_examples(different_examples: list[dict]) -> None:
     console.print(table)
 
 
-def get_tax_id_range(coll: Collection) -> tuple[Any, Any]:
+def get_tax_id_range(coll: "Collection") -> tuple[Any, Any]:
     """Get min and max tax_id values."""
     min_tax = list(
         coll.find({"tax_id": {"$type": "number"}}, {"tax_id": 1}).sort("tax_id", 1).limit(1)
@@ -108,7 +115,7 @@ def get_tax_id_range(coll: Collection) -> tuple[Any, Any]:
     return min_val, max_val
 
 
-def print_string_tax_id_samples(coll: Collection) -> None:
+def print_string_tax_id_samples(coll: "Collection") -> None:
     """Print sample string tax_id values."""
     console.print("\n[bold]Checking for non-numeric tax_id values:[/bold]")
 
@@ -124,6 +131,124 @@ def print_string_tax_id_samples(coll: Collection) -> None:
         console.print("  No string tax_id values found")
 
 
+def validate_all_against_index(
+    coll: "Collection", index: TaxonomyIndex, batch_size: int = 10000
+) -> tuple[Counter, Counter, list[dict[str, Any]]]:
+    """Validate every numeric tax_id in the collection against a local taxonomy index.
+
+    Args:
+        coll: MongoDB collection
+        index: Offline NCBI Taxonomy index
+        batch_size: Cursor batch size
+
+    Returns:
+        Tuple of (status_counts, rank_counts, issues) where status_counts tallies
+        valid/merged/missing ids and exact/partial/no/unknown name matches
+        (unknown when the record or NCBI has no name), and issues lists every
+        record whose tax_id is not current or whose name is not an exact match.
+    """
+    status: Counter = Counter()
+    ranks: Counter = Counter()
+    issues: list[dict[str, Any]] = []
+
+    cursor = coll.find(
+        {"tax_id": {"$type": "number"}}, {"_id": 0, "tax_id": 1, "org_name": 1}
+    ).batch_size(batch_size)
+    for doc in cursor:
+        tax_id = int(doc["tax_id"])
+        org_name = str(doc.get("org_name") or "")
+        status["checked"] += 1
+
+        current_id = tax_id
+        if tax_id in index:
+            status["valid"] += 1
+            id_status = "valid"
+        else:
+            merged = index.merged_into(tax_id)
+            if merged is not None:
+                status["merged"] += 1
+                id_status = "merged"
+                current_id = merged
+            else:
+                status["not_found"] += 1
+                issues.append(
+                    {
+                        "tax_id": tax_id,
+                        "org_name": org_name,
+                        "status": "not_found",
+                        "current_tax_id": "",
+                        "ncbi_name": "",
+                        "ncbi_rank": "",
+                        "match_type": "unknown",
+                    }
+                )
+                continue
+
+        ncbi_name, rank = index.lookup(current_id)
+        ranks[rank or "unknown"] += 1
+        if org_name and ncbi_name:
+            symbol, _ = compare_names(org_name, ncbi_name)
+            match_type = MATCH_TYPES[symbol]
+        else:
+            match_type = "unknown"  # nothing to compare, so not a match of any kind
+        status[f"name_{match_type}"] += 1
+
+        if id_status != "valid" or match_type != "exact":
+            issues.append(
+                {
+                    "tax_id": tax_id,
+                    "org_name": org_name,
+                    "status": id_status,
+                    "current_tax_id": current_id,
+                    "ncbi_name": ncbi_name or "",
+                    "ncbi_rank": rank or "",
+                    "match_type": match_type,
+                }
+            )
+
+    return status, ranks, issues
+
+
+def print_index_validation(status: Counter, ranks: Counter) -> None:
+    """Print the offline NCBI validation summary."""
+    checked = status["checked"]
+    console.print("\n[bold]Offline NCBI Taxonomy validation (all tax_ids):[/bold]")
+    console.print(f"  Checked: {checked:,}")
+    for key, label in (
+        ("valid", "Current NCBI tax_ids"),
+        ("merged", "Merged into another tax_id"),
+        ("not_found", "Not found in NCBI"),
+        ("name_exact", "Exact name matches"),
+        ("name_partial", "Partial name matches"),
+        ("name_no", "Name mismatches"),
+        ("name_unknown", "Missing names"),
+    ):
+        pct = status[key] / checked * 100 if checked else 0
+        console.print(f"  {label}: {status[key]:,} ({pct:.2f}%)")
+
+    console.print("\n  Ranks of validated tax_ids:")
+    for rank, count in ranks.most_common():
+        console.print(f"    {rank}: {count:,}")
+
+
+def save_issues_tsv(issues: list[dict[str, Any]], output_path: Path) -> None:
+    """Save per-record offline validation issues to a TSV file."""
+    columns = [
+        "tax_id",
+        "org_name",
+        "status",
+        "current_tax_id",
+        "ncbi_name",
+        "ncbi_rank",
+        "match_type",
+    ]
+    with output_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, delimiter="\t")
+        writer.writeheader()
+        writer.writerows(issues)
+    console.print(f"\n[green]{len(issues):,} validation issues saved to {output_path}[/green]")
+
+
 def save_analysis_tsv(
     output_path: Path,
     total_docs: int,
@@ -169,8 +294,30 @@ def save_analysis_tsv(
 @click.option("--database", default="madin", help="Database name")
 @click.option("--collection", default="madin", help="Collection name")
 @click.option("--output-tsv", type=click.Path(), help="Optional: Save analysis summary to TSV file")
-def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None) -> None:
+@click.option(
+    "--taxonomy-index",
+    type=click.Path(exists=True, file_okay=False),
+    help="Optional: Offline NCBI Taxonomy index (build-taxonomy-index) to validate every tax_id",
+)
+@click.option(
+    "--issues-tsv",
+    type=click.Path(),
+    help="Optional: Save per-record offline validation issues to TSV (needs --taxonomy-index)",
+)
+def cli(
+    mongo_uri: str,
+    database: str,
+    collection: str,
+    output_tsv: str | None,
+    taxonomy_index: str | None,
+    issues_tsv: str | None,
+) -> None:
     """Validate tax_id and species_tax_id field formats and consistency."""
+    if issues_tsv and not taxonomy_index:
+        raise click.UsageError("--issues-tsv requires --taxonomy-index")
+
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
@@ -214,6 +361,13 @@ def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None)
 
     print_string_tax_id_samples(coll)
 
+    if taxonomy_index:
+        with TaxonomyIndex(taxonomy_index) as index:
+            status, ranks, issues = validate_all_against_index(coll, index)
+        print_index_validation(status, ranks)
+        if issues_tsv:
+            save_issues_tsv(issues, Path(issues_tsv))
+
     if output_tsv:
         save_analysis_tsv(
             Path(output_tsv),
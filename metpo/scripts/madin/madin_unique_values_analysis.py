@@ -9,8 +9,6 @@ import logging
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure
 from rich.console import Console
 from rich.table import Table
 
@@ -42,6 +40,8 @@ def analyze_unique_values(
         ConnectionFailure: If cannot connect to MongoDB
         OperationFailure: If database operation fails
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     logger.info(f"Connecting to MongoDB: {database_name}.{collection_name}")
 
     client = MongoClient(connection_string)
@@ -173,6 +173,9 @@ def cli(
     output_tsv: str | None,
 ) -> None:
     """Analyze unique values per field in the madin MongoDB collection."""
+    from pymongo import MongoClient  # noqa: PLC0415
+    from pymongo.errors import ConnectionFailure, OperationFailure  # noqa: PLC0415
+
     try:
         # Connect and get total count first
         client = MongoClient(mongo_uri)
@@ -2,17 +2,21 @@
 
 import csv
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from pymongo import MongoClient
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
 
-def lookup_specific_reference(ref_coll: Collection, madin_coll: Collection, ref_id: int) -> None:
+def lookup_specific_reference(
+    ref_coll: "Collection", madin_coll: "Collection", ref_id: int
+) -> None:
     """Look up and display a specific reference."""
     refs = list(ref_coll.find({"ref_id": ref_id}))
 
@@ -37,7 +41,7 @@ def lookup_specific_reference(ref_coll: Collection, madin_coll: Collection, ref_
         console.print("[yellow]No organisms found citing this reference[/yellow]")
 
 
-def get_duplicate_ref_ids(ref_coll: Collection) -> list[dict]:
+def get_duplicate_ref_ids(ref_coll: "Collection") -> list[dict]:
     """Find duplicate ref_ids in the references collection."""
     pipeline = [
         {"$group": {"_id": "$ref_id", "count": {"$sum": 1}}},
@@ -46,7 +50,7 @@ def get_duplicate_ref_ids(ref_coll: Collection) -> list[dict]:
     return list(ref_coll.aggregate(pipeline))
 
 
-def get_top_cited_refs(madin_coll: Collection) -> list[dict]:
+def get_top_cited_refs(madin_coll: "Collection") -> list[dict]:
     """Get the most commonly cited references."""
     pipeline = [
         {"$match": {"ref_id": {"$exists": True, "$nin": [None, "NA"]}}},
@@ -57,7 +61,7 @@ def get_top_cited_refs(madin_coll: Collection) -> list[dict]:
     return list(madin_coll.aggregate(pipeline))
 
 
-def display_top_refs_table(top_refs: list[dict], ref_coll: Collection) -> None:
+def display_top_refs_table(top_refs: list[dict], ref_coll: "Collection") -> None:
     """Display table of top cited references."""
     table = Table()
     table.add_column("Rank", style="cyan")
@@ -80,7 +84,7 @@ def display_top_refs_table(top_refs: list[dict], ref_coll: Collection) -> None:
     console.print(table)
 
 
-def save_top_refs_tsv(top_refs: list[dict], ref_coll: Collection, output_path: Path) -> None:
+def save_top_refs_tsv(top_refs: list[dict], ref_coll: "Collection", output_path: Path) -> None:
     """Save top cited references to TSV file."""
     with output_path.open("w", newline="") as f:
         writer = csv.writer(f, delimiter="\t")
@@ -95,7 +99,7 @@ def save_top_refs_tsv(top_refs: list[dict], ref_coll: Collection, output_path: P
 
 
 def show_collection_statistics(
-    ref_coll: Collection, madin_coll: Collection, output_tsv: str | None
+    ref_coll: "Collection", madin_coll: "Collection", output_tsv: str | None
 ) -> None:
     """Show statistics about the reference collection."""
     total_refs = ref_coll.count_documents({})
@@ -129,6 +133,8 @@ def show_collection_statistics(
 @click.option("--output-tsv", type=click.Path(), help="Optional: Save results to TSV file")
 def cli(mongo_uri: str, database: str, ref_id: int | None, output_tsv: str | None) -> None:
     """Query madin references from MongoDB."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     ref_coll = db["references"]
@@ -3,17 +3,19 @@
 import csv
 from collections import Counter
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
 
 def get_sample_values(
-    coll: Collection,
+    coll: "Collection",
     field: str,
     limit: int = 20,
 ) -> tuple[list[tuple[str, Any]], list[tuple[str, Any]]]:
@@ -51,7 +53,7 @@ def get_sample_values(
     return single_examples, comma_examples
 
 
-def count_field_values(coll: Collection, field: str) -> Counter:
+def count_field_values(coll: "Collection", field: str) -> Counter:
     """Count occurrences of each field value.
 
     Args:
@@ -73,7 +75,7 @@ def count_field_values(coll: Collection, field: str) -> Counter:
     return counter
 
 
-def unpack_comma_separated(coll: Collection, field: str) -> Counter:
+def unpack_comma_separated(coll: "Collection", field: str) -> Counter:
     """Unpack comma-separated values and count individual items.
 
     Args:
@@ -151,7 +153,7 @@ def save_counter_to_tsv(
 
 
 def print_field_stats(
-    coll: Collection,
+    coll: "Collection",
     field: str,
     total_docs: int,
 ) -> int:
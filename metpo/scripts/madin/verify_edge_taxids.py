@@ -6,7 +6,6 @@ from pathlib import Path
 
 import click
 import requests
-from pymongo import MongoClient
 from rich.console import Console
 from rich.table import Table
 
@@ -71,6 +70,8 @@ def check_ncbi_taxid(tax_id: int) -> tuple[bool, str, str]:
 )
 def cli(mongo_uri: str, database: str, collection: str, output_tsv: str | None) -> None:
     """Verify edge case tax_ids."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
@@ -3,15 +3,16 @@
 import csv
 import time
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import click
 import requests
-from pymongo import MongoClient
-from pymongo.collection import Collection
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
 console = Console()
 
 
@@ -43,7 +44,7 @@ def compare_names(org_name: str, ncbi_name: str) -> tuple[str, float]:
     return "✗", 0.0
 
 
-def get_random_samples(coll: Collection, sample_size: int) -> list[dict]:
+def get_random_samples(coll: "Collection", sample_size: int) -> list[dict]:
     """Get random sample of documents with tax_ids."""
     pipeline = [
         {"$match": {"tax_id": {"$exists": True, "$ne": None}}},
@@ -158,6 +159,8 @@ def cli(
     mongo_uri: str, database: str, collection: str, sample_size: int, output_tsv: str | None
 ) -> None:
     """Verify random sample of tax_ids against NCBI Taxonomy API."""
+    from pymongo import MongoClient  # noqa: PLC0415
+
     client = MongoClient(mongo_uri)
     db = client[database]
     coll = db[collection]
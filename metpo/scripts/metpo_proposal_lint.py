@@ -25,6 +25,10 @@ a later run with ``--baseline PATH`` fails only on findings BEYOND that floor, s
 large existing-debt audit can gate new additions without first paying down the debt.
 Regenerate the baseline as debt is fixed -- the count can only go down.
 
+Changed-only: for a sheet synced by ``sync-sheets``, ``--changed-only`` skips the lint
+when the sheet's current content already passed in the same mode. A sheet with errors
+stays pending until it passes.
+
 NOTE: ID-RANGE encodes the METPO convention (classes METPO:1xxxxxx, properties
 METPO:2xxxxxx). Term IRIs are https://w3id.org/metpo/<7-digit id> (no obolibrary
 PURLs); the w3id scheme is settled (#458). Remaining ODK-config/IRI cleanup
@@ -41,6 +45,8 @@ from pathlib import Path
 
 import click
 
+from metpo.utils.sheet_sync import changed_sheets, mark_checked, synced_sheet_name
+
 # An OBO/ontology *class* CURIE in definition_source means "mapping", not "source".
 ONTOLOGY_PREFIXES = {
     "GO",
@@ -528,8 +534,28 @@ def validate_curies(path):
     is_flag=True,
     help="Write the current findings to --baseline as the new accepted floor, then exit 0.",
 )
-def main(template, known, mode, do_validate_curies, as_json, warn_only, baseline, write_baseline):
+@click.option(
+    "--changed-only",
+    is_flag=True,
+    help="For a sheet synced by sync-sheets, skip it if this content already passed in this mode.",
+)
+def main(
+    template,
+    known,
+    mode,
+    do_validate_curies,
+    as_json,
+    warn_only,
+    baseline,
+    write_baseline,
+    changed_only,
+):
     """Lint a METPO ROBOT-template TSV (proposal review or released-content audit)."""
+    consumer = f"metpo-proposal-lint:{mode}"
+    sheet = synced_sheet_name(template) if changed_only else None
+    if sheet and sheet not in changed_sheets(consumer, Path(template).parent):
+        click.echo(f"# metpo-proposal-lint: {template} unchanged since it last passed; skipping")
+        raise SystemExit(0)
     external = bool(known)
     kl, ki = load_known(known) if external else (set(), set())
     findings, n = lint(template, kl, ki, mode, external)
@@ -579,6 +605,8 @@ def main(template, known, mode, do_validate_curies, as_json, warn_only, baseline
             click.echo(f"  [{f.sev:5}] {f.code:13} {f.rid:14} {f.msg}")
         tail = f"  ({baselined} baselined/accepted, not scored)" if baseline_set else ""
         click.echo(f"\n  {len(errs)} error(s), {len(warns)} warning(s){tail}")
+    if sheet and not errs:
+        mark_checked(consumer, [sheet], Path(template).parent)
     raise SystemExit(1 if errs and not warn_only else 0)
 
 
@@ -12,8 +12,6 @@ from collections import defaultdict
 from pathlib import Path
 
 import click
-import matplotlib.pyplot as plt
-import numpy as np
 
 
 def read_best_matches(sssom_path: Path) -> dict[str, dict]:
@@ -84,6 +82,9 @@ def main(mappings: Path, output: Path, stats_output: Path):
     """
     Plot distribution of best embedding similarity scores for METPO terms.
     """
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+    import numpy as np  # noqa: PLC0415
+
     click.echo(f"Reading SSSOM mappings from {mappings}...")
     best_matches = read_best_matches(mappings)
 
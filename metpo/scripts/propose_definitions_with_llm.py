@@ -21,7 +21,18 @@ from pathlib import Path
 
 import click
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from metpo.cli_common import telemetry_option
+from metpo.utils.chat_completions import (
+    DEFAULT_BASE_URL,
+    DEFAULT_CACHE,
+    DEFAULT_RETRIES,
+    DEFAULT_WORKERS,
+    ChatClient,
+    CompletionResult,
+    ResponseCache,
+    complete_many,
+)
 
 # Load environment
 load_dotenv()
@@ -176,6 +187,51 @@ Respond with ONLY the definition text, nothing else.
     return prompt
 
 
+def result_row(
+    metpo_id: str,
+    term: dict,
+    matched: dict | None,
+    candidates: list[dict],
+    answer: CompletionResult,
+    model: str,
+) -> dict:
+    """Output row for one term's LLM answer (or error)."""
+    current_def = term["current_definition"]
+    row = {
+        "metpo_id": metpo_id,
+        "metpo_label": term["label"],
+        "parent_classes": "|".join(term["parents"]),
+        "current_definition": current_def,
+        "proposed_definition": f"[ERROR: {answer.error}]",
+        "has_current": "yes" if current_def else "no",
+        "sources_consulted": "",
+        "num_sources": 0,
+        "model_used": model,
+    }
+    if answer.error:
+        return row
+
+    proposed_def = answer.content.strip()
+
+    # Remove quotes if LLM added them
+    if proposed_def.startswith('"') and proposed_def.endswith('"'):
+        proposed_def = proposed_def[1:-1]
+
+    # Track sources
+    sources_used = []
+    if matched:
+        sources_used.append(f"{matched.get('source_ontology')}:{matched.get('source_iri', '')}")
+    for cand in candidates[:3]:
+        src = f"{cand.get('source_ontology')}:{cand.get('source_iri', '')}"
+        if src not in sources_used:
+            sources_used.append(src)
+
+    row["proposed_definition"] = proposed_def
+    row["sources_consulted"] = "; ".join(sources_used)
+    row["num_sources"] = len(sources_used)
+    return row
+
+
 @click.command()
 @click.option(
     "--metpo-terms",
@@ -206,16 +262,53 @@ Respond with ONLY the definition text, nothing else.
     help="Output TSV with proposed definitions",
 )
 @click.option("--model", "-m", default="gpt-4", help="OpenAI model to use")
+@click.option(
+    "--base-url",
+    envvar="OPENAI_BASE_URL",
+    default=DEFAULT_BASE_URL,
+    show_default=True,
+    help="OpenAI-compatible API root (e.g. a local server or the benchmark stand-in)",
+)
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_WORKERS,
+    show_default=True,
+    help="Maximum requests in flight",
+)
+@click.option(
+    "--cache",
+    "cache_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_CACHE,
+    show_default=True,
+    help="JSON-lines cache of responses keyed by model and prompt hash",
+)
+@click.option("--no-cache", is_flag=True, help="Neither read nor write the response cache")
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=DEFAULT_RETRIES,
+    show_default=True,
+    help="Retries after rate-limit (429) and server errors, with exponential backoff",
+)
 @click.option(
     "--limit", type=int, default=None, help="Limit number of terms to process (for testing)"
 )
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed progress")
+@telemetry_option()
 def main(
     metpo_terms: Path,
     best_definitions: Path,
     all_candidates: Path,
     output: Path,
     model: str,
+    base_url: str,
+    workers: int,
+    cache_path: Path,
+    no_cache: bool,
+    retries: int,
     limit: int | None,
     verbose: bool,
 ):
@@ -223,16 +316,19 @@ def main(
     Use LLM to propose definitions for all METPO classes.
 
     Follows Seppälä-Ruttenberg-Smith guidelines and METPO hierarchy.
+    Requests run concurrently and answers are cached, so re-running after a
+    crash or a prompt change only sends the prompts without a cached answer.
     """
 
-    # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    # Check for API key (local OpenAI-compatible servers do not need one)
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    if not api_key and base_url == DEFAULT_BASE_URL:
         click.echo("Error: OPENAI_API_KEY not found in environment", err=True)
         click.echo("Please set it in your .env file", err=True)
         return 1
 
-    client = OpenAI(api_key=api_key)
+    client = ChatClient(base_url, api_key, model, retries=retries)
+    cache = None if no_cache else ResponseCache(cache_path)
 
     # Load data
     click.echo(f"Loading METPO terms from {metpo_terms}...")
@@ -247,101 +343,67 @@ def main(
     all_cands = load_all_candidates(all_candidates)
     click.echo(f"Loaded candidates for {len(all_cands)} terms")
 
-    # Process each term
-    results = []
-    processed = 0
+    metpo_ids = sorted(metpo_data.keys())[:limit] if limit else sorted(metpo_data.keys())
+    prompts = {}
+    for metpo_id in metpo_ids:
+        term = metpo_data[metpo_id]
+        prompts[metpo_id] = [
+            {"role": "system", "content": DEFINITION_GUIDELINES},
+            {
+                "role": "user",
+                "content": build_prompt(
+                    metpo_id,
+                    term["label"],
+                    term["parents"],
+                    term["current_definition"],
+                    matched_defs.get(metpo_id),
+                    all_cands.get(metpo_id, []),
+                ),
+            },
+        ]
 
-    click.echo(f"\nProcessing terms with {model}...")
+    click.echo(f"\nProcessing {len(metpo_ids)} terms with {model} ({workers} in flight)...")
+    if cache is not None:
+        click.echo(f"Response cache: {cache_path} ({len(cache)} entries)")
     click.echo("(This may take a few minutes)\n")
 
-    for metpo_id in sorted(metpo_data.keys()):
-        if limit and processed >= limit:
-            break
-
-        term = metpo_data[metpo_id]
-        label = term["label"]
-        parents = term["parents"]
+    # Call LLM
+    answers = {}
+    cached = 0
+    for answer in complete_many(
+        client,
+        prompts.items(),
+        cache=cache,
+        workers=workers,
+        temperature=0.3,  # Lower temperature for more consistent output
+        max_tokens=300,
+    ):
+        answers[answer.id] = answer
+        cached += answer.cached
+        term = metpo_data[answer.id]
         current_def = term["current_definition"]
-
-        matched = matched_defs.get(metpo_id)
-        candidates = all_cands.get(metpo_id, [])
-
-        # Build prompt
-        prompt = build_prompt(metpo_id, label, parents, current_def, matched, candidates)
-
-        if verbose:
-            click.echo(f"\n{metpo_id} ({label})")
-            click.echo(f"  Parents: {', '.join(parents) if parents else '[ROOT]'}")
-
-        # Call LLM
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": DEFINITION_GUIDELINES},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,  # Lower temperature for more consistent output
-                max_tokens=300,
-            )
-
-            proposed_def = response.choices[0].message.content.strip()
-
-            # Remove quotes if LLM added them
-            if proposed_def.startswith('"') and proposed_def.endswith('"'):
-                proposed_def = proposed_def[1:-1]
-
-            if verbose:
-                click.echo(f"  Current: {current_def[:60] if current_def else '[NONE]'}...")
-                click.echo(f"  Proposed: {proposed_def[:80]}...")
-            else:
-                status = "✓" if current_def else "+"
-                click.echo(f"{status} {metpo_id:20s} {label:40s}")
-
-            # Track sources
-            sources_used = []
-            if matched:
-                sources_used.append(
-                    f"{matched.get('source_ontology')}:{matched.get('source_iri', '')}"
-                )
-            if candidates:
-                for cand in candidates[:3]:
-                    src = f"{cand.get('source_ontology')}:{cand.get('source_iri', '')}"
-                    if src not in sources_used:
-                        sources_used.append(src)
-
-            results.append(
-                {
-                    "metpo_id": metpo_id,
-                    "metpo_label": label,
-                    "parent_classes": "|".join(parents),
-                    "current_definition": current_def,
-                    "proposed_definition": proposed_def,
-                    "has_current": "yes" if current_def else "no",
-                    "sources_consulted": "; ".join(sources_used),
-                    "num_sources": len(sources_used),
-                    "model_used": model,
-                }
-            )
-
-            processed += 1
-
-        except Exception as e:
-            click.echo(f"✗ {metpo_id:20s} ERROR: {e}", err=True)
-            results.append(
-                {
-                    "metpo_id": metpo_id,
-                    "metpo_label": label,
-                    "parent_classes": "|".join(parents),
-                    "current_definition": current_def,
-                    "proposed_definition": f"[ERROR: {e}]",
-                    "has_current": "yes" if current_def else "no",
-                    "sources_consulted": "",
-                    "num_sources": 0,
-                    "model_used": model,
-                }
-            )
-            processed += 1
+        if answer.error:
+            click.echo(f"✗ {answer.id:20s} ERROR: {answer.error}", err=True)
+        elif verbose:
+            click.echo(f"\n{answer.id} ({term['label']})")
+            click.echo(f"  Parents: {', '.join(term['parents']) if term['parents'] else '[ROOT]'}")
+            click.echo(f"  Current: {current_def[:60] if current_def else '[NONE]'}...")
+            click.echo(f"  Proposed: {answer.content.strip()[:80]}...")
+        else:
+            status = "✓" if current_def else "+"
+            click.echo(f"{status} {answer.id:20s} {term['label']:40s}")
+
+    results = [
+        result_row(
+            metpo_id,
+            metpo_data[metpo_id],
+            matched_defs.get(metpo_id),
+            all_cands.get(metpo_id, []),
+            answers[metpo_id],
+            model,
+        )
+        for metpo_id in metpo_ids
+    ]
 
     # Write output
     click.echo(f"\nWriting proposed definitions to {output}...")
@@ -381,7 +443,9 @@ def main(
     )
     click.echo(f"Based on parent class only: {len(results) - with_sources}")
 
-    click.echo(f"\nModel used: {model}")
+    failed = sum(1 for r in results if r["proposed_definition"].startswith("[ERROR"))
+    click.echo(f"\nAnswered from cache: {cached}; failed: {failed} (re-run to retry)")
+    click.echo(f"Model used: {model}")
     click.echo(f"Output file: {output}")
     return None
 
@@ -4,25 +4,45 @@ Quality Control script for METPO Google Sheets templates.
 Checks for:
 - ID clashes within and across sheets
 - Label clashes within and across sheets
+- Fuzzy (typo-level) clashes between labels and synonyms of different terms
 - Parent classes/properties referenced but not defined
 - Self-referential parent definitions
 - Assay outcome pairing (synonym +/- pairs must be consistent)
 - Structural issues (missing IDs, labels, malformed IDs)
+
+Checks are implemented as rules (subclasses of QCRule registered with
+@register_rule). Each sheet is read exactly once: while its rows stream in,
+every rule's per-row callback runs against them. Cross-sheet callbacks then run
+once against a shared QCIndex built from all loaded sheets, so adding a rule
+does not add another pass over the data. Sheets can be scanned in parallel.
+
+QC can be limited to some sheets (e.g. those changed since the last sync). The
+other sheets are still loaded, so cross-sheet rules see every definition, but
+only issues involving a checked sheet are reported.
 """
 
 import csv
 import re
 import sys
-import urllib.request
 from collections import defaultdict
+from collections.abc import Collection, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from typing import NamedTuple
 
 import click
 
-from metpo.sheets_config import SHEET_GIDS, SPREADSHEET_ID
+from metpo.sheets_config import SHEET_GIDS, all_export_urls
+from metpo.utils.sheet_sync import DEFAULT_SHEETS_DIR, changed_sheets, mark_checked, sync_sheets
 
-# Map from download filename stems to sheets_config keys
-_SHEET_NAMES = {"metpo_sheet": "classes", "metpo-properties": "properties"}
+ENTITY_TYPES = ("owl:Class", "owl:ObjectProperty", "owl:DataProperty", "owl:AnnotationProperty")
+STRUCTURAL_TYPES = ("owl:Class", "owl:ObjectProperty", "owl:DataProperty")
+FUZZY_CLASH_THRESHOLD = 0.8
+# A word that is another word with one of these prefixes is its opposite, not a typo
+NEGATING_PREFIXES = ("non", "an", "un", "in", "a")
+SYNONYM_TUPLE = re.compile(r"Synonym\s+'([^']+)'")
+SYNC_CONSUMER = "qc-metpo-sheets"  # name under which --changed-only records checked sheets
 
 
 class QCIssue:
@@ -39,12 +59,24 @@ class QCIssue:
         return f"{self.severity}: {self.category}{loc}: {self.message}"
 
 
+class SheetRow(NamedTuple):
+    """A non-empty data row of a template sheet with its key cells stripped."""
+
+    row_num: int
+    cells: list[str]
+    id: str
+    label: str
+    type: str
+    comment: str
+
+
 class SheetData:
     """Represents parsed data from a METPO template sheet."""
 
     def __init__(self, filename: str):
         self.filename = filename
         self.rows = []
+        self.records: list[SheetRow] = []  # non-empty data rows, in sheet order
         self.ids = {}  # id -> (row_num, label, type, is_stub)
         self.labels = defaultdict(list)  # label -> [(row_num, id, type, is_stub)]
         self.parents = []  # [(row_num, id, parent_ref, type)]
@@ -52,85 +84,153 @@ class SheetData:
 
     def load(self):
         """Load TSV file and extract key information."""
+        for _record in self.iter_load():
+            pass
+
+    def iter_load(self) -> Iterable[SheetRow]:
+        """Load the TSV file, yielding each data row as it is indexed."""
         with Path(self.filename).open(encoding="utf-8") as f:
-            reader = csv.reader(f, delimiter="\t")
-            for row_num, row in enumerate(reader, start=1):
-                self.rows.append(row)
-
-                # Skip header rows
-                if row_num <= 2:
-                    continue
-
-                if len(row) < 3:
-                    continue
-
-                row_id = row[0].strip() if row[0] else ""
-                label = row[1].strip() if len(row) > 1 and row[1] else ""
-                row_type = row[2].strip() if len(row) > 2 and row[2] else ""
-                comment = row[3].strip() if len(row) > 3 and row[3] else ""
-
-                # Skip empty rows
-                if not row_id and not label:
-                    continue
-
-                # Check if this is a stub definition
-                is_stub = "stub" in comment.lower()
-                if is_stub:
-                    self.stubs.append((row_num, row_id, label))
-
-                # Store ID mapping
-                if row_id:
-                    self.ids[row_id] = (row_num, label, row_type, is_stub)
-
-                # Store label mapping
-                if label and row_type in [
-                    "owl:Class",
-                    "owl:ObjectProperty",
-                    "owl:DataProperty",
-                    "owl:AnnotationProperty",
-                ]:
-                    self.labels[label].append((row_num, row_id, row_type, is_stub))
-
-                # Extract parent reference (column 3 for classes, column 6 for properties)
-                parent_ref = ""
-                if row_type == "owl:Class" and len(row) > 3:
-                    parent_ref = row[3].strip()
-                elif row_type in ["owl:ObjectProperty", "owl:DataProperty"] and len(row) > 6:
-                    parent_ref = row[6].strip()
-
-                if parent_ref and "stub" not in parent_ref.lower():  # Don't track stub as parent
-                    self.parents.append((row_num, row_id, parent_ref, row_type))
-
-
-def download_sheet(gid: str, output_file: str):
-    """Download TSV from Google Sheets."""
-    url = (
-        f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?exportFormat=tsv&gid={gid}"
-    )
-    click.echo(f"Downloading {output_file} from Google Sheets...")
-    urllib.request.urlretrieve(url, output_file)
-    click.echo(f"  ✓ Downloaded to {output_file}")
+            for row_num, row in enumerate(csv.reader(f, delimiter="\t"), start=1):
+                record = self.add_row(row_num, row)
+                if record is not None:
+                    yield record
 
+    def add_row(self, row_num: int, row: list[str]) -> SheetRow | None:
+        """Index one raw row; return it as a SheetRow unless it is a header or empty."""
+        self.rows.append(row)
 
-def check_id_clashes(sheets: list[SheetData]) -> list[QCIssue]:
-    """Check for duplicate IDs within and across sheets."""
-    issues = []
-    all_ids = defaultdict(list)  # id -> [(sheet_name, row_num, label, type, is_stub)]
+        # Skip header rows
+        if row_num <= 2:
+            return None
 
-    for sheet in sheets:
-        for id_val, (row_num, label, row_type, is_stub) in sheet.ids.items():
-            all_ids[id_val].append((sheet.filename, row_num, label, row_type, is_stub))
-
-    # Find duplicates
-    for id_val, occurrences in all_ids.items():
-        if len(occurrences) > 1:
-            # Check if this is a legitimate stub + real definition pattern
-            stub_count = sum(1 for _, _, _, _, is_stub in occurrences if is_stub)
-            real_count = sum(1 for _, _, _, _, is_stub in occurrences if not is_stub)
-
-            # If we have exactly one stub and one real definition across sheets, this is OK
-            if stub_count > 0 and real_count > 0 and len(occurrences) == stub_count + real_count:
-                # This is expected: stub in properties sheet, real definition in main sheet
+        if len(row) < 3:
+            return None
+
+        row_id = row[0].strip() if row[0] else ""
+        label = row[1].strip() if len(row) > 1 and row[1] else ""
+        row_type = row[2].strip() if len(row) > 2 and row[2] else ""
+        comment = row[3].strip() if len(row) > 3 and row[3] else ""
+
+        # Skip empty rows
+        if not row_id and not label:
+            return None
+
+        # Check if this is a stub definition
+        is_stub = "stub" in comment.lower()
+        if is_stub:
+            self.stubs.append((row_num, row_id, label))
+
+        # Store ID mapping
+        if row_id:
+            self.ids[row_id] = (row_num, label, row_type, is_stub)
+
+        # Store label mapping
+        if label and row_type in ENTITY_TYPES:
+            self.labels[label].append((row_num, row_id, row_type, is_stub))
+
+        # Extract parent reference (column 3 for classes, column 6 for properties)
+        parent_ref = ""
+        if row_type == "owl:Class" and len(row) > 3:
+            parent_ref = row[3].strip()
+        elif row_type in ["owl:ObjectProperty", "owl:DataProperty"] and len(row) > 6:
+            parent_ref = row[6].strip()
+
+        if parent_ref and "stub" not in parent_ref.lower():  # Don't track stub as parent
+            self.parents.append((row_num, row_id, parent_ref, row_type))
+
+        record = SheetRow(row_num, row, row_id, label, row_type, comment)
+        self.records.append(record)
+        return record
+
+
+class QCIndex:
+    """Cross-sheet indexes shared by all rules, built once after the sheets are scanned.
+
+    ``checked`` holds the filenames whose issues are reported (default: all
+    sheets); the other sheets only provide context.
+    """
+
+    def __init__(self, sheets: Sequence[SheetData], checked: Collection[str] | None = None):
+        self.sheets = list(sheets)
+        self.checked = (
+            set(checked) if checked is not None else {sheet.filename for sheet in self.sheets}
+        )
+        self.ids = defaultdict(list)  # id -> [(sheet_name, row_num, label, type, is_stub)]
+        self.labels = defaultdict(list)  # label -> [(sheet_name, row_num, id, type, is_stub)]
+
+        for sheet in self.sheets:
+            for id_val, (row_num, label, row_type, is_stub) in sheet.ids.items():
+                self.ids[id_val].append((sheet.filename, row_num, label, row_type, is_stub))
+            for label, occurrences in sheet.labels.items():
+                for row_num, id_val, row_type, is_stub in occurrences:
+                    self.labels[label].append((sheet.filename, row_num, id_val, row_type, is_stub))
+
+    def reports(self, sheet_names: Iterable[str]) -> bool:
+        """Whether an issue spanning these sheets involves a checked sheet."""
+        return not self.checked.isdisjoint(sheet_names)
+
+
+class QCRule:
+    """Base class for QC rules.
+
+    Subclasses override any of the callbacks. Per-sheet callbacks run inside the
+    single scan of each sheet (possibly in a worker process, so rules and their
+    per-sheet state must be picklable); ``check_sheets`` runs once afterwards.
+    """
+
+    name = ""
+    description = ""
+
+    def start_sheet(self, sheet: SheetData) -> object:
+        """Return per-sheet state passed to ``check_row`` and ``finish_sheet``."""
+        return None
+
+    def check_row(self, state, sheet: SheetData, row: SheetRow) -> Iterable[QCIssue]:
+        """Check one data row while the sheet is being scanned."""
+        return ()
+
+    def finish_sheet(self, state, sheet: SheetData) -> Iterable[QCIssue]:
+        """Check a sheet after all of its rows were scanned."""
+        return ()
+
+    def check_sheets(self, index: QCIndex) -> Iterable[QCIssue]:
+        """Check relationships across all scanned sheets."""
+        return ()
+
+
+QC_RULES: dict[str, type[QCRule]] = {}
+
+
+def register_rule(rule_class: type[QCRule]) -> type[QCRule]:
+    """Class decorator adding a rule to QC_RULES; registration order is report order."""
+    QC_RULES[rule_class.name] = rule_class
+    return rule_class
+
+
+def _stub_and_real_pair(occurrences: list[tuple]) -> bool:
+    """Return True for the legitimate stub + real definition pattern."""
+    stub_count = sum(1 for *_, is_stub in occurrences if is_stub)
+    real_count = len(occurrences) - stub_count
+    return stub_count > 0 and real_count > 0
+
+
+@register_rule
+class IdClashRule(QCRule):
+    """Duplicate IDs within and across sheets."""
+
+    name = "id-clashes"
+    description = "ID clashes"
+
+    def check_sheets(self, index: QCIndex) -> Iterable[QCIssue]:
+        issues = []
+
+        for id_val, occurrences in index.ids.items():
+            if len(occurrences) <= 1:
+                continue
+            # This is expected: stub in properties sheet, real definition in main sheet
+            if _stub_and_real_pair(occurrences):
+                continue
+            if not index.reports(occurrence[0] for occurrence in occurrences):
                 continue
 
             # Group by sheet
@@ -151,50 +251,43 @@ def check_id_clashes(sheets: list[SheetData]) -> list[QCIssue]:
                     )
                 )
             else:
-                # Across sheets - check if all are stubs or all are real
+                # Across sheets: every occurrence is a stub, or every one is real
                 all_stubs = all(is_stub for _, _, _, _, is_stub in occurrences)
-                all_real = all(not is_stub for _, _, _, _, is_stub in occurrences)
-
-                if all_stubs or all_real:
-                    # Multiple stubs or multiple real definitions - this is an error
-                    details = "; ".join(
-                        [
-                            f"{sheet}: rows {', '.join([f'{r} (' + ('stub' if s else 'real') + ')' for r, _, _, s in rows])}"
-                            for sheet, rows in by_sheet.items()
-                        ]
-                    )
-                    issues.append(
-                        QCIssue(
-                            "ERROR",
-                            "ID_CLASH_ACROSS_SHEETS",
-                            f"ID '{id_val}' appears in multiple sheets (all {'stubs' if all_stubs else 'real definitions'})",
-                            details,
-                        )
+                details = "; ".join(
+                    [
+                        f"{sheet}: rows {', '.join([f'{r} (' + ('stub' if s else 'real') + ')' for r, _, _, s in rows])}"
+                        for sheet, rows in by_sheet.items()
+                    ]
+                )
+                issues.append(
+                    QCIssue(
+                        "ERROR",
+                        "ID_CLASH_ACROSS_SHEETS",
+                        f"ID '{id_val}' appears in multiple sheets (all {'stubs' if all_stubs else 'real definitions'})",
+                        details,
                     )
+                )
 
-    return issues
+        return issues
 
 
-def check_label_clashes(sheets: list[SheetData]) -> list[QCIssue]:
-    """Check for duplicate labels within and across sheets."""
-    issues = []
-    all_labels = defaultdict(list)  # label -> [(sheet_name, row_num, id, type, is_stub)]
+@register_rule
+class LabelClashRule(QCRule):
+    """Duplicate labels within and across sheets."""
 
-    for sheet in sheets:
-        for label, occurrences in sheet.labels.items():
-            for row_num, id_val, row_type, is_stub in occurrences:
-                all_labels[label].append((sheet.filename, row_num, id_val, row_type, is_stub))
-
-    # Find duplicates
-    for label, occurrences in all_labels.items():
-        if len(occurrences) > 1:
-            # Check if this is a legitimate stub + real definition pattern
-            stub_count = sum(1 for _, _, _, _, is_stub in occurrences if is_stub)
-            real_count = sum(1 for _, _, _, _, is_stub in occurrences if not is_stub)
-
-            # If we have exactly one stub and one real definition across sheets, this is OK
-            if stub_count > 0 and real_count > 0 and len(occurrences) == stub_count + real_count:
-                # This is expected: stub in properties sheet, real definition in main sheet
+    name = "label-clashes"
+    description = "label clashes"
+
+    def check_sheets(self, index: QCIndex) -> Iterable[QCIssue]:
+        issues = []
+
+        for label, occurrences in index.labels.items():
+            if len(occurrences) <= 1:
+                continue
+            # This is expected: stub in properties sheet, real definition in main sheet
+            if _stub_and_real_pair(occurrences):
+                continue
+            if not index.reports(occurrence[0] for occurrence in occurrences):
                 continue
 
             # Check if same type
@@ -224,122 +317,263 @@ def check_label_clashes(sheets: list[SheetData]) -> list[QCIssue]:
                     )
                 )
             else:
-                # Across sheets - check if all are stubs or all are real
+                # Across sheets: every occurrence is a stub, or every one is real
                 all_stubs = all(is_stub for _, _, _, _, is_stub in occurrences)
-                all_real = all(not is_stub for _, _, _, _, is_stub in occurrences)
-
-                if all_stubs or all_real:
-                    # Multiple stubs or multiple real definitions - this is an error
-                    details = "; ".join(
-                        [
-                            f"{sheet}: rows {', '.join([f'{r} ({id_val}, ' + ('stub' if s else 'real') + ')' for r, id_val, _, s in rows])}"
-                            for sheet, rows in by_sheet.items()
-                        ]
-                    )
-                    issues.append(
-                        QCIssue(
-                            severity,
-                            "LABEL_CLASH_ACROSS_SHEETS",
-                            f"Label '{label}' appears in multiple sheets (all {'stubs' if all_stubs else 'real definitions'})",
-                            details,
-                        )
+                details = "; ".join(
+                    [
+                        f"{sheet}: rows {', '.join([f'{r} ({id_val}, ' + ('stub' if s else 'real') + ')' for r, id_val, _, s in rows])}"
+                        for sheet, rows in by_sheet.items()
+                    ]
+                )
+                issues.append(
+                    QCIssue(
+                        severity,
+                        "LABEL_CLASH_ACROSS_SHEETS",
+                        f"Label '{label}' appears in multiple sheets (all {'stubs' if all_stubs else 'real definitions'})",
+                        details,
                     )
+                )
 
-    return issues
+        return issues
 
 
-def check_undefined_parents(sheets: list[SheetData]) -> list[QCIssue]:
-    """Check for parent references that are not defined."""
-    issues = []
+class _Name(NamedTuple):
+    """A label or synonym of one row, as indexed by FuzzyClashRule."""
 
-    # Build combined ID and label index
-    all_ids = set()
-    all_labels = set()
+    sheet: str
+    row_num: int
+    term: str  # the row ID, or sheet:row when the row has none
+    kind: str  # label or synonym
+    text: str
 
-    for sheet in sheets:
-        all_ids.update(sheet.ids.keys())
-        all_labels.update(sheet.labels.keys())
 
-    # Check each parent reference
-    for sheet in sheets:
-        for row_num, id_val, parent_ref, _row_type in sheet.parents:
-            # Skip empty parents
-            if not parent_ref:
-                continue
+def _synonym_columns(sheet: SheetData) -> list[tuple[int, bool]]:
+    """Return (column, holds AP tuples) for each synonym column of a sheet.
+
+    Columns are found from the ROBOT directive row; sheets without one fall
+    back to header names that mention a synonym.
+    """
+    names = sheet.rows[0] if sheet.rows else []
+    directives = sheet.rows[1] if len(sheet.rows) > 1 else []
+    columns = []
+    for i in range(3, max(len(names), len(directives))):
+        directive = directives[i].strip() if i < len(directives) else ""
+        name = names[i].strip().lower() if i < len(names) else ""
+        if directive.startswith("AP"):
+            columns.append((i, True))
+        elif "Synonym" in directive or (
+            not directive and "synonym" in name and "source" not in name
+        ):
+            columns.append((i, False))
+    return columns
+
+
+def _sheet_names(sheet: SheetData) -> Iterable[_Name]:
+    """Every label and synonym in a sheet."""
+    columns = _synonym_columns(sheet)
+    for row in sheet.records:
+        term = row.id or f"{sheet.filename}:{row.row_num}"
+        if row.label:
+            yield _Name(sheet.filename, row.row_num, term, "label", row.label)
+        for i, is_tuple in columns:
+            cell = row.cells[i] if i < len(row.cells) else ""
+            values = SYNONYM_TUPLE.findall(cell) if is_tuple else cell.split("|")
+            for value in values:
+                if value.strip():
+                    yield _Name(sheet.filename, row.row_num, term, "synonym", value.strip())
+
+
+def _systematic_variant(a: str, b: str) -> bool:
+    """Whether two normalized names differ by design rather than by a typo.
+
+    Covers numbered series (``mid1``/``mid2``), qualified forms (``X``/``X low``)
+    and negations (``aerobic``/``anaerobic``).
+    """
+    if re.sub(r"\d+", "#", a) == re.sub(r"\d+", "#", b):
+        return True
+    words_a, words_b = a.split(), b.split()
+    if set(words_a) < set(words_b) or set(words_b) < set(words_a):
+        return True
+    if len(words_a) != len(words_b):
+        return False
+    differing = [(x, y) for x, y in zip(words_a, words_b, strict=True) if x != y]
+    if len(differing) != 1:
+        return False
+    x, y = differing[0]
+    return any(x == prefix + y or y == prefix + x for prefix in NEGATING_PREFIXES)
+
+
+@register_rule
+class FuzzyClashRule(QCRule):
+    """Labels and synonyms of different terms that differ by a typo.
+
+    Every distinct normalized label and synonym of all sheets goes into a
+    MinHash-LSH index of character 3-grams, so candidate pairs come from
+    shared LSH buckets instead of an all-pairs compare. Candidates are kept
+    when their exact 3-gram Jaccard similarity is at least ``threshold``.
+    Exact duplicates are left to the ID and label clash rules. Numbered
+    series, qualified forms and negations are skipped.
+    """
+
+    name = "fuzzy-clashes"
+    description = "fuzzy label and synonym clashes"
+
+    def __init__(self, threshold: float = FUZZY_CLASH_THRESHOLD):
+        self.threshold = threshold
+
+    def check_sheets(self, index: QCIndex) -> Iterable[QCIssue]:
+        from metpo.utils.minhash import MinHashLSH, normalize  # noqa: PLC0415
 
-            # Skip comment-only rows (stubs)
-            if "stub" in parent_ref.lower():
+        occurrences: dict[str, list[_Name]] = defaultdict(list)
+        for sheet in index.sheets:
+            for name in _sheet_names(sheet):
+                occurrences[normalize(name.text)].append(name)
+        texts = [text for text in occurrences if text]
+        lsh = MinHashLSH()
+        lsh.add_many(texts)
+
+        # One issue per pair of terms: the most similar of their names
+        best: dict[tuple[str, str], tuple[float, _Name, _Name]] = {}
+        for i, j, similarity in lsh.similar_pairs(self.threshold):
+            if _systematic_variant(texts[i], texts[j]):
                 continue
+            for a in occurrences[texts[i]]:
+                for b in occurrences[texts[j]]:
+                    if a.term == b.term or not index.reports((a.sheet, b.sheet)):
+                        continue
+                    a_first, b_first = sorted((a, b), key=lambda name: name.term)
+                    key = (a_first.term, b_first.term)
+                    if key not in best or similarity > best[key][0]:
+                        best[key] = (similarity, a_first, b_first)
+
+        issues = []
+        for similarity, a, b in sorted(best.values(), key=lambda found: -found[0]):
+            labels_only = a.kind == b.kind == "label"
+            if a.sheet == b.sheet:
+                location = f"{a.sheet}: rows {a.row_num}, {b.row_num}"
+            else:
+                location = f"{a.sheet}: row {a.row_num}; {b.sheet}: row {b.row_num}"
+            issues.append(
+                QCIssue(
+                    "WARNING" if labels_only else "INFO",
+                    "FUZZY_LABEL_CLASH" if labels_only else "FUZZY_SYNONYM_CLASH",
+                    f"{a.kind.capitalize()} '{a.text}' ({a.term}) and {b.kind} '{b.text}' "
+                    f"({b.term}) are {similarity:.0%} similar",
+                    location,
+                )
+            )
+        return issues
+
 
-            # ROBOT templates use pipe-separated multiple parents (SPLIT=|)
-            parent_parts = [p.strip() for p in parent_ref.split("|") if p.strip()]
-
-            for part in parent_parts:
-                # Check if parent is defined (could be ID or label)
-                is_id = part.startswith("METPO:") or ":" in part
-                is_label = not is_id
-
-                if is_id and part not in all_ids:
-                    issues.append(
-                        QCIssue(
-                            "ERROR",
-                            "UNDEFINED_PARENT_ID",
-                            f"Parent ID '{part}' not defined anywhere",
-                            f"{sheet.filename}: row {row_num}, ID {id_val}",
+@register_rule
+class UndefinedParentRule(QCRule):
+    """Parent references that are not defined anywhere, or that point at the row itself."""
+
+    name = "undefined-parents"
+    description = "undefined parents"
+
+    def check_sheets(self, index: QCIndex) -> Iterable[QCIssue]:
+        issues = []
+
+        for sheet in index.sheets:
+            if not index.reports([sheet.filename]):
+                continue
+            for row_num, id_val, parent_ref, _row_type in sheet.parents:
+                current_label = sheet.ids.get(id_val, (None, None, None, None))[1]
+                location = f"{sheet.filename}: row {row_num}, ID {id_val}"
+
+                # ROBOT templates use pipe-separated multiple parents (SPLIT=|)
+                parent_parts = [p.strip() for p in parent_ref.split("|") if p.strip()]
+
+                for part in parent_parts:
+                    # Check if parent is defined (could be ID or label)
+                    is_id = part.startswith("METPO:") or ":" in part
+
+                    if is_id and part not in index.ids:
+                        issues.append(
+                            QCIssue(
+                                "ERROR",
+                                "UNDEFINED_PARENT_ID",
+                                f"Parent ID '{part}' not defined anywhere",
+                                location,
+                            )
                         )
-                    )
-                elif is_label and part not in all_labels:
-                    issues.append(
-                        QCIssue(
-                            "WARNING",
-                            "UNDEFINED_PARENT_LABEL",
-                            f"Parent label '{part}' not defined anywhere (using labels for parents may cause issues)",
-                            f"{sheet.filename}: row {row_num}, ID {id_val}",
+                    elif not is_id and part not in index.labels:
+                        issues.append(
+                            QCIssue(
+                                "WARNING",
+                                "UNDEFINED_PARENT_LABEL",
+                                f"Parent label '{part}' not defined anywhere (using labels for parents may cause issues)",
+                                location,
+                            )
                         )
-                    )
 
-                # Check for self-referential parents
-                current_label = sheet.ids.get(id_val, (None, None, None, None))[1]
-                if part == id_val:
-                    issues.append(
-                        QCIssue(
-                            "ERROR",
-                            "SELF_REFERENTIAL_PARENT_ID",
-                            "Parent references itself via ID",
-                            f"{sheet.filename}: row {row_num}, ID {id_val}",
+                    # Check for self-referential parents
+                    if part == id_val:
+                        issues.append(
+                            QCIssue(
+                                "ERROR",
+                                "SELF_REFERENTIAL_PARENT_ID",
+                                "Parent references itself via ID",
+                                location,
+                            )
                         )
-                    )
-                elif part == current_label:
-                    issues.append(
-                        QCIssue(
-                            "ERROR",
-                            "SELF_REFERENTIAL_PARENT_LABEL",
-                            f"Parent references itself via label '{part}'",
-                            f"{sheet.filename}: row {row_num}, ID {id_val}",
+                    elif part == current_label:
+                        issues.append(
+                            QCIssue(
+                                "ERROR",
+                                "SELF_REFERENTIAL_PARENT_LABEL",
+                                f"Parent references itself via label '{part}'",
+                                location,
+                            )
                         )
-                    )
 
-    return issues
+        return issues
 
 
-def check_assay_outcome_pairing(sheets: list[SheetData]) -> list[QCIssue]:
-    """Check that synonym/assay-outcome pairs in metpo-properties.tsv are consistent.
+class _AssayOutcomeState:
+    def __init__(self):
+        self.enabled: bool | None = None
+        # synonym -> [(row_num, id, label, assay_outcome)]
+        self.synonyms: dict[str, list[tuple[int, str, str, str]]] = defaultdict(list)
+
+
+@register_rule
+class AssayOutcomeRule(QCRule):
+    """Synonym/assay-outcome pairs in sheets with an assay outcome column.
 
     Every synonym string shared by two properties should have exactly one '+'
     and one '-' assay outcome. Flags:
     - ERROR if two properties share a synonym and both have the same outcome
     - WARNING if a property has a synonym + outcome but no counterpart
     """
-    issues: list[QCIssue] = []
 
-    for sheet in sheets:
-        if not _sheet_has_assay_outcome_column(sheet):
-            continue
+    name = "assay-outcome-pairing"
+    description = "assay outcome pairing"
 
-        synonym_map = _extract_synonym_map_for_assay_outcomes(sheet)
-        issues.extend(_build_assay_outcome_issues(sheet, synonym_map))
+    def start_sheet(self, sheet: SheetData) -> _AssayOutcomeState:
+        return _AssayOutcomeState()
 
-    return issues
+    def check_row(self, state, sheet: SheetData, row: SheetRow) -> Iterable[QCIssue]:
+        if state.enabled is None:
+            # Header rows are always read before the first data row
+            state.enabled = _sheet_has_assay_outcome_column(sheet)
+        if not state.enabled or len(row.cells) < 12:
+            return ()
+
+        synonym_tuples = row.cells[9].strip()
+        assay_outcome = row.cells[11].strip()
+        if not (row.id and synonym_tuples and assay_outcome):
+            return ()
+
+        # Extract synonym string from tuple like "oboInOwl:hasRelatedSynonym 'fermentation'"
+        match = re.search(r"'([^']+)'", synonym_tuples)
+        if match:
+            state.synonyms[match.group(1)].append((row.row_num, row.id, row.label, assay_outcome))
+        return ()
+
+    def finish_sheet(self, state, sheet: SheetData) -> Iterable[QCIssue]:
+        return _build_assay_outcome_issues(sheet, state.synonyms)
 
 
 def _sheet_has_assay_outcome_column(sheet: SheetData) -> bool:
@@ -352,33 +586,6 @@ def _sheet_has_assay_outcome_column(sheet: SheetData) -> bool:
     return any("assay outcome" in cell for cell in header_cells)
 
 
-def _extract_synonym_map_for_assay_outcomes(
-    sheet: SheetData,
-) -> dict[str, list[tuple[int, str, str, str]]]:
-    """Extract synonym -> [(row_num, id, label, assay_outcome)] from a sheet."""
-    synonym_map: dict[str, list[tuple[int, str, str, str]]] = defaultdict(list)
-
-    for row_num, row in enumerate(sheet.rows, start=1):
-        if row_num <= 2 or len(row) < 12:
-            continue
-
-        row_id = row[0].strip() if row[0] else ""
-        label = row[1].strip() if len(row) > 1 and row[1] else ""
-        synonym_tuples = row[9].strip() if len(row) > 9 and row[9] else ""
-        assay_outcome = row[11].strip() if len(row) > 11 and row[11] else ""
-
-        if not (row_id and synonym_tuples and assay_outcome):
-            continue
-
-        # Extract synonym string from tuple like "oboInOwl:hasRelatedSynonym 'fermentation'"
-        match = re.search(r"'([^']+)'", synonym_tuples)
-        if match:
-            synonym = match.group(1)
-            synonym_map[synonym].append((row_num, row_id, label, assay_outcome))
-
-    return synonym_map
-
-
 def _build_assay_outcome_issues(
     sheet: SheetData,
     synonym_map: dict[str, list[tuple[int, str, str, str]]],
@@ -435,73 +642,204 @@ def _build_assay_outcome_issues(
     return issues
 
 
-def check_structural_issues(sheets: list[SheetData]) -> list[QCIssue]:
-    """Check for other structural issues."""
-    issues = []
+@register_rule
+class StructuralRule(QCRule):
+    """Missing IDs or labels and non-METPO ID prefixes."""
 
-    for sheet in sheets:
-        for row_num, row in enumerate(sheet.rows, start=1):
-            if row_num <= 2:  # Skip headers
-                continue
+    name = "structural"
+    description = "structural issues"
 
-            if len(row) < 3:
-                continue
+    def check_row(self, state, sheet: SheetData, row: SheetRow) -> Iterable[QCIssue]:
+        issues = []
+        location = f"{sheet.filename}: row {row.row_num}"
 
-            id_val = row[0].strip() if row[0] else ""
-            label = row[1].strip() if len(row) > 1 and row[1] else ""
-            row_type = row[2].strip() if len(row) > 2 and row[2] else ""
+        # Check for missing ID
+        if not row.id and row.type in STRUCTURAL_TYPES:
+            issues.append(
+                QCIssue("ERROR", "MISSING_ID", f"Row has label '{row.label}' but no ID", location)
+            )
 
-            # Skip empty rows
-            if not id_val and not label:
-                continue
+        # Check for missing label
+        if row.id and not row.label and row.type in STRUCTURAL_TYPES:
+            issues.append(
+                QCIssue("WARNING", "MISSING_LABEL", f"ID '{row.id}' has no label", location)
+            )
 
-            # Check for missing ID
-            if not id_val and row_type in ["owl:Class", "owl:ObjectProperty", "owl:DataProperty"]:
-                issues.append(
-                    QCIssue(
-                        "ERROR",
-                        "MISSING_ID",
-                        f"Row has label '{label}' but no ID",
-                        f"{sheet.filename}: row {row_num}",
-                    )
+        # Check ID format
+        if row.id and not row.id.startswith(("METPO:", "IAO:")) and row.type != "":
+            issues.append(
+                QCIssue(
+                    "WARNING",
+                    "NON_METPO_ID",
+                    f"ID '{row.id}' doesn't start with METPO: or IAO:",
+                    location,
                 )
+            )
 
-            # Check for missing label
-            if (
-                id_val
-                and not label
-                and row_type in ["owl:Class", "owl:ObjectProperty", "owl:DataProperty"]
-            ):
-                issues.append(
-                    QCIssue(
-                        "WARNING",
-                        "MISSING_LABEL",
-                        f"ID '{id_val}' has no label",
-                        f"{sheet.filename}: row {row_num}",
-                    )
-                )
+        return issues
 
-            # Check ID format
-            if (
-                id_val
-                and not id_val.startswith("METPO:")
-                and not id_val.startswith("IAO:")
-                and row_type != ""
-            ):
-                issues.append(
-                    QCIssue(
-                        "WARNING",
-                        "NON_METPO_ID",
-                        f"ID '{id_val}' doesn't start with METPO: or IAO:",
-                        f"{sheet.filename}: row {row_num}",
-                    )
-                )
 
-    return issues
+def _run_sheet_rules(
+    sheet: SheetData, rows: Iterable[SheetRow], rules: Sequence[QCRule]
+) -> tuple[SheetData, list[list[QCIssue]]]:
+    """Run every rule's per-sheet callbacks over ``rows`` as they are produced."""
+    states = [rule.start_sheet(sheet) for rule in rules]
+    issues: list[list[QCIssue]] = [[] for _ in rules]
+    for row in rows:
+        for rule, state, found in zip(rules, states, issues, strict=True):
+            found.extend(rule.check_row(state, sheet, row))
+    for rule, state, found in zip(rules, states, issues, strict=True):
+        found.extend(rule.finish_sheet(state, sheet))
+    return sheet, issues
+
+
+def _scan_sheet(
+    filename: str, rules: Sequence[QCRule], check: bool = True
+) -> tuple[SheetData, list[list[QCIssue]]]:
+    """Load one sheet, evaluating per-sheet rule callbacks during the single read.
+
+    With ``check`` False the sheet is only loaded, as context for cross-sheet rules.
+    """
+    sheet = SheetData(filename)
+    if not check:
+        sheet.load()
+        return sheet, [[] for _ in rules]
+    return _run_sheet_rules(sheet, sheet.iter_load(), rules)
+
+
+def _collect(
+    scans: Iterable[tuple[SheetData, list[list[QCIssue]]]],
+    rules: Sequence[QCRule],
+    checked: Collection[str] | None = None,
+) -> tuple[list[SheetData], list[QCIssue]]:
+    sheets: list[SheetData] = []
+    by_rule: list[list[QCIssue]] = [[] for _ in rules]
+    for sheet, sheet_issues in scans:
+        sheets.append(sheet)
+        for found, issues in zip(by_rule, sheet_issues, strict=True):
+            found.extend(issues)
+
+    index = QCIndex(sheets, checked)
+    for rule, found in zip(rules, by_rule, strict=True):
+        found.extend(rule.check_sheets(index))
+    return sheets, [issue for found in by_rule for issue in found]
+
+
+def run_qc(
+    files: Sequence[str],
+    rules: Sequence[QCRule] | None = None,
+    workers: int = 1,
+    checked: Collection[str] | None = None,
+) -> tuple[list[SheetData], list[QCIssue]]:
+    """Scan each sheet once and evaluate all rules against it.
+
+    Args:
+        files: Template TSV paths, in report order
+        rules: Rule instances to evaluate (default: every registered rule)
+        workers: Number of sheets to scan in parallel processes
+        checked: Paths among ``files`` to report issues for (default: all);
+            the other sheets are loaded only for the cross-sheet rules
+
+    Returns:
+        Tuple of (loaded sheets, issues ordered by rule then sheet)
+    """
+    rules = list(rules) if rules is not None else [rule() for rule in QC_RULES.values()]
+    checks = [checked is None or filename in checked for filename in files]
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            return _collect(pool.map(_scan_sheet, files, repeat(rules), checks), rules, checked)
+    scans = (
+        _scan_sheet(filename, rules, check) for filename, check in zip(files, checks, strict=True)
+    )
+    return _collect(scans, rules, checked)
+
+
+def evaluate_rules(sheets: Sequence[SheetData], rules: Sequence[QCRule]) -> list[QCIssue]:
+    """Evaluate rules against sheets that were already loaded."""
+    return _collect((_run_sheet_rules(sheet, sheet.records, rules) for sheet in sheets), rules)[1]
+
+
+def check_id_clashes(sheets: list[SheetData]) -> list[QCIssue]:
+    """Check for duplicate IDs within and across sheets."""
+    return evaluate_rules(sheets, [IdClashRule()])
+
+
+def check_label_clashes(sheets: list[SheetData]) -> list[QCIssue]:
+    """Check for duplicate labels within and across sheets."""
+    return evaluate_rules(sheets, [LabelClashRule()])
+
+
+def check_undefined_parents(sheets: list[SheetData]) -> list[QCIssue]:
+    """Check for parent references that are not defined."""
+    return evaluate_rules(sheets, [UndefinedParentRule()])
+
+
+def check_assay_outcome_pairing(sheets: list[SheetData]) -> list[QCIssue]:
+    """Check that synonym/assay-outcome pairs in metpo-properties.tsv are consistent."""
+    return evaluate_rules(sheets, [AssayOutcomeRule()])
+
+
+def check_structural_issues(sheets: list[SheetData]) -> list[QCIssue]:
+    """Check for other structural issues."""
+    return evaluate_rules(sheets, [StructuralRule()])
+
+
+def _download_sheets(all_sheets: bool, sheets_dir: Path) -> dict[str, str]:
+    """Sync the primary (and optionally secondary) sheets; return their paths by name."""
+    names = list(all_export_urls()) if all_sheets else list(SHEET_GIDS)
+    click.echo(f"Syncing {len(names)} sheet(s) from Google Sheets into {sheets_dir}...")
+    results = sync_sheets(sheets_dir, names)
+    failed = [r.name for r in results if r.status == "failed"]
+    if failed:
+        raise click.ClickException(f"Failed to download: {', '.join(failed)}")
+    for result in results:
+        click.echo(f"  ✓ {result.path} ({result.status})")
+    return {r.name: str(r.path) for r in results}
+
+
+def _pending_sheets(
+    synced: dict[str, str], sheets_dir: Path, extra_sheets: Sequence[str]
+) -> tuple[list[str], list[str]]:
+    """Return the synced sheets changed since their last clean QC and the paths to check.
+
+    Sheets given with --sheet are always checked. Exits when there is nothing to check.
+    """
+    pending = [name for name in changed_sheets(SYNC_CONSUMER, sheets_dir) if name in synced]
+    if not pending and not extra_sheets:
+        click.secho("✅ No sheets changed since their last clean QC; skipping", fg="green")
+        sys.exit(0)
+    click.echo(f"Changed since the last clean QC: {', '.join(pending) or 'none'}")
+    return pending, [synced[name] for name in pending] + list(extra_sheets)
+
+
+def _select_rules(rule_names: Sequence[str], fuzzy_threshold: float) -> list[QCRule]:
+    """Instantiate the named rules (default: all), applying rule options."""
+    rules = [QC_RULES[name]() for name in rule_names or QC_RULES]
+    for rule in rules:
+        if isinstance(rule, FuzzyClashRule):
+            rule.threshold = fuzzy_threshold
+    return rules
 
 
 @click.command()
 @click.option("--download", is_flag=True, help="Download sheets directly from Google Sheets")
+@click.option(
+    "--all-sheets",
+    is_flag=True,
+    help="With --download, also download and check the secondary sheets from sheets.yaml",
+)
+@click.option(
+    "--sheets-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_SHEETS_DIR,
+    show_default=True,
+    help="With --download, directory the sheets are synced into",
+)
+@click.option(
+    "--changed-only",
+    is_flag=True,
+    help="With --download, only report issues in sheets changed since their last clean QC",
+)
 @click.option(
     "--main-sheet",
     "-m",
@@ -516,17 +854,60 @@ def check_structural_issues(sheets: list[SheetData]) -> list[QCIssue]:
     default="src/templates/metpo-properties.tsv",
     help="Path to metpo-properties.tsv (default: src/templates/metpo-properties.tsv)",
 )
-def main(download: bool, main_sheet: str, properties_sheet: str):
+@click.option(
+    "--sheet",
+    "-s",
+    "extra_sheets",
+    type=click.Path(exists=True),
+    multiple=True,
+    help="Additional template TSV to check alongside the main sheets (repeatable)",
+)
+@click.option(
+    "--rule",
+    "rule_names",
+    type=click.Choice(list(QC_RULES)),
+    multiple=True,
+    help="Only run this rule (repeatable; default: all rules)",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Scan this many sheets in parallel processes",
+)
+@click.option(
+    "--fuzzy-threshold",
+    type=click.FloatRange(0, 1),
+    default=FUZZY_CLASH_THRESHOLD,
+    show_default=True,
+    help="Minimum character 3-gram similarity reported by the fuzzy-clashes rule",
+)
+def main(
+    download: bool,
+    all_sheets: bool,
+    sheets_dir: Path,
+    changed_only: bool,
+    main_sheet: str,
+    properties_sheet: str,
+    extra_sheets: tuple[str, ...],
+    rule_names: tuple[str, ...],
+    workers: int,
+    fuzzy_threshold: float,
+):
     """
     Quality control checks for METPO Google Sheets templates.
 
     Validates METPO template files for common errors including:
     - ID clashes within and across sheets
     - Label clashes and duplicates
+    - Typo-level near-duplicate labels and synonyms
     - Undefined or self-referential parent references
     - Missing IDs or labels
     - Malformed ID formats
 
+    Every sheet is read once; all selected rules are evaluated during that scan.
+
     Examples:
 
         # Check local files (default paths)
@@ -535,55 +916,43 @@ def main(download: bool, main_sheet: str, properties_sheet: str):
         # Check specific local files
         uv run qc-metpo-sheets -m path/to/metpo_sheet.tsv -p path/to/metpo-properties.tsv
 
+        # Also check stubs and deprecated terms, scanning sheets in parallel
+        uv run qc-metpo-sheets -s src/templates/stubs.tsv -s src/templates/deprecated.tsv --workers 4
+
         # Download from Google Sheets and check
         uv run qc-metpo-sheets --download
+
+        # Only look for typo-level clashes, with a looser threshold
+        uv run qc-metpo-sheets --rule fuzzy-clashes --fuzzy-threshold 0.7
+
+        # Sync all sheets, checking only those changed upstream since their last clean QC
+        uv run qc-metpo-sheets --download --all-sheets --changed-only
     """
     click.echo("=" * 80)
     click.echo("METPO Sheet Quality Control")
     click.echo("=" * 80)
     click.echo()
 
-    if download:
-        files = []
-        for file_stem, config_key in _SHEET_NAMES.items():
-            gid = SHEET_GIDS[config_key]
-            filename = f"/tmp/{file_stem}.tsv"
-            download_sheet(gid, filename)
-            files.append(filename)
-    else:
-        files = [main_sheet, properties_sheet]
-
-    # Load sheets
-    sheets = []
-    for filename in files:
-        click.echo(f"Loading {filename}...")
-        sheet = SheetData(filename)
-        sheet.load()
-        sheets.append(sheet)
+    if changed_only and not download:
+        raise click.UsageError("--changed-only requires --download")
+    synced = _download_sheets(all_sheets, sheets_dir) if download else {}
+    files = list(synced.values()) if download else [main_sheet, properties_sheet]
+    files.extend(extra_sheets)
+    pending, checked = (
+        _pending_sheets(synced, sheets_dir, extra_sheets) if changed_only else ([], None)
+    )
+
+    rules = _select_rules(rule_names, fuzzy_threshold)
+    click.echo(f"Scanning {len(files)} sheet(s) with rules: {', '.join(r.name for r in rules)}")
+    sheets, all_issues = run_qc(files, rules, workers=workers, checked=checked)
+    if pending and not any(issue.severity == "ERROR" for issue in all_issues):
+        mark_checked(SYNC_CONSUMER, pending, sheets_dir)
+    for sheet in sheets:
         click.echo(
-            f"  ✓ {len(sheet.ids)} entities ({len(sheet.stubs)} stubs), {len(sheet.parents)} parent references"
+            f"  ✓ {sheet.filename}: {len(sheet.ids)} entities ({len(sheet.stubs)} stubs), "
+            f"{len(sheet.parents)} parent references"
         )
 
-    click.echo()
-
-    # Run checks
-    all_issues = []
-
-    click.echo("Checking for ID clashes...")
-    all_issues.extend(check_id_clashes(sheets))
-
-    click.echo("Checking for label clashes...")
-    all_issues.extend(check_label_clashes(sheets))
-
-    click.echo("Checking for undefined parents...")
-    all_issues.extend(check_undefined_parents(sheets))
-
-    click.echo("Checking for assay outcome pairing...")
-    all_issues.extend(check_assay_outcome_pairing(sheets))
-
-    click.echo("Checking for structural issues...")
-    all_issues.extend(check_structural_issues(sheets))
-
     # Report results
     click.echo()
     click.echo("=" * 80)
@@ -11,18 +11,27 @@ Coverage is reported at two levels:
 - **METPO resolution**: card maps to specific METPO predicate pairs and class terms
 - **Effective KGX coverage**: card carries usable external CURIEs (CHEBI, GO, EC)
   that can be used directly in KGX output, even without full METPO resolution
+
+The label, synonym and CURIE indexes compiled from the templates are cached
+(keyed by the templates' content hashes) together with every resolved row.
+On re-runs only cards whose content changed, or whose referenced index entries
+changed, are resolved again.
 """
 
 from __future__ import annotations
 
 import csv
+import hashlib
+import json
 import re
 from collections import Counter, defaultdict
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from pathlib import Path
 
 import click
 
+from metpo.utils.files import write_atomic
+
 GENERIC_PROCESS_CURIES = {
     "GO:0008152",  # metabolism
     "GO:0009058",  # biosynthetic process
@@ -49,6 +58,10 @@ KGX_USABLE_PREFIXES = {"CHEBI", "GO", "EC"}
 # Pattern for MetaTraits EC numbers like "EC3.2.1.52" (no colon after prefix).
 _EC_NO_COLON_RE = re.compile(r"^EC\d+\.\d+")
 
+# Bump when the cache layout or any resolution rule changes, to invalidate caches.
+RESOLUTION_CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path("local/metatraits_resolution_cache.json")
+
 
 def classify_external_curies(
     substrate_curies: tuple[str, ...],
@@ -291,6 +304,137 @@ def parse_metpo_dataprop_index(path: Path) -> dict[str, list[tuple[str, str]]]:
     return dict(index)
 
 
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@dataclass
+class ResolutionIndexes:
+    """All template-derived lookup indexes used to resolve MetaTraits cards."""
+
+    curie_to_metpo: dict[str, list[tuple[str, str]]]
+    category_map: dict[str, dict[str, PropertyRef | None]]
+    class_index: dict[str, list[tuple[str, str]]]
+    dataprop_index: dict[str, list[tuple[str, str]]]
+
+    @classmethod
+    def build(cls, metpo_sheet: Path, properties_sheet: Path) -> ResolutionIndexes:
+        """Parse the class and property templates into indexes."""
+        return cls(
+            curie_to_metpo=dict(parse_metpo_curies(metpo_sheet)),
+            category_map=parse_property_outcome_pairs(properties_sheet),
+            class_index=parse_metpo_class_index(metpo_sheet),
+            dataprop_index=parse_metpo_dataprop_index(properties_sheet),
+        )
+
+    def to_json(self) -> dict:
+        """Return a JSON-serializable form of the indexes."""
+        return {
+            "curie_to_metpo": self.curie_to_metpo,
+            "category_map": {
+                category: {key: astuple(ref) if ref else None for key, ref in pair.items()}
+                for category, pair in self.category_map.items()
+            },
+            "class_index": self.class_index,
+            "dataprop_index": self.dataprop_index,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> ResolutionIndexes:
+        """Rebuild indexes from :meth:`to_json` output."""
+
+        def entries(index: dict[str, list[list[str]]]) -> dict[str, list[tuple[str, str]]]:
+            return {key: [(a, b) for a, b in values] for key, values in index.items()}
+
+        return cls(
+            curie_to_metpo=entries(data["curie_to_metpo"]),
+            category_map={
+                category: {key: PropertyRef(*ref) if ref else None for key, ref in pair.items()}
+                for category, pair in data["category_map"].items()
+            },
+            class_index=entries(data["class_index"]),
+            dataprop_index=entries(data["dataprop_index"]),
+        )
+
+    def card_dependencies(self, card: TraitCard) -> list:
+        """Return every index entry that resolving ``card`` can consult.
+
+        Mirrors the lookups in :func:`_resolve_composed_card` and
+        :func:`_resolve_base_card`, so a card needs re-resolving only when its
+        own content or one of these entries changes.
+        """
+        deps: list = [
+            [curie, self.curie_to_metpo.get(curie)]
+            for curie in card.process_curies
+            if curie not in GENERIC_PROCESS_CURIES
+        ]
+        if card.is_composed:
+            category_key = normalize_text(card.base_category)
+            category_key = CATEGORY_ALIASES.get(category_key, category_key)
+            pair = self.category_map.get(category_key)
+            deps.append(
+                [category_key, {k: astuple(v) if v else None for k, v in (pair or {}).items()}]
+            )
+            deps.append(self.class_index.get(normalize_text(card.substrate_label)))
+        else:
+            name_key = normalize_text(card.name)
+            if card.trait_format == "uncomposed_numeric":
+                deps.append(self.dataprop_index.get(name_key))
+            deps.append(self.class_index.get(name_key))
+        return deps
+
+    def card_fingerprint(self, card: TraitCard) -> str:
+        """Hash a card's content together with the index entries it depends on."""
+        payload = json.dumps([astuple(card), self.card_dependencies(card)], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_resolution_cache(cache_path: Path | None) -> dict:
+    """Load a resolution cache, returning an empty one if missing or stale."""
+    if cache_path is None or not cache_path.exists():
+        return {}
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    if cache.get("version") != RESOLUTION_CACHE_VERSION:
+        return {}
+    return cache
+
+
+def load_indexes(
+    metpo_sheet: Path, properties_sheet: Path, cache: dict
+) -> tuple[ResolutionIndexes, dict[str, str], bool]:
+    """Return (indexes, template hashes, loaded_from_cache).
+
+    Indexes are reused from ``cache`` when both template hashes match.
+    """
+    template_hashes = {
+        "metpo_sheet": file_sha256(metpo_sheet),
+        "properties_sheet": file_sha256(properties_sheet),
+    }
+    if cache.get("template_hashes") == template_hashes and "indexes" in cache:
+        return ResolutionIndexes.from_json(cache["indexes"]), template_hashes, True
+    return ResolutionIndexes.build(metpo_sheet, properties_sheet), template_hashes, False
+
+
+def write_resolution_cache(
+    cache_path: Path,
+    indexes: ResolutionIndexes,
+    template_hashes: dict[str, str],
+    resolutions: dict[str, dict[str, str]],
+) -> None:
+    """Persist compiled indexes and per-card resolutions for the next run."""
+    payload = {
+        "version": RESOLUTION_CACHE_VERSION,
+        "template_hashes": template_hashes,
+        "indexes": indexes.to_json(),
+        "resolutions": resolutions,
+    }
+    write_atomic(cache_path, json.dumps(payload, sort_keys=True))
+
+
 def _resolve_composed_card(
     card: TraitCard,
     category_map: dict[str, dict[str, PropertyRef | None]],
@@ -440,27 +584,63 @@ def resolve_cards(
     dataprop_index: dict[str, list[tuple[str, str]]],
 ) -> list[dict[str, str]]:
     """Resolve each card to deterministic operational lookup rows."""
-    resolved: list[dict[str, str]] = []
+    return [
+        resolve_card(card, category_map, curie_to_metpo, class_index, dataprop_index)
+        for card in cards
+    ]
 
-    for card in cards:
-        ext_prefixes = classify_external_curies(card.substrate_curies, card.process_curies)
-        ext_curies_str = "; ".join(sorted(ext_prefixes)) if ext_prefixes else ""
-        curie_count = len(card.substrate_curies) + len(card.process_curies)
 
-        if card.is_composed:
-            resolved.append(
-                _resolve_composed_card(
-                    card, category_map, curie_to_metpo, class_index, curie_count, ext_curies_str
-                )
+def resolve_card(
+    card: TraitCard,
+    category_map: dict[str, dict[str, PropertyRef | None]],
+    curie_to_metpo: dict[str, list[tuple[str, str]]],
+    class_index: dict[str, list[tuple[str, str]]],
+    dataprop_index: dict[str, list[tuple[str, str]]],
+) -> dict[str, str]:
+    """Resolve one card to its operational lookup row."""
+    ext_prefixes = classify_external_curies(card.substrate_curies, card.process_curies)
+    ext_curies_str = "; ".join(sorted(ext_prefixes)) if ext_prefixes else ""
+    curie_count = len(card.substrate_curies) + len(card.process_curies)
+
+    if card.is_composed:
+        return _resolve_composed_card(
+            card, category_map, curie_to_metpo, class_index, curie_count, ext_curies_str
+        )
+    return _resolve_base_card(
+        card, curie_to_metpo, class_index, dataprop_index, curie_count, ext_curies_str
+    )
+
+
+def resolve_cards_incremental(
+    cards: list[TraitCard],
+    indexes: ResolutionIndexes,
+    previous: dict[str, dict[str, str]],
+) -> tuple[list[dict[str, str]], dict[str, dict[str, str]], int]:
+    """Resolve cards, reusing rows from ``previous`` for unchanged fingerprints.
+
+    Returns:
+        Tuple of (rows in card order, fingerprint -> row map for the next run,
+        number of cards reused from ``previous``)
+    """
+    rows: list[dict[str, str]] = []
+    resolutions: dict[str, dict[str, str]] = {}
+    reused = 0
+    for card in cards:
+        fingerprint = indexes.card_fingerprint(card)
+        row = previous.get(fingerprint)
+        if row is None:
+            row = resolve_card(
+                card,
+                indexes.category_map,
+                indexes.curie_to_metpo,
+                indexes.class_index,
+                indexes.dataprop_index,
             )
         else:
-            resolved.append(
-                _resolve_base_card(
-                    card, curie_to_metpo, class_index, dataprop_index, curie_count, ext_curies_str
-                )
-            )
-
-    return resolved
+            reused += 1
+        resolutions[fingerprint] = row
+        rows.append(row)
+    return rows, resolutions, reused
 
 
 def write_resolution_table(rows: list[dict[str, str]], output_path: Path) -> None:
@@ -688,21 +868,39 @@ def write_report(rows: list[dict[str, str]], report_path: Path) -> None:
     default=Path("data/mappings/metatraits_in_sheet_resolution_report.md"),
     show_default=True,
 )
+@click.option(
+    "--cache",
+    "cache_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_CACHE_PATH,
+    show_default=True,
+    help="Compiled index + resolution cache for incremental re-resolution",
+)
+@click.option("--no-cache", is_flag=True, help="Rebuild indexes and resolve every card")
 def main(
     metatraits_cards: Path,
     metpo_sheet: Path,
     properties_sheet: Path,
     output: Path,
     report: Path,
+    cache_path: Path,
+    no_cache: bool,
 ) -> None:
     """Resolve MetaTraits catalog traits to in-sheet METPO operational mapping hints."""
     cards = parse_metatraits_cards(metatraits_cards)
-    curie_to_metpo = parse_metpo_curies(metpo_sheet)
-    category_map = parse_property_outcome_pairs(properties_sheet)
-    class_index = parse_metpo_class_index(metpo_sheet)
-    dataprop_index = parse_metpo_dataprop_index(properties_sheet)
+    cache = {} if no_cache else load_resolution_cache(cache_path)
+    indexes, template_hashes, indexes_cached = load_indexes(metpo_sheet, properties_sheet, cache)
+
+    rows, resolutions, reused = resolve_cards_incremental(
+        cards, indexes, cache.get("resolutions", {})
+    )
+    if not no_cache:
+        write_resolution_cache(cache_path, indexes, template_hashes, resolutions)
+        click.echo(
+            f"Indexes {'loaded from cache' if indexes_cached else 'compiled'}; "
+            f"re-resolved {len(rows) - reused}/{len(rows)} cards"
+        )
 
-    rows = resolve_cards(cards, category_map, curie_to_metpo, class_index, dataprop_index)
     write_resolution_table(rows, output)
     write_report(rows, report)
 
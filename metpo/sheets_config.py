@@ -27,6 +27,13 @@ TEMPLATE_PATHS: dict[str, str] = {
 }
 
 
+SHEET_FILENAMES: dict[str, str] = {
+    name: sheet.get("filename", f"{name}.tsv")
+    for section in ("primary", "secondary")
+    for name, sheet in _config.get(section, {}).items()
+}
+
+
 def export_url(sheet: str) -> str:
     """Return the Google Sheets TSV export URL for a primary sheet."""
     gid = SHEET_GIDS[sheet]
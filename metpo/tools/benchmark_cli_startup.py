@@ -0,0 +1,104 @@
+"""Measure how long METPO commands take to start.
+
+Each command runs in a fresh interpreter several times, both as its
+standalone script and through the ``metpo`` group. The median wall time is
+reported next to a bare interpreter baseline. ``--help`` is the default
+argument list, so nothing beyond option parsing runs.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+from metpo.cli import command_targets
+
+DEFAULT_COMMANDS = (
+    "categorize-ontologies",
+    "qc-metpo-sheets",
+    "convert-chem-props",
+    "analyze-matches",
+    "madin-analyze-cell-shape",
+    "plot-embedding-similarity",
+)
+
+
+def time_run(argv: list[str], repeat: int) -> float:
+    """Median wall time in seconds of ``repeat`` runs of ``argv``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, capture_output=True, check=False)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def script_argv(name: str, target: str, args: list[str]) -> list[str]:
+    """Run ``target`` the way its console script does, in a fresh interpreter."""
+    module_name, _, attr = target.partition(":")
+    code = (
+        f"import sys; from {module_name} import {attr}; sys.argv[0] = {name!r}; sys.exit({attr}())"
+    )
+    return [sys.executable, "-c", code, *args]
+
+
+@click.command()
+@click.option(
+    "--command",
+    "-c",
+    "commands",
+    multiple=True,
+    help="Command to time (repeatable; default: a mix of light and heavy commands)",
+)
+@click.option("--repeat", "-n", type=int, default=5, show_default=True, help="Runs per command")
+@click.option(
+    "--args",
+    "extra_args",
+    default="--help",
+    show_default=True,
+    help="Arguments passed to each command",
+)
+@click.option(
+    "--json-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also write the timings as JSON",
+)
+def benchmark_cli_startup(commands, repeat, extra_args, json_output):
+    """Time command startup as standalone scripts and through `metpo`."""
+    targets = command_targets()
+    commands = commands or DEFAULT_COMMANDS
+    unknown = [name for name in commands if name not in targets]
+    if unknown:
+        raise click.BadParameter(
+            f"Unknown command(s): {', '.join(unknown)}", param_hint="--command"
+        )
+    args = extra_args.split()
+
+    results = {
+        "python": time_run([sys.executable, "-c", "pass"], repeat),
+        "metpo --help": time_run([sys.executable, "-m", "metpo.cli", "--help"], repeat),
+    }
+    for name in commands:
+        results[name] = time_run(script_argv(name, targets[name], args), repeat)
+        results[f"metpo {name}"] = time_run(
+            [sys.executable, "-m", "metpo.cli", name, *args], repeat
+        )
+
+    width = max(map(len, results))
+    click.echo(f"{'command':<{width}}  median (s), {repeat} runs, args: {extra_args}")
+    for label, seconds in results.items():
+        click.echo(f"{label:<{width}}  {seconds:.3f}")
+
+    if json_output:
+        json_output.write_text(
+            json.dumps({"repeat": repeat, "args": extra_args, "seconds": results}, indent=2) + "\n"
+        )
+        click.echo(f"✓ Wrote {json_output}")
+
+
+if __name__ == "__main__":
+    benchmark_cli_startup()
@@ -0,0 +1,58 @@
+"""Build an offline NCBI Taxonomy index from an unpacked taxdump.
+
+The index is written as memory-mappable tables (see metpo.utils.ncbi_taxonomy)
+and is used for network-free tax_id validation, e.g. by madin-tax-validation.
+"""
+
+from pathlib import Path
+
+import click
+
+from metpo.utils.ncbi_taxonomy import TaxonomyIndex, build_index
+
+
+@click.command()
+@click.option(
+    "--taxdump-dir",
+    "-d",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    required=True,
+    help="Directory containing nodes.dmp and names.dmp (optionally .gz) and merged.dmp",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory to write the taxonomy index into",
+)
+@click.option("--lookup", type=int, multiple=True, help="Print lineage for tax_id(s) after build")
+def build_taxonomy_index(taxdump_dir: Path, output_dir: Path, lookup: tuple[int, ...]):
+    """Build a memory-mapped NCBI Taxonomy index from nodes.dmp and names.dmp."""
+
+    def find(stem: str) -> Path | None:
+        for candidate in (taxdump_dir / stem, taxdump_dir / f"{stem}.gz"):
+            if candidate.exists():
+                return candidate
+        return None
+
+    nodes_dmp = find("nodes.dmp")
+    names_dmp = find("names.dmp")
+    if nodes_dmp is None or names_dmp is None:
+        raise click.ClickException(f"nodes.dmp and names.dmp are required in {taxdump_dir}")
+
+    meta = build_index(nodes_dmp, names_dmp, output_dir, merged_dmp=find("merged.dmp"))
+    click.echo(
+        f"✅ Indexed {meta['node_count']:,} taxa ({meta['name_count']:,} names, "
+        f"{meta['merged_count']:,} merged ids) into {output_dir}"
+    )
+
+    if lookup:
+        with TaxonomyIndex(output_dir) as index:
+            for tax_id in lookup:
+                lineage = [f"{index.name(t)} [{index.rank(t)}]" for t in index.lineage(tax_id)]
+                click.echo(f"{tax_id}: {' < '.join(lineage) if lineage else 'NOT FOUND'}")
+
+
+if __name__ == "__main__":
+    build_taxonomy_index()
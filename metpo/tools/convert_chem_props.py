@@ -4,7 +4,6 @@ import re
 from pathlib import Path
 
 import click
-import pandas as pd
 import yaml
 
 
@@ -21,6 +20,8 @@ import yaml
 def convert_chem_props(input_file, output_file):
     """Convert chem_interaction_props.tsv to LinkML enumeration format."""
 
+    import pandas as pd  # noqa: PLC0415
+
     # Read the TSV file
     df = pd.read_csv(input_file, sep="\t")
 
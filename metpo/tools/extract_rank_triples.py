@@ -1,17 +1,167 @@
 """Extract taxonomy rank triples from NCBI nodes.dmp file.
 
 This tool processes the NCBI taxonomy nodes.dmp file and extracts
-taxonomic rank information as RDF triples in Turtle format.
+taxonomic rank information as RDF triples in Turtle or N-Triples format.
+
+The input is streamed line by line (plain or gzip-compressed) and triples are
+written directly in buffered chunks, so memory use stays constant regardless of
+taxonomy size. Uncompressed input can additionally be split into byte ranges
+that are parsed in parallel worker processes; output order is preserved.
 """
 
+import gzip
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import IO
 
 import click
-from rdflib import Graph, Literal, URIRef
-from tqdm import tqdm
+
+from metpo.utils.ncbi_taxonomy import open_text
 
 NCBI_TAXON_PREFIX = "http://purl.obolibrary.org/obo/NCBITaxon_"
-HAS_RANK_PREDICATE = URIRef("http://purl.obolibrary.org/obo/ncbitaxon#has_rank")
+HAS_RANK_PREDICATE = "http://purl.obolibrary.org/obo/ncbitaxon#has_rank"
+
+TURTLE_HEADER = (
+    f"@prefix NCBITaxon: <{NCBI_TAXON_PREFIX}> .\n"
+    f"@prefix ncbitaxon: <{HAS_RANK_PREDICATE.rsplit('#', 1)[0]}#> .\n\n"
+)
+
+DEFAULT_EXCLUDED_RANKS = frozenset({"", "no rank"})
+CHUNK_BYTES = 8 * 1024 * 1024
+LINES_PER_FLUSH = 50_000
+
+
+def _literal(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def format_rank_triples(
+    lines: Iterable[str],
+    fmt: str = "turtle",
+    ranks: frozenset[str] | None = None,
+) -> tuple[str, int]:
+    """Format nodes.dmp lines as rank triples.
+
+    Args:
+        lines: Raw nodes.dmp lines
+        fmt: ``turtle`` (prefixed names) or ``ntriples`` (full IRIs)
+        ranks: Ranks to keep; None keeps every rank except ``no rank``
+
+    Returns:
+        Tuple of (serialized triples, number of triples)
+    """
+    if fmt == "ntriples":
+        subject_template = f"<{NCBI_TAXON_PREFIX}{{}}> <{HAS_RANK_PREDICATE}> {{}} .\n"
+    else:
+        subject_template = "NCBITaxon:{} ncbitaxon:has_rank {} .\n"
+
+    out = []
+    for line in lines:
+        parts = line.split("\t|\t", 3)
+        if len(parts) < 3:
+            continue
+        rank = parts[2].strip()
+        if (rank in DEFAULT_EXCLUDED_RANKS) if ranks is None else (rank not in ranks):
+            continue
+        out.append(subject_template.format(parts[0].strip(), _literal(rank)))
+    return "".join(out), len(out)
+
+
+def iter_line_batches(handle: IO[str], size: int = LINES_PER_FLUSH) -> Iterator[list[str]]:
+    """Yield lists of at most ``size`` lines from an open text file."""
+    batch: list[str] = []
+    for line in handle:
+        batch.append(line)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def byte_ranges(path: Path, chunk_bytes: int = CHUNK_BYTES) -> list[tuple[int, int]]:
+    """Split a file into newline-aligned ``(start, end)`` byte ranges."""
+    size = path.stat().st_size
+    ranges = []
+    with path.open("rb") as handle:
+        start = 0
+        while start < size:
+            handle.seek(min(start + chunk_bytes, size))
+            handle.readline()
+            end = min(handle.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _format_byte_range(
+    path: str, start: int, end: int, fmt: str, ranks: frozenset[str] | None
+) -> tuple[str, int]:
+    with Path(path).open("rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start).decode("utf-8")
+    return format_rank_triples(data.splitlines(), fmt, ranks)
+
+
+def _parallel_chunks(
+    path: Path, fmt: str, ranks: frozenset[str] | None, workers: int
+) -> Iterator[tuple[str, int]]:
+    """Format byte ranges in worker processes, yielding results in file order.
+
+    At most ``2 * workers`` chunks are in flight, which bounds memory use.
+    """
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start, end in byte_ranges(path):
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(_format_byte_range, str(path), start, end, fmt, ranks))
+        while pending:
+            yield pending.popleft().result()
+
+
+def _open_output(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "wt", encoding="utf-8")
+    return path.open("w", encoding="utf-8", buffering=1024 * 1024)
+
+
+def write_rank_triples(
+    input_file: str | Path,
+    output_file: str | Path,
+    fmt: str = "turtle",
+    ranks: frozenset[str] | None = None,
+    workers: int = 1,
+) -> int:
+    """Stream nodes.dmp rank triples to ``output_file`` and return the triple count."""
+    input_path = Path(input_file)
+    if workers > 1 and input_path.suffix != ".gz":
+        chunks: Iterable[tuple[str, int]] = _parallel_chunks(input_path, fmt, ranks, workers)
+        handle = None
+    else:
+        handle = open_text(input_path)
+        chunks = (format_rank_triples(batch, fmt, ranks) for batch in iter_line_batches(handle))
+
+    total = 0
+    try:
+        with _open_output(Path(output_file)) as out:
+            if fmt == "turtle":
+                out.write(TURTLE_HEADER)
+            for text, count in chunks:
+                out.write(text)
+                total += count
+    finally:
+        if handle is not None:
+            handle.close()
+    return total
+
+
+def _infer_format(output_file: str) -> str:
+    name = output_file.removesuffix(".gz")
+    return "ntriples" if name.endswith(".nt") else "turtle"
 
 
 @click.command()
@@ -20,33 +170,48 @@ HAS_RANK_PREDICATE = URIRef("http://purl.obolibrary.org/obo/ncbitaxon#has_rank")
     "-i",
     type=click.Path(exists=True),
     required=True,
-    help="Path to nodes.dmp input file",
+    help="Path to nodes.dmp input file (plain or .gz)",
 )
 @click.option(
     "--output-file",
     "-o",
     type=click.Path(writable=True),
     required=True,
-    help="Path to output Turtle (.ttl) RDF file",
+    help="Path to output RDF file (.ttl or .nt, optionally .gz)",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["turtle", "ntriples"]),
+    default=None,
+    help="Output syntax (default: inferred from --output-file extension)",
+)
+@click.option(
+    "--rank",
+    "ranks",
+    multiple=True,
+    help="Only emit triples for this rank (repeatable; default: all except 'no rank')",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Parallel parser processes for uncompressed input (0 = CPU count)",
 )
-def extract_taxon_ranks(input_file, output_file):
+def extract_taxon_ranks(input_file, output_file, fmt, ranks, workers):
     """Extract RDF triples from NCBI nodes.dmp linking taxon IDs to textual ranks."""
-    g = Graph()
-
-    with Path(input_file).open(encoding="utf-8") as f:
-        lines = f.readlines()
-
-    for line in tqdm(lines, desc="Processing nodes.dmp"):
-        parts = [p.strip() for p in line.split("\t|\t")]
-        if len(parts) >= 3:
-            tax_id = parts[0]
-            rank = parts[2]
-            if rank and rank != "no rank":
-                subject = URIRef(f"{NCBI_TAXON_PREFIX}{tax_id}")
-                g.add((subject, HAS_RANK_PREDICATE, Literal(rank)))
-
-    g.serialize(destination=output_file, format="turtle")
-    click.echo(f"✅ RDF triples written to: {output_file}")
+    fmt = fmt or _infer_format(output_file)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    total = write_rank_triples(
+        input_file,
+        output_file,
+        fmt=fmt,
+        ranks=frozenset(ranks) if ranks else None,
+        workers=workers,
+    )
+    click.echo(f"✅ {total:,} RDF triples written to: {output_file}")
 
 
 if __name__ == "__main__":
@@ -4,9 +4,10 @@ import csv
 from pathlib import Path
 
 import click
-from pymongo import MongoClient
 from tqdm import tqdm
 
+from metpo.cli_common import profile_options, stage, telemetry_option
+
 
 def sanitize_field_name(field_name):
     """
@@ -60,6 +61,8 @@ def sanitize_field_name(field_name):
 @click.option("--collection", "-c", default="bactotraits", help="MongoDB collection name")
 @click.option("--drop/--no-drop", default=True, help="Drop existing collection before import")
 @click.option("--mongo-uri", default="mongodb://localhost:27017/", help="MongoDB connection URI")
+@profile_options()
+@telemetry_option()
 def import_bactotraits(input_file, database, collection, drop, mongo_uri):
     """
     Import BactoTraits TSV data into MongoDB.
@@ -86,6 +89,8 @@ def import_bactotraits(input_file, database, collection, drop, mongo_uri):
         uv run import-bactotraits
         uv run import-bactotraits --input-file /path/to/BactoTraits.tsv --no-drop
     """
+    from pymongo import MongoClient  # noqa: PLC0415
+
     click.echo("=" * 80)
     click.echo("BactoTraits MongoDB Import")
     click.echo("=" * 80)
@@ -118,7 +123,8 @@ def import_bactotraits(input_file, database, collection, drop, mongo_uri):
     # Drop collection if requested
     if drop:
         click.echo(f"Dropping existing collection '{collection}'...")
-        coll.drop()
+        with stage("drop collection"):
+            coll.drop()
         click.echo("✓ Collection dropped")
 
     # Read and process TSV file
@@ -148,7 +154,8 @@ def import_bactotraits(input_file, database, collection, drop, mongo_uri):
 
         # Count rows
         click.echo("\nCounting rows...")
-        row_count = sum(1 for _ in f)
+        with stage("count rows"):
+            row_count = sum(1 for _ in f)
         f.seek(0)
         next(reader)  # Skip header again
 
@@ -177,20 +184,23 @@ def import_bactotraits(input_file, database, collection, drop, mongo_uri):
 
             # Insert in batches
             if len(documents) >= batch_size:
-                coll.insert_many(documents)
+                with stage("insert batches", items=len(documents)):
+                    coll.insert_many(documents)
                 documents = []
 
         # Insert remaining documents
         if documents:
-            coll.insert_many(documents)
+            with stage("insert batches", items=len(documents)):
+                coll.insert_many(documents)
 
     click.echo(f"\n✓ Imported {row_count} documents")
 
     # Create indexes
     click.echo("\nCreating indexes...")
-    coll.create_index("Bacdive_ID")
-    coll.create_index("ncbitaxon_id")
-    coll.create_index([("Kingdom", 1), ("Phylum", 1), ("Class", 1)])
+    with stage("create indexes"):
+        coll.create_index("Bacdive_ID")
+        coll.create_index("ncbitaxon_id")
+        coll.create_index([("Kingdom", 1), ("Phylum", 1), ("Class", 1)])
     click.echo("✓ Created indexes on Bacdive_ID, ncbitaxon_id, and taxonomy fields")
 
     # Verify import
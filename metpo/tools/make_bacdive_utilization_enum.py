@@ -2,7 +2,6 @@ import re
 from pathlib import Path
 
 import click
-import pandas as pd
 import yaml
 
 
@@ -103,6 +102,8 @@ def convert_tsv_to_linkml_enum(
         LinkML YAML as string
     """
 
+    import pandas as pd  # noqa: PLC0415
+
     # Read the TSV file, skipping the first header row
     df = pd.read_csv(tsv_file, sep="\t", skiprows=[1])
 
@@ -161,6 +162,8 @@ def convert_tsv_to_linkml_enum(
 
 def print_summary_stats(tsv_file: str):
     """Print summary statistics about the TSV data."""
+    import pandas as pd  # noqa: PLC0415
+
     df = pd.read_csv(tsv_file, sep="\t", skiprows=[1])
 
     print("=== TSV File Summary ===")
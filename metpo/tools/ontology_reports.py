@@ -0,0 +1,51 @@
+"""Generate the METPO SPARQL reports natively from metpo.json.
+
+See metpo.utils.ontology_reports for the reports and their SPARQL equivalents.
+"""
+
+import time
+from pathlib import Path
+
+import click
+
+from metpo.utils.ontology_index import DEFAULT_ONTOLOGY_JSON, OntologyIndex
+from metpo.utils.ontology_reports import REPORT_WRITERS
+
+
+@click.command()
+@click.option(
+    "--metpo-json",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_ONTOLOGY_JSON,
+    show_default=True,
+    help="METPO OBO Graphs JSON",
+)
+@click.option(
+    "--report",
+    "-r",
+    "reports",
+    type=click.Choice(list(REPORT_WRITERS)),
+    multiple=True,
+    help="Report to generate (repeatable; default: all)",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("reports"),
+    show_default=True,
+    help="Directory the <report>.tsv files are written to",
+)
+def generate_ontology_reports(metpo_json: Path, reports: tuple[str, ...], output_dir: Path):
+    """Write synonym-sources, labels, xrefs and terms reports without ROBOT."""
+    start = time.perf_counter()
+    index = OntologyIndex.load(metpo_json)
+    for name in reports or REPORT_WRITERS:
+        path = output_dir / f"{name}.tsv"
+        rows = REPORT_WRITERS[name](index, path)
+        click.echo(f"  {path}: {rows} rows")
+    click.echo(f"✅ Reports written in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    generate_ontology_reports()
@@ -0,0 +1,123 @@
+"""Run the synthetic-scale benchmark suite and check it against a JSON baseline.
+
+Inputs are generated at ``--scale`` times the current data sizes, and the OLS,
+Ollama and BioPortal APIs are answered by local stand-ins (see
+metpo.benchmarks). Baselines live in benchmark-baselines/scale-<N>.json.
+The command exits non-zero when a benchmark's throughput drops, or its peak
+memory grows, by more than ``--tolerance``.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import click
+
+from metpo.benchmarks.suite import (
+    BENCHMARKS,
+    baseline_path,
+    compare,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+
+
+@click.command()
+@click.option(
+    "--bench",
+    "-b",
+    "names",
+    type=click.Choice(list(BENCHMARKS)),
+    multiple=True,
+    help="Benchmark to run (repeatable; default: all)",
+)
+@click.option(
+    "--scale",
+    type=float,
+    default=10,
+    show_default=True,
+    help="Input size as a multiple of the current data (e.g. 10, 100, 1000)",
+)
+@click.option(
+    "--latency-ms",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Delay the API stand-ins add to every request",
+)
+@click.option("--repeat", "-n", type=int, default=1, show_default=True, help="Runs per benchmark")
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Baseline JSON (default: benchmark-baselines/scale-<scale>.json)",
+)
+@click.option(
+    "--update-baseline",
+    is_flag=True,
+    help="Write these results to the baseline instead of checking",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.25,
+    show_default=True,
+    help="Allowed throughput drop / peak-memory growth as a fraction of the baseline",
+)
+@click.option(
+    "--work-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Keep generated inputs and command logs here (default: a temporary directory)",
+)
+@click.option(
+    "--json-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also write the results as JSON",
+)
+def run_benchmarks(
+    names, scale, latency_ms, repeat, baseline, update_baseline, tolerance, work_dir, json_output
+):
+    """Benchmark hot commands on synthetic data against local API stand-ins."""
+    names = list(names or BENCHMARKS)
+    baseline = baseline or baseline_path(scale)
+    click.echo(f"Running {len(names)} benchmark(s) at {scale:g}x, {latency_ms:g} ms API latency")
+    header = f"{'benchmark':<36} {'scale':>5} {'items':>10} {'wall s':>8} {'CPU s':>8} "
+    click.echo(header + f"{'peak MiB':>9} {'items/s':>12}")
+
+    def report(name: str, result: dict) -> None:
+        click.echo(
+            f"{name:<36} {result['scale']:>5g} {result['items']:>10} {result['wall_s']:>8.2f} "
+            f"{result['cpu_s']:>8.2f} {result['peak_rss_mib']:>9.1f} {result['items_per_s']:>12.1f}"
+        )
+
+    with tempfile.TemporaryDirectory(prefix="metpo-bench-") as tmp:
+        try:
+            results = run_suite(
+                names, scale, work_dir or Path(tmp), latency_ms / 1000, repeat, progress=report
+            )
+        except RuntimeError as e:
+            raise click.ClickException(str(e)) from e
+
+    if json_output:
+        json_output.write_text(json.dumps(results, indent=2) + "\n")
+        click.echo(f"✓ Wrote {json_output}")
+
+    if update_baseline:
+        save_baseline(results, baseline)
+        click.echo(f"✓ Updated baseline {baseline}")
+        return
+
+    recorded = load_baseline(baseline)
+    if recorded is None:
+        click.echo(f"No baseline at {baseline}; record one with --update-baseline")
+        return
+    regressions = compare(results, recorded, tolerance)
+    if regressions:
+        for message in regressions:
+            click.echo(f"✗ {message}", err=True)
+        raise click.ClickException(f"{len(regressions)} regression(s) against {baseline}")
+    click.echo(f"✓ Within {tolerance:.0%} of {baseline}")
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,127 @@
+"""Summarize a telemetry file written by ``--telemetry`` / ``METPO_TELEMETRY``.
+
+For each run: per-stage calls, items, wall time, items/s and p50/p95 stage
+durations; per-histogram count, p50, p95 and max latency (OLS searches,
+embedding requests, external ontology lookups); and the counters.
+"""
+
+import json
+from pathlib import Path
+
+import click
+
+from metpo.utils.telemetry import Histogram, read_runs
+
+
+def summarize_run(run_id: str, run: dict) -> dict:
+    """JSON-ready summary of one run folded by :func:`metpo.utils.telemetry.read_runs`."""
+    start, end = run["start"] or {}, run["end"]
+    stages = []
+    for span in run["spans"].values():
+        wall = span["wall"]
+        histogram = Histogram.from_dict(span["durations"])
+        stages.append(
+            {
+                "name": span["name"],
+                "depth": span["depth"],
+                "calls": span["calls"],
+                "items": span["items"],
+                "wall_s": wall,
+                "items_per_s": span["items"] / wall if wall else 0.0,
+                "p50_s": histogram.quantile(0.5),
+                "p95_s": histogram.quantile(0.95),
+            }
+        )
+    histograms = {
+        name: {
+            "count": histogram.count,
+            "p50_s": histogram.quantile(0.5),
+            "p95_s": histogram.quantile(0.95),
+            "max_s": histogram.max,
+        }
+        for name, histogram in sorted(run["histograms"].items())
+    }
+    return {
+        "run": run_id,
+        "command": start.get("command", ""),
+        "started": start.get("started", ""),
+        "status": end["status"] if end else "incomplete",
+        "wall_s": end["wall"] if end else None,
+        "stages": sorted(stages, key=lambda s: s["name"]),
+        "histograms": histograms,
+        "counters": dict(sorted(run["counters"].items())),
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+
+def print_summary(summary: dict) -> None:
+    wall = "" if summary["wall_s"] is None else f", {summary['wall_s']:.2f}s"
+    click.echo(
+        f"Run {summary['run']}: {summary['command'] or '?'} "
+        f"({summary['started']}, {summary['status']}{wall})"
+    )
+    if summary["stages"]:
+        click.echo(
+            f"  {'stage':<40} {'calls':>7} {'items':>9} {'wall':>9} {'items/s':>10} "
+            f"{'p50':>9} {'p95':>9}"
+        )
+        for s in summary["stages"]:
+            name = "  " * s["depth"] + s["name"].rsplit("/", 1)[-1]
+            click.echo(
+                f"  {name:<40} {s['calls']:>7} {s['items']:>9} {format_seconds(s['wall_s']):>9} "
+                f"{s['items_per_s']:>10.1f} {format_seconds(s['p50_s']):>9} "
+                f"{format_seconds(s['p95_s']):>9}"
+            )
+    if summary["histograms"]:
+        click.echo(f"  {'latency':<40} {'count':>7} {'p50':>9} {'p95':>9} {'max':>9}")
+        for name, h in summary["histograms"].items():
+            click.echo(
+                f"  {name:<40} {h['count']:>7} {format_seconds(h['p50_s']):>9} "
+                f"{format_seconds(h['p95_s']):>9} {format_seconds(h['max_s']):>9}"
+            )
+    if summary["counters"]:
+        click.echo(f"  {'counter':<40} {'value':>7}")
+        for name, value in summary["counters"].items():
+            click.echo(f"  {name:<40} {value:>7}")
+
+
+@click.command()
+@click.argument("telemetry_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--run", "run_ids", multiple=True, help="Only this run id (repeatable)")
+@click.option(
+    "--last",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Summarize the last N runs in the file (0 for all)",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the summaries as JSON")
+def summarize_telemetry(telemetry_file, run_ids, last, as_json):
+    """Report stage throughput and p50/p95 latencies from a telemetry file."""
+    with telemetry_file.open(encoding="utf-8") as f:
+        runs = read_runs(f)
+    if run_ids:
+        missing = [run_id for run_id in run_ids if run_id not in runs]
+        if missing:
+            raise click.ClickException(f"No run {', '.join(missing)} in {telemetry_file}")
+        selected = list(run_ids)
+    else:
+        selected = list(runs)[-last:] if last else list(runs)
+    summaries = [summarize_run(run_id, runs[run_id]) for run_id in selected]
+
+    if as_json:
+        click.echo(json.dumps(summaries, indent=2))
+        return
+    if not summaries:
+        click.echo(f"No runs in {telemetry_file}")
+    for i, summary in enumerate(summaries):
+        if i:
+            click.echo()
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    summarize_telemetry()
@@ -0,0 +1,66 @@
+"""Download all METPO Google Sheets concurrently, rewriting only changed files.
+
+See metpo.utils.sheet_sync for the manifest and change-detection details.
+"""
+
+from pathlib import Path
+
+import click
+
+from metpo.sheets_config import all_export_urls
+from metpo.utils.sheet_sync import DEFAULT_SHEETS_DIR, DEFAULT_WORKERS, sync_sheets
+
+
+@click.command()
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_SHEETS_DIR,
+    show_default=True,
+    help="Directory for the sheet TSVs and sync manifest",
+)
+@click.option(
+    "--sheet",
+    "-s",
+    "sheets",
+    type=click.Choice(list(all_export_urls())),
+    multiple=True,
+    help="Only sync this sheet (repeatable; default: all primary and secondary sheets)",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=DEFAULT_WORKERS,
+    show_default=True,
+    help="Maximum concurrent downloads",
+)
+@click.option(
+    "--print-changed",
+    is_flag=True,
+    help="Print only the paths of changed sheets, one per line (for scripting)",
+)
+def sync_metpo_sheets(output_dir: Path, sheets: tuple[str, ...], workers: int, print_changed: bool):
+    """Download METPO Google Sheets in parallel and record content hashes."""
+    results = sync_sheets(output_dir, sheets or None, workers=workers)
+
+    failed = [r for r in results if r.status == "failed"]
+    if print_changed:
+        for result in results:
+            if result.changed:
+                click.echo(result.path)
+    else:
+        for result in results:
+            detail = f" ({result.error})" if result.error else ""
+            click.echo(f"  {result.status:>9}  {result.path}{detail}")
+        changed = sum(r.changed for r in results)
+        click.echo(f"✅ {len(results)} sheets synced to {output_dir}: {changed} changed")
+
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} sheet(s) failed to download: {', '.join(r.name for r in failed)}"
+        )
+
+
+if __name__ == "__main__":
+    sync_metpo_sheets()
@@ -0,0 +1,230 @@
+"""Concurrent, cached chat completions against any OpenAI-compatible API.
+
+:class:`ChatClient` POSTs to ``{base_url}/chat/completions``, so the same code
+talks to OpenAI, a local server (Ollama, vLLM, llama.cpp) or the benchmark
+stand-in (see :mod:`metpo.benchmarks.stand_ins`). Rate-limit (429) and
+transient server errors are retried with exponential backoff, honouring
+``Retry-After``. While one worker backs off, the others wait too, so a rate
+limit is not hit again by every request in flight.
+
+:class:`ResponseCache` keeps answers in a JSON-lines file keyed by the model and
+a SHA-256 of the request (messages and sampling parameters). Each answer is
+appended and flushed as soon as it arrives. A killed run therefore loses only
+its in-flight requests, and a re-run after editing a prompt pays only for the
+prompts that changed.
+
+:func:`complete_many` runs requests on a thread pool with at most ``workers``
+in flight, and yields results as they finish.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+
+from metpo.utils import telemetry
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_CACHE = Path("local/llm_cache/chat_completions.jsonl")
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 5
+RETRY_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+TIMEOUT = 120
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class ChatCompletionError(Exception):
+    """A request that failed with a non-retryable status or after all retries."""
+
+
+def request_key(model: str, messages: list[dict], params: dict) -> str:
+    """Cache key: ``model:sha256`` of the canonical JSON of the request."""
+    body = json.dumps({"messages": messages, **params}, sort_keys=True, ensure_ascii=False)
+    return f"{model}:{hashlib.sha256(body.encode()).hexdigest()}"
+
+
+class ResponseCache:
+    """Append-only JSON-lines cache of completion texts; the last line for a key wins."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries: dict[str, str] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short when a run was killed
+                    if isinstance(entry.get("content"), str):
+                        self.entries[entry["key"]] = entry["content"]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> str | None:
+        return self.entries.get(key)
+
+    def put(self, key: str, content: str) -> None:
+        line = json.dumps({"key": key, "content": content}, ensure_ascii=False)
+        with self._lock:
+            self.entries[key] = content
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class ChatClient:
+    """Minimal OpenAI-compatible chat client with shared rate-limit backoff.
+
+    Args:
+        base_url: API root, e.g. ``https://api.openai.com/v1`` or ``http://localhost:11434/v1``
+        api_key: Bearer token (may be empty for local servers)
+        model: Model name sent with every request
+        retries: Extra attempts after a 429, a 5xx or a connection error
+        backoff: First retry delay in seconds; doubles per attempt up to ``MAX_BACKOFF``
+        timeout: Seconds to wait for each response
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        api_key: str = "",
+        model: str = "gpt-4",
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = RETRY_BACKOFF,
+        timeout: float = TIMEOUT,
+    ):
+        self.url = f"{base_url.rstrip('/')}/chat/completions"
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.model = model
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def _session(self) -> requests.Session:
+        # requests sessions are not thread-safe; keep one per worker
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _wait_for_backoff(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _back_off(self, attempt: int, retry_after: str | None) -> None:
+        try:
+            delay = float(retry_after) if retry_after else None
+        except ValueError:
+            delay = None
+        if delay is None:
+            # Jitter spreads out workers that were rate-limited together
+            delay = min(self.backoff * 2**attempt, MAX_BACKOFF) * (1 + random.random() / 2)
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def complete(self, messages: list[dict], **params) -> str:
+        """Return the text of the first choice.
+
+        Raises:
+            ChatCompletionError: On a non-retryable status, a malformed
+                response, an answer without text (such as a tool call or a
+                refusal), or when retries are exhausted
+        """
+        payload = {"model": self.model, "messages": messages, **params}
+        for attempt in range(self.retries + 1):
+            self._wait_for_backoff()
+            try:
+                with telemetry.timed("llm.request"):
+                    response = self._session().post(
+                        self.url, json=payload, headers=self.headers, timeout=self.timeout
+                    )
+            except requests.exceptions.RequestException as e:
+                if attempt == self.retries:
+                    raise ChatCompletionError(str(e)) from e
+                telemetry.count("llm.retries")
+                self._back_off(attempt, None)
+                continue
+            if response.status_code in RETRYABLE_STATUS and attempt < self.retries:
+                telemetry.count(
+                    "llm.rate_limited" if response.status_code == 429 else "llm.retries"
+                )
+                self._back_off(attempt, response.headers.get("Retry-After"))
+                continue
+            if response.status_code != 200:
+                msg = f"HTTP {response.status_code}: {response.text[:200]}"
+                raise ChatCompletionError(msg)
+            try:
+                message = response.json()["choices"][0]["message"]
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                raise ChatCompletionError(f"Malformed response: {response.text[:200]}") from e
+            content = message.get("content") if isinstance(message, dict) else None
+            if not isinstance(content, str):
+                raise ChatCompletionError(f"No text in response: {response.text[:200]}")
+            return content
+        raise ChatCompletionError("Retries exhausted")
+
+
+@dataclass
+class CompletionResult:
+    """The answer (or error) for one request of :func:`complete_many`."""
+
+    id: str
+    content: str | None
+    error: str | None = None
+    cached: bool = False
+
+
+def complete_many(
+    client: ChatClient,
+    requests_by_id: Iterable[tuple[str, list[dict]]],
+    cache: ResponseCache | None = None,
+    workers: int = DEFAULT_WORKERS,
+    **params,
+) -> Iterator[CompletionResult]:
+    """Complete ``(id, messages)`` pairs concurrently, in completion order.
+
+    Cached answers are yielded first without a request. New answers are added
+    to ``cache`` as they arrive; failures are yielded with ``error`` set and
+    are not cached, so a re-run retries them.
+    """
+    pending = []
+    for request_id, messages in requests_by_id:
+        key = request_key(client.model, messages, params)
+        content = cache.get(key) if cache is not None else None
+        if content is not None:
+            telemetry.count("llm.cache_hits")
+            yield CompletionResult(request_id, content, cached=True)
+        else:
+            pending.append((request_id, key, messages))
+    if not pending:
+        return
+
+    def run(request_id: str, key: str, messages: list[dict]) -> CompletionResult:
+        try:
+            content = client.complete(messages, **params)
+        except ChatCompletionError as e:
+            telemetry.count("llm.failures")
+            return CompletionResult(request_id, None, error=str(e))
+        if cache is not None:
+            cache.put(key, content)
+        return CompletionResult(request_id, content)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+        futures = [pool.submit(run, *job) for job in pending]
+        for future in as_completed(futures):
+            yield future.result()
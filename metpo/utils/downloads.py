@@ -0,0 +1,247 @@
+"""Resumable, checksummed streaming downloads with a per-host connection cap.
+
+Each download streams to ``<dest>.part`` in chunks, so memory use is
+constant regardless of file size. If the connection drops, the next
+attempt asks for the rest with an HTTP ``Range`` request, and a later run
+does the same. The ETag (or Last-Modified date) of the response that started
+the part file is kept beside it in ``<dest>.part.validator`` and sent as
+``If-Range``, so a resource that changed since answers 200 instead of
+bytes from the new version being spliced onto the old ones. Any 200 answer,
+including from a server that ignores ``Range``, restarts the part file from
+zero. The part file is renamed to ``dest`` only after the
+size (``Content-Length`` / ``Content-Range``) and any expected SHA-256 have
+been checked.
+
+:func:`download_many` runs several downloads on a thread pool, and
+:class:`HostLimiter` caps how many hit the same host at once.
+"""
+
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+
+from metpo.utils.files import file_sha256
+
+CHUNK_SIZE = 1024 * 1024
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 300
+DEFAULT_RETRIES = 3
+DEFAULT_PER_HOST = 2
+RETRY_BACKOFF = 1.0
+
+RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+    # Raised by response.raw while streaming
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.ReadTimeoutError,
+)
+
+
+class DownloadError(Exception):
+    """A download that cannot succeed by retrying (bad status, size or checksum)."""
+
+
+@dataclass
+class DownloadJob:
+    """One file to fetch."""
+
+    name: str
+    url: str
+    dest: Path
+    params: dict = field(default_factory=dict)
+    sha256: str | None = None
+    min_size: int = 0
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one download."""
+
+    name: str
+    path: Path
+    status: str  # downloaded, resumed, failed
+    size: int = 0
+    sha256: str = ""
+    resumed_from: int = 0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+class HostLimiter:
+    """Per-host semaphores limiting concurrent connections to ``per_host``."""
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+
+    def __call__(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.per_host)
+            return self._semaphores[host]
+
+
+def part_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + ".part")
+
+
+def validator_path(part: Path) -> Path:
+    return part.with_name(part.name + ".validator")
+
+
+def _discard_part(part: Path) -> None:
+    part.unlink(missing_ok=True)
+    validator_path(part).unlink(missing_ok=True)
+
+
+def _response_validator(response: requests.Response) -> str | None:
+    """The strong ETag, else Last-Modified, usable in ``If-Range``; weak ETags are not."""
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def _total_size(response: requests.Response, offset: int) -> int | None:
+    """Full size of the resource from Content-Range or Content-Length."""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length and length.isdigit() else None
+
+
+def _fetch_once(
+    session: requests.Session, job: DownloadJob, part: Path, timeout: tuple[float, float]
+) -> int:
+    """Stream the remaining bytes of ``job`` into ``part``; return the resource size.
+
+    Raises the requests exceptions in RETRYABLE_ERRORS when the connection
+    fails midway; whatever arrived stays in ``part`` for the next attempt.
+    """
+    offset = part.stat().st_size if part.exists() else 0
+    validator_file = validator_path(part)
+    # Ranges address the bytes on the wire, so ask for them unencoded
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        if validator_file.exists():
+            headers["If-Range"] = validator_file.read_text(encoding="utf-8")
+    with session.get(
+        job.url, params=job.params, headers=headers, stream=True, timeout=timeout
+    ) as response:
+        if response.status_code == 416 and offset:
+            # Nothing left to send: complete if the part already has every byte
+            total = _total_size(response, offset)
+            if total == offset:
+                return offset
+            _discard_part(part)
+            raise requests.exceptions.ConnectionError("Range not satisfiable; restarting")
+        if response.status_code >= 400:
+            raise DownloadError(f"HTTP {response.status_code} for {job.url}")
+        if response.status_code != 206:
+            # Range ignored, or If-Range saw a changed resource: start over
+            offset = 0
+            validator = _response_validator(response)
+            if validator:
+                validator_file.write_text(validator, encoding="utf-8")
+            else:
+                validator_file.unlink(missing_ok=True)
+        total = _total_size(response, offset)
+        with part.open("r+b" if offset else "wb") as handle:
+            handle.seek(offset)
+            handle.truncate()
+            # read1 returns whatever has arrived, so bytes received before a
+            # dropped connection are kept for the next attempt
+            while chunk := response.raw.read1(CHUNK_SIZE):
+                handle.write(chunk)
+    size = part.stat().st_size
+    if total is not None and size < total:
+        raise requests.exceptions.ChunkedEncodingError(f"Connection closed at {size}/{total}")
+    if total is not None and size != total:
+        raise DownloadError(f"Size mismatch: got {size} bytes, expected {total}")
+    return size
+
+
+def download(
+    job: DownloadJob,
+    session: requests.Session | None = None,
+    retries: int = DEFAULT_RETRIES,
+    timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    backoff: float = RETRY_BACKOFF,
+) -> DownloadResult:
+    """Download ``job.url`` to ``job.dest``, resuming any partial file.
+
+    Up to ``retries`` extra attempts are made after connection errors, each
+    continuing from the bytes already on disk. Returns a failed result, and
+    never raises, on HTTP errors, size or checksum mismatches, or when
+    retries are exhausted. The part file is kept after connection failures
+    only, so a later run can resume it.
+    """
+    dest = Path(job.dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = part_path(dest)
+    resumed_from = part.stat().st_size if part.exists() else 0
+    session = session or requests.Session()
+    try:
+        for attempt in range(retries + 1):
+            try:
+                size = _fetch_once(session, job, part, timeout)
+                break
+            except RETRYABLE_ERRORS:
+                if attempt == retries:
+                    raise
+                time.sleep(backoff * 2**attempt)
+        if size < job.min_size:
+            raise DownloadError(f"File too small ({size} bytes)")
+        digest = file_sha256(part)
+        if job.sha256 and digest != job.sha256.lower():
+            raise DownloadError(f"SHA-256 mismatch: got {digest}, expected {job.sha256}")
+    except DownloadError as e:
+        _discard_part(part)
+        return DownloadResult(job.name, dest, "failed", error=str(e))
+    except (requests.exceptions.RequestException, *RETRYABLE_ERRORS) as e:
+        return DownloadResult(job.name, dest, "failed", error=str(e))
+    part.replace(dest)
+    validator_path(part).unlink(missing_ok=True)
+    status = "resumed" if resumed_from else "downloaded"
+    return DownloadResult(job.name, dest, status, size, digest, resumed_from)
+
+
+def download_many(
+    jobs: Iterable[DownloadJob],
+    workers: int = 4,
+    per_host: int = DEFAULT_PER_HOST,
+    **kwargs,
+) -> list[DownloadResult]:
+    """Run downloads concurrently, at most ``per_host`` at a time against one host.
+
+    Extra keyword arguments go to :func:`download`. Results are returned in
+    job order.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    limiter = HostLimiter(per_host)
+
+    def run(job: DownloadJob) -> DownloadResult:
+        with limiter(job.url), requests.Session() as session:
+            return download(job, session=session, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as pool:
+        return list(pool.map(run, jobs))
@@ -0,0 +1,98 @@
+"""File fingerprints and atomic writes shared by METPO's caches and manifests.
+
+A fingerprint records the size, mtime and SHA-256 of one version of a file.
+A later check first compares size and mtime, which costs one ``stat``, and
+only rehashes when the mtime moved but the size did not (a touched but
+identical file still matches).
+
+Caches, manifests and reports are written through :func:`atomic_open` or
+:func:`write_atomic`: the content goes to ``<name>.tmp`` next to the target,
+which then replaces it, so an interrupted run never leaves a truncated file.
+"""
+
+import hashlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+READ_BLOCK = 1024 * 1024
+
+
+def file_sha256(path: str | Path) -> str:
+    """SHA-256 hex digest of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for block in iter(lambda: handle.read(READ_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str | Path, count_lines: bool = False) -> dict:
+    """Return the size, mtime and SHA-256 that identify one version of a file.
+
+    With ``count_lines`` the same read also counts lines (a final line without
+    a newline still counts) and stores them under ``"lines"``.
+    """
+    path = Path(path)
+    stat = path.stat()
+    digest = hashlib.sha256()
+    lines = 0
+    last = b"\n"
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(READ_BLOCK), b""):
+            digest.update(block)
+            if count_lines:
+                lines += block.count(b"\n")
+                last = block[-1:]
+    result = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+    if count_lines:
+        result["lines"] = lines + (last != b"\n")
+    return result
+
+
+def is_unchanged(path: str | Path, recorded: dict | None, rehash: bool = True) -> bool:
+    """Whether ``path`` is still the version described by a recorded fingerprint.
+
+    Size and mtime are compared first. When only the mtime differs the file
+    is rehashed, unless ``rehash`` is False, in which case it counts as changed.
+    """
+    if not recorded:
+        return False
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return False
+    if stat.st_size != recorded.get("size"):
+        return False
+    if stat.st_mtime_ns == recorded.get("mtime_ns"):
+        return True
+    return rehash and recorded.get("sha256") == file_sha256(path)
+
+
+@contextmanager
+def atomic_open(path: str | Path, mode: str = "w", **kwargs) -> Iterator[IO]:
+    """Open ``<path>.tmp`` for writing and move it over ``path`` once the block succeeds.
+
+    Parent directories are created. Extra arguments go to :func:`open`
+    (for example ``encoding`` or ``newline``). If the block raises, the
+    temporary file is removed and ``path`` is left as it was.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with tmp.open(mode, **kwargs) as handle:
+            yield handle
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path: str | Path, data: str | bytes, encoding: str = "utf-8") -> None:
+    """Replace ``path`` with ``data`` (text is encoded with ``encoding``) atomically."""
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    with atomic_open(path, "wb") as handle:
+        handle.write(data)
@@ -0,0 +1,208 @@
+"""Read METPO templates from git history through long-lived ``git cat-file`` processes.
+
+Release audits look at every template at every tag. Running ``git show`` once
+per (tag, template) pair costs a process spawn each time, and the same blob is
+parsed again for every tag that did not touch the template. This module
+instead:
+
+1. Resolves each ``<ref>:<path>`` to its blob SHA with one ``git cat-file
+   --batch-check`` process.
+2. Reads the contents of unseen blobs through one ``git cat-file --batch``
+   process.
+3. Caches the parsed IDs and rows per blob SHA in a JSON file. Blobs are
+   immutable, so cache entries never go stale. A template version is parsed
+   once, however many tags contain it.
+"""
+
+import contextlib
+import json
+import re
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from metpo.utils.files import write_atomic
+
+GIT_TEMPLATE_CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path("local/git_template_cache.json")
+
+_METPO_ID = re.compile(r"METPO:(\d+)")
+
+
+@dataclass
+class TemplateSnapshot:
+    """IDs and METPO rows of one template blob."""
+
+    blob: str
+    ids: set[str]  # numeric IDs of lines starting with METPO:<digits>
+    rows: list[tuple[str, str, str]]  # (ID cell, label, TYPE cell) of METPO: rows
+
+    def label(self, numeric_id: str) -> str:
+        """Return the label of ``METPO:<numeric_id>``, or "" if absent."""
+        curie = f"METPO:{numeric_id}"
+        for row_id, label, _row_type in self.rows:
+            if row_id == curie:
+                return label
+        return ""
+
+
+def parse_template(blob: str, text: str) -> TemplateSnapshot:
+    """Extract METPO IDs and (ID, label, TYPE) rows from template text."""
+    ids: set[str] = set()
+    rows: list[tuple[str, str, str]] = []
+    for line in text.splitlines():
+        match = _METPO_ID.match(line)
+        if match:
+            ids.add(match.group(1))
+        parts = line.split("\t")
+        row_id = parts[0].strip()
+        if row_id.startswith("METPO:"):
+            label = parts[1].strip() if len(parts) > 1 else ""
+            row_type = parts[2].strip() if len(parts) > 2 else ""
+            rows.append((row_id, label, row_type))
+    return TemplateSnapshot(blob, ids, rows)
+
+
+class GitTemplateHistory:
+    """Blob-SHA-cached reader for templates at arbitrary git refs.
+
+    Use as a context manager; the git processes are started lazily and the
+    cache file is written on close if anything new was parsed.
+    """
+
+    def __init__(self, repo_root: str | Path, cache_path: str | Path | None = DEFAULT_CACHE_PATH):
+        self.repo_root = Path(repo_root)
+        self.cache_path = None
+        if cache_path is not None:
+            cache_path = Path(cache_path)
+            self.cache_path = (
+                cache_path if cache_path.is_absolute() else self.repo_root / cache_path
+            )
+        self._blobs: dict[str, TemplateSnapshot] = {}
+        self._dirty = False
+        self._check: subprocess.Popen | None = None
+        self._batch: subprocess.Popen | None = None
+        self.blobs_read = 0
+        self._load_cache()
+
+    def _load_cache(self) -> None:
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        if data.get("version") != GIT_TEMPLATE_CACHE_VERSION:
+            return
+        for blob, entry in data["blobs"].items():
+            rows = [tuple(row) for row in entry["rows"]]
+            self._blobs[blob] = TemplateSnapshot(blob, set(entry["ids"]), rows)
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None or not self._dirty:
+            return
+        data = {
+            "version": GIT_TEMPLATE_CACHE_VERSION,
+            "blobs": {
+                blob: {"ids": sorted(snap.ids), "rows": [list(row) for row in snap.rows]}
+                for blob, snap in sorted(self._blobs.items())
+            },
+        }
+        write_atomic(self.cache_path, json.dumps(data, separators=(",", ":")) + "\n")
+        self._dirty = False
+
+    def _spawn(self, mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=self.repo_root,
+        )
+
+    @staticmethod
+    def _request(proc: subprocess.Popen, spec: str) -> tuple[IO[bytes], list[str]]:
+        """Send one object spec and return stdout with the split header line.
+
+        A process that has exited (e.g. ``git cat-file`` outside a git
+        checkout) yields an empty header instead of raising BrokenPipeError.
+        """
+        assert proc.stdin is not None
+        assert proc.stdout is not None
+        if proc.poll() is not None:
+            return proc.stdout, []
+        try:
+            proc.stdin.write(spec.encode("utf-8") + b"\n")
+            proc.stdin.flush()
+        except OSError:
+            return proc.stdout, []
+        return proc.stdout, proc.stdout.readline().decode("utf-8").split()
+
+    def resolve(self, ref: str, path: str) -> str | None:
+        """Return the blob SHA of ``path`` at ``ref``, or None if it does not exist there.
+
+        Outside a git checkout nothing resolves, so callers fall back to files.
+        """
+        if self._check is None:
+            self._check = self._spawn("--batch-check")
+        _, header = self._request(self._check, f"{ref}:{path}")
+        if len(header) != 3 or header[1] != "blob":
+            return None
+        return header[0]
+
+    def _read_blob(self, blob: str) -> str:
+        if self._batch is None:
+            self._batch = self._spawn("--batch")
+        stdout, header = self._request(self._batch, blob)
+        if len(header) != 3:
+            raise ValueError(f"git cat-file could not read blob {blob}: {' '.join(header)}")
+        content = stdout.read(int(header[2]))
+        stdout.read(1)  # trailing newline after the object contents
+        self.blobs_read += 1
+        return content.decode("utf-8", errors="replace")
+
+    def read_text(self, ref: str, path: str) -> tuple[str, str] | None:
+        """Return ``(blob_sha, text)`` of ``path`` at ``ref``, or None if it does not exist."""
+        blob = self.resolve(ref, path)
+        if blob is None:
+            return None
+        return blob, self._read_blob(blob)
+
+    def snapshot(self, ref: str, path: str) -> TemplateSnapshot | None:
+        """Return the parsed template at ``ref:path``, or None if it does not exist."""
+        blob = self.resolve(ref, path)
+        if blob is None:
+            return None
+        snap = self._blobs.get(blob)
+        if snap is None:
+            snap = parse_template(blob, self._read_blob(blob))
+            self._blobs[blob] = snap
+            self._dirty = True
+        return snap
+
+    def tags(self) -> list[str]:
+        """Return tags ordered by creation date (oldest first)."""
+        result = subprocess.run(
+            ["git", "tag", "--sort=creatordate"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=self.repo_root,
+        )
+        return [tag.strip() for tag in result.stdout.splitlines() if tag.strip()]
+
+    def close(self) -> None:
+        """Stop the git processes and persist newly parsed blobs."""
+        for proc in (self._check, self._batch):
+            if proc is not None:
+                assert proc.stdin is not None
+                assert proc.stdout is not None
+                with contextlib.suppress(BrokenPipeError):
+                    proc.stdin.close()
+                proc.wait()
+                proc.stdout.close()
+        self._check = self._batch = None
+        self._save_cache()
+
+    def __enter__(self) -> "GitTemplateHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,163 @@
+"""Weighted keyword-group scoring loaded from a YAML config.
+
+A config declares keyword *groups*, ordered *rules* over those groups, and
+score *categories* (see metpo/pipeline/ontology_relevance.yaml). Scoring is
+split into two steps so weights can be tuned without re-reading text:
+
+1. :meth:`KeywordScorer.match` turns a document into a bitmask of the
+   groups it matched. Every distinct keyword is tested once per document,
+   whichever groups share it, with CPython's substring search.
+2. :meth:`KeywordScorer.score_mask` applies the rules to a bitmask and a
+   count, returning ``(category, score, reason)``.
+
+For repeated scoring (tuning weights over a large catalog), match once with
+:meth:`match_many`, then call :meth:`score_masks` after each config change.
+Only integer operations remain at that point.
+
+We also tried a pure-Python Aho-Corasick automaton. For a few dozen keywords
+over descriptions of a few hundred characters, it was about twice as slow
+as one C-level ``in`` test per distinct keyword, so matching uses the
+latter.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+
+@dataclass(frozen=True)
+class ScoringRule:
+    """One weighted rule; conditions left as None are not checked."""
+
+    reason: str
+    weight: int = 0
+    all_of: int = 0  # bitmask of groups that must all match
+    none_of: int = 0  # bitmask of groups that must not match
+    count_above: int | None = None
+    count_at_least: int | None = None
+    count_below: int | None = None
+    score_at_least: int | None = None
+    score_below: int | None = None
+
+    def applies(self, mask: int, count: int, score: int) -> bool:
+        return (
+            mask & self.all_of == self.all_of
+            and not mask & self.none_of
+            and (self.count_above is None or count > self.count_above)
+            and (self.count_at_least is None or count >= self.count_at_least)
+            and (self.count_below is None or count < self.count_below)
+            and (self.score_at_least is None or score >= self.score_at_least)
+            and (self.score_below is None or score < self.score_below)
+        )
+
+
+class KeywordScorer:
+    """Compiled keyword groups, rules and categories.
+
+    Args:
+        groups: Group name -> keywords (matched as lower-case substrings)
+        rules: Rule dicts with ``reason``, ``weight``, ``all``/``none`` group
+            lists and optional count/score bounds (see :class:`ScoringRule`)
+        categories: ``{"name", "min_score"?, "max_score"?}`` dicts, first match wins
+        default_category: Category when no bounds match
+        no_match_reason: Reason when no rule fires
+
+    Raises:
+        ValueError: If a rule names an unknown group
+    """
+
+    def __init__(
+        self,
+        groups: Mapping[str, Iterable[str]],
+        rules: Iterable[Mapping],
+        categories: Iterable[Mapping] = (),
+        default_category: str = "uncategorized",
+        no_match_reason: str = "no keywords matched",
+    ):
+        self.group_names = list(groups)
+        bits = {name: 1 << i for i, name in enumerate(self.group_names)}
+        keyword_masks: dict[str, int] = {}
+        for name, keywords in groups.items():
+            for keyword in map(str.lower, keywords):
+                keyword_masks[keyword] = keyword_masks.get(keyword, 0) | bits[name]
+        self._keywords = tuple(keyword_masks.items())
+
+        def group_mask(names: Iterable[str]) -> int:
+            unknown = [name for name in names if name not in bits]
+            if unknown:
+                raise ValueError(f"Unknown keyword group(s) in rule: {', '.join(unknown)}")
+            return sum(bits[name] for name in set(names))
+
+        self.rules = [
+            ScoringRule(
+                reason=rule["reason"],
+                weight=rule.get("weight", 0),
+                all_of=group_mask(rule.get("all", [])),
+                none_of=group_mask(rule.get("none", [])),
+                count_above=rule.get("count_above"),
+                count_at_least=rule.get("count_at_least"),
+                count_below=rule.get("count_below"),
+                score_at_least=rule.get("score_at_least"),
+                score_below=rule.get("score_below"),
+            )
+            for rule in rules
+        ]
+        self.categories = [
+            (category["name"], category.get("min_score"), category.get("max_score"))
+            for category in categories
+        ]
+        self.default_category = default_category
+        self.no_match_reason = no_match_reason
+
+    @classmethod
+    def from_config(cls, path: str | Path) -> "KeywordScorer":
+        """Load a scorer from a YAML config file."""
+        with Path(path).open(encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        return cls(
+            config["groups"],
+            config["rules"],
+            config.get("categories", ()),
+            config.get("default_category", "uncategorized"),
+            config.get("no_match_reason", "no keywords matched"),
+        )
+
+    def match(self, text: str) -> int:
+        """Bitmask of the groups with at least one keyword in ``text``."""
+        text = text.lower()
+        mask = 0
+        for keyword, groups in self._keywords:
+            if keyword in text:
+                mask |= groups
+        return mask
+
+    def match_many(self, texts: Iterable[str]) -> list[int]:
+        return [self.match(text) for text in texts]
+
+    def category(self, score: int) -> str:
+        for name, min_score, max_score in self.categories:
+            if (min_score is None or score >= min_score) and (
+                max_score is None or score <= max_score
+            ):
+                return name
+        return self.default_category
+
+    def score_mask(self, mask: int, count: int = 0) -> tuple[str, int, str]:
+        """Apply the rules in order to a group bitmask; return (category, score, reason)."""
+        score = 0
+        reasons = []
+        for rule in self.rules:
+            if rule.applies(mask, count, score):
+                score += rule.weight
+                reasons.append(rule.reason)
+        return self.category(score), score, "; ".join(reasons) or self.no_match_reason
+
+    def score(self, text: str, count: int = 0) -> tuple[str, int, str]:
+        return self.score_mask(self.match(text), count)
+
+    def score_masks(
+        self, masks: Iterable[int], counts: Iterable[int]
+    ) -> list[tuple[str, int, str]]:
+        return [self.score_mask(mask, count) for mask, count in zip(masks, counts, strict=True)]
@@ -0,0 +1,281 @@
+"""Offline NCBI Taxonomy index built from a taxdump (``nodes.dmp`` / ``names.dmp``).
+
+The index is a directory of flat, array-backed tables addressed directly by
+tax_id, so that loading it is just a handful of ``mmap`` calls:
+
+    parent.u32       parent tax_id per tax_id (0 = tax_id not present)
+    rank.u8          rank code per tax_id (see ``ranks.txt``)
+    name_offset.u32  byte offset of the scientific name in ``names.bin``
+    names.bin        newline-terminated UTF-8 scientific names
+    merged_from.u32  sorted old tax_ids from ``merged.dmp`` (optional)
+    merged_to.u32    replacement tax_id for each ``merged_from`` entry
+    ranks.txt        rank vocabulary, one per line, indexed by rank code
+    meta.json        format version, item size, byte order and counts
+
+Build once with ``build-taxonomy-index`` and reuse it for lookups, lineage and
+rank queries without network access.
+See https://ftp.ncbi.nlm.nih.gov/pub/taxonomy/taxdump_readme.txt
+"""
+
+import gzip
+import json
+import mmap
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Literal
+
+INDEX_FORMAT_VERSION = 1
+
+DMP_FIELD_SEPARATOR = "\t|\t"
+DMP_LINE_TERMINATOR = "\t|"
+
+# Guard against cycles in malformed dumps; real NCBI lineages are < 100 deep.
+MAX_LINEAGE_DEPTH = 256
+
+
+def open_text(path: str | Path) -> IO[str]:
+    """Open a plain or gzip-compressed text file for line-by-line reading."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def split_dmp_line(line: str) -> list[str]:
+    """Split one taxdump line (``a\\t|\\tb\\t|``) into stripped fields."""
+    line = line.rstrip("\n")
+    line = line.removesuffix(DMP_LINE_TERMINATOR)
+    return [field.strip() for field in line.split(DMP_FIELD_SEPARATOR)]
+
+
+def iter_dmp_rows(path: str | Path) -> Iterator[list[str]]:
+    """Stream the fields of every row of a ``.dmp`` file (optionally gzipped)."""
+    with open_text(path) as handle:
+        for line in handle:
+            if line.strip():
+                yield split_dmp_line(line)
+
+
+def _grow(table: array, size: int) -> None:
+    """Zero-extend ``table`` so that ``table[size - 1]`` is addressable."""
+    missing = size - len(table)
+    if missing > 0:
+        table.frombytes(bytes(missing * table.itemsize))
+
+
+def build_index(
+    nodes_dmp: str | Path,
+    names_dmp: str | Path,
+    index_dir: str | Path,
+    merged_dmp: str | Path | None = None,
+) -> dict:
+    """Build an on-disk taxonomy index from taxdump files.
+
+    Args:
+        nodes_dmp: Path to ``nodes.dmp`` (plain or ``.gz``)
+        names_dmp: Path to ``names.dmp`` (plain or ``.gz``)
+        index_dir: Directory to write the index tables into (created if needed)
+        merged_dmp: Optional path to ``merged.dmp`` for retired tax_id redirects
+
+    Returns:
+        The metadata dict written to ``meta.json``
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    parent = array("I")
+    rank = array("B")
+    rank_codes: dict[str, int] = {"": 0}
+    node_count = 0
+
+    for fields in iter_dmp_rows(nodes_dmp):
+        if len(fields) < 3:
+            continue
+        tax_id = int(fields[0])
+        _grow(parent, tax_id + 1)
+        _grow(rank, tax_id + 1)
+        parent[tax_id] = int(fields[1])
+        code = rank_codes.setdefault(fields[2], len(rank_codes))
+        if code > 255:
+            raise ValueError(f"More than 255 distinct ranks in {nodes_dmp}")
+        rank[tax_id] = code
+        node_count += 1
+
+    name_offset = array("I", [0]) * len(parent)
+    name_count = 0
+    with (index_dir / "names.bin").open("wb") as names_out:
+        # Offset 0 is reserved for "no name" so a zero entry stays unambiguous.
+        names_out.write(b"\n")
+        offset = 1
+        for fields in iter_dmp_rows(names_dmp):
+            if len(fields) < 4 or fields[3] != "scientific name":
+                continue
+            tax_id = int(fields[0])
+            if tax_id >= len(parent):
+                continue
+            encoded = fields[1].encode("utf-8") + b"\n"
+            names_out.write(encoded)
+            name_offset[tax_id] = offset
+            offset += len(encoded)
+            name_count += 1
+
+    merged_pairs: list[tuple[int, int]] = []
+    if merged_dmp is not None and Path(merged_dmp).exists():
+        merged_pairs = sorted(
+            (int(fields[0]), int(fields[1]))
+            for fields in iter_dmp_rows(merged_dmp)
+            if len(fields) >= 2
+        )
+
+    tables = {
+        "parent.u32": parent,
+        "rank.u8": rank,
+        "name_offset.u32": name_offset,
+        "merged_from.u32": array("I", [old for old, _ in merged_pairs]),
+        "merged_to.u32": array("I", [new for _, new in merged_pairs]),
+    }
+    for filename, table in tables.items():
+        with (index_dir / filename).open("wb") as out:
+            table.tofile(out)
+
+    ranks_by_code = sorted(rank_codes, key=rank_codes.__getitem__)
+    (index_dir / "ranks.txt").write_text("\n".join(ranks_by_code) + "\n", encoding="utf-8")
+
+    meta = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "u32_itemsize": parent.itemsize,
+        "max_tax_id": len(parent) - 1,
+        "node_count": node_count,
+        "name_count": name_count,
+        "merged_count": len(merged_pairs),
+    }
+    (index_dir / "meta.json").write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+    return meta
+
+
+class TaxonomyIndex:
+    """Read-only, memory-mapped view of an index written by :func:`build_index`.
+
+    Opening the index maps the tables without reading them, so startup cost is
+    independent of taxonomy size; pages are faulted in as tax_ids are queried.
+    """
+
+    def __init__(self, index_dir: str | Path):
+        self.index_dir = Path(index_dir)
+        meta_path = self.index_dir / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No taxonomy index at {self.index_dir} (missing meta.json)")
+        self.meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if self.meta.get("format_version") != INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported taxonomy index format {self.meta.get('format_version')!r}; "
+                "rebuild it with build-taxonomy-index"
+            )
+        if self.meta["byteorder"] != sys.byteorder or self.meta["u32_itemsize"] != 4:
+            raise ValueError("Taxonomy index was built on an incompatible platform; rebuild it")
+
+        self._maps: list[mmap.mmap] = []
+        self._parent = self._map("parent.u32", "I")
+        self._rank = self._map("rank.u8", "B")
+        self._name_offset = self._map("name_offset.u32", "I")
+        self._merged_from = self._map("merged_from.u32", "I")
+        self._merged_to = self._map("merged_to.u32", "I")
+        self._names = self._map_raw("names.bin")
+        self.ranks = (self.index_dir / "ranks.txt").read_text(encoding="utf-8").split("\n")[:-1]
+
+    def _map_raw(self, filename: str) -> mmap.mmap | bytes:
+        with (self.index_dir / filename).open("rb") as handle:
+            if handle.seek(0, 2) == 0:
+                return b""
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _map(self, filename: str, typecode: Literal["B", "I"]) -> memoryview:
+        return memoryview(self._map_raw(filename)).cast(typecode)
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        for view in (
+            self._parent,
+            self._rank,
+            self._name_offset,
+            self._merged_from,
+            self._merged_to,
+        ):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps.clear()
+
+    def __enter__(self) -> "TaxonomyIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.meta["node_count"]
+
+    def __contains__(self, tax_id: int) -> bool:
+        return 0 < tax_id < len(self._parent) and self._parent[tax_id] != 0
+
+    def parent(self, tax_id: int) -> int | None:
+        """Return the parent tax_id, or None if ``tax_id`` is not in the index."""
+        if tax_id not in self:
+            return None
+        return self._parent[tax_id]
+
+    def rank(self, tax_id: int) -> str | None:
+        """Return the rank (e.g. ``species``), or None if ``tax_id`` is not in the index."""
+        if tax_id not in self:
+            return None
+        return self.ranks[self._rank[tax_id]]
+
+    def name(self, tax_id: int) -> str | None:
+        """Return the scientific name, or None if unknown."""
+        if tax_id not in self:
+            return None
+        start = self._name_offset[tax_id]
+        if start == 0:
+            return None
+        end = self._names.find(b"\n", start)
+        return self._names[start:end].decode("utf-8")
+
+    def merged_into(self, tax_id: int) -> int | None:
+        """Return the replacement tax_id if ``tax_id`` was merged, else None."""
+        pos = bisect_left(self._merged_from, tax_id)
+        if pos < len(self._merged_from) and self._merged_from[pos] == tax_id:
+            return self._merged_to[pos]
+        return None
+
+    def lookup(self, tax_id: int) -> tuple[str | None, str | None]:
+        """Return ``(scientific_name, rank)`` for a tax_id; ``(None, None)`` if absent."""
+        return self.name(tax_id), self.rank(tax_id)
+
+    def lineage(self, tax_id: int) -> list[int]:
+        """Return tax_ids from ``tax_id`` up to and including the root."""
+        lineage: list[int] = []
+        current = tax_id
+        while current in self and len(lineage) < MAX_LINEAGE_DEPTH:
+            lineage.append(current)
+            parent = self._parent[current]
+            if parent == current:
+                break
+            current = parent
+        return lineage
+
+    def ancestor_at_rank(self, tax_id: int, rank: str) -> int | None:
+        """Return the nearest ancestor (or self) with the given rank."""
+        for ancestor in self.lineage(tax_id):
+            if self.ranks[self._rank[ancestor]] == rank:
+                return ancestor
+        return None
+
+    def is_descendant(self, tax_id: int, ancestor_id: int) -> bool:
+        """Return True if ``ancestor_id`` is in the lineage of ``tax_id``."""
+        return ancestor_id in self.lineage(tax_id)
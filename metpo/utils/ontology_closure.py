@@ -0,0 +1,207 @@
+"""Precomputed transitive closure of an ontology hierarchy, stored as bitsets.
+
+Every node gets a dense integer. Its descendants and ancestors are each held
+as one Python ``int`` used as a bitset, where bit ``i`` stands for node ``i``.
+Both sets are filled in a single topological pass over the DAG: children
+before parents for descendants, parents before children for ancestors. A node
+with several parents simply ORs in each parent's set, so multiple inheritance
+needs no special handling.
+
+With the closure in place, the usual hierarchy questions become word-level
+bit operations:
+
+- descendants / leaf descendants of a node: ``desc & leaves``
+- subsumption: test one bit
+- how many leaves of each branch a set of terms covers: ``(desc & leaves & covered).bit_count()``
+
+Branch-level coverage over the whole ontology therefore costs one pass to
+build the closure plus one AND/popcount per (branch, source) pair. Before,
+every branch recomputed its descendants recursively.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+
+from metpo.utils.ontology_index import OntologyIndex
+
+
+def _bit_positions(bits: int) -> list[int]:
+    positions = []
+    while bits:
+        low = bits & -bits
+        positions.append(low.bit_length() - 1)
+        bits ^= low
+    return positions
+
+
+class ClosureIndex:
+    """Descendant and ancestor bitsets for every node of a DAG.
+
+    Args:
+        nodes: Node identifiers; their order defines the bit positions
+        parents: Direct parents of each node, aligned with ``nodes``.
+            Parents that are not in ``nodes`` are ignored.
+
+    Raises:
+        ValueError: If the hierarchy contains a cycle
+    """
+
+    def __init__(self, nodes: Sequence[str], parents: Sequence[Iterable[str]]):
+        self.nodes = list(nodes)
+        self._positions = {node: i for i, node in enumerate(self.nodes)}
+        if len(self._positions) != len(self.nodes):
+            raise ValueError("Closure nodes must be unique")
+        count = len(self.nodes)
+        self._parents: list[list[int]] = [[] for _ in range(count)]
+        self._children: list[list[int]] = [[] for _ in range(count)]
+        for child, node_parents in enumerate(parents):
+            for parent in dict.fromkeys(node_parents):
+                position = self._positions.get(parent)
+                if position is not None and position != child:
+                    self._parents[child].append(position)
+                    self._children[position].append(child)
+        self._descendants = self._propagate(self._children, self._parents)
+        self._ancestors = self._propagate(self._parents, self._children)
+        self.leaf_bits = sum(1 << i for i in range(count) if not self._children[i])
+
+    @classmethod
+    def from_ontology_index(
+        cls, index: OntologyIndex, terms: Iterable[str] | None = None
+    ) -> "ClosureIndex":
+        """Build the closure of ``terms`` (default: non-deprecated METPO classes).
+
+        Only hierarchy edges between the selected terms are kept.
+        """
+        nodes = list(index.terms() if terms is None else terms)
+        return cls(nodes, [index.parents(node) for node in nodes])
+
+    @classmethod
+    def from_children_map(
+        cls, children_map: Mapping[str, Iterable[str]], nodes: Iterable[str] | None = None
+    ) -> "ClosureIndex":
+        """Build the closure from a parent -> children mapping.
+
+        ``nodes`` fixes the node set and order; by default it is every node
+        mentioned in ``children_map``.
+        """
+        parents: dict[str, list[str]] = {}
+        for parent, children in children_map.items():
+            parents.setdefault(parent, [])
+            for child in children:
+                parents.setdefault(child, []).append(parent)
+        if nodes is None:
+            nodes = list(parents)
+        nodes = list(nodes)
+        return cls(nodes, [parents.get(node, []) for node in nodes])
+
+    def _propagate(self, below: list[list[int]], above: list[list[int]]) -> list[int]:
+        """OR each node's ``below`` neighbours (and their closure) into its bitset.
+
+        Nodes are visited once all their ``below`` neighbours are done (Kahn's
+        algorithm). If any node is never reached, the graph has a cycle.
+        """
+        closure = [0] * len(self.nodes)
+        pending = [len(nodes) for nodes in below]
+        ready = deque(i for i, remaining in enumerate(pending) if remaining == 0)
+        done = 0
+        while ready:
+            node = ready.popleft()
+            done += 1
+            bits = 0
+            for neighbour in below[node]:
+                bits |= closure[neighbour] | (1 << neighbour)
+            closure[node] = bits
+            for upper in above[node]:
+                pending[upper] -= 1
+                if pending[upper] == 0:
+                    ready.append(upper)
+        if done != len(self.nodes):
+            cyclic = [self.nodes[i] for i, remaining in enumerate(pending) if remaining]
+            raise ValueError(f"Hierarchy has a cycle involving: {', '.join(cyclic[:10])}")
+        return closure
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._positions
+
+    def position(self, node: str) -> int:
+        """Return the bit position of ``node`` (KeyError if absent)."""
+        return self._positions[node]
+
+    def bits(self, nodes: Iterable[str]) -> int:
+        """Return the bitset of ``nodes``, ignoring nodes outside the closure."""
+        bits = 0
+        for node in nodes:
+            position = self._positions.get(node)
+            if position is not None:
+                bits |= 1 << position
+        return bits
+
+    def members(self, bits: int) -> set[str]:
+        """Return the nodes whose bits are set."""
+        return {self.nodes[i] for i in _bit_positions(bits)}
+
+    def descendant_bits(self, node: str) -> int:
+        return self._descendants[self._positions[node]]
+
+    def ancestor_bits(self, node: str) -> int:
+        return self._ancestors[self._positions[node]]
+
+    def leaf_descendant_bits(self, node: str) -> int:
+        return self.descendant_bits(node) & self.leaf_bits
+
+    def descendants(self, node: str) -> set[str]:
+        """All proper descendants of ``node``."""
+        return self.members(self.descendant_bits(node))
+
+    def ancestors(self, node: str) -> set[str]:
+        """All proper ancestors of ``node``."""
+        return self.members(self.ancestor_bits(node))
+
+    def leaf_descendants(self, node: str) -> set[str]:
+        """Descendants of ``node`` that have no children."""
+        return self.members(self.leaf_descendant_bits(node))
+
+    def children(self, node: str) -> list[str]:
+        return [self.nodes[i] for i in self._children[self._positions[node]]]
+
+    def parents(self, node: str) -> list[str]:
+        return [self.nodes[i] for i in self._parents[self._positions[node]]]
+
+    def is_leaf(self, node: str) -> bool:
+        return not self._children[self._positions[node]]
+
+    def internal_nodes(self) -> list[str]:
+        """Nodes with at least one child, in node order."""
+        return [node for i, node in enumerate(self.nodes) if self._children[i]]
+
+    def subsumes(self, ancestor: str, descendant: str) -> bool:
+        """Whether ``descendant`` is a proper descendant of ``ancestor``."""
+        return bool(self.descendant_bits(ancestor) >> self._positions[descendant] & 1)
+
+    def branch_coverage(
+        self, branches: Mapping[str, int], covered: Mapping[str, Iterable[str]]
+    ) -> dict[str, dict[str, int]]:
+        """Count how many nodes of each branch every source covers.
+
+        Args:
+            branches: Branch name -> bitset of the nodes that make up the branch
+                (typically ``leaf_descendant_bits`` of the branch root)
+            covered: Source name (e.g. an ontology) -> nodes it covers;
+                nodes outside the closure are ignored
+
+        Returns:
+            Branch name -> {source: covered node count}, omitting zero counts
+        """
+        source_bits = {source: self.bits(nodes) for source, nodes in covered.items()}
+        coverage: dict[str, dict[str, int]] = {}
+        for branch, branch_bits in branches.items():
+            counts = {}
+            for source, bits in source_bits.items():
+                count = (branch_bits & bits).bit_count()
+                if count:
+                    counts[source] = count
+            coverage[branch] = counts
+        return coverage
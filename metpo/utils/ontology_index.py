@@ -0,0 +1,463 @@
+"""In-process METPO ontology index built from ``metpo.json`` (OBO Graphs).
+
+Analysis scripts need the same few things from METPO: labels, synonyms,
+definitions, xrefs, parents and deprecation status. Re-deriving those from the
+templates, or opening ``metpo.owl`` with pronto, costs seconds per script and
+gives slightly different answers depending on the source. ``OntologyIndex``
+reads the released ``metpo.json`` once and gives every term a dense integer.
+It keeps one parallel table per field.
+
+The tables are persisted to a binary cache laid out as below. The repository's
+``metpo.json`` is cached in ``local/metpo_index.bin``; any other source gets its
+own cache next to it (see :func:`cache_path_for`), so indexing a fixture or an
+older release never replaces the index other scripts share.
+
+    MAGIC               b"METPOIDX"
+    header length       4-byte big-endian unsigned int
+    header              JSON: format version, Python version, source
+                        size/mtime/SHA-256 and the (offset, length) of each field
+    field blobs         one ``marshal`` blob per field
+
+Loading a cache only parses the header. A field is unmarshalled from the
+memory-mapped file the first time it is used, so a script that only needs
+labels never decodes synonyms or definitions. The cache is rebuilt when the
+source ``metpo.json`` changes (the size and mtime are checked, then the
+SHA-256) or when it was written by another Python version, since the marshal
+format is only stable within one version.
+"""
+
+import contextlib
+import json
+import marshal
+import mmap
+import struct
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from metpo.utils.files import atomic_open, file_fingerprint, is_unchanged
+
+ONTOLOGY_INDEX_VERSION = 2
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_ONTOLOGY_JSON = _REPO_ROOT / "metpo.json"
+DEFAULT_INDEX_CACHE = _REPO_ROOT / "local" / "metpo_index.bin"
+AUTO_CACHE = "auto"  # OntologyIndex.load: use cache_path_for(source)
+
+MAGIC = b"METPOIDX"
+_HEADER_LENGTH = struct.Struct(">I")
+
+# Persisted per-term tables, all indexed by the dense term number.
+FIELDS = (
+    "ids",  # CURIE
+    "labels",  # rdfs:label ("" for terms without one)
+    "types",  # CLASS, PROPERTY, INDIVIDUAL ("" for terms only referenced by edges)
+    "deprecated",  # bytes, 1 for owl:deprecated terms
+    "definitions",  # IAO:0000115 text
+    "definition_sources",  # tuple of IAO:0000119 (or other source) values on the definition
+    "synonyms",  # tuple of (text, scope, sources, type, xrefs, derived_from) tuples
+    "xrefs",  # tuple of CURIEs
+    "parents",  # tuple of term numbers (is_a and subPropertyOf edges)
+)
+
+HIERARCHY_PREDICATES = {"is_a", "subPropertyOf"}
+DEFINITION_SOURCE_PRED = "http://purl.obolibrary.org/obo/IAO_0000119"
+# Axiom annotations read as the source of a definition or synonym.
+SOURCE_PREDS = {
+    DEFINITION_SOURCE_PRED,
+    "http://www.geneontology.org/formats/oboInOwl#source",
+    "http://purl.org/dc/terms/source",
+    "http://purl.org/dc/elements/1.1/source",
+}
+DERIVED_FROM_PRED = "http://www.w3.org/ns/prov#wasDerivedFrom"
+SYNONYM_SCOPES = {
+    "hasExactSynonym": "EXACT",
+    "hasRelatedSynonym": "RELATED",
+    "hasBroadSynonym": "BROAD",
+    "hasNarrowSynonym": "NARROW",
+}
+
+# IRI prefix -> CURIE prefix; OBO PURLs are handled separately (GO_0008152 -> GO:0008152).
+IRI_PREFIXES = {
+    "https://w3id.org/metpo/": "METPO:",
+    "http://www.geneontology.org/formats/oboInOwl#": "oboInOwl:",
+    "http://www.w3.org/2004/02/skos/core#": "skos:",
+    "http://purl.org/dc/terms/": "dcterms:",
+    "http://qudt.org/schema/qudt/": "qudt:",
+}
+OBO_PREFIX = "http://purl.obolibrary.org/obo/"
+
+
+class Synonym(NamedTuple):
+    """A synonym with its OBO scope and axiom annotations."""
+
+    text: str
+    scope: str
+    sources: tuple[str, ...]  # IAO:0000119 and other source annotations
+    synonym_type: str = ""
+    xrefs: tuple[str, ...] = ()
+    derived_from: tuple[str, ...] = ()
+
+
+def iri_to_curie(iri: str) -> str:
+    """Contract a METPO, OBO or known-vocabulary IRI to a CURIE (other IRIs are returned as-is)."""
+    if iri.startswith(OBO_PREFIX):
+        local = iri[len(OBO_PREFIX) :]
+        prefix, sep, rest = local.partition("_")
+        return f"{prefix}:{rest}" if sep and prefix.isalpha() else iri
+    for iri_prefix, curie_prefix in IRI_PREFIXES.items():
+        if iri.startswith(iri_prefix):
+            return curie_prefix + iri[len(iri_prefix) :]
+    return iri
+
+
+def curie_to_iri(curie: str) -> str:
+    """Expand a CURIE produced by :func:`iri_to_curie` back to its IRI."""
+    prefix, sep, local = curie.partition(":")
+    if not sep or local.startswith("//"):
+        return curie
+    for iri_prefix, curie_prefix in IRI_PREFIXES.items():
+        if curie_prefix == f"{prefix}:":
+            return iri_prefix + local
+    return f"{OBO_PREFIX}{prefix}_{local}"
+
+
+def cache_path_for(source: str | Path) -> Path:
+    """Default cache of ``source``: ``local/metpo_index.bin`` for the repository's
+    ``metpo.json``, otherwise ``<source>.index.bin`` beside the source file."""
+    source = Path(source).resolve()
+    if source == DEFAULT_ONTOLOGY_JSON.resolve():
+        return DEFAULT_INDEX_CACHE
+    return source.with_name(source.name + ".index.bin")
+
+
+def _annotations(meta: dict, preds: set[str]) -> tuple[str, ...]:
+    return tuple(
+        value["val"] for value in meta.get("basicPropertyValues", []) if value.get("pred") in preds
+    )
+
+
+def _sources(meta: dict) -> tuple[str, ...]:
+    return _annotations(meta, SOURCE_PREDS)
+
+
+def _synonym(syn: dict) -> tuple:
+    meta = syn.get("meta", {})
+    return (
+        syn["val"],
+        SYNONYM_SCOPES.get(syn.get("pred", ""), "RELATED"),
+        _sources(meta),
+        syn.get("synonymType", ""),
+        tuple(syn.get("xrefs", ())),
+        _annotations(meta, {DERIVED_FROM_PRED}),
+    )
+
+
+def _tables_from_graph(graph: dict) -> dict[str, object]:
+    """Flatten one OBO Graphs graph into the per-field tables."""
+    positions: dict[str, int] = {}
+    tables: dict[str, list] = {name: [] for name in FIELDS}
+
+    def add(iri: str, node: dict) -> int:
+        meta = node.get("meta", {})
+        definition = meta.get("definition", {})
+        positions[iri] = len(tables["ids"])
+        tables["ids"].append(iri_to_curie(iri))
+        tables["labels"].append(node.get("lbl", ""))
+        tables["types"].append(node.get("type", ""))
+        tables["deprecated"].append(1 if meta.get("deprecated") else 0)
+        tables["definitions"].append(definition.get("val", ""))
+        tables["definition_sources"].append(_sources(definition.get("meta", {})))
+        tables["synonyms"].append(tuple(_synonym(syn) for syn in meta.get("synonyms", [])))
+        tables["xrefs"].append(tuple(iri_to_curie(xref["val"]) for xref in meta.get("xrefs", [])))
+        tables["parents"].append([])
+        return positions[iri]
+
+    for node in graph.get("nodes", []):
+        if node["id"] not in positions:
+            add(node["id"], node)
+    for edge in graph.get("edges", []):
+        if edge.get("pred") not in HIERARCHY_PREDICATES:
+            continue
+        # Parents outside the graph (e.g. imported terms) become label-less stubs
+        child = positions.get(edge["sub"])
+        if child is None:
+            child = add(edge["sub"], {})
+        parent = positions.get(edge["obj"])
+        if parent is None:
+            parent = add(edge["obj"], {})
+        if parent not in tables["parents"][child]:
+            tables["parents"][child].append(parent)
+
+    fields: dict[str, object] = dict(tables)
+    fields["deprecated"] = bytes(tables["deprecated"])
+    fields["parents"] = [tuple(parents) for parents in tables["parents"]]
+    return fields
+
+
+class OntologyIndex:
+    """Dense, field-per-table view of an ontology, optionally backed by a memory-mapped cache.
+
+    Terms are addressed by CURIE in the public accessors; ``position`` and the
+    table properties (``ids``, ``labels``, ``parent_table`` ...) expose the dense
+    numbering for callers that want to work with integers directly.
+    """
+
+    def __init__(
+        self,
+        fields: dict[str, object] | None = None,
+        source: dict | None = None,
+        *,
+        buffer: mmap.mmap | None = None,
+        spans: dict[str, tuple[int, int]] | None = None,
+    ):
+        self.source = source or {}
+        self._fields: dict[str, Any] = dict(fields or {})
+        self._buffer = buffer
+        self._spans = spans or {}
+        self._positions: dict[str, int] | None = None
+        self._by_label: dict[str, list[str]] | None = None
+        self._children: list[tuple[int, ...]] | None = None
+
+    # -- construction and persistence ------------------------------------------------
+
+    @classmethod
+    def from_obographs(cls, path: str | Path = DEFAULT_ONTOLOGY_JSON) -> "OntologyIndex":
+        """Build an index from the first graph of an OBO Graphs JSON file."""
+        path = Path(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        graphs = data.get("graphs", [])
+        if not graphs:
+            raise ValueError(f"{path} contains no OBO Graphs graph")
+        source = {"path": str(path), **file_fingerprint(path)}
+        return cls(_tables_from_graph(graphs[0]), source)
+
+    def save(self, path: str | Path = DEFAULT_INDEX_CACHE) -> None:
+        """Write the index to a binary cache file (atomically)."""
+        path = Path(path)
+        blobs = [marshal.dumps(self._get(name)) for name in FIELDS]
+        spans, offset = {}, 0
+        for name, blob in zip(FIELDS, blobs, strict=True):
+            spans[name] = [offset, len(blob)]
+            offset += len(blob)
+        header = json.dumps(
+            {
+                "version": ONTOLOGY_INDEX_VERSION,
+                "python": list(sys.version_info[:2]),
+                "source": self.source,
+                "fields": spans,
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+        with atomic_open(path, "wb") as handle:
+            handle.write(MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+            for blob in blobs:
+                handle.write(blob)
+
+    @staticmethod
+    def read_header(path: str | Path) -> dict | None:
+        """Return the header of a cache file, or None if it is missing or not an index."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with path.open("rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                return None
+            (length,) = _HEADER_LENGTH.unpack(handle.read(_HEADER_LENGTH.size))
+            header = json.loads(handle.read(length))
+        header["data_offset"] = len(MAGIC) + _HEADER_LENGTH.size + length
+        return header
+
+    @classmethod
+    def open(cls, path: str | Path = DEFAULT_INDEX_CACHE) -> "OntologyIndex":
+        """Open a cache file; fields are unmarshalled lazily on first access."""
+        header = cls.read_header(path)
+        if header is None:
+            raise ValueError(f"{path} is not an ontology index")
+        if header.get("version") != ONTOLOGY_INDEX_VERSION:
+            raise ValueError(f"{path} has index format {header.get('version')}")
+        with Path(path).open("rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        base = header["data_offset"]
+        spans = {name: (base + off, length) for name, (off, length) in header["fields"].items()}
+        return cls(source=header["source"], buffer=buffer, spans=spans)
+
+    @classmethod
+    def load(
+        cls,
+        source: str | Path = DEFAULT_ONTOLOGY_JSON,
+        cache_path: str | Path | None = AUTO_CACHE,
+        rebuild: bool = False,
+    ) -> "OntologyIndex":
+        """Return the index for ``source``, reusing the cache when it is current.
+
+        Args:
+            source: OBO Graphs JSON file (default: the repository's metpo.json)
+            cache_path: Binary cache location, None to always build in memory,
+                or ``AUTO_CACHE`` for :func:`cache_path_for` the source
+            rebuild: Ignore an existing cache and rebuild it
+
+        Returns:
+            The index, memory-mapped from the cache when possible
+        """
+        source = Path(source)
+        if cache_path is None:
+            return cls.from_obographs(source)
+        cache_path = cache_path_for(source) if cache_path == AUTO_CACHE else Path(cache_path)
+        if not rebuild and cls.is_current(cache_path, source):
+            return cls.open(cache_path)
+        index = cls.from_obographs(source)
+        # A read-only directory beside the source only costs the cache
+        with contextlib.suppress(OSError):
+            index.save(cache_path)
+        return index
+
+    @classmethod
+    def is_current(cls, cache_path: str | Path, source: str | Path) -> bool:
+        """Whether the cache at ``cache_path`` was built from this version of ``source``."""
+        header = cls.read_header(cache_path)
+        if (
+            header is None
+            or header.get("version") != ONTOLOGY_INDEX_VERSION
+            or header.get("python") != list(sys.version_info[:2])
+        ):
+            return False
+        return is_unchanged(source, header.get("source"))
+
+    def close(self) -> None:
+        """Release the memory map of a cache-backed index (materialized fields stay usable)."""
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def _get(self, name: str) -> Any:
+        value = self._fields.get(name)
+        if value is None:
+            if name not in self._spans or self._buffer is None:
+                raise KeyError(f"Ontology index field {name!r} is not available")
+            offset, length = self._spans[name]
+            value = marshal.loads(self._buffer[offset : offset + length])
+            self._fields[name] = value
+        return value
+
+    # -- per-field tables ---------------------------------------------------------
+
+    @property
+    def ids(self) -> list[str]:
+        return self._get("ids")
+
+    @property
+    def labels(self) -> list[str]:
+        return self._get("labels")
+
+    @property
+    def types(self) -> list[str]:
+        return self._get("types")
+
+    @property
+    def deprecated(self) -> bytes:
+        return self._get("deprecated")
+
+    @property
+    def definitions(self) -> list[str]:
+        return self._get("definitions")
+
+    @property
+    def synonym_table(self) -> list[tuple[tuple, ...]]:
+        """Raw synonym tuples per term (see :class:`Synonym` for the layout)."""
+        return self._get("synonyms")
+
+    @property
+    def xref_table(self) -> list[tuple[str, ...]]:
+        return self._get("xrefs")
+
+    @property
+    def parent_table(self) -> list[tuple[int, ...]]:
+        return self._get("parents")
+
+    @property
+    def child_table(self) -> list[tuple[int, ...]]:
+        """Direct children per term, derived from the parent table on first use."""
+        if self._children is None:
+            children: list[list[int]] = [[] for _ in self.ids]
+            for child, parents in enumerate(self.parent_table):
+                for parent in parents:
+                    children[parent].append(child)
+            self._children = [tuple(c) for c in children]
+        return self._children
+
+    # -- lookups by CURIE ---------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, curie: object) -> bool:
+        return curie in self._position_map()
+
+    def _position_map(self) -> dict[str, int]:
+        if self._positions is None:
+            self._positions = {curie: i for i, curie in enumerate(self.ids)}
+        return self._positions
+
+    def position(self, curie: str) -> int:
+        """Return the dense term number of ``curie`` (KeyError if absent)."""
+        return self._position_map()[curie]
+
+    def label(self, curie: str) -> str:
+        return self.labels[self.position(curie)]
+
+    def type(self, curie: str) -> str:
+        return self.types[self.position(curie)]
+
+    def is_deprecated(self, curie: str) -> bool:
+        return bool(self.deprecated[self.position(curie)])
+
+    def definition(self, curie: str) -> str:
+        return self.definitions[self.position(curie)]
+
+    def definition_sources(self, curie: str) -> tuple[str, ...]:
+        return self._get("definition_sources")[self.position(curie)]
+
+    def synonyms(self, curie: str) -> list[Synonym]:
+        return [Synonym(*syn) for syn in self._get("synonyms")[self.position(curie)]]
+
+    def xrefs(self, curie: str) -> tuple[str, ...]:
+        return self._get("xrefs")[self.position(curie)]
+
+    def parents(self, curie: str) -> list[str]:
+        """Direct is_a / subPropertyOf parents of ``curie``."""
+        ids = self.ids
+        return [ids[p] for p in self.parent_table[self.position(curie)]]
+
+    def children(self, curie: str) -> list[str]:
+        """Direct is_a / subPropertyOf children of ``curie``."""
+        ids = self.ids
+        return [ids[c] for c in self.child_table[self.position(curie)]]
+
+    def ids_by_label(self, label: str) -> list[str]:
+        """Return the CURIEs whose rdfs:label is exactly ``label``."""
+        if self._by_label is None:
+            by_label: dict[str, list[str]] = {}
+            for curie, term_label in zip(self.ids, self.labels, strict=True):
+                if term_label:
+                    by_label.setdefault(term_label, []).append(curie)
+            self._by_label = by_label
+        return list(self._by_label.get(label, []))
+
+    def terms(
+        self,
+        term_type: str | None = "CLASS",
+        prefix: str | None = "METPO:",
+        include_deprecated: bool = False,
+    ) -> Iterator[str]:
+        """Iterate CURIEs in index order, filtered by type, CURIE prefix and deprecation."""
+        deprecated = self.deprecated
+        for i, (curie, kind) in enumerate(zip(self.ids, self.types, strict=True)):
+            if term_type is not None and kind != term_type:
+                continue
+            if prefix is not None and not curie.startswith(prefix):
+                continue
+            if deprecated[i] and not include_deprecated:
+                continue
+            yield curie
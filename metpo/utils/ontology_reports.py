@@ -0,0 +1,249 @@
+"""Native Python equivalents of the ROBOT SPARQL reports in ``src/sparql/``.
+
+``robot query`` starts a JVM and loads the whole OWL file for each report.
+That takes tens of seconds, even though all the reports read the same few
+annotations. This module builds them from the cached
+:class:`~metpo.utils.ontology_index.OntologyIndex` instead:
+
+- ``synonym-sources``: src/sparql/synonym-sources.sparql
+- ``labels``: src/sparql/labels.sparql
+- ``xrefs``: src/sparql/xrefs.sparql
+- ``terms``: src/sparql/terms.sparql (every entity IRI in the graph)
+
+Rows are written in ROBOT's TSV result format, with ``?var`` headers, IRIs in
+angle brackets and quoted literals. Existing report files and the code that
+reads them keep working. The reconcilers call :func:`load_synonym_sources`
+in-process and read either a report file or ``metpo.json`` directly.
+
+OBO Graphs does not keep language tags, so ``?lang`` is always empty.
+"""
+
+from collections.abc import Callable, Iterable
+from itertools import product
+from pathlib import Path
+from typing import NamedTuple
+
+from metpo.utils.files import atomic_open
+from metpo.utils.ontology_index import DEFAULT_ONTOLOGY_JSON, OntologyIndex, curie_to_iri
+
+RDFS_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+OBO_IN_OWL = "http://www.geneontology.org/formats/oboInOwl#"
+SCOPE_PREDICATES = {
+    "EXACT": f"{OBO_IN_OWL}hasExactSynonym",
+    "RELATED": f"{OBO_IN_OWL}hasRelatedSynonym",
+    "BROAD": f"{OBO_IN_OWL}hasBroadSynonym",
+    "NARROW": f"{OBO_IN_OWL}hasNarrowSynonym",
+}
+ENTITY_TYPES = {"CLASS": "class", "PROPERTY": "property"}
+
+
+class SynonymSource(NamedTuple):
+    """One row of the synonym-sources report (IRIs without brackets, literals unquoted)."""
+
+    entity: str
+    entity_type: str  # class or property
+    predicate: str
+    value: str
+    lang: str = ""
+    synonym_type: str = ""
+    xref: str = ""
+    source: str = ""
+    prov: str = ""
+
+
+# ROBOT column name and cell kind for each SynonymSource field. Optional columns
+# are empty when unbound and hold either an IRI or a literal otherwise.
+SYNONYM_SOURCE_COLUMNS = (
+    ("?entity", "iri"),
+    ("?entityType", "literal"),
+    ("?synonymPred", "iri"),
+    ("?synValue", "literal"),
+    ("?lang", "literal"),
+    ("?synType", "optional"),
+    ("?xref", "optional"),
+    ("?src", "optional"),
+    ("?prov", "optional"),
+)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _unescape(text: str) -> str:
+    out, chars = [], iter(text)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            out.append({"t": "\t", "n": "\n"}.get(escaped, escaped))
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def format_cell(value: str, kind: str) -> str:
+    """Format a value the way ROBOT writes SPARQL results to TSV."""
+    if kind == "literal":
+        return f'"{_escape(value)}"'
+    if kind == "iri":
+        return f"<{value}>"
+    if not value:
+        return ""
+    return f"<{value}>" if "://" in value or value.startswith("urn:") else f'"{_escape(value)}"'
+
+
+def parse_cell(cell: str) -> str:
+    """Strip ROBOT TSV decoration (``<iri>`` or ``"literal"``) from a cell."""
+    if cell.startswith("<") and cell.endswith(">"):
+        return cell[1:-1]
+    if len(cell) >= 2 and cell.startswith('"'):
+        end = cell.rfind('"')
+        if end > 0:  # drop any ^^datatype or @lang suffix
+            return _unescape(cell[1:end])
+    return cell
+
+
+def _optional(values: Iterable[str]) -> list[str]:
+    """Values of an OPTIONAL variable: one empty binding when there are none."""
+    return list(dict.fromkeys(values)) or [""]
+
+
+def synonym_sources(index: OntologyIndex) -> list[SynonymSource]:
+    """Labels and synonyms of every class and property, one row per source binding.
+
+    Matches synonym-sources.sparql. Each combination of synonym type, xref,
+    source and provenance is its own row (the cross product the SPARQL
+    OPTIONALs produce), and rows are sorted by entity type, predicate, entity
+    and value.
+    """
+    rows: set[SynonymSource] = set()
+    synonyms = index.synonym_table
+    for i, (curie, kind) in enumerate(zip(index.ids, index.types, strict=True)):
+        entity_type = ENTITY_TYPES.get(kind)
+        if entity_type is None:
+            continue
+        entity = curie_to_iri(curie)
+        if index.labels[i]:
+            rows.add(SynonymSource(entity, entity_type, RDFS_LABEL, index.labels[i]))
+        for text, scope, sources, syn_type, xrefs, derived_from in synonyms[i]:
+            predicate = SCOPE_PREDICATES[scope]
+            for xref, source, prov in product(
+                _optional(xrefs), _optional(sources), _optional(derived_from)
+            ):
+                rows.add(
+                    SynonymSource(
+                        entity, entity_type, predicate, text, "", syn_type, xref, source, prov
+                    )
+                )
+    return sorted(rows, key=lambda row: (row.entity_type, row.predicate, row.entity, row[3:]))
+
+
+def labels(index: OntologyIndex) -> list[tuple[str, str]]:
+    """(class IRI, label) for every class, sorted by IRI (labels.sparql)."""
+    return sorted(
+        (curie_to_iri(curie), label)
+        for curie, kind, label in zip(index.ids, index.types, index.labels, strict=True)
+        if kind == "CLASS"
+    )
+
+
+def xrefs(index: OntologyIndex) -> list[tuple[str, str]]:
+    """(class IRI, xref) for every database cross-reference of a class (xrefs.sparql)."""
+    table = index.xref_table
+    return [
+        (curie_to_iri(curie), xref)
+        for i, (curie, kind) in enumerate(zip(index.ids, index.types, strict=True))
+        if kind == "CLASS"
+        for xref in table[i]
+    ]
+
+
+def terms(index: OntologyIndex) -> list[str]:
+    """Every entity IRI in the graph, including referenced-only parents (terms.sparql)."""
+    return sorted({curie_to_iri(curie) for curie in index.ids})
+
+
+def write_tsv(path: str | Path, header: Iterable[str], rows: Iterable[Iterable[str]]) -> int:
+    """Write pre-formatted rows as a ROBOT-style TSV; return the row count."""
+    count = 0
+    with atomic_open(path, "w", encoding="utf-8", newline="") as handle:
+        handle.write("\t".join(header) + "\n")
+        for row in rows:
+            handle.write("\t".join(row) + "\n")
+            count += 1
+    return count
+
+
+def write_synonym_sources(rows: Iterable[SynonymSource], path: str | Path) -> int:
+    """Write synonym-sources rows in the layout ``robot query`` produces."""
+    header = [name for name, _kind in SYNONYM_SOURCE_COLUMNS]
+    return write_tsv(
+        path,
+        header,
+        (
+            [
+                format_cell(value, kind)
+                for value, (_name, kind) in zip(row, SYNONYM_SOURCE_COLUMNS, strict=True)
+            ]
+            for row in rows
+        ),
+    )
+
+
+def read_synonym_sources(path: str | Path) -> list[SynonymSource]:
+    """Read a synonym-sources TSV written by ROBOT or :func:`write_synonym_sources`."""
+    with Path(path).open(encoding="utf-8") as handle:
+        header = handle.readline().rstrip("\n").split("\t")
+        columns = [
+            header.index(name) if name in header else None for name, _ in SYNONYM_SOURCE_COLUMNS
+        ]
+        rows = []
+        for line in handle:
+            cells = line.rstrip("\n").split("\t")
+            rows.append(
+                SynonymSource(
+                    *(
+                        parse_cell(cells[col]) if col is not None and col < len(cells) else ""
+                        for col in columns
+                    )
+                )
+            )
+    return rows
+
+
+def load_synonym_sources(
+    tsv_path: str | Path | None = None, ontology_json: str | Path = DEFAULT_ONTOLOGY_JSON
+) -> list[SynonymSource]:
+    """Synonym-sources rows from a report file, or generated in-process from ``metpo.json``."""
+    if tsv_path is not None:
+        return read_synonym_sources(tsv_path)
+    return synonym_sources(OntologyIndex.load(ontology_json))
+
+
+def _write_synonym_sources(index: OntologyIndex, path: Path) -> int:
+    return write_synonym_sources(synonym_sources(index), path)
+
+
+def _write_labels(index: OntologyIndex, path: Path) -> int:
+    rows = (
+        [format_cell(iri, "iri"), format_cell(label, "literal") if label else ""]
+        for iri, label in labels(index)
+    )
+    return write_tsv(path, ["?x", "?label"], rows)
+
+
+def _write_xrefs(index: OntologyIndex, path: Path) -> int:
+    rows = ([format_cell(iri, "iri"), format_cell(xref, "literal")] for iri, xref in xrefs(index))
+    return write_tsv(path, ["?cls", "?xref"], rows)
+
+
+def _write_terms(index: OntologyIndex, path: Path) -> int:
+    return write_tsv(path, ["?term"], ([format_cell(iri, "iri")] for iri in terms(index)))
+
+
+REPORT_WRITERS: dict[str, Callable[[OntologyIndex, Path], int]] = {
+    "synonym-sources": _write_synonym_sources,
+    "labels": _write_labels,
+    "xrefs": _write_xrefs,
+    "terms": _write_terms,
+}
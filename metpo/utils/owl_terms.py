@@ -0,0 +1,293 @@
+"""Streaming extraction of labels, synonyms and definitions from ontology files.
+
+This is a native equivalent of ``sparql/extract_for_embeddings.rq``. For every
+``owl:Class`` or ``skos:Concept`` with at least one label, outside the W3C
+namespaces, it collects:
+
+- labels: rdfs:label, skos:prefLabel, dc/dcterms:title, spin:labelTemplate, owl:label
+- synonyms: oboInOwl:has{Exact,Broad,Narrow,Related}Synonym, skos:altLabel,
+  owl:altLabel, obo#Synonym
+- definitions: IAO:0000115, skos:definition, rdfs:comment, dc/dcterms:description,
+  obo#Definition
+
+RDF/XML (the usual ``.owl`` download) is read with ``iterparse``. Each
+top-level node element is cleared as soon as it ends, so memory use depends
+on the number of annotation values kept, never on the size of the XML tree.
+Other RDF syntaxes (Turtle, N-Triples) are loaded with rdflib.
+
+Output is ROBOT's TSV result layout, as produced by ``robot query``:
+``?class``, ``?labels``, ``?synonyms``, ``?definitions``. Multiple values are
+joined with `` | `` the way GROUP_CONCAT joins them, in document order.
+"""
+
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urldefrag, urljoin
+from xml.etree.ElementTree import iterparse
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.util import guess_format
+
+from metpo.utils.ontology_reports import format_cell, write_tsv
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS = "http://www.w3.org/2000/01/rdf-schema#"
+OWL = "http://www.w3.org/2002/07/owl#"
+SKOS = "http://www.w3.org/2004/02/skos/core#"
+DC = "http://purl.org/dc/elements/1.1/"
+DCTERMS = "http://purl.org/dc/terms/"
+OBO_IN_OWL = "http://www.geneontology.org/formats/oboInOwl#"
+OBO = "http://purl.obolibrary.org/obo#"
+SPIN = "http://spinrdf.org/spin#"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+CLASS_TYPES = frozenset({f"{OWL}Class", f"{SKOS}Concept"})
+EXCLUDED_PREFIX = "http://www.w3.org/"
+
+LABELS, SYNONYMS, DEFINITIONS = 0, 1, 2
+FIELD_PREDICATES = {
+    LABELS: (
+        f"{RDFS}label",
+        f"{SKOS}prefLabel",
+        f"{DC}title",
+        f"{DCTERMS}title",
+        f"{SPIN}labelTemplate",
+        f"{OWL}label",
+    ),
+    SYNONYMS: (
+        f"{OBO_IN_OWL}hasExactSynonym",
+        f"{OBO_IN_OWL}hasBroadSynonym",
+        f"{OBO_IN_OWL}hasNarrowSynonym",
+        f"{OBO_IN_OWL}hasRelatedSynonym",
+        f"{SKOS}altLabel",
+        f"{OWL}altLabel",
+        f"{OBO}Synonym",
+    ),
+    DEFINITIONS: (
+        "http://purl.obolibrary.org/obo/IAO_0000115",
+        f"{SKOS}definition",
+        f"{RDFS}comment",
+        f"{DC}description",
+        f"{DCTERMS}description",
+        f"{OBO}Definition",
+    ),
+}
+PREDICATE_FIELDS = {pred: field for field, preds in FIELD_PREDICATES.items() for pred in preds}
+
+TERM_COLUMNS = ("?class", "?labels", "?synonyms", "?definitions")
+VALUE_SEPARATOR = " | "
+RDFXML_SUFFIXES = frozenset({".owl", ".rdf", ".xml"})
+
+_RDF_TYPE = f"{RDF}type"
+_RDF_DESCRIPTION = f"{{{RDF}}}Description"
+_ABOUT = f"{{{RDF}}}about"
+_ID = f"{{{RDF}}}ID"
+_RESOURCE = f"{{{RDF}}}resource"
+_NODE_ID = f"{{{RDF}}}nodeID"
+_PARSE_TYPE = f"{{{RDF}}}parseType"
+_XML_BASE = f"{{{XML_NS}}}base"
+
+# Frame kinds on the element stack
+_NODE, _PROPERTY, _SKIP = "node", "property", "skip"
+
+
+class OntologyTerm(NamedTuple):
+    """One extracted class: IRI plus distinct label, synonym and definition values."""
+
+    iri: str
+    labels: tuple[str, ...]
+    synonyms: tuple[str, ...]
+    definitions: tuple[str, ...]
+
+
+class _TermCollector:
+    """Annotation values per subject plus the set of class-typed subjects."""
+
+    def __init__(self):
+        self.values: dict[str, tuple[dict, dict, dict]] = {}
+        self.classes: set[str] = set()
+
+    def add_type(self, subject: str | None, type_iri: str) -> None:
+        if subject is not None and type_iri in CLASS_TYPES:
+            self.classes.add(subject)
+
+    def add_value(self, subject: str | None, predicate: str, value: str) -> None:
+        field = PREDICATE_FIELDS.get(predicate)
+        if subject is None or field is None:
+            return
+        fields = self.values.get(subject)
+        if fields is None:
+            fields = self.values[subject] = ({}, {}, {})
+        fields[field][value] = None
+
+    def terms(self) -> list[OntologyTerm]:
+        """Labelled, non-W3C classes sorted by IRI (the query's HAVING / ORDER BY)."""
+        terms = []
+        for iri in sorted(self.classes):
+            fields = self.values.get(iri)
+            if iri.startswith(EXCLUDED_PREFIX) or fields is None or not fields[LABELS]:
+                continue
+            terms.append(OntologyTerm(iri, *(tuple(values) for values in fields)))
+        return terms
+
+
+def _split_tag(tag: str) -> str:
+    """``{ns}local`` -> ``nslocal`` (the element's IRI)."""
+    if tag.startswith("{"):
+        namespace, _, local = tag[1:].partition("}")
+        return namespace + local
+    return tag
+
+
+def _subject(elem, base: str) -> str | None:
+    about = elem.get(_ABOUT)
+    if about is not None:
+        return urljoin(base, about)
+    rdf_id = elem.get(_ID)
+    if rdf_id is not None:
+        return f"{urldefrag(base)[0]}#{rdf_id}"
+    return None  # blank node
+
+
+def _open_frame(elem, parent: tuple | None, base: str, collector: _TermCollector) -> tuple:
+    """Classify a starting element and record the type and attribute triples it carries."""
+    if parent is not None and parent[0] == _SKIP:
+        return (_SKIP, None, None, base)
+    if parent is None or parent[0] == _PROPERTY:
+        subject = _subject(elem, base)
+        if elem.tag != _RDF_DESCRIPTION:
+            collector.add_type(subject, _split_tag(elem.tag))
+        for name, value in elem.attrib.items():
+            if not name.startswith((f"{{{RDF}}}", f"{{{XML_NS}}}")):
+                collector.add_value(subject, _split_tag(name), value)
+        return (_NODE, subject, None, base)
+    subject, predicate = parent[1], _split_tag(elem.tag)
+    resource = elem.get(_RESOURCE)
+    if predicate == _RDF_TYPE and resource is not None:
+        collector.add_type(subject, urljoin(base, resource))
+    parse_type = elem.get(_PARSE_TYPE)
+    if parse_type == "Literal":
+        return (_SKIP, subject, predicate, base)
+    if parse_type == "Resource":
+        return (_NODE, None, None, base)
+    return (_PROPERTY, subject, predicate, base)
+
+
+def _iter_rdfxml(path: Path, collector: _TermCollector) -> None:
+    """Stream an RDF/XML file into ``collector``.
+
+    Node and property elements alternate with depth. The stack records, for
+    each open element, its kind, subject (nodes) or predicate and subject
+    (properties), and the xml:base in scope.
+    """
+    stack: list[tuple[str, str | None, str | None, str]] = []
+    root = None
+    default_base = path.resolve().as_uri()
+    for event, elem in iterparse(path, events=("start", "end")):
+        if event == "start":
+            parent = stack[-1] if stack else None
+            base = elem.get(_XML_BASE) or (parent[3] if parent else default_base)
+            if root is None:
+                root = elem
+                if elem.tag == f"{{{RDF}}}RDF":
+                    stack.append((_PROPERTY, None, None, base))
+                    continue
+            stack.append(_open_frame(elem, parent, base, collector))
+            continue
+
+        kind, subject, predicate, _base = stack.pop()
+        is_literal = elem.get(_RESOURCE) is None and elem.get(_NODE_ID) is None
+        if (
+            predicate is not None
+            and is_literal
+            and (kind == _SKIP or not len(elem))
+            and stack[-1][0] != _SKIP
+        ):
+            text = "".join(elem.itertext()) if kind == _SKIP else (elem.text or "")
+            collector.add_value(subject, predicate, text)
+        if len(stack) == 1:
+            # Top-level node element finished: drop it and everything below it
+            elem.clear()
+            root.clear()
+
+
+def _iter_rdflib(path: Path, collector: _TermCollector) -> None:
+    """Load a non-XML RDF file with rdflib and feed the relevant triples to ``collector``."""
+    graph = Graph()
+    graph.parse(path, format=guess_format(str(path)) or "turtle")
+    for type_iri in CLASS_TYPES:
+        for subject in graph.subjects(URIRef(_RDF_TYPE), URIRef(type_iri)):
+            if isinstance(subject, URIRef):
+                collector.add_type(str(subject), type_iri)
+    for predicate in PREDICATE_FIELDS:
+        for subject, value in graph.subject_objects(URIRef(predicate)):
+            if isinstance(subject, URIRef) and isinstance(value, Literal):
+                collector.add_value(str(subject), predicate, str(value))
+
+
+def _is_rdfxml(path: Path) -> bool:
+    if path.suffix.lower() in RDFXML_SUFFIXES:
+        return True
+    with path.open("rb") as handle:
+        return handle.read(512).lstrip().startswith(b"<")
+
+
+def extract_terms(path: str | Path) -> list[OntologyTerm]:
+    """Extract labelled classes from an RDF/XML, Turtle or N-Triples ontology file."""
+    path = Path(path)
+    collector = _TermCollector()
+    if _is_rdfxml(path):
+        _iter_rdfxml(path, collector)
+    else:
+        _iter_rdflib(path, collector)
+    return collector.terms()
+
+
+def _joined(values: tuple[str, ...]) -> str:
+    return format_cell(VALUE_SEPARATOR.join(values), "literal") if values else ""
+
+
+def format_term_rows(terms: Iterable[OntologyTerm]) -> Iterator[list[str]]:
+    """Format terms as ROBOT TSV cells; empty value groups become empty cells."""
+    for term in terms:
+        yield [
+            format_cell(term.iri, "iri"),
+            _joined(term.labels),
+            _joined(term.synonyms),
+            _joined(term.definitions),
+        ]
+
+
+def write_terms(input_file: str | Path, output_file: str | Path) -> int:
+    """Extract terms from ``input_file`` into a TSV at ``output_file``; return the term count."""
+    return write_tsv(output_file, TERM_COLUMNS, format_term_rows(extract_terms(input_file)))
+
+
+def _write_terms_job(input_file: str, output_file: str) -> tuple[str, int, str | None]:
+    try:
+        return input_file, write_terms(input_file, output_file), None
+    except Exception as e:
+        return input_file, 0, f"{type(e).__name__}: {e}"
+
+
+def write_terms_parallel(
+    jobs: Iterable[tuple[str | Path, str | Path]], workers: int = 0
+) -> Iterator[tuple[str, int, str | None]]:
+    """Run :func:`write_terms` for each ``(input, output)`` pair in worker processes.
+
+    Yields ``(input, term_count, error)`` as each ontology finishes; ``error``
+    is None on success. One failing ontology does not stop the others.
+    """
+    pairs = [(str(source), str(target)) for source, target in jobs]
+    workers = min(workers or os.cpu_count() or 1, len(pairs)) or 1
+    if workers == 1:
+        for source, target in pairs:
+            yield _write_terms_job(source, target)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_write_terms_job, source, target) for source, target in pairs]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,303 @@
+"""Wall/CPU stage timings, cProfile and tracemalloc for METPO commands.
+
+Commands mark their phases with :func:`stage`::
+
+    with stage("load terms"):
+        terms = load_terms(path)
+
+Stages are recorded while a :class:`ProfileSession` is active (the
+``--profile`` options in :mod:`metpo.cli_common` start one). They are also
+telemetry spans while a :class:`metpo.utils.telemetry.TelemetryRecorder` is
+active. Without either, ``stage`` only checks two module globals, so it is
+safe in hot loops.
+Repeated stages with the same name (for example one per term in a loop) are
+aggregated. Nested stages are keyed by their path (``"rank/embed"``).
+
+A session can also:
+
+- run cProfile and write ``<prefix>.pstats`` (for ``python -m pstats`` or
+  snakeviz) and ``<prefix>.collapsed`` (collapsed stacks for flamegraph.pl
+  or speedscope). cProfile records caller/callee edges, not whole stacks,
+  so the collapsed stacks split a callee's time between its callers in
+  proportion to the time on each edge.
+- trace allocations with tracemalloc and report the peak plus the lines
+  that allocated the most. Per-stage peaks are tracked as well.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from metpo.utils import telemetry
+
+MIB = 1024 * 1024
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 10
+MAX_STACK_DEPTH = 64
+MIN_STACK_SECONDS = 1e-6
+MIN_STACK_SHARE = 1e-3  # collapsed stacks: branches below this share of the total are not expanded
+MAX_STACK_NODES = 100_000  # collapsed stacks: frames visited at most
+
+_ACTIVE: "ProfileSession | None" = None
+
+
+@dataclass
+class StageTiming:
+    """Aggregated timings of every run of one stage path."""
+
+    name: str
+    depth: int
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_bytes: int = 0  # highest traced memory while the stage ran (tracemalloc only)
+
+
+class ProfileSession:
+    """Collect stage timings and, optionally, cProfile and tracemalloc data.
+
+    Args:
+        cpu_profile: Run cProfile while the session is active
+        memory: Trace allocations with tracemalloc
+        output_prefix: Write ``.pstats``, ``.collapsed`` and ``.stages.json`` files here
+    """
+
+    def __init__(
+        self, cpu_profile: bool = False, memory: bool = False, output_prefix: Path | None = None
+    ):
+        self.cpu_profile = cpu_profile
+        self.memory = memory
+        self.output_prefix = Path(output_prefix) if output_prefix else None
+        self.stages: dict[str, StageTiming] = {}
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_bytes = 0
+        self.top_allocations: list[tracemalloc.Statistic] = []
+        self.profiler: cProfile.Profile | None = None
+        self._path: list[str] = []
+        self._peaks: list[int] = []
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "ProfileSession":
+        global _ACTIVE  # noqa: PLW0603
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.cpu_profile:
+            self.profiler = cProfile.Profile()
+        _ACTIVE = self
+        self._start = (time.perf_counter(), time.process_time())
+        if self.profiler:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _ACTIVE  # noqa: PLW0603
+        if self.profiler:
+            self.profiler.disable()
+        self.wall = time.perf_counter() - self._start[0]
+        self.cpu = time.process_time() - self._start[1]
+        _ACTIVE = None
+        if self.memory:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                ]
+            )
+            self.top_allocations = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self._path.append(name)
+        key = "/".join(self._path)
+        timing = self.stages.get(key)
+        if timing is None:
+            timing = self.stages[key] = StageTiming(key, len(self._path) - 1)
+        if self.memory:
+            self._enter_peak()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timing.calls += 1
+            timing.wall += time.perf_counter() - start_wall
+            timing.cpu += time.process_time() - start_cpu
+            if self.memory:
+                timing.peak_bytes = max(timing.peak_bytes, self._exit_peak())
+            self._path.pop()
+
+    def _enter_peak(self) -> None:
+        # tracemalloc has one peak counter: fold it into the enclosing stages
+        # and the session before resetting it for this stage
+        peak = tracemalloc.get_traced_memory()[1]
+        self._peaks = [max(outer, peak) for outer in self._peaks]
+        self.peak_bytes = max(self.peak_bytes, peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+
+    def _exit_peak(self) -> int:
+        peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+        self.peak_bytes = max(self.peak_bytes, peak)
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        return peak
+
+    def report(self) -> str:
+        """Human-readable summary of stages, memory and the hottest functions."""
+        lines = [f"Total: {self.wall:.3f}s wall, {self.cpu:.3f}s CPU"]
+        if self.stages:
+            width = max(len(t.name.rsplit("/", 1)[-1]) + 2 * t.depth for t in self.stages.values())
+            header = f"  {'stage':<{width}}  {'calls':>6}  {'wall s':>8}  {'CPU s':>8}"
+            lines += ["", "Stages:", header + ("  peak MiB" if self.memory else "")]
+            for timing in self.stages.values():
+                label = "  " * timing.depth + timing.name.rsplit("/", 1)[-1]
+                line = f"  {label:<{width}}  {timing.calls:>6}  {timing.wall:>8.3f}  {timing.cpu:>8.3f}"
+                if self.memory:
+                    line += f"  {timing.peak_bytes / MIB:>8.1f}"
+                lines.append(line)
+        if self.memory:
+            lines += [
+                "",
+                f"Peak traced memory: {format_bytes(self.peak_bytes)}",
+                "Top allocations:",
+            ]
+            lines += [
+                f"  {stat.traceback[0].filename}:{stat.traceback[0].lineno}: "
+                f"{format_bytes(stat.size)} in {stat.count} blocks"
+                for stat in self.top_allocations
+            ]
+        if self.profiler:
+            out = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=out).sort_stats("cumulative")
+            stats.print_stats(TOP_FUNCTIONS)
+            lines += ["", f"Top {TOP_FUNCTIONS} functions by cumulative time:", out.getvalue()]
+        return "\n".join(lines)
+
+    def write_outputs(self) -> list[Path]:
+        """Write the profile files under ``output_prefix``; return the paths written."""
+        if not self.output_prefix:
+            return []
+        self.output_prefix.parent.mkdir(parents=True, exist_ok=True)
+        written = []
+        stages_path = self.output_prefix.with_name(self.output_prefix.name + ".stages.json")
+        summary = {
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "peak_bytes": self.peak_bytes if self.memory else None,
+            "stages": [asdict(timing) for timing in self.stages.values()],
+        }
+        stages_path.write_text(json.dumps(summary, indent=2) + "\n")
+        written.append(stages_path)
+        if self.profiler:
+            pstats_path = self.output_prefix.with_name(self.output_prefix.name + ".pstats")
+            self.profiler.dump_stats(pstats_path)
+            collapsed_path = self.output_prefix.with_name(self.output_prefix.name + ".collapsed")
+            stats = pstats.Stats(self.profiler)
+            collapsed_path.write_text("".join(f"{line}\n" for line in collapsed_stacks(stats)))
+            written += [pstats_path, collapsed_path]
+        return written
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / MIB:.1f} MiB" if size >= MIB else f"{size / 1024:.1f} KiB"
+
+
+@contextmanager
+def stage(name: str, items: int = 1) -> Iterator[None]:
+    """Time a named phase of the active profile session and telemetry recorder.
+
+    ``items`` is how many items the phase processed (for example the size
+    of a batch); telemetry reports it per second. Without a session or a
+    recorder this is a no-op.
+    """
+    recorder = telemetry.active()
+    if _ACTIVE is None and recorder is None:
+        yield
+        return
+    with (
+        _ACTIVE.stage(name) if _ACTIVE else nullcontext(),
+        recorder.span(name, items) if recorder else nullcontext(),
+    ):
+        yield
+
+
+def _frame_name(func: tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":  # built-in
+        return name.strip("<>").replace(";", ":")
+    return f"{name} ({Path(filename).name}:{lineno})".replace(";", ":")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """Collapsed-stack lines (``a;b;c <microseconds>``) from a cProfile call graph.
+
+    Each function's cumulative time is split between its callers in
+    proportion to the time on each caller edge, then self time is emitted
+    at every stack that reaches it. Recursive edges are cut.
+
+    The number of caller-to-callee paths grows exponentially in graphs such as
+    nested imports, so the walk is bounded: a branch worth less than
+    ``MIN_STACK_SHARE`` of the total time is not expanded, nor is any branch
+    once ``MAX_STACK_NODES`` frames were visited. Self time below a branch that
+    is not expanded is left out of the stacks.
+    """
+    # func -> (cc, nc, self_time, cumulative, callers); not in the pstats stubs
+    raw = stats.stats  # type: ignore[attr-defined]
+    names = {func: _frame_name(func) for func in raw}
+    callees: dict[tuple, list[tuple[tuple, float]]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    cutoff = max(MIN_STACK_SECONDS, MIN_STACK_SHARE * sum(raw[root][3] for root in roots))
+
+    totals: dict[str, float] = {}
+    visited = 0
+
+    def walk(func: tuple, share: float, stack: list[str]) -> None:
+        nonlocal visited
+        visited += 1
+        _cc, _nc, self_time, cumulative, _callers = raw[func]
+        stack = [*stack, names[func]]
+        if self_time * share > 0:
+            key = ";".join(stack)
+            totals[key] = totals.get(key, 0.0) + self_time * share
+        if (
+            len(stack) >= MAX_STACK_DEPTH
+            or cumulative * share < cutoff
+            or visited >= MAX_STACK_NODES
+        ):
+            return
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = raw[callee][3]
+            if names[callee] in stack or not callee_total:
+                continue
+            walk(callee, share * edge_time / callee_total, stack)
+
+    for root in roots:
+        walk(root, 1.0, [])
+    return [
+        f"{key} {round(seconds * 1e6)}"
+        for key, seconds in totals.items()
+        if seconds >= MIN_STACK_SECONDS
+    ]
+
+
+def print_report(session: ProfileSession) -> None:
+    """Print the session report and any written files to stderr."""
+    print("\n=== Profile ===", file=sys.stderr)
+    print(session.report(), file=sys.stderr)
+    for path in session.write_outputs():
+        print(f"Wrote {path}", file=sys.stderr)
@@ -0,0 +1,164 @@
+"""Concurrent, change-detecting download of the METPO Google Sheets.
+
+Every primary and secondary sheet listed in sheets.yaml (see metpo.sheets_config)
+is fetched in parallel, so a full refresh takes roughly one round-trip. Each
+export is hashed. Files whose content did not change are left untouched, so
+their mtimes stay valid for Make and other timestamp-based tools.
+
+The sync directory holds a manifest (``.sheets-manifest.json``) with the
+SHA-256, size and fetch time of every sheet. Consumers such as QC and lint
+record the SHA-256 of each sheet they acted on with ``mark_checked``;
+``changed_sheets`` returns the sheets whose content a consumer has not seen.
+Changes therefore accumulate across syncs, including single-sheet syncs, until
+that consumer acts on them, and one consumer never hides a change from another.
+"""
+
+import hashlib
+import json
+import urllib.request
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from metpo.sheets_config import SHEET_FILENAMES, all_export_urls
+from metpo.utils.files import file_sha256, write_atomic
+
+MANIFEST_NAME = ".sheets-manifest.json"
+MANIFEST_VERSION = 2
+DEFAULT_SHEETS_DIR = Path("downloads/sheets")
+DEFAULT_WORKERS = 8
+FETCH_TIMEOUT = 60
+
+
+@dataclass
+class SheetSyncResult:
+    """Outcome of syncing one sheet."""
+
+    name: str
+    path: Path
+    status: str  # new, updated, unchanged, failed
+    sha256: str = ""
+    error: str = ""
+
+    @property
+    def changed(self) -> bool:
+        return self.status in ("new", "updated")
+
+
+def fetch_url(url: str, timeout: float = FETCH_TIMEOUT) -> bytes:
+    """Return the body of a sheet export URL."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+def load_manifest(directory: str | Path = DEFAULT_SHEETS_DIR) -> dict:
+    """Load the sync manifest, or an empty one if absent or from another version."""
+    path = Path(directory) / MANIFEST_NAME
+    if path.exists():
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    return {"version": MANIFEST_VERSION, "sheets": {}, "checked": {}}
+
+
+def _save_manifest(directory: Path, manifest: dict) -> None:
+    write_atomic(directory / MANIFEST_NAME, json.dumps(manifest, indent=2) + "\n")
+
+
+def changed_sheets(consumer: str, directory: str | Path = DEFAULT_SHEETS_DIR) -> list[str]:
+    """Return the synced sheets whose current content ``consumer`` has not marked checked."""
+    manifest = load_manifest(directory)
+    checked = manifest["checked"].get(consumer, {})
+    return [
+        name for name, entry in manifest["sheets"].items() if checked.get(name) != entry["sha256"]
+    ]
+
+
+def mark_checked(
+    consumer: str, names: Iterable[str], directory: str | Path = DEFAULT_SHEETS_DIR
+) -> None:
+    """Record that ``consumer`` acted on the current content of the named sheets."""
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    checked = manifest["checked"].setdefault(consumer, {})
+    for name in names:
+        if name in manifest["sheets"]:
+            checked[name] = manifest["sheets"][name]["sha256"]
+    _save_manifest(directory, manifest)
+
+
+def synced_sheet_name(path: str | Path) -> str | None:
+    """Return the sheets.yaml key of a synced sheet file, from the manifest beside it."""
+    path = Path(path)
+    for name, entry in load_manifest(path.parent)["sheets"].items():
+        if entry["filename"] == path.name:
+            return name
+    return None
+
+
+def _store(name: str, data: bytes, directory: Path, previous: dict | None) -> SheetSyncResult:
+    """Write ``data`` for a sheet unless the file on disk already has that content."""
+    path = directory / SHEET_FILENAMES[name]
+    digest = hashlib.sha256(data).hexdigest()
+    if path.exists():
+        if previous and previous["sha256"] == digest and previous["size"] == path.stat().st_size:
+            return SheetSyncResult(name, path, "unchanged", digest)
+        if file_sha256(path) == digest:
+            return SheetSyncResult(name, path, "unchanged", digest)
+        status = "updated"
+    else:
+        status = "new"
+    write_atomic(path, data)
+    return SheetSyncResult(name, path, status, digest)
+
+
+def sync_sheets(
+    directory: str | Path = DEFAULT_SHEETS_DIR,
+    names: Iterable[str] | None = None,
+    workers: int = DEFAULT_WORKERS,
+    fetch: Callable[[str], bytes] = fetch_url,
+) -> list[SheetSyncResult]:
+    """Download sheets concurrently, rewriting only those whose content changed.
+
+    Args:
+        directory: Directory the sheet TSVs and manifest are written to
+        names: sheets.yaml keys to sync (default: all primary and secondary sheets)
+        workers: Maximum number of concurrent downloads
+        fetch: Function returning the body of an export URL
+
+    Returns:
+        One result per sheet, in the order of ``names``
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    urls = all_export_urls()
+    names = list(names) if names is not None else list(urls)
+    unknown = [name for name in names if name not in urls]
+    if unknown:
+        raise ValueError(f"Unknown sheet(s): {', '.join(unknown)}; valid: {', '.join(urls)}")
+
+    manifest = load_manifest(directory)
+    results: list[SheetSyncResult] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as pool:
+        futures = {name: pool.submit(fetch, urls[name]) for name in names}
+        for name in names:
+            try:
+                data = futures[name].result()
+            except OSError as e:
+                results.append(
+                    SheetSyncResult(name, directory / SHEET_FILENAMES[name], "failed", error=str(e))
+                )
+                continue
+            result = _store(name, data, directory, manifest["sheets"].get(name))
+            results.append(result)
+            manifest["sheets"][name] = {
+                "filename": result.path.name,
+                "sha256": result.sha256,
+                "size": len(data),
+                "fetched_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            }
+
+    _save_manifest(directory, manifest)
+    return results
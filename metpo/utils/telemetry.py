@@ -0,0 +1,293 @@
+"""Run telemetry for METPO commands: counters, latency histograms and stage spans.
+
+A :class:`TelemetryRecorder` started by ``--telemetry PATH`` (or the
+``METPO_TELEMETRY`` environment variable, see :mod:`metpo.cli_common`)
+collects:
+
+- counters: ``count("ols.failures")``
+- latency histograms: ``with timed("ols.search"): ...`` or
+  ``observe("mongo.insert_many", seconds)``
+- stage spans: every ``stage("...")`` block (see :mod:`metpo.utils.profiling`)
+  records its calls, items, wall time and a histogram of its durations
+
+Metrics are aggregated in memory and appended to the file as JSON lines:
+a ``run_start`` event, then cumulative ``counter``, ``histogram`` and ``span``
+events, rewritten at every flush, and finally ``run_end``. A flush happens at
+the end of the run and at most every ``flush_interval`` seconds while it
+runs, so a crashed or killed run still leaves recent numbers. Readers keep
+the last event per run and name (see :func:`read_runs`).
+
+Histograms use log-spaced buckets about 9% wide, so percentiles are
+estimated to within a bucket. With no recorder active, each call checks one
+module global and returns.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TextIO
+
+ENV_VAR = "METPO_TELEMETRY"
+BUCKETS_PER_DOUBLING = 8
+MIN_SECONDS = 1e-6
+FLUSH_INTERVAL = 60.0
+
+_RECORDER: "TelemetryRecorder | None" = None
+_NULL = nullcontext()
+
+
+class Histogram:
+    """Log-bucketed histogram of durations in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: dict[int, int] = {}
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        index = math.ceil(math.log2(max(seconds, MIN_SECONDS)) * BUCKETS_PER_DOUBLING)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (capped at the maximum)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(2 ** (index / BUCKETS_PER_DOUBLING), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "buckets": sorted(self.buckets.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        histogram = cls()
+        histogram.count = data["count"]
+        histogram.total = data["sum"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        histogram.buckets = {int(index): n for index, n in data["buckets"]}
+        return histogram
+
+
+class SpanStats:
+    """Aggregated runs of one stage path."""
+
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        self.depth = depth
+        self.items = 0
+        self.durations = Histogram()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "calls": self.durations.count,
+            "items": self.items,
+            "wall": self.durations.total,
+            "durations": self.durations.to_dict(),
+        }
+
+
+class TelemetryRecorder:
+    """Collect metrics for one run and append them to a JSON-lines file.
+
+    Args:
+        path: File to append events to (created with its parent directories)
+        command: Command name recorded in ``run_start``
+        flush_interval: Seconds between flushes while the run is going
+    """
+
+    def __init__(self, path: str | Path, command: str = "", flush_interval: float = FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.command = command
+        self.flush_interval = flush_interval
+        self.run_id = uuid.uuid4().hex[:12]
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.spans: dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file: TextIO | None = None
+        self._start = 0.0
+        self._last_flush = 0.0
+
+    def __enter__(self) -> "TelemetryRecorder":
+        global _RECORDER  # noqa: PLW0603
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._start = self._last_flush = time.perf_counter()
+        self._write(
+            {
+                "event": "run_start",
+                "command": self.command,
+                "argv": sys.argv[1:],
+                "pid": os.getpid(),
+                "started": datetime.now(UTC).isoformat(timespec="seconds"),
+            }
+        )
+        _RECORDER = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        global _RECORDER  # noqa: PLW0603
+        _RECORDER = None
+        self.flush()
+        # click's Exit and SystemExit carry an exit code; any other exception is a failure
+        code = 0 if exc is None else getattr(exc, "exit_code", getattr(exc, "code", 1))
+        self._write(
+            {
+                "event": "run_end",
+                "wall": time.perf_counter() - self._start,
+                "status": "ok" if code in (0, None) else "error",
+            }
+        )
+        self._file.close()
+
+    def _write(self, event: dict) -> None:
+        self._file.write(json.dumps({**event, "run": self.run_id}) + "\n")
+
+    def flush(self) -> None:
+        """Append the current totals of every metric."""
+        with self._lock:
+            self._last_flush = time.perf_counter()
+            for name, value in self.counters.items():
+                self._write({"event": "counter", "name": name, "value": value})
+            for name, histogram in self.histograms.items():
+                self._write({"event": "histogram", "name": name, **histogram.to_dict()})
+            for span in self.spans.values():
+                self._write({"event": "span", **span.to_dict()})
+        self._file.flush()
+
+    def _maybe_flush(self) -> None:
+        if time.perf_counter() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds)
+        self._maybe_flush()
+
+    @contextmanager
+    def span(self, name: str, items: int = 1) -> Iterator[None]:
+        # Each thread nests its own spans
+        path = getattr(self._local, "path", None)
+        if path is None:
+            path = self._local.path = []
+        path.append(name)
+        key = "/".join(path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            path.pop()
+            with self._lock:
+                stats = self.spans.get(key)
+                if stats is None:
+                    stats = self.spans[key] = SpanStats(key, key.count("/"))
+                stats.items += items
+                stats.durations.add(elapsed)
+            self._maybe_flush()
+
+
+class _Timer:
+    __slots__ = ("name", "recorder", "start")
+
+    def __init__(self, recorder: TelemetryRecorder, name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.recorder.observe(self.name, time.perf_counter() - self.start)
+
+
+def active() -> TelemetryRecorder | None:
+    return _RECORDER
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add ``n`` to a counter of the active recorder (no-op without one)."""
+    if _RECORDER is not None:
+        _RECORDER.count(name, n)
+
+
+def observe(name: str, seconds: float) -> None:
+    """Record one latency in a histogram of the active recorder (no-op without one)."""
+    if _RECORDER is not None:
+        _RECORDER.observe(name, seconds)
+
+
+def timed(name: str):
+    """Context manager recording its duration in histogram ``name`` (no-op without a recorder)."""
+    if _RECORDER is None:
+        return _NULL
+    return _Timer(_RECORDER, name)
+
+
+def read_runs(lines: Iterable[str]) -> dict[str, dict]:
+    """Fold telemetry JSON lines into one summary per run, keeping each metric's last value.
+
+    Returns:
+        ``run id -> {"start", "end", "counters", "histograms", "spans"}``;
+        ``end`` is None for a run that is still going or died
+    """
+    runs: dict[str, dict] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # a line cut short when a run was killed
+        run = runs.setdefault(
+            event["run"],
+            {"start": None, "end": None, "counters": {}, "histograms": {}, "spans": {}},
+        )
+        kind = event["event"]
+        if kind == "run_start":
+            run["start"] = event
+        elif kind == "run_end":
+            run["end"] = event
+        elif kind == "counter":
+            run["counters"][event["name"]] = event["value"]
+        elif kind == "histogram":
+            run["histograms"][event["name"]] = Histogram.from_dict(event)
+        elif kind == "span":
+            run["spans"][event["name"]] = event
+    return runs
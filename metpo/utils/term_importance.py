@@ -0,0 +1,330 @@
+"""Offline term importance: PageRank over the local mapping and term-reuse graph.
+
+Definition enrichment prefers candidate definitions from terms that many
+ontologies reuse. That used to be estimated with one OLS search per IRI.
+:class:`TermImportance` computes it offline, from files already in the repo:
+
+- SSSOM mapping sets (``data/mappings/*.sssom.tsv``): an edge between subject
+  and object, weighted by confidence, and an edge between the object and the
+  ontology it was found in (``object_source``)
+- term dumps (``data/pipeline/non-ols-terms/*.tsv``, from ``extract-ontology-terms``):
+  an edge between each term and the ontology of the dump, so terms imported
+  into several ontologies gain weight
+- METPO xrefs from the ontology index: an edge between the term and each xref
+
+Identifiers are CURIEs where they can be contracted, IRIs otherwise, and
+ontologies are nodes named ``ontology:<name>``. Edges are undirected.
+
+Scores are the stationary distribution of a random walk with restarts
+(PageRank), found by power iteration. The sparse matrix-vector product is a
+``numpy.bincount`` over the edge arrays. They are reported as multiples of the
+uniform score ``1/n``, so 1.0 is an average node. Weighted degree is also
+kept, along with ``usage``: the number of ontologies a term appears in.
+
+Results are cached in ``local/term_importance.npz`` and rebuilt when any input
+file changes.
+"""
+
+import csv
+import json
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from metpo.utils.files import atomic_open, file_fingerprint, is_unchanged
+from metpo.utils.ontology_index import DEFAULT_ONTOLOGY_JSON, OntologyIndex, iri_to_curie
+from metpo.utils.sssom_utils import strip_angle_brackets
+
+TERM_IMPORTANCE_VERSION = 1
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_MAPPING_DIR = _REPO_ROOT / "data" / "mappings"
+DEFAULT_TERM_DUMP_DIR = _REPO_ROOT / "data" / "pipeline" / "non-ols-terms"
+DEFAULT_IMPORTANCE_CACHE = _REPO_ROOT / "local" / "term_importance.npz"
+
+ONTOLOGY_NODE_PREFIX = "ontology:"
+DAMPING = 0.85
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 200
+
+
+def node_id(identifier: str) -> str:
+    """Normalize a CURIE, IRI or ``<IRI>`` to the graph's node name."""
+    return iri_to_curie(strip_angle_brackets(identifier))
+
+
+def ontology_node(name: str) -> str:
+    return ONTOLOGY_NODE_PREFIX + name.strip().lower()
+
+
+class TermGraph:
+    """Undirected weighted graph over terms and ontologies, stored as edge lists."""
+
+    def __init__(self):
+        self.positions: dict[str, int] = {}
+        self.sources: list[int] = []
+        self.targets: list[int] = []
+        self.weights: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self.positions)
+
+    def node(self, name: str) -> int:
+        position = self.positions.get(name)
+        if position is None:
+            position = self.positions[name] = len(self.positions)
+        return position
+
+    def link(self, a: str, b: str, weight: float = 1.0) -> None:
+        if not a or not b or a == b or weight <= 0:
+            return
+        i, j = self.node(a), self.node(b)
+        self.sources += (i, j)
+        self.targets += (j, i)
+        self.weights += (weight, weight)
+
+    def add_mapping_set(self, path: str | Path) -> None:
+        """Add subject-object and object-ontology edges from an SSSOM TSV."""
+        with Path(path).open(encoding="utf-8") as f:
+            reader = csv.DictReader(
+                (line for line in f if not line.startswith("#")), delimiter="\t"
+            )
+            for row in reader:
+                subject = node_id(row.get("subject_id") or "")
+                target = node_id(row.get("object_id") or "")
+                try:
+                    confidence = float(row.get("confidence") or 1.0)
+                except ValueError:
+                    confidence = 1.0
+                self.link(subject, target, confidence)
+                if source := (row.get("object_source") or "").strip():
+                    self.link(target, ontology_node(source))
+
+    def add_term_dump(self, path: str | Path) -> None:
+        """Add an edge from every term in an ``extract-ontology-terms`` TSV to its ontology."""
+        path = Path(path)
+        ontology = ontology_node(path.stem)
+        with path.open(encoding="utf-8") as f:
+            reader = csv.reader(f, delimiter="\t")
+            next(reader, None)
+            for row in reader:
+                if row and row[0].strip():
+                    self.link(node_id(row[0]), ontology)
+
+    def add_xrefs(self, index: OntologyIndex) -> None:
+        for curie, xrefs in zip(index.ids, index.xref_table, strict=True):
+            for xref in xrefs:
+                self.link(curie, node_id(xref))
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return (
+            np.asarray(self.sources, dtype=np.int64),
+            np.asarray(self.targets, dtype=np.int64),
+            np.asarray(self.weights, dtype=np.float64),
+        )
+
+
+def pagerank(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    n: int,
+    damping: float = DAMPING,
+    tolerance: float = TOLERANCE,
+    max_iterations: int = MAX_ITERATIONS,
+) -> np.ndarray:
+    """PageRank of a weighted directed edge list by power iteration.
+
+    Each step moves rank along every edge in proportion to its share of the
+    source's out-weight. Rank from nodes without out-edges is spread evenly.
+    Iteration stops when the L1 change falls below ``tolerance``.
+
+    Returns:
+        Scores summing to 1, indexed by node number
+    """
+    if n == 0:
+        return np.zeros(0)
+    out_weight = np.bincount(sources, weights=weights, minlength=n)
+    share = weights / out_weight[sources] if len(weights) else weights
+    dangling = out_weight == 0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        flow = np.bincount(targets, weights=rank[sources] * share, minlength=n)
+        updated = (1 - damping) / n + damping * (flow + rank[dangling].sum() / n)
+        converged = np.abs(updated - rank).sum() < tolerance
+        rank = updated
+        if converged:
+            break
+    return rank
+
+
+def source_files(mapping_sets: Iterable[Path], term_dumps: Iterable[Path]) -> list[Path]:
+    """Input files in a stable order: mapping sets, then term dumps, each sorted."""
+    return sorted({Path(p) for p in mapping_sets}) + sorted({Path(p) for p in term_dumps})
+
+
+class TermImportance:
+    """Per-node PageRank, weighted degree and ontology usage of the mapping graph."""
+
+    def __init__(
+        self,
+        ids: list[str],
+        pagerank: np.ndarray,
+        degree: np.ndarray,
+        usage: np.ndarray,
+        sources: list[dict] | None = None,
+    ):
+        self.ids = ids
+        self.pagerank = pagerank
+        self.degree = degree
+        self.usage = usage
+        self.sources = sources or []
+        self._positions = {node: i for i, node in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _position(self, identifier: str) -> int | None:
+        return self._positions.get(node_id(identifier))
+
+    def score(self, identifier: str) -> float:
+        """PageRank as a multiple of the uniform score (0.0 for unknown terms)."""
+        position = self._position(identifier)
+        return 0.0 if position is None else float(self.pagerank[position] * len(self.ids))
+
+    def degree_of(self, identifier: str) -> float:
+        position = self._position(identifier)
+        return 0.0 if position is None else float(self.degree[position])
+
+    def usage_count(self, identifier: str) -> int:
+        """Number of ontologies (term dumps and mapping sources) the term appears in."""
+        position = self._position(identifier)
+        return 0 if position is None else int(self.usage[position])
+
+    def top(self, n: int = 10) -> list[tuple[str, float]]:
+        """The ``n`` highest-ranked terms (ontology nodes excluded)."""
+        ranked = []
+        for position in np.argsort(-self.pagerank):
+            node = self.ids[position]
+            if not node.startswith(ONTOLOGY_NODE_PREFIX):
+                ranked.append((node, float(self.pagerank[position] * len(self.ids))))
+                if len(ranked) == n:
+                    break
+        return ranked
+
+    # -- construction and persistence ------------------------------------------------
+
+    @classmethod
+    def from_graph(cls, graph: TermGraph, sources: list[dict] | None = None) -> "TermImportance":
+        ids = graph.ids
+        n = len(ids)
+        src, dst, weights = graph.arrays()
+        is_ontology = np.array([node.startswith(ONTOLOGY_NODE_PREFIX) for node in ids], dtype=bool)
+        # Count each (term, ontology) pair once, however many rows link them
+        to_ontology = is_ontology[dst]
+        pairs = np.unique(np.stack([src[to_ontology], dst[to_ontology]]), axis=1)
+        return cls(
+            ids,
+            pagerank(src, dst, weights, n),
+            np.bincount(src, weights=weights, minlength=n),
+            np.bincount(pairs[0], minlength=n),
+            sources,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        mapping_sets: Iterable[Path],
+        term_dumps: Iterable[Path] = (),
+        metpo_json: Path | None = DEFAULT_ONTOLOGY_JSON,
+    ) -> "TermImportance":
+        """Build the graph from local files and rank it."""
+        mapping_paths = {Path(p) for p in mapping_sets}
+        inputs = source_files(mapping_paths, term_dumps)
+        graph = TermGraph()
+        for path in inputs:
+            if path in mapping_paths:
+                graph.add_mapping_set(path)
+            else:
+                graph.add_term_dump(path)
+        if metpo_json is not None and Path(metpo_json).exists():
+            graph.add_xrefs(OntologyIndex.load(metpo_json))
+            inputs.append(Path(metpo_json))
+        return cls.from_graph(graph, [{"path": str(p), **file_fingerprint(p)} for p in inputs])
+
+    def save(self, path: str | Path = DEFAULT_IMPORTANCE_CACHE) -> None:
+        """Write the scores to a ``.npz`` cache (atomically)."""
+        meta = {"version": TERM_IMPORTANCE_VERSION, "sources": self.sources}
+        with atomic_open(path, "wb") as handle:
+            np.savez(
+                handle,
+                ids=np.array(self.ids, dtype=str),
+                pagerank=self.pagerank,
+                degree=self.degree,
+                usage=self.usage,
+                meta=np.array(json.dumps(meta)),
+            )
+
+    @classmethod
+    def open(cls, path: str | Path = DEFAULT_IMPORTANCE_CACHE) -> "TermImportance":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                data["ids"].tolist(),
+                data["pagerank"],
+                data["degree"],
+                data["usage"],
+                meta["sources"],
+            )
+
+    @staticmethod
+    def is_current(cache_path: str | Path, inputs: list[Path]) -> bool:
+        """Whether the cache was built from exactly these versions of ``inputs``."""
+        cache_path = Path(cache_path)
+        if not cache_path.exists():
+            return False
+        with np.load(cache_path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+        recorded = meta.get("sources", [])
+        if meta.get("version") != TERM_IMPORTANCE_VERSION or [s["path"] for s in recorded] != [
+            str(p) for p in inputs
+        ]:
+            return False
+        return all(
+            is_unchanged(path, source) for source, path in zip(recorded, inputs, strict=True)
+        )
+
+    @classmethod
+    def load(
+        cls,
+        mapping_sets: Iterable[Path],
+        term_dumps: Iterable[Path] = (),
+        metpo_json: Path | None = DEFAULT_ONTOLOGY_JSON,
+        cache_path: str | Path | None = DEFAULT_IMPORTANCE_CACHE,
+        rebuild: bool = False,
+    ) -> "TermImportance":
+        """Return the scores for these inputs, reusing the cache when it is current.
+
+        Args:
+            mapping_sets: SSSOM TSV files
+            term_dumps: ``extract-ontology-terms`` TSV files, one per ontology
+            metpo_json: METPO OBO Graphs JSON for xrefs, or None to skip them
+            cache_path: ``.npz`` cache location, or None to always build in memory
+            rebuild: Ignore an existing cache and rebuild it
+        """
+        mapping_sets, term_dumps = list(mapping_sets), list(term_dumps)
+        if cache_path is None:
+            return cls.build(mapping_sets, term_dumps, metpo_json)
+        inputs = source_files(mapping_sets, term_dumps)
+        if metpo_json is not None and Path(metpo_json).exists():
+            inputs.append(Path(metpo_json))
+        if not rebuild and cls.is_current(cache_path, inputs):
+            return cls.open(cache_path)
+        importance = cls.build(mapping_sets, term_dumps, metpo_json)
+        importance.save(cache_path)
+        return importance
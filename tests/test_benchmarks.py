@@ -0,0 +1,109 @@
+"""Tests for the synthetic data generators, API stand-ins and benchmark suite."""
+
+import csv
+import json
+import time
+import urllib.request
+
+from click.testing import CliRunner
+
+from metpo.benchmarks import synthetic
+from metpo.benchmarks.stand_ins import OlsHierarchyAdapter, StandInServer
+from metpo.benchmarks.suite import compare
+from metpo.pipeline.cross_ontology_search import ols_candidates
+from metpo.tools.run_benchmarks import run_benchmarks
+
+
+def test_generators_scale_and_are_deterministic(tmp_path):
+    rows = synthetic.scaled_rows("classes", 10)
+    assert rows == 2910
+    first, second = tmp_path / "a.tsv", tmp_path / "b.tsv"
+    synthetic.write_robot_template(first, rows)
+    synthetic.write_robot_template(second, rows)
+    assert first.read_bytes() == second.read_bytes()
+
+    with first.open() as f:
+        table = list(csv.reader(f, delimiter="\t"))
+    assert table[1][:4] == ["ID", "LABEL", "TYPE", "SC % SPLIT=|"]
+    assert len(table) == rows + 2
+    labels = [row[1] for row in table[2:]]
+    assert len(labels) - len(set(labels)) == (rows - 1) // synthetic.DUPLICATE_LABEL_EVERY
+
+    sssom = tmp_path / "m.sssom.tsv"
+    synthetic.write_sssom(sssom, 100, subjects=[("METPO:1000059", "phenotype")])
+    lines = sssom.read_text().splitlines()
+    data = [line for line in lines if not line.startswith("#")]
+    assert data[0].split("\t") == synthetic.SSSOM_COLUMNS
+    assert len(data) == 101
+    assert all(line.startswith("METPO:1000059\tphenotype\t") for line in data[1:])
+
+    traits = tmp_path / "traits.tsv"
+    synthetic.write_trait_table(traits, 50)
+    header = traits.read_text().splitlines()[0].split("\t")
+    assert header[0] == "Bacdive_ID"
+    assert "GC_<=42.65" in header
+
+
+def test_stand_ins_answer_ols_embeddings_and_hierarchy():
+    with StandInServer(latency=0.05) as server:
+        start = time.perf_counter()
+        docs = ols_candidates("aerobic growth", rows=5, ols_url=server.ols_search_url)
+        assert time.perf_counter() - start >= 0.05
+        assert len(docs) == 5
+        assert docs[0]["label"] == "aerobic growth"
+        assert docs[0]["curie"].split(":")[0].lower() == docs[0]["ontology"]
+
+        request = urllib.request.Request(
+            server.embed_url, data=json.dumps({"model": "m", "prompt": "aerobic growth"}).encode()
+        )
+        with urllib.request.urlopen(request) as response:
+            vector = json.load(response)["embedding"]
+        assert len(vector) == 64
+
+        server.latency = 0.0
+        adapter = OlsHierarchyAdapter(server.url, "go")
+        assert adapter.hierarchical_parents("GO:0000017") == ["GO:0000002"]
+        children = [child for _, child in adapter.incoming_relationships("GO:0000002")]
+        assert children == [f"GO:{n:07d}" for n in range(16, 24)]
+        assert server.requests == {"ols_search": 1, "embeddings": 1, "ols_hierarchy": 2}
+
+
+def test_compare_flags_throughput_and_memory_regressions():
+    base = {"scale": 10, "items_per_s": 1000.0, "peak_rss_mib": 100.0, "unit": "rows"}
+    baseline = {"benchmarks": {"a": base, "b": base, "c": {**base, "scale": 1}}}
+    results = {
+        "benchmarks": {
+            "a": {**base, "items_per_s": 700.0},
+            "b": {**base, "items_per_s": 900.0, "peak_rss_mib": 130.0},
+            "c": {**base, "items_per_s": 1.0},  # recorded at another scale
+        }
+    }
+    regressions = compare(results, baseline, tolerance=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("a: throughput")
+    assert regressions[1].startswith("b: peak RSS")
+
+
+def test_run_benchmarks_records_and_checks_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    args = ["-b", "qc-metpo-sheets", "-b", "cross-ontology-search", "--scale", "0.05"]
+    args += ["--baseline", str(baseline), "--work-dir", str(tmp_path / "work")]
+
+    result = CliRunner().invoke(run_benchmarks, [*args, "--update-baseline"])
+    assert result.exit_code == 0, result.output
+    recorded = json.loads(baseline.read_text())["benchmarks"]
+    assert recorded["qc-metpo-sheets"]["items"] == 15 + 6
+    assert recorded["cross-ontology-search"]["api_requests"] > 15
+    matches = (tmp_path / "work" / "cross-ontology-search" / "matches.tsv").read_text()
+    assert "METPO:1000000" in matches
+
+    result = CliRunner().invoke(run_benchmarks, [*args, "--tolerance", "100"])
+    assert result.exit_code == 0, result.output
+    assert "Within" in result.output
+
+    regressed = json.loads(baseline.read_text())
+    regressed["benchmarks"]["qc-metpo-sheets"]["items_per_s"] *= 1000
+    baseline.write_text(json.dumps(regressed))
+    result = CliRunner().invoke(run_benchmarks, args)
+    assert result.exit_code == 1
+    assert "qc-metpo-sheets: throughput" in result.stderr
@@ -0,0 +1,123 @@
+"""Tests for concurrent, cached chat completions and propose-definitions-with-llm."""
+
+import csv
+import json
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from metpo.benchmarks.stand_ins import StandInServer
+from metpo.scripts.propose_definitions_with_llm import main as propose_definitions
+from metpo.utils.chat_completions import (
+    ChatClient,
+    ChatCompletionError,
+    ResponseCache,
+    complete_many,
+    request_key,
+)
+
+
+def _messages(label):
+    return [{"role": "user", "content": f'TERM: METPO:1 "{label}"\nPARENT CLASS(ES): phenotype\n'}]
+
+
+def test_complete_many_backs_off_on_429_and_caches(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.jsonl")
+    jobs = [(str(i), _messages(f"label {i}")) for i in range(12)]
+    with StandInServer(rate_limit_every=4) as server:
+        client = ChatClient(server.openai_base_url, model="m", backoff=0.01)
+        results = list(complete_many(client, jobs, cache=cache, workers=4, temperature=0))
+        assert sorted(int(r.id) for r in results) == list(range(12))
+        assert all(r.content.startswith("A phenotype that ") for r in results)
+        assert not any(r.cached or r.error for r in results)
+        # 12 answers took at least 3 rate-limited attempts
+        assert server.requests["chat_completions"] >= 15
+
+        reloaded = ResponseCache(tmp_path / "cache.jsonl")
+        assert len(reloaded) == 12
+        before = server.requests["chat_completions"]
+        again = list(complete_many(client, jobs, cache=reloaded, temperature=0))
+        assert all(r.cached for r in again)
+        assert server.requests["chat_completions"] == before
+        # Sampling parameters are part of the key
+        assert request_key("m", jobs[0][1], {"temperature": 0}) != request_key(
+            "m", jobs[0][1], {"temperature": 1}
+        )
+
+
+def test_client_reports_failures_without_caching(tmp_path):
+    with StandInServer(rate_limit_every=1) as server:
+        client = ChatClient(server.openai_base_url, model="m", retries=2, backoff=0.001)
+        with pytest.raises(ChatCompletionError, match="429"):
+            client.complete(_messages("x"))
+        assert server.requests["chat_completions"] == 3
+
+        cache = ResponseCache(tmp_path / "cache.jsonl")
+        [result] = complete_many(client, [("a", _messages("x"))], cache=cache)
+        assert result.content is None
+        assert "429" in result.error
+        assert len(cache) == 0
+
+        missing = ChatClient(f"{server.url}/nowhere", model="m", retries=3)
+        with pytest.raises(ChatCompletionError, match="404"):
+            missing.complete(_messages("x"))
+
+
+def test_answer_without_text_is_an_error_and_not_cached(tmp_path, monkeypatch):
+    message = {"role": "assistant", "content": None, "tool_calls": [{"id": "call_1"}]}
+    body = {"choices": [{"message": message, "finish_reason": "tool_calls"}]}
+    response = SimpleNamespace(status_code=200, json=lambda: body, text=json.dumps(body))
+    client = ChatClient("http://localhost:1", model="m")
+    monkeypatch.setattr(client, "_session", lambda: SimpleNamespace(post=lambda *a, **k: response))
+    with pytest.raises(ChatCompletionError, match="No text"):
+        client.complete(_messages("x"))
+
+    cache = ResponseCache(tmp_path / "cache.jsonl")
+    [result] = complete_many(client, [("a", _messages("x"))], cache=cache)
+    assert result.content is None
+    assert "No text" in result.error
+    assert len(cache) == 0
+
+
+def test_cache_ignores_a_truncated_last_line(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    cache = ResponseCache(path)
+    cache.put("m:1", "A definition.")
+    with path.open("a") as f:
+        f.write('{"key": "m:2", "cont')
+    assert ResponseCache(path).entries == {"m:1": "A definition."}
+
+
+def _write_template(path, labels):
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f, delimiter="\t")
+        writer.writerow(["ID", "label", "TYPE", "parent classes", "definition"])
+        writer.writerow(["ID", "LABEL", "TYPE", "SC %", "A IAO:0000115"])
+        for i, label in enumerate(labels):
+            writer.writerow([f"METPO:100000{i}", label, "owl:Class", "cell shape", ""])
+
+
+def test_propose_definitions_reuses_cache_after_prompt_change(tmp_path):
+    template = tmp_path / "metpo_sheet.tsv"
+    output = tmp_path / "proposed.tsv"
+    cache = tmp_path / "cache.jsonl"
+    _write_template(template, ["coccus", "bacillus", "spirillum"])
+    with StandInServer() as server:
+        args = ["-t", str(template), "-b", str(tmp_path / "none.tsv")]
+        args += ["-c", str(tmp_path / "none.tsv"), "-o", str(output), "--cache", str(cache)]
+        args += ["--base-url", server.openai_base_url, "-j", "2"]
+        result = CliRunner().invoke(propose_definitions, args)
+        assert result.exit_code == 0, result.output
+        assert server.requests["chat_completions"] == 3
+
+        _write_template(template, ["coccus", "rod", "spirillum"])
+        result = CliRunner().invoke(propose_definitions, args)
+        assert result.exit_code == 0, result.output
+        assert server.requests["chat_completions"] == 4
+        assert "Answered from cache: 2; failed: 0" in result.stdout
+
+    with output.open() as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    assert [row["metpo_label"] for row in rows] == ["coccus", "rod", "spirillum"]
+    assert all(row["proposed_definition"].startswith("A cell shape that ") for row in rows)
@@ -0,0 +1,74 @@
+"""Tests for the lazy-loading ``metpo`` command group."""
+
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from metpo import cli
+from metpo.cli import command_targets, main, short_help
+
+
+def test_help_lists_commands_without_importing_them():
+    code = (
+        "import sys\n"
+        "from metpo.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = [m for m in ('pandas', 'pymongo', 'matplotlib', 'metpo.pipeline.analyze_matches')"
+        " if m in sys.modules]\n"
+        "print('HEAVY', heavy)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert "categorize-ontologies" in result.stdout
+    assert "Categorize ontologies by relevance" in result.stdout
+    assert "HEAVY []" in result.stdout
+
+
+def test_subcommand_matches_console_script():
+    targets = command_targets()
+    assert targets["categorize-ontologies"] == "metpo.pipeline.categorize_ontologies:main"
+    assert "metpo" not in targets
+
+    result = CliRunner().invoke(main, ["categorize-ontologies", "--help"])
+    assert result.exit_code == 0
+    assert "--output-prefix" in result.output
+
+
+def test_unknown_command():
+    result = CliRunner().invoke(main, ["no-such-command"])
+    assert result.exit_code != 0
+    assert "No such command" in result.output
+
+
+def test_short_help_reads_docstring_from_source():
+    assert short_help("metpo.tools.sync_sheets:sync_metpo_sheets", limit=80) == (
+        "Download METPO Google Sheets in parallel and record content hashes."
+    )
+    assert short_help("metpo.tools.sync_sheets:sync_metpo_sheets", limit=20) == (
+        "Download METPO..."
+    )
+    assert short_help("metpo.no_such_module:main") == ""
+
+
+def test_short_help_falls_back_to_module_docstring():
+    assert short_help("metpo.scripts.demo_metatraits_mongo_to_kgx:main", limit=80) == (
+        "Demo: map MetaTraits MongoDB records to KGX using official KGX sinks."
+    )
+
+
+def test_unrelated_pyproject_is_ignored(tmp_path, monkeypatch):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[project]\nname = "other"\n[project.scripts]\nx = "metpo.x:main"\n')
+    monkeypatch.setattr(cli, "PYPROJECT", pyproject)
+    command_targets.cache_clear()
+    try:
+        targets = command_targets()
+        assert "x" not in targets
+        assert "categorize-ontologies" in targets  # from the installed entry points
+    finally:
+        command_targets.cache_clear()
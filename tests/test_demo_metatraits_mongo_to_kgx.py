@@ -0,0 +1,81 @@
+"""Tests for the partitioned MetaTraits Mongo to KGX export."""
+
+import itertools
+import json
+
+from metpo.scripts.demo_metatraits_mongo_to_kgx import (
+    EDGE_COLUMNS,
+    compute_id_partitions,
+    id_range_filter,
+    kgx_paths,
+    merge_partitions,
+    stream_records_to_kgx,
+)
+
+TABLE = {
+    "gram positive": {"trait_name": "gram positive", "matched_process_metpo": "METPO:1000698|gp"},
+}
+
+
+def _records(accessions):
+    return [
+        {"name": "gram positive", "majority_label": "true", "genome_accession": acc}
+        for acc in accessions
+    ]
+
+
+class FakeCollection:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def aggregate(self, pipeline):
+        return [{"_id": i} for i in self.ids]
+
+
+def test_compute_id_partitions_covers_whole_range():
+    ranges = compute_id_partitions(FakeCollection(list(range(100))), 4)
+    assert len(ranges) == 4
+    assert ranges[0][0] is None
+    assert ranges[-1][1] is None
+    for (_, hi), (lo, _) in itertools.pairwise(ranges):
+        assert hi == lo
+
+
+def test_compute_id_partitions_single():
+    assert compute_id_partitions(FakeCollection([]), 1) == [(None, None)]
+    assert id_range_filter(None, None) == {}
+    assert id_range_filter(3, None) == {"_id": {"$gte": 3}}
+
+
+def test_stream_and_merge_dedupes_nodes(tmp_path):
+    prefixes = []
+    for i, accessions in enumerate([["GCA_1", "GCA_2", "GCA_1"], ["GCA_2", "GCA_3"]]):
+        prefix = tmp_path / f"out.part-{i:04d}"
+        nodes_path, edges_path = kgx_paths(prefix, "tsv")
+        with nodes_path.open("w") as nodes_out, edges_path.open("w") as edges_out:
+            stats = stream_records_to_kgx(
+                [*_records(accessions), {"name": "unmapped"}], TABLE, nodes_out, edges_out, "tsv"
+            )
+        assert stats["edges"] == len(accessions)
+        assert stats["missing_mapping"] == 1
+        prefixes.append(prefix)
+
+    nodes_path, edges_path, node_count = merge_partitions(prefixes, tmp_path / "out", "tsv")
+    node_lines = nodes_path.read_text().splitlines()
+    edge_lines = edges_path.read_text().splitlines()
+    assert node_count == 4  # three genomes + METPO:1000698
+    assert len(node_lines) == 5
+    assert edge_lines[0].split("\t") == EDGE_COLUMNS
+    assert len(edge_lines) == 6
+    assert "assembly:GCA_3\tbiolink:has_phenotype\tMETPO:1000698" in edge_lines[-1]
+    assert not list(tmp_path.glob("*.part-*"))
+
+
+def test_jsonl_merge(tmp_path):
+    prefix = tmp_path / "out.part-0000"
+    nodes_path, edges_path = kgx_paths(prefix, "jsonl")
+    with nodes_path.open("w") as nodes_out, edges_path.open("w") as edges_out:
+        stream_records_to_kgx(_records(["GCA_1"]), TABLE, nodes_out, edges_out, "jsonl")
+    nodes_path, edges_path, _ = merge_partitions([prefix], tmp_path / "out", "jsonl")
+    edge = json.loads(edges_path.read_text().splitlines()[0])
+    assert edge["primary_knowledge_source"] == ["infores:metatraits"]
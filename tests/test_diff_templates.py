@@ -1,5 +1,6 @@
 """Tests for diff_templates CLI."""
 
+import subprocess
 from pathlib import Path
 
 import click
@@ -8,12 +9,18 @@ from click.testing import CliRunner
 
 from metpo.scripts.diff_templates import (
     compare,
+    diff_versions,
     load_full_rows,
     load_headers,
     load_ids,
+    load_version,
     main,
+    read_version,
     resolve_source,
+    row_fingerprint,
 )
+from metpo.sheets_config import TEMPLATE_PATHS
+from metpo.utils.git_history import GitTemplateHistory
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
@@ -119,6 +126,34 @@ class TestCompare:
         assert result["common"] == 0
 
 
+class TestDiffVersions:
+    def test_fingerprint_ignores_whitespace_and_trailing_empty_cells(self):
+        assert row_fingerprint(["METPO:1", " a ", ""]) == row_fingerprint(["METPO:1", "a"])
+        assert row_fingerprint(["METPO:1", "a"]) != row_fingerprint(["METPO:1", "", "a"])
+
+    def test_only_changed_rows_are_reported(self, template_a, template_b):
+        diff = diff_versions(read_version("A", template_a), read_version("B", template_b))
+        assert diff.only_a == ["METPO:1000003"]
+        assert diff.only_b == ["METPO:1000004"]
+        assert diff.changed == ["METPO:1000002"]
+        assert diff.label_changes == [("METPO:1000002", "beta", "beta renamed")]
+
+    def test_identical_content_short_circuits(self, template_a):
+        a = read_version("A", template_a)
+        diff = diff_versions(a, read_version("A again", template_a))
+        assert diff.changed == []
+        assert len(diff.common) == 3
+
+    def test_load_version_reads_git_blob_and_shares_parses(self):
+        parsed = {}
+        with GitTemplateHistory(Path.cwd(), cache_path=None) as history:
+            head = load_version("HEAD", "classes", history, parsed)
+            again = load_version("HEAD", "classes", history, parsed)
+        assert head.rows
+        assert again.rows is head.rows
+        assert len(parsed) == 1
+
+
 class TestResolveSource:
     def test_file_path(self, template_a):
         path = resolve_source(str(template_a), "classes")
@@ -152,6 +187,43 @@ class TestCli:
         assert "METPO:1000004" in result.output
         assert "beta renamed" in result.output
 
+    def test_file_vs_file_outside_a_git_checkout(self, template_a, template_b, monkeypatch):
+        monkeypatch.chdir(template_a.parent)
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["-a", str(template_a), "-b", str(template_b), "-t", "classes"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "beta renamed" in result.output
+
+    def test_tag_without_the_template_counts_as_absent(self, template_a, monkeypatch):
+        repo = template_a.parent / "repo"
+        repo.mkdir()
+
+        def git(*args):
+            subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+        git("init", "-q")
+        git("config", "user.email", "test@example.org")
+        git("config", "user.name", "test")
+        (repo / "README").write_text("docs only\n")
+        git("add", "-A")
+        git("commit", "-q", "-m", "v1")
+        git("tag", "v1")
+        target = repo / TEMPLATE_PATHS["classes"]
+        target.parent.mkdir(parents=True)
+        target.write_text(template_a.read_text())
+        git("add", "-A")
+        git("commit", "-q", "-m", "v2")
+        git("tag", "v2")
+        monkeypatch.chdir(repo)
+
+        runner = CliRunner()
+        result = runner.invoke(main, ["--tags", "*", "-t", "classes", "--summary"])
+        assert result.exit_code == 0, result.output
+        steps = [line.split() for line in result.output.splitlines() if line.split()[:1] == ["v1"]]
+        assert steps == [["v1", "v2", "3", "3", "0", "0", "0"]]
+
     def test_cell_diffs_flag(self, template_a, template_b):
         runner = CliRunner()
         result = runner.invoke(
@@ -166,3 +238,18 @@ class TestCli:
         result = runner.invoke(main, ["-a", "HEAD", "-b", "HEAD", "-t", "properties"])
         assert result.exit_code == 0
         assert "IDs and labels are identical" in result.output
+
+    def test_n_way_summary(self, template_a, template_b):
+        runner = CliRunner()
+        args = ["-s", str(template_a), "-s", str(template_b), "-s", str(template_a)]
+        result = runner.invoke(main, [*args, "-t", "classes", "--summary"])
+        assert result.exit_code == 0
+        steps = [line.split() for line in result.output.splitlines() if "a.tsv" in line]
+        assert [step[2:] for step in steps] == [["3", "1", "1", "1", "1"]] * 2
+
+    def test_n_way_full_diffs(self, template_a, template_b):
+        runner = CliRunner()
+        args = ["-s", str(template_a), "-s", str(template_b), "-s", str(template_a)]
+        result = runner.invoke(main, [*args, "-t", "classes", "--cell-diffs"])
+        assert result.exit_code == 0
+        assert result.output.count("Cell-level diffs (2 cells") == 2
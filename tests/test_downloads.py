@@ -0,0 +1,181 @@
+"""Tests for resumable downloads against a local HTTP stand-in."""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from click.testing import CliRunner
+
+from metpo.bactotraits.download_ontology import main as download_ontology
+from metpo.utils.downloads import DownloadJob, download, download_many, part_path
+
+BODY = bytes(range(256)) * 400  # 100 KiB
+
+
+class StandIn(ThreadingHTTPServer):
+    """Serves BODY at any path, honouring Range; can drop or stall responses."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RangeHandler)
+        self.body = BODY
+        self.drop_after: int | None = None  # close the first response after this many bytes
+        self.honour_range = True
+        self.etag = '"v1"'
+        self.delay = 0.0
+        self.requests: list[dict] = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(
+                {
+                    "path": self.path,
+                    "range": self.headers.get("Range"),
+                    "if_range": self.headers.get("If-Range"),
+                }
+            )
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self._respond(server)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _respond(self, server):
+        time.sleep(server.delay)
+        body, start = server.body, 0
+        requested = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if requested and if_range not in (None, server.etag):
+            requested = None  # the resource changed: send all of it
+        if requested and server.honour_range:
+            start = int(requested.removeprefix("bytes=").split("-")[0])
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        payload = body[start:]
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if server.drop_after is not None:
+            self.wfile.write(payload[: server.drop_after])
+            server.drop_after = None
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def server():
+    stand_in = StandIn()
+    thread = threading.Thread(target=stand_in.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield stand_in
+    stand_in.shutdown()
+    stand_in.server_close()
+
+
+def _job(server, tmp_path, **kwargs):
+    return DownloadJob("ONT", f"{server.url}/ONT", tmp_path / "ONT.owl", **kwargs)
+
+
+def test_download_verifies_checksum(server, tmp_path):
+    result = download(_job(server, tmp_path, sha256=hashlib.sha256(BODY).hexdigest()))
+    assert result.status == "downloaded"
+    assert (tmp_path / "ONT.owl").read_bytes() == BODY
+    assert not part_path(tmp_path / "ONT.owl").exists()
+
+
+def test_dropped_connection_resumes_with_range(server, tmp_path):
+    server.drop_after = 30_000
+    result = download(_job(server, tmp_path), backoff=0)
+    assert result.ok
+    assert (tmp_path / "ONT.owl").read_bytes() == BODY
+    assert [r["range"] for r in server.requests] == [None, "bytes=30000-"]
+
+
+def test_existing_part_file_is_resumed(server, tmp_path):
+    part_path(tmp_path / "ONT.owl").write_bytes(BODY[:50_000])
+    result = download(_job(server, tmp_path))
+    assert result.status == "resumed"
+    assert result.resumed_from == 50_000
+    assert result.sha256 == hashlib.sha256(BODY).hexdigest()
+    assert (tmp_path / "ONT.owl").read_bytes() == BODY
+
+
+def test_server_ignoring_range_restarts(server, tmp_path):
+    server.honour_range = False
+    part_path(tmp_path / "ONT.owl").write_bytes(b"stale bytes")
+    assert download(_job(server, tmp_path)).ok
+    assert (tmp_path / "ONT.owl").read_bytes() == BODY
+
+
+def test_changed_resource_is_not_spliced_onto_an_old_part(server, tmp_path):
+    server.drop_after = 30_000
+    assert not download(_job(server, tmp_path), retries=0).ok
+    part = part_path(tmp_path / "ONT.owl")
+    assert part.stat().st_size == 30_000
+
+    server.body = BODY[::-1]
+    server.etag = '"v2"'
+    assert download(_job(server, tmp_path)).ok
+    assert (tmp_path / "ONT.owl").read_bytes() == BODY[::-1]
+    assert server.requests[-1]["if_range"] == '"v1"'
+    assert list(tmp_path.iterdir()) == [tmp_path / "ONT.owl"]
+
+
+def test_checksum_mismatch_fails_and_discards(server, tmp_path):
+    result = download(_job(server, tmp_path, sha256="0" * 64))
+    assert result.status == "failed"
+    assert "SHA-256 mismatch" in result.error
+    assert not (tmp_path / "ONT.owl").exists()
+    assert not part_path(tmp_path / "ONT.owl").exists()
+
+
+def test_download_many_caps_connections_per_host(server, tmp_path):
+    server.delay = 0.05
+    jobs = [DownloadJob(f"O{i}", f"{server.url}/O{i}", tmp_path / f"O{i}.owl") for i in range(6)]
+    results = download_many(jobs, workers=6, per_host=2)
+    assert [r.name for r in results] == [f"O{i}" for i in range(6)]
+    assert all(r.ok for r in results)
+    assert server.max_active <= 2
+
+
+def test_cli_records_manifest(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BIOPORTAL_API_KEY", "key")
+    args = ["D3O", "MPO", "--output-dir", "onts", "--base-url", f"{server.url}/{{ontology_id}}"]
+    result = CliRunner().invoke(download_ontology, args)
+    assert result.exit_code == 0, result.output
+    assert server.requests[0]["path"].endswith("?apikey=key")
+    manifest = json.loads((tmp_path / ".ontology_manifest.json").read_text())
+    assert manifest["ontologies"]["MPO"]["status"] == "success"
+    assert manifest["artifacts"]["onts/D3O.owl"]["sha256"] == hashlib.sha256(BODY).hexdigest()
+
+    result = CliRunner().invoke(download_ontology, [*args, "--skip-existing"])
+    assert "already downloaded" in result.output
+    assert len(server.requests) == 2
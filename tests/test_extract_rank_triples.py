@@ -0,0 +1,42 @@
+"""Tests for the streaming extract-rank-triples tool."""
+
+import gzip
+
+from metpo.tools.extract_rank_triples import format_rank_triples, write_rank_triples
+
+NODES = [
+    "1\t|\t1\t|\tno rank\t|\t\t|\t8\t|\n",
+    "2\t|\t131567\t|\tsuperkingdom\t|\t\t|\t0\t|\n",
+    "561\t|\t1224\t|\tgenus\t|\t\t|\t0\t|\n",
+    "562\t|\t561\t|\tspecies\t|\tEC\t|\t0\t|\n",
+]
+
+
+def test_format_turtle_skips_no_rank():
+    text, count = format_rank_triples(NODES)
+    assert count == 3
+    assert 'NCBITaxon:562 ncbitaxon:has_rank "species" .' in text
+    assert "NCBITaxon:1 " not in text
+
+
+def test_format_ntriples_with_rank_filter():
+    text, count = format_rank_triples(NODES, "ntriples", frozenset({"genus"}))
+    assert count == 1
+    assert text == (
+        "<http://purl.obolibrary.org/obo/NCBITaxon_561> "
+        '<http://purl.obolibrary.org/obo/ncbitaxon#has_rank> "genus" .\n'
+    )
+
+
+def test_gzip_input_and_parallel_output_match(tmp_path):
+    nodes = tmp_path / "nodes.dmp"
+    nodes.write_text("".join(NODES * 50), encoding="utf-8")
+    with gzip.open(tmp_path / "nodes.dmp.gz", "wt", encoding="utf-8") as f:
+        f.write("".join(NODES * 50))
+
+    serial = tmp_path / "serial.ttl"
+    parallel = tmp_path / "parallel.ttl"
+    assert write_rank_triples(tmp_path / "nodes.dmp.gz", serial) == 150
+    assert write_rank_triples(nodes, parallel, workers=2) == 150
+    assert serial.read_text(encoding="utf-8") == parallel.read_text(encoding="utf-8")
+    assert serial.read_text(encoding="utf-8").startswith("@prefix NCBITaxon:")
@@ -0,0 +1,113 @@
+"""Tests for the streaming MetaTraits catalog extractor and conditional fetch."""
+
+import json
+
+import pytest
+import requests
+
+from metpo.scripts.fetch_metatraits import extract_traits, fetch_traits, iter_traits
+
+CATALOG = """<html><body>
+<div class="container">
+<div class="card mb-3" id="acidophilic">
+  <div class="card-body">
+    <h4 class="card-title">acidophilic</h4>
+    <span class="badge bg-secondary rounded-pill">binary</span>
+    <p class="card-text text-muted">Grows at pH &lt; 5.5, see <a href="x">OMP</a>.</p>
+    <a class="btn btn-cta" href=https://www.ebi.ac.uk/ols/terms?obo_id=OMP%3A0005009>OMP:0005009</a>
+  </div>
+</div>
+<div class="card mb-3" id="produces-ethanol">
+  <h4 class="card-title">produces: ethanol &amp; co</h4>
+  <span class="badge rounded-pill">boolean</span>
+  <p class="card-text">Ethanol production.</p>
+  <a class="btn btn-cta" href=https://example.org/CHEBI_16236>CHEBI:16236</a>
+  <a class="btn btn-cta" href=https://example.org/GO_0006113>GO:0006113</a>
+</div>
+<div class="card mb-3" id="no-name"><p class="card-text">ignored</p></div>
+</div></body></html>"""
+
+
+def test_extract_traits():
+    traits = extract_traits(CATALOG)
+    assert [t["card_id"] for t in traits] == ["acidophilic", "produces-ethanol"]
+    first, second = traits
+    assert first["name"] == "acidophilic"
+    assert first["type"] == "binary"
+    assert first["description"] == "Grows at pH < 5.5, see OMP."
+    assert first["ontology_refs"] == [
+        {"curie": "OMP:0005009", "url": "https://www.ebi.ac.uk/ols/terms?obo_id=OMP%3A0005009"}
+    ]
+    # Names keep entity references verbatim, as the regex extractor did.
+    assert second["name"] == "produces: ethanol &amp; co"
+    assert [r["curie"] for r in second["ontology_refs"]] == ["CHEBI:16236", "GO:0006113"]
+
+
+def test_chunked_parse_matches_whole_document():
+    chunks = [CATALOG[i : i + 7] for i in range(0, len(CATALOG), 7)]
+    assert list(iter_traits(chunks)) == extract_traits(CATALOG)
+
+
+def test_name_joins_text_of_nested_tags():
+    html = (
+        '<div class="card mb-3" id="halophilic"><h4>halo<i>philic</i>'
+        ' <span class="badge rounded-pill">binary</span></h4></div>'
+    )
+    [trait] = extract_traits(html)
+    assert trait["name"] == "halophilic binary"
+    assert trait["type"] == "binary"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body="", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        assert self.status_code < 400
+
+    def iter_content(self, chunk_size, decode_unicode=False):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i : i + chunk_size]
+
+
+class FakeSession:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, CATALOG, {"ETag": '"v1"'})
+
+
+def test_conditional_fetch_reuses_cache(tmp_path):
+    session = FakeSession()
+    traits, cached = fetch_traits("https://x/traits", tmp_path, session=session)
+    assert not cached
+    assert len(traits) == 2
+    assert json.loads((tmp_path / "meta.json").read_text())["etag"] == '"v1"'
+
+    again, cached = fetch_traits("https://x/traits", tmp_path, session=session)
+    assert cached
+    assert again == traits
+    assert session.requests[-1] == {"If-None-Match": '"v1"'}
+
+    _, cached = fetch_traits("https://x/traits", tmp_path, session=session, force=True)
+    assert not cached
+
+
+def test_not_modified_without_validators_raises(tmp_path):
+    session = FakeSession()
+    session.get = lambda url, headers=None, **kwargs: FakeResponse(304)
+    with pytest.raises(requests.HTTPError, match="without a cached copy"):
+        fetch_traits("https://x/traits", tmp_path, session=session)
@@ -0,0 +1,99 @@
+"""Tests for the concurrent, cached OLS catalog fetch."""
+
+import threading
+import time
+
+import requests
+from click.testing import CliRunner
+
+from metpo.pipeline import fetch_ontology_names
+from metpo.pipeline.fetch_ontology_names import (
+    fetch_catalog,
+    load_catalog_cache,
+    merge_catalog,
+    write_catalog_cache,
+)
+
+
+def _onto(onto_id, updated="2025-01-01", title=None):
+    return {
+        "ontologyId": onto_id,
+        "config": {"id": onto_id, "title": title or onto_id.upper(), "description": "d"},
+        "numberOfTerms": 10,
+        "status": "LOADED",
+        "updated": updated,
+    }
+
+
+class FakeOLS:
+    """Serve catalog pages of two ontologies each; tracks concurrency."""
+
+    def __init__(self, ontologies, fail_once=()):
+        self.ontologies = ontologies
+        self.fail_once = set(fail_once)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, page):
+        with self.lock:
+            self.calls.append(page)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.02)
+            if page in self.fail_once:
+                self.fail_once.discard(page)
+                raise requests.exceptions.ConnectionError("reset")
+            chunk = self.ontologies[page * 2 : page * 2 + 2]
+            total = (len(self.ontologies) + 1) // 2
+            return {"page": {"totalPages": total}, "_embedded": {"ontologies": chunk}}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_fetch_catalog_first_page_then_concurrent():
+    ols = FakeOLS([_onto(f"o{i}") for i in range(9)], fail_once={3})
+    records, failed = fetch_catalog(ols, workers=4, api_delay=0)
+    assert failed == []
+    assert [r["ontologyId"] for r in records] == [f"o{i}" for i in range(9)]
+    assert ols.calls[0] == 0
+    assert ols.calls.count(3) == 2
+    assert ols.max_active > 1
+    assert records[0]["title"] == "O0"
+    assert list(records[0])[:3] == ["ontologyId", "id", "title"]
+
+
+def test_merge_by_updated_timestamp(tmp_path):
+    cached = {r["ontologyId"]: r for r in fetch_catalog(FakeOLS([_onto("a"), _onto("b")]))[0]}
+    fetched = fetch_catalog(
+        FakeOLS([_onto("b", updated="2025-06-01"), _onto("a"), _onto("c")]), api_delay=0
+    )[0]
+    merged, stats = merge_catalog(cached, fetched)
+    assert stats == {"added": 1, "updated": 1, "unchanged": 1}
+    assert list(merged) == ["a", "b", "c"]
+    assert merged["b"]["updated"] == "2025-06-01"
+
+    path = tmp_path / "cache.jsonl"
+    assert write_catalog_cache(merged, path)
+    assert not write_catalog_cache(load_catalog_cache(path), path)
+    assert load_catalog_cache(path) == merged
+
+
+def test_cli_offline_uses_cache(tmp_path):
+    cache = tmp_path / "cache.jsonl"
+    write_catalog_cache(
+        {r["ontologyId"]: r for r in fetch_catalog(FakeOLS([_onto("pato", title="PATO")]))[0]},
+        cache,
+    )
+    sizes = tmp_path / "sizes.csv"
+    sizes.write_text("ontologyId,count\npato,100\nzzz,5\n")
+    output = tmp_path / "catalog.csv"
+    result = CliRunner().invoke(
+        fetch_ontology_names.main,
+        ["-i", str(sizes), "-o", str(output), "--cache", str(cache), "--offline"],
+    )
+    assert result.exit_code == 0, result.output
+    assert output.read_text().splitlines()[1:] == ["pato,PATO,100,d", "zzz,Unknown,5,"]
@@ -0,0 +1,52 @@
+"""Tests for the shared file fingerprint and atomic write helpers."""
+
+import os
+
+import pytest
+
+from metpo.utils.files import atomic_open, file_fingerprint, is_unchanged, write_atomic
+
+
+def test_fingerprint_counts_lines_in_the_same_read(tmp_path):
+    path = tmp_path / "x.tsv"
+    path.write_text("h\na\nb")
+    assert "lines" not in file_fingerprint(path)
+    recorded = file_fingerprint(path, count_lines=True)
+    assert recorded["lines"] == 3
+    assert recorded["size"] == 5
+    empty = tmp_path / "empty.tsv"
+    empty.touch()
+    assert file_fingerprint(empty, count_lines=True)["lines"] == 0
+
+
+def test_is_unchanged_rehashes_only_when_the_mtime_moved(tmp_path):
+    path = tmp_path / "x.json"
+    path.write_text("{}")
+    recorded = file_fingerprint(path)
+    assert is_unchanged(path, recorded)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert is_unchanged(path, recorded)
+    assert not is_unchanged(path, recorded, rehash=False)
+
+    path.write_text("[]")
+    assert not is_unchanged(path, recorded)
+    assert not is_unchanged(tmp_path / "missing", recorded)
+    assert not is_unchanged(path, None)
+
+
+def test_atomic_write_leaves_the_target_intact_on_failure(tmp_path):
+    path = tmp_path / "sub" / "out.txt"
+    write_atomic(path, "first\n")
+    assert path.read_text() == "first\n"
+
+    def interrupted_write():
+        with atomic_open(path) as handle:
+            handle.write("partial")
+            raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        interrupted_write()
+    assert path.read_text() == "first\n"
+    assert list(path.parent.iterdir()) == [path]
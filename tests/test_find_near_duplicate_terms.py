@@ -0,0 +1,102 @@
+"""Tests for embedding-based near-duplicate detection among METPO terms."""
+
+import csv
+import json
+
+import numpy as np
+from click.testing import CliRunner
+
+from metpo.benchmarks.stand_ins import StandInServer
+from metpo.scripts.find_near_duplicate_terms import blocked_top_k, main
+from metpo.utils.ontology_index import DEFAULT_INDEX_CACHE
+
+METPO = "https://w3id.org/metpo/"
+
+
+def test_blocked_top_k_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8))
+    owners = np.arange(50) // 2  # consecutive rows belong to the same term
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    full = unit @ unit.T
+    full[owners[:, None] == owners[None, :]] = -np.inf
+    expected = set()
+    for row in range(50):
+        for column in np.argsort(-full[row])[:3]:
+            if full[row, column] >= 0.5:
+                expected.add((row, int(column)))
+    assert expected
+    for block_size in (1, 7, 100):
+        found = blocked_top_k(vectors, owners, k=3, threshold=0.5, block_size=block_size)
+        assert {(row, column) for row, column, _ in found} == expected
+
+
+def _node(number, label, parent=None, synonyms=(), deprecated=False):
+    meta = {"synonyms": [{"pred": "hasExactSynonym", "val": s} for s in synonyms]}
+    if deprecated:
+        meta["deprecated"] = True
+    node = {"id": f"{METPO}{number}", "lbl": label, "type": "CLASS", "meta": meta}
+    edge = {"sub": f"{METPO}{number}", "pred": "is_a", "obj": f"{METPO}{parent}"}
+    return node, edge if parent else None
+
+
+def _write_ontology(path):
+    terms = [
+        _node(1000001, "quality"),
+        _node(1000002, "cell shape", 1000001),
+        _node(1000003, "rod shaped", 1000002, synonyms=["bacillus cell shape"]),
+        _node(1000004, "bacillus cell shape", 1000002),
+        _node(1000005, "temperature preference", 1000001),
+        _node(1000006, "growth at high temperature", 1000005),
+        _node(1000007, "obsolete bacillus cell shape", 1000002, deprecated=True),
+    ]
+    graph = {
+        "nodes": [node for node, _ in terms],
+        "edges": [edge for _, edge in terms if edge],
+    }
+    path.write_text(json.dumps({"graphs": [graph]}), encoding="utf-8")
+
+
+def test_reports_pairs_grouped_by_subtree_and_reuses_embeddings(tmp_path):
+    ontology = tmp_path / "metpo.json"
+    _write_ontology(ontology)
+    stubs = tmp_path / "stubs.tsv"
+    stubs.write_text(
+        "ID\tlabel\tTYPE\nID\tLABEL\tTYPE\n"
+        "METPO:1000002\tcell shape\towl:Class\n"
+        "METPO:1999999\tgrowth at high temperature\towl:Class\n"
+    )
+    output = tmp_path / "pairs.tsv"
+    cache = tmp_path / "embeddings.npz"
+    shared = DEFAULT_INDEX_CACHE.stat().st_mtime_ns if DEFAULT_INDEX_CACHE.exists() else None
+    with StandInServer() as server:
+        args = ["--metpo-json", str(ontology), "--stubs", str(stubs), "-o", str(output)]
+        args += ["--embed-url", server.embed_url, "--cache", str(cache), "-t", "0.99"]
+        result = CliRunner().invoke(main, args)
+        assert result.exit_code == 0, result.output
+        requests = server.requests["embeddings"]
+        assert "2 pairs at similarity >= 0.99" in result.stdout
+
+        result = CliRunner().invoke(main, args)
+        assert result.exit_code == 0, result.output
+        assert server.requests["embeddings"] == requests
+
+    # Every cache stays under tmp_path; the shared index is left alone
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "embeddings.npz",
+        "metpo.json",
+        "metpo.json.index.bin",
+        "pairs.tsv",
+        "stubs.tsv",
+    ]
+    current = DEFAULT_INDEX_CACHE.stat().st_mtime_ns if DEFAULT_INDEX_CACHE.exists() else None
+    assert current == shared
+
+    with output.open() as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    pairs = {(row["subtree"], row["term_a"], row["term_b"], row["matched_a"]) for row in rows}
+    assert pairs == {
+        ("cell shape", "METPO:1000003", "METPO:1000004", "synonym"),
+        ("(stubs) | temperature preference", "METPO:1000006", "METPO:1999999", "label"),
+    }
+    assert all(float(row["similarity"]) >= 0.99 for row in rows)
@@ -0,0 +1,97 @@
+"""Tests for the blob-cached git template reader."""
+
+import subprocess
+
+import pytest
+
+from metpo.scripts.audit_id_allocation import collect_ids
+from metpo.scripts.generate_deprecated_template import collect_all_ids, collect_labels
+from metpo.utils.git_history import GitTemplateHistory, parse_template
+
+CLASSES = "src/templates/metpo_sheet.tsv"
+PROPERTIES = "src/templates/metpo-properties.tsv"
+HEADER = "ID\tlabel\tTYPE\nID\tLABEL\tTYPE\n"
+
+
+def _git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _commit(repo, files, tag):
+    for rel, text in files.items():
+        path = repo / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", tag)
+    _git(repo, "tag", tag)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.org")
+    _git(tmp_path, "config", "user.name", "test")
+    props = HEADER + "METPO:2000001\thas old\towl:ObjectProperty\n"
+    _commit(tmp_path, {CLASSES: HEADER + "METPO:1000001\tcell\towl:Class\n"}, "v1")
+    _commit(tmp_path, {PROPERTIES: props}, "v2")
+    _commit(tmp_path, {"README": "docs only\n"}, "v3")
+    _commit(
+        tmp_path,
+        {
+            CLASSES: HEADER + "METPO:1000002\tspore\tMETPO:1000001\n",
+            PROPERTIES: HEADER + "METPO:2000002\thas new\towl:DataProperty\n",
+        },
+        "v4",
+    )
+    return tmp_path
+
+
+def test_parse_template():
+    snap = parse_template("abc", HEADER + "METPO:1000001\tcell\towl:Class\n  METPO:1000009\tx\n")
+    assert snap.ids == {"1000001"}
+    assert snap.rows == [("METPO:1000001", "cell", "owl:Class"), ("METPO:1000009", "x", "")]
+    assert snap.label("1000009") == "x"
+    assert snap.label("1") == ""
+
+
+def test_each_blob_is_read_once(repo):
+    cache = repo / "cache.json"
+    with GitTemplateHistory(repo, cache) as git:
+        assert git.tags() == ["v1", "v2", "v3", "v4"]
+        assert git.snapshot("v1", PROPERTIES) is None
+        ids = [git.snapshot(tag, CLASSES).ids for tag in git.tags()]
+        assert ids == [{"1000001"}] * 3 + [{"1000002"}]
+        assert git.blobs_read == 2
+
+    with GitTemplateHistory(repo, cache) as git:
+        for tag in git.tags():
+            git.snapshot(tag, CLASSES)
+            git.snapshot(tag, PROPERTIES)
+        assert git.blobs_read == 2  # only the two properties versions were new
+
+
+def test_nothing_resolves_outside_a_git_checkout(tmp_path):
+    with GitTemplateHistory(tmp_path, None) as git:
+        assert git.resolve("HEAD", CLASSES) is None
+        assert git.snapshot("HEAD", CLASSES) is None
+
+
+def test_audit_and_deprecated_template_collection(repo):
+    audit = collect_ids(repo, GitTemplateHistory(repo, None))
+    assert audit.release_ids == {
+        "v1": {"1000001"},
+        "v2": {"1000001", "2000001"},
+        "v3": {"1000001", "2000001"},
+        "v4": {"1000002", "2000002"},
+    }
+    assert audit.burned_ids == {"1000001", "2000001"}
+
+    with GitTemplateHistory(repo, None) as git:
+        current, all_ids = collect_all_ids(repo, git)
+        labels = collect_labels(repo, git)
+    assert current == {"1000002", "2000002"}
+    assert all_ids == audit.all_ids
+    assert labels["2000001"] == ("has old", "owl:ObjectProperty", "tag:v3")
+    # Column 3 holding a parent CURIE is not an OWL type
+    assert labels["1000002"] == ("spore", "owl:Class", "tag:v4")
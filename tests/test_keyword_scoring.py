@@ -0,0 +1,68 @@
+"""Tests for the YAML-configured keyword scorer behind categorize-ontologies."""
+
+import pytest
+
+from metpo.pipeline.categorize_ontologies import load_scorer, score_ontologies, score_ontology
+from metpo.utils.keyword_scoring import KeywordScorer
+
+
+def _onto(title, description="", count=1000):
+    return {"title": title, "description": description, "count": count}
+
+
+def test_default_config_scores():
+    assert score_ontology(_onto("Bacterial phenotype ontology")) == (
+        "very_appealing",
+        27,
+        "bacterial/microbial; phenotype-centric",
+    )
+    assert score_ontology(_onto("Zebrafish anatomy")) == (
+        "not_appealing",
+        -20,
+        "anatomy not phenotype; unrelated domain",
+    )
+    assert score_ontology(_onto("Widget catalog")) == ("in_between", 0, "no keywords matched")
+
+
+def test_size_and_fungal_rules():
+    assert score_ontology(_onto("Yeast phenotypes", count=4000))[1:] == (
+        11,
+        "phenotype-centric; fungal (small, acceptable)",
+    )
+    category, score, reason = score_ontology(_onto("Habitat terms", count=600000))
+    assert (category, score) == ("not_appealing", -6)
+    assert reason == "environmental conditions; very large; too large"
+
+
+def test_rescore_masks_with_new_weights():
+    ontologies = [_onto("Microbial traits"), _onto("Host habitat"), _onto("Drugs")]
+    assert score_ontologies(ontologies) == [score_ontology(o) for o in ontologies]
+
+    scorer = KeywordScorer(
+        {"microbe": ["microb"], "place": ["habitat"]},
+        [{"all": ["microbe"], "weight": 3, "reason": "microbe"}],
+        categories=[{"name": "high", "min_score": 3}],
+        default_category="low",
+    )
+    masks = scorer.match_many(o["title"] for o in ontologies)
+    assert scorer.score_masks(masks, [0, 0, 0]) == [
+        ("high", 3, "microbe"),
+        ("low", 0, "no keywords matched"),
+        ("low", 0, "no keywords matched"),
+    ]
+    # Same masks, different rules: no text is matched again
+    retuned = KeywordScorer(
+        {"microbe": ["microb"], "place": ["habitat"]},
+        [{"all": ["place"], "weight": 5, "reason": "place"}],
+        categories=[{"name": "high", "min_score": 3}],
+        default_category="low",
+    )
+    assert [s[0] for s in retuned.score_masks(masks, [0, 0, 0])] == ["low", "high", "low"]
+
+
+def test_unknown_group_rejected(tmp_path):
+    with pytest.raises(ValueError, match="missing"):
+        KeywordScorer({"a": ["x"]}, [{"all": ["missing"], "weight": 1, "reason": "r"}])
+    config = tmp_path / "relevance.yaml"
+    config.write_text("groups: {a: [x]}\nrules:\n  - {all: [a], weight: 2, reason: has x}\n")
+    assert load_scorer(config).score("XYZ") == ("uncategorized", 2, "has x")
@@ -9,6 +9,8 @@ from metpo.scripts.metpo_proposal_lint import (
     parse_bound,
     parse_syn_threshold,
 )
+from metpo.sheets_config import all_export_urls
+from metpo.utils.sheet_sync import sync_sheets
 
 # A minimal classes ROBOT template (row 1 labels, row 2 directives) exercising each check.
 TEMPLATE = (
@@ -179,3 +181,18 @@ def test_baseline_ratchet(tmp_path):
 def test_write_baseline_requires_path(tmp_path):
     r = CliRunner().invoke(main, [str(_write(tmp_path)), "--write-baseline"])
     assert r.exit_code != 0
+
+
+def test_changed_only_skips_synced_sheet_that_passed(tmp_path):
+    root = "METPO:1007000\tphenotype\towl:Class\t\tA quality of an organism.\tPMID:1\t\t\t\t\n"
+    clean = "\n".join(TEMPLATE.splitlines()[:3]) + "\n" + root
+    fetch = {all_export_urls()["classes"]: clean.encode()}.get
+    sync_sheets(tmp_path, ["classes"], fetch=fetch)
+    args = [str(tmp_path / "classes.tsv"), "--mode", "draft", "--changed-only"]
+    runner = CliRunner()
+    r = runner.invoke(main, args)
+    assert r.exit_code == 0, r.output
+    assert "0 error(s)" in r.output
+    assert "skipping" in runner.invoke(main, args).output
+    # Passing in draft mode says nothing about submit mode
+    assert "skipping" not in runner.invoke(main, [*args[:1], "--changed-only"]).output
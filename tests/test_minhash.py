@@ -0,0 +1,44 @@
+"""Tests for MinHash-LSH fuzzy string matching."""
+
+import itertools
+
+import pytest
+
+from metpo.utils.minhash import MinHashLSH, jaccard, shingles
+
+
+def test_shingles_normalize_case_and_punctuation():
+    assert shingles("Spore-forming") == shingles("spore forming")
+    assert shingles("a") == frozenset([" a "])
+    assert jaccard(shingles("endospore"), shingles("endospore")) == 1.0
+
+
+def test_lsh_finds_every_similar_pair_found_by_brute_force():
+    words = ["thermophilic", "mesophilic", "psychrophilic", "halophilic", "acidophilic"]
+    suffixes = ["growth", "growth at low ph", "growth in the dark"]
+    texts = [f"{w} {s}" for w, s in itertools.product(words, suffixes)]
+    texts += [
+        "thermophillic growth at low ph",
+        "psychrophylic growth in the dark",
+        "halophillic growth at low ph",
+    ]
+    sets = [shingles(text) for text in texts]
+    expected = {
+        (i, j)
+        for i, j in itertools.combinations(range(len(texts)), 2)
+        if jaccard(sets[i], sets[j]) >= 0.8
+    }
+    assert len(expected) >= 3
+
+    lsh = MinHashLSH()
+    assert lsh.add_many(texts) == range(len(texts))
+    found = list(lsh.similar_pairs(0.8))
+    assert {(i, j) for i, j, _ in found} == expected
+    assert all(similarity == jaccard(sets[i], sets[j]) for i, j, similarity in found)
+    # Far fewer candidates than the all-pairs compare
+    assert len(lsh.candidate_pairs()) < len(texts) * (len(texts) - 1) // 4
+
+
+def test_bands_must_divide_signature():
+    with pytest.raises(ValueError, match="multiple of bands"):
+        MinHashLSH(num_perm=100, bands=30)
@@ -0,0 +1,79 @@
+"""Tests for the offline NCBI Taxonomy index."""
+
+import gzip
+
+import pytest
+
+from metpo.utils.ncbi_taxonomy import TaxonomyIndex, build_index, split_dmp_line
+
+NODES = (
+    "1\t|\t1\t|\tno rank\t|\t\t|\n"
+    "2\t|\t131567\t|\tsuperkingdom\t|\t\t|\n"
+    "131567\t|\t1\t|\tcellular root\t|\t\t|\n"
+    "1224\t|\t2\t|\tphylum\t|\t\t|\n"
+    "561\t|\t1224\t|\tgenus\t|\t\t|\n"
+    "562\t|\t561\t|\tspecies\t|\t\t|\n"
+)
+NAMES = (
+    "1\t|\troot\t|\t\t|\tscientific name\t|\n"
+    "2\t|\tBacteria\t|\tBacteria <bacteria>\t|\tscientific name\t|\n"
+    "131567\t|\tcellular organisms\t|\t\t|\tscientific name\t|\n"
+    "1224\t|\tPseudomonadota\t|\t\t|\tscientific name\t|\n"
+    "561\t|\tEscherichia\t|\t\t|\tscientific name\t|\n"
+    "562\t|\tEscherichia coli\t|\t\t|\tscientific name\t|\n"
+    "562\t|\tBacillus coli\t|\t\t|\tsynonym\t|\n"
+)
+MERGED = "1637\t|\t562\t|\n"
+
+
+@pytest.fixture
+def index(tmp_path):
+    dump = tmp_path / "taxdmp"
+    dump.mkdir()
+    (dump / "nodes.dmp").write_text(NODES, encoding="utf-8")
+    with gzip.open(dump / "names.dmp.gz", "wt", encoding="utf-8") as f:
+        f.write(NAMES)
+    (dump / "merged.dmp").write_text(MERGED, encoding="utf-8")
+    build_index(dump / "nodes.dmp", dump / "names.dmp.gz", tmp_path / "index", dump / "merged.dmp")
+    with TaxonomyIndex(tmp_path / "index") as idx:
+        yield idx
+
+
+def test_split_dmp_line():
+    assert split_dmp_line("562\t|\t561\t|\tspecies\t|\n") == ["562", "561", "species"]
+
+
+def test_lookup(index):
+    assert index.lookup(562) == ("Escherichia coli", "species")
+    assert index.lookup(3) == (None, None)
+    assert 562 in index
+    assert 10**9 not in index
+    assert len(index) == 6
+
+
+def test_synonyms_are_not_scientific_names(index):
+    assert index.name(562) == "Escherichia coli"
+
+
+def test_lineage(index):
+    assert index.lineage(562) == [562, 561, 1224, 2, 131567, 1]
+    assert index.lineage(999) == []
+    assert index.is_descendant(562, 2)
+    assert not index.is_descendant(2, 562)
+
+
+def test_ancestor_at_rank(index):
+    assert index.ancestor_at_rank(562, "phylum") == 1224
+    assert index.ancestor_at_rank(562, "species") == 562
+    assert index.ancestor_at_rank(562, "order") is None
+
+
+def test_merged(index):
+    assert 1637 not in index
+    assert index.merged_into(1637) == 562
+    assert index.merged_into(562) is None
+
+
+def test_missing_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TaxonomyIndex(tmp_path)
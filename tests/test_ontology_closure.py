@@ -0,0 +1,61 @@
+"""Tests for the bitset transitive-closure index."""
+
+import pytest
+
+from metpo.scripts.analyze_definition_coverage_by_subtree import analyze_coverage
+from metpo.utils.ontology_closure import ClosureIndex
+
+
+@pytest.fixture
+def closure():
+    # root -> a, b; a -> c; b -> c, d; c -> e  (c has two parents)
+    return ClosureIndex.from_children_map(
+        {"root": ["a", "b"], "a": ["c"], "b": ["c", "d"], "c": ["e"]}
+    )
+
+
+def test_descendants_and_ancestors_on_dag(closure):
+    assert closure.descendants("root") == {"a", "b", "c", "d", "e"}
+    assert closure.descendants("b") == {"c", "d", "e"}
+    assert closure.ancestors("e") == {"c", "a", "b", "root"}
+    assert closure.descendants("e") == set()
+    assert closure.parents("c") == ["a", "b"]
+
+
+def test_leaves_and_subsumption(closure):
+    assert closure.members(closure.leaf_bits) == {"d", "e"}
+    assert closure.leaf_descendants("a") == {"e"}
+    assert closure.leaf_descendants("root") == {"d", "e"}
+    assert closure.internal_nodes() == ["root", "a", "b", "c"]
+    assert closure.subsumes("a", "e")
+    assert not closure.subsumes("a", "d")
+    assert not closure.subsumes("e", "e")
+
+
+def test_branch_coverage(closure):
+    branches = {node: closure.leaf_descendant_bits(node) for node in ("root", "a", "b")}
+    coverage = closure.branch_coverage(branches, {"X": {"d", "e", "zzz"}, "Y": {"e", "c"}})
+    assert coverage == {"root": {"X": 2, "Y": 1}, "a": {"X": 1, "Y": 1}, "b": {"X": 2, "Y": 1}}
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        ClosureIndex.from_children_map({"a": ["b"], "b": ["c"], "c": ["a"]})
+
+
+def test_subtree_definition_coverage():
+    def term(term_id, label, has_definition):
+        return {"id": term_id, "label": label, "has_definition": has_definition}
+
+    terms = {
+        "M:1": term("M:1", "top", True),
+        "M:2": term("M:2", "mid", True),
+        "M:3": term("M:3", "leaf one", False),
+        "M:4": term("M:4", "leaf two", True),
+    }
+    results = analyze_coverage(terms, {"top": ["M:2"], "mid": ["M:3", "M:4"]})
+    by_parent = {r["parent_label"]: r for r in results}
+    assert by_parent["top"]["coverage_percent"] == 100.0
+    assert by_parent["top"]["total_descendants"] == 3
+    assert by_parent["top"]["descendant_coverage_percent"] == pytest.approx(66.7)
+    assert by_parent["mid"]["stragglers"] == "leaf one (M:3)"
@@ -0,0 +1,156 @@
+"""Tests for the cached METPO ontology index."""
+
+import json
+import os
+
+import pytest
+
+from metpo.scripts.analyze_definition_coverage_by_subtree import load_metpo_hierarchy_from_index
+from metpo.utils.ontology_index import (
+    DEFAULT_INDEX_CACHE,
+    OntologyIndex,
+    Synonym,
+    cache_path_for,
+    iri_to_curie,
+)
+
+METPO = "https://w3id.org/metpo/"
+SOURCE = "http://purl.obolibrary.org/obo/IAO_0000119"
+
+
+def _graph():
+    return {
+        "graphs": [
+            {
+                "nodes": [
+                    {"id": f"{METPO}1000001", "lbl": "quality", "type": "CLASS"},
+                    {
+                        "id": f"{METPO}1000002",
+                        "lbl": "GC content",
+                        "type": "CLASS",
+                        "meta": {
+                            "definition": {
+                                "val": "Percentage of G and C.",
+                                "meta": {"basicPropertyValues": [{"pred": SOURCE, "val": "x:1"}]},
+                            },
+                            "synonyms": [
+                                {"pred": "hasExactSynonym", "val": "GC"},
+                                {
+                                    "pred": "hasRelatedSynonym",
+                                    "val": "GC percentage",
+                                    "meta": {
+                                        "basicPropertyValues": [{"pred": SOURCE, "val": "mt"}]
+                                    },
+                                },
+                            ],
+                            "xrefs": [{"val": "http://purl.obolibrary.org/obo/PATO_0000001"}],
+                        },
+                    },
+                    {"id": f"{METPO}1000003", "lbl": "high GC", "type": "CLASS"},
+                    {
+                        "id": f"{METPO}0000001",
+                        "lbl": "obsolete thing",
+                        "type": "CLASS",
+                        "meta": {"deprecated": True},
+                    },
+                    {"id": f"{METPO}2000001", "lbl": "has quality", "type": "PROPERTY"},
+                ],
+                "edges": [
+                    {"sub": f"{METPO}1000002", "pred": "is_a", "obj": f"{METPO}1000001"},
+                    {"sub": f"{METPO}1000003", "pred": "is_a", "obj": f"{METPO}1000002"},
+                    {
+                        "sub": f"{METPO}1000003",
+                        "pred": "is_a",
+                        "obj": "http://purl.obolibrary.org/obo/PATO_0000001",
+                    },
+                    {"sub": f"{METPO}1000001", "pred": "part_of", "obj": f"{METPO}1000003"},
+                ],
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "metpo.json"
+    path.write_text(json.dumps(_graph()), encoding="utf-8")
+    return path
+
+
+def test_iri_to_curie():
+    assert iri_to_curie(f"{METPO}1000001") == "METPO:1000001"
+    assert iri_to_curie("http://purl.obolibrary.org/obo/GO_0008152") == "GO:0008152"
+    assert iri_to_curie("http://purl.obolibrary.org/obo/metpo.owl") == (
+        "http://purl.obolibrary.org/obo/metpo.owl"
+    )
+    assert iri_to_curie("https://example.org/x") == "https://example.org/x"
+
+
+def test_fields(source):
+    index = OntologyIndex.from_obographs(source)
+    assert index.label("METPO:1000002") == "GC content"
+    assert index.definition("METPO:1000002") == "Percentage of G and C."
+    assert index.definition_sources("METPO:1000002") == ("x:1",)
+    assert index.synonyms("METPO:1000002") == [
+        Synonym("GC", "EXACT", ()),
+        Synonym("GC percentage", "RELATED", ("mt",)),
+    ]
+    assert index.xrefs("METPO:1000002") == ("PATO:0000001",)
+    assert index.parents("METPO:1000003") == ["METPO:1000002", "PATO:0000001"]
+    assert index.children("METPO:1000001") == ["METPO:1000002"]
+    # Non-hierarchy edges are ignored; external parents become stubs
+    assert index.type("PATO:0000001") == ""
+    assert index.is_deprecated("METPO:0000001")
+    assert index.ids_by_label("high GC") == ["METPO:1000003"]
+    assert list(index.terms()) == ["METPO:1000001", "METPO:1000002", "METPO:1000003"]
+    assert list(index.terms("PROPERTY")) == ["METPO:2000001"]
+
+
+def test_cache_round_trip_is_lazy(source, tmp_path):
+    cache = tmp_path / "index.bin"
+    built = OntologyIndex.load(source, cache)
+    assert cache.exists()
+
+    loaded = OntologyIndex.load(source, cache)
+    assert loaded._fields == {}
+    assert loaded.label("METPO:1000002") == "GC content"
+    assert set(loaded._fields) == {"ids", "labels"}
+    assert loaded.synonyms("METPO:1000002") == built.synonyms("METPO:1000002")
+    assert loaded.parent_table == built.parent_table
+    loaded.close()
+
+
+def test_cache_is_rebuilt_when_source_changes(source, tmp_path):
+    cache = tmp_path / "index.bin"
+    OntologyIndex.load(source, cache)
+    assert OntologyIndex.is_current(cache, source)
+
+    # Same content with a new mtime is still current (SHA-256 matches)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert OntologyIndex.is_current(cache, source)
+
+    graph = _graph()
+    graph["graphs"][0]["nodes"][0]["lbl"] = "renamed quality"
+    source.write_text(json.dumps(graph), encoding="utf-8")
+    assert not OntologyIndex.is_current(cache, source)
+    assert OntologyIndex.load(source, cache).label("METPO:1000001") == "renamed quality"
+
+
+def test_default_cache_is_kept_beside_other_sources(source):
+    shared = DEFAULT_INDEX_CACHE.stat().st_mtime_ns if DEFAULT_INDEX_CACHE.exists() else None
+    OntologyIndex.load(source)
+    assert cache_path_for(source) == source.with_name("metpo.json.index.bin")
+    assert OntologyIndex.is_current(cache_path_for(source), source)
+    current = DEFAULT_INDEX_CACHE.stat().st_mtime_ns if DEFAULT_INDEX_CACHE.exists() else None
+    assert current == shared
+
+
+def test_definition_coverage_hierarchy(source):
+    terms, parent_to_children = load_metpo_hierarchy_from_index(
+        OntologyIndex.from_obographs(source)
+    )
+    assert set(terms) == {"METPO:1000001", "METPO:1000002", "METPO:1000003"}
+    assert terms["METPO:1000002"]["has_definition"]
+    assert parent_to_children["GC content"] == ["METPO:1000003"]
+    assert parent_to_children["PATO:0000001"] == ["METPO:1000003"]  # unlabeled external parent
@@ -0,0 +1,66 @@
+"""Tests for incremental ontology manifest scanning."""
+
+import json
+import os
+
+from click.testing import CliRunner
+
+from metpo.bactotraits import ontology_manifest
+from metpo.bactotraits.ontology_manifest import fingerprint, refresh_fingerprints
+from metpo.bactotraits.scan_manifest import main as scan_manifest
+
+
+def test_fingerprint_counts_terms(tmp_path):
+    tsv = tmp_path / "X.tsv"
+    tsv.write_text('?class\t?labels\n<a>\t"a"\n<b>\t"b"')
+    result = fingerprint(tsv)
+    assert result["term_count"] == 2
+    assert result["size"] == tsv.stat().st_size
+    owl = tmp_path / "X.owl"
+    owl.write_text("<rdf:RDF/>")
+    assert "term_count" not in fingerprint(owl)
+
+
+def test_refresh_only_rereads_changed_files(tmp_path, monkeypatch):
+    first, second = tmp_path / "a.tsv", tmp_path / "b.tsv"
+    first.write_text("h\n1\n")
+    second.write_text("h\n1\n2\n")
+    artifacts = {}
+    assert refresh_fingerprints([first, second], artifacts) == [first, second]
+
+    calls = []
+    original = ontology_manifest.fingerprint
+    monkeypatch.setattr(ontology_manifest, "fingerprint", lambda p: calls.append(p) or original(p))
+    assert refresh_fingerprints([first, second], artifacts) == []
+    second.write_text("h\n1\n2\n3\n")
+    os.utime(second, ns=(0, 1))
+    assert refresh_fingerprints([first, second], artifacts) == [second]
+    assert calls == [second]
+    assert artifacts[str(second)]["term_count"] == 3
+
+
+def test_scan_manifest_is_incremental(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bioportal = tmp_path / "external/ontologies/bioportal"
+    bioportal.mkdir(parents=True)
+    (bioportal / "D3O.owl").write_text("<rdf:RDF/>" + " " * 2000)
+    terms = tmp_path / "data/pipeline/non-ols-terms"
+    terms.mkdir(parents=True)
+    (terms / "D3O.tsv").write_text("?class\n<a>\n<b>\n")
+
+    result = CliRunner().invoke(scan_manifest, [])
+    assert result.exit_code == 0, result.output
+    assert "(2 re-read)" in result.output
+    manifest = json.loads((tmp_path / ".ontology_manifest.json").read_text())
+    entry = manifest["ontologies"]["D3O"]
+    assert entry["status"] == "success"
+    assert entry["term_count"] == 2
+    assert entry["robot_query_status"] == "success"
+    assert set(manifest["artifacts"]) == {
+        "external/ontologies/bioportal/D3O.owl",
+        "data/pipeline/non-ols-terms/D3O.tsv",
+    }
+
+    result = CliRunner().invoke(scan_manifest, [])
+    assert "(0 re-read)" in result.output
+    assert "Manifest unchanged" in result.output
@@ -0,0 +1,108 @@
+"""Tests for the native ROBOT-equivalent ontology reports."""
+
+import json
+
+import pytest
+
+from metpo.bactotraits.reconcile_bactotraits_coverage import (
+    BACTOTRAITS_SOURCE_URI,
+    load_bactotraits_synonyms,
+)
+from metpo.utils.ontology_index import OntologyIndex
+from metpo.utils.ontology_reports import (
+    RDFS_LABEL,
+    SynonymSource,
+    format_cell,
+    parse_cell,
+    read_synonym_sources,
+    synonym_sources,
+    write_synonym_sources,
+)
+
+METPO = "https://w3id.org/metpo/"
+SOURCE = "http://purl.obolibrary.org/obo/IAO_0000119"
+EXACT = "http://www.geneontology.org/formats/oboInOwl#hasExactSynonym"
+
+
+@pytest.fixture
+def index(tmp_path):
+    graph = {
+        "graphs": [
+            {
+                "nodes": [
+                    {
+                        "id": f"{METPO}1000002",
+                        "lbl": "GC content",
+                        "type": "CLASS",
+                        "meta": {
+                            "synonyms": [
+                                {
+                                    "pred": "hasExactSynonym",
+                                    "val": 'GC "percent"',
+                                    "xrefs": ["x:1", "x:2"],
+                                    "meta": {
+                                        "basicPropertyValues": [
+                                            {"pred": SOURCE, "val": BACTOTRAITS_SOURCE_URI}
+                                        ]
+                                    },
+                                },
+                            ],
+                        },
+                    },
+                    {"id": f"{METPO}2000001", "lbl": "has quality", "type": "PROPERTY"},
+                    {"id": f"{METPO}9999999", "lbl": "some individual", "type": "INDIVIDUAL"},
+                ],
+                "edges": [],
+            }
+        ]
+    }
+    path = tmp_path / "metpo.json"
+    path.write_text(json.dumps(graph))
+    return OntologyIndex.load(path, cache_path=None)
+
+
+def test_synonym_sources_rows(index):
+    rows = synonym_sources(index)
+    assert [(r.entity_type, r.predicate, r.value, r.xref) for r in rows] == [
+        ("class", EXACT, 'GC "percent"', "x:1"),
+        ("class", EXACT, 'GC "percent"', "x:2"),
+        ("class", RDFS_LABEL, "GC content", ""),
+        ("property", RDFS_LABEL, "has quality", ""),
+    ]
+    assert rows[0].entity == f"{METPO}1000002"
+    assert rows[0].source == BACTOTRAITS_SOURCE_URI
+
+
+def test_robot_cell_format():
+    assert format_cell("class", "literal") == '"class"'
+    assert format_cell("", "literal") == '""'
+    assert format_cell("", "optional") == ""
+    assert format_cell(BACTOTRAITS_SOURCE_URI, "optional") == f"<{BACTOTRAITS_SOURCE_URI}>"
+    assert format_cell('a "b"\tc', "literal") == '"a \\"b\\"\\tc"'
+    assert parse_cell('"a \\"b\\"\\tc"') == 'a "b"\tc'
+    assert parse_cell('"chat"@en') == "chat"
+
+
+def test_write_read_round_trip(index, tmp_path):
+    rows = synonym_sources(index)
+    path = tmp_path / "synonym-sources.tsv"
+    assert write_synonym_sources(rows, path) == len(rows)
+    header, first = path.read_text().splitlines()[:2]
+    assert header.startswith("?entity\t?entityType\t?synonymPred\t?synValue")
+    assert first.split("\t")[:5] == [
+        f"<{METPO}1000002>",
+        '"class"',
+        f"<{EXACT}>",
+        '"GC \\"percent\\""',
+        '""',
+    ]
+    assert first.split("\t")[-1] == ""
+    assert read_synonym_sources(path) == rows
+
+
+def test_bactotraits_synonyms_from_rows(index):
+    rows = [*synonym_sources(index), SynonymSource(f"{METPO}1", "class", EXACT, "other", "", "")]
+    synonyms = load_bactotraits_synonyms(rows=rows)
+    assert synonyms
+    assert {info["entity"] for info in synonyms.values()} == {f"{METPO}1000002"}
+    assert {info["label"] for info in synonyms.values()} == {"GC content"}
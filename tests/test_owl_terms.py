@@ -0,0 +1,104 @@
+"""Tests for the streaming ontology term extractor."""
+
+from click.testing import CliRunner
+
+from metpo.bactotraits.query_ontology import extract_many
+from metpo.utils.owl_terms import OntologyTerm, extract_terms, write_terms
+
+RDFXML = """<?xml version="1.0"?>
+<!DOCTYPE rdf:RDF [
+    <!ENTITY obo "http://purl.obolibrary.org/obo/" >
+]>
+<rdf:RDF xml:base="http://example.org/onto"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+     xmlns:skos="http://www.w3.org/2004/02/skos/core#"
+     xmlns:obo="http://purl.obolibrary.org/obo/"
+     xmlns:oboInOwl="http://www.geneontology.org/formats/oboInOwl#">
+    <owl:Ontology rdf:about="http://example.org/onto"><rdfs:label>Onto</rdfs:label></owl:Ontology>
+    <owl:Class rdf:about="&obo;X_0000002">
+        <rdfs:label xml:lang="en">motile</rdfs:label>
+        <rdfs:subClassOf rdf:resource="&obo;X_0000001"/>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="&obo;RO_0000001"/>
+                <rdfs:label>restriction label</rdfs:label>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+        <oboInOwl:hasExactSynonym>moving</oboInOwl:hasExactSynonym>
+        <oboInOwl:hasExactSynonym>moving</oboInOwl:hasExactSynonym>
+        <oboInOwl:hasRelatedSynonym>mobile "cell"</oboInOwl:hasRelatedSynonym>
+        <obo:IAO_0000115>Able to
+move.</obo:IAO_0000115>
+    </owl:Class>
+    <owl:Class rdf:about="&obo;X_0000001" rdfs:label="cell trait"/>
+    <rdf:Description rdf:ID="local">
+        <rdf:type rdf:resource="http://www.w3.org/2004/02/skos/core#Concept"/>
+        <skos:prefLabel>local concept</skos:prefLabel>
+    </rdf:Description>
+    <owl:Class rdf:about="&obo;X_0000003"/>
+    <owl:Class rdf:about="http://www.w3.org/2002/07/owl#Thing"><rdfs:label>Thing</rdfs:label></owl:Class>
+</rdf:RDF>
+"""
+
+EXPECTED = [
+    OntologyTerm("http://example.org/onto#local", ("local concept",), (), ()),
+    OntologyTerm("http://purl.obolibrary.org/obo/X_0000001", ("cell trait",), (), ()),
+    OntologyTerm(
+        "http://purl.obolibrary.org/obo/X_0000002",
+        ("motile",),
+        ("moving", 'mobile "cell"'),
+        ("Able to\nmove.",),
+    ),
+]
+
+
+def test_extract_terms_from_rdfxml(tmp_path):
+    path = tmp_path / "onto.owl"
+    path.write_text(RDFXML)
+    assert extract_terms(path) == EXPECTED
+
+
+def test_turtle_matches_rdfxml(tmp_path):
+    path = tmp_path / "onto.ttl"
+    path.write_text(
+        "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+        "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+        "@prefix obo: <http://purl.obolibrary.org/obo/> .\n"
+        "@prefix oio: <http://www.geneontology.org/formats/oboInOwl#> .\n"
+        'obo:X_0000001 a owl:Class ; rdfs:label "cell trait" .\n'
+        'obo:X_0000002 a owl:Class ; rdfs:label "motile"@en ;\n'
+        '    oio:hasExactSynonym "moving" ; obo:IAO_0000115 "Able to\\nmove." .\n'
+    )
+    assert extract_terms(path) == [
+        EXPECTED[1],
+        EXPECTED[2]._replace(synonyms=("moving",)),
+    ]
+
+
+def test_write_terms_robot_layout(tmp_path):
+    source = tmp_path / "onto.owl"
+    source.write_text(RDFXML)
+    output = tmp_path / "out" / "onto.tsv"
+    assert write_terms(source, output) == 3
+    lines = output.read_text().splitlines()
+    assert lines[0] == "?class\t?labels\t?synonyms\t?definitions"
+    assert lines[2] == '<http://purl.obolibrary.org/obo/X_0000001>\t"cell trait"\t\t'
+    assert lines[3].split("\t")[2:] == ['"moving | mobile \\"cell\\""', '"Able to\\nmove."']
+
+
+def test_extract_many_reports_failures(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    good = tmp_path / "GOOD.owl"
+    good.write_text(RDFXML)
+    broken = tmp_path / "BROKEN.owl"
+    broken.write_text("<rdf:RDF")
+    result = CliRunner().invoke(
+        extract_many, [str(good), str(broken), "-o", str(tmp_path / "out"), "-w", "2"]
+    )
+    assert result.exit_code == 1
+    assert "GOOD: 3 terms" in result.output
+    assert (tmp_path / "out" / "GOOD.tsv").exists()
+    assert not (tmp_path / "out" / "BROKEN.tsv").exists()
+    assert "BROKEN" in (tmp_path / ".robot_query.log").read_text()
@@ -0,0 +1,125 @@
+"""Tests for the --profile options and stage() timings."""
+
+import json
+import time
+from types import SimpleNamespace
+
+import click
+from click.testing import CliRunner
+
+from metpo.cli_common import profile_options, stage
+from metpo.pipeline import cross_ontology_search
+from metpo.utils.profiling import MAX_STACK_NODES, ProfileSession, collapsed_stacks
+
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+@click.command()
+@click.option("--n", default=2000)
+@profile_options()
+def toy(n):
+    with stage("setup"):
+        data = [str(i) * 10 for i in range(n)]
+    for _ in range(3):
+        with stage("loop"), stage("square"):
+            _work(n)
+    click.echo(f"done {len(data)}")
+
+
+def test_no_flags_runs_command_without_profiling():
+    result = CliRunner().invoke(toy, ["--n", "10"])
+    assert result.exit_code == 0, result.output
+    assert result.stdout == "done 10\n"
+    assert "Profile" not in result.stderr
+
+
+def test_profile_reports_stages_and_writes_outputs(tmp_path):
+    prefix = tmp_path / "prof" / "toy"
+    result = CliRunner().invoke(
+        toy, ["--profile", "--profile-memory", "--profile-output", str(prefix)]
+    )
+    assert result.exit_code == 0, result.output
+    # Report goes to stderr so stdout stays usable in pipelines
+    assert result.stdout == "done 2000\n"
+    assert "Stages:" in result.stderr
+    assert "Peak traced memory" in result.stderr
+    assert "functions by cumulative time" in result.stderr
+
+    summary = json.loads((tmp_path / "prof" / "toy.stages.json").read_text())
+    stages = {s["name"]: s for s in summary["stages"]}
+    assert stages["setup"]["calls"] == 1
+    assert stages["loop"]["calls"] == 3
+    assert stages["loop/square"]["depth"] == 1
+    assert stages["setup"]["peak_bytes"] > 0
+    assert summary["peak_bytes"] >= stages["setup"]["peak_bytes"]
+
+    assert (tmp_path / "prof" / "toy.pstats").stat().st_size > 0
+    collapsed = (tmp_path / "prof" / "toy.collapsed").read_text().splitlines()
+    assert any("_work" in line for line in collapsed)
+    for line in collapsed:
+        stack, micros = line.rsplit(" ", 1)
+        assert stack
+        assert int(micros) > 0
+
+
+def _import_graph(width, depth, self_time=0.001):
+    """Stats of modules that each import every module of the next layer."""
+    layers = [[("main.py", 1, "<module>")]]
+    layers += [[(f"pkg/m{d}_{w}.py", 1, "<module>") for w in range(width)] for d in range(depth)]
+    raw = {}
+    cumulative = self_time
+    for d in range(depth, -1, -1):
+        callers = layers[d - 1] if d else []
+        for func in layers[d]:
+            edges = {caller: (1, 1, 0.0, cumulative / len(callers)) for caller in callers}
+            raw[func] = (1, 1, self_time, cumulative, edges)
+        # Every module of this layer imports the whole next layer
+        cumulative = self_time + (cumulative * width if d == 1 else cumulative)
+    return SimpleNamespace(stats=raw), self_time * (1 + width * depth)
+
+
+def test_collapsed_stacks_bounds_wide_import_graphs():
+    # 8 ** 12 distinct import chains: an exhaustive walk would never finish
+    stats, total = _import_graph(width=8, depth=12)
+    start = time.perf_counter()
+    lines = collapsed_stacks(stats)
+    assert time.perf_counter() - start < 10
+    assert 0 < len(lines) <= MAX_STACK_NODES
+    emitted = sum(int(line.rsplit(" ", 1)[1]) for line in lines) / 1e6
+    assert emitted <= total * 1.001
+    assert lines[0] == "<module> (main.py:1) 1000"
+    assert any(line.startswith("<module> (main.py:1);<module> (m0_0.py:1);") for line in lines)
+
+
+def test_stage_outside_session_is_noop():
+    with stage("ignored"):
+        pass
+    with ProfileSession() as session, stage("a"):
+        pass
+    assert list(session.stages) == ["a"]
+    assert session.profiler is None
+
+
+def test_cross_ontology_search_emits_stages(monkeypatch):
+    monkeypatch.setattr(
+        cross_ontology_search,
+        "ols_candidates",
+        lambda label, rows=20, ols_url=None: [
+            {
+                "ontology": "pato",
+                "curie": "PATO:1",
+                "iri": "http://purl.obolibrary.org/obo/PATO_1",
+                "label": label,
+                "definition": "",
+            }
+        ],
+    )
+    result = CliRunner().invoke(
+        cross_ontology_search.main, ["--label", "motile", "--no-embeddings", "--profile"]
+    )
+    assert result.exit_code == 0, result.output
+    for name in ("load terms", "OLS search", "rank candidates", "write matches"):
+        assert name in result.stderr
+    assert "PATO:1" in result.stdout
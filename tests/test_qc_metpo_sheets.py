@@ -0,0 +1,197 @@
+"""Tests for the qc-metpo-sheets rule engine."""
+
+from functools import partial
+
+from click.testing import CliRunner
+
+from metpo.scripts import qc_metpo_sheets
+from metpo.scripts.qc_metpo_sheets import (
+    QC_RULES,
+    FuzzyClashRule,
+    QCRule,
+    SheetData,
+    check_structural_issues,
+    main,
+    run_qc,
+)
+from metpo.sheets_config import all_export_urls
+from metpo.utils.sheet_sync import sync_sheets
+
+HEADER = "ID\tlabel\tTYPE\tparent\nID\tLABEL\tTYPE\tSC %\n"
+
+CLASSES = HEADER + (
+    "METPO:1000001\tphenotype\towl:Class\t\n"
+    "METPO:1000002\tmesophilic\towl:Class\tphenotype\n"
+    "METPO:1000004\tthermophilic\towl:Class\tMETPO:1999999\n"
+    "METPO:1000003\tself\towl:Class\tself\n"
+    "\tno id\towl:Class\tphenotype\n"
+)
+STUBS = HEADER + (
+    "METPO:1000001\tphenotype\towl:Class\tstub\nGO:0000001\tmesophilic\towl:Class\tstub\n"
+)
+
+
+def _write(tmp_path):
+    classes = tmp_path / "classes.tsv"
+    stubs = tmp_path / "stubs.tsv"
+    classes.write_text(CLASSES, encoding="utf-8")
+    stubs.write_text(STUBS, encoding="utf-8")
+    return [str(classes), str(stubs)]
+
+
+def _categories(issues):
+    return [issue.category for issue in issues]
+
+
+def test_rules_are_registered_in_report_order():
+    assert list(QC_RULES) == [
+        "id-clashes",
+        "label-clashes",
+        "fuzzy-clashes",
+        "undefined-parents",
+        "assay-outcome-pairing",
+        "structural",
+    ]
+
+
+def test_run_qc_single_pass(tmp_path):
+    sheets, issues = run_qc(_write(tmp_path))
+    assert [len(s.stubs) for s in sheets] == [0, 2]
+    assert _categories(issues) == [
+        "UNDEFINED_PARENT_ID",
+        "SELF_REFERENTIAL_PARENT_LABEL",
+        "MISSING_ID",
+        "NON_METPO_ID",
+    ]
+
+
+def test_parallel_matches_serial(tmp_path):
+    files = _write(tmp_path)
+    serial = [str(i) for i in run_qc(files)[1]]
+    parallel = [str(i) for i in run_qc(files, workers=2)[1]]
+    assert parallel == serial
+
+
+def test_only_checked_sheets_are_reported(tmp_path):
+    classes, stubs = _write(tmp_path)
+    extra = tmp_path / "extra.tsv"
+    extra.write_text(HEADER + "METPO:1000010\tpsychrophilic\towl:Class\tmesophilic\n")
+    _, issues = run_qc([classes, stubs], checked=[stubs])
+    assert _categories(issues) == ["NON_METPO_ID"]
+    # The parent is defined in an unchecked sheet, which is still loaded as context
+    _, issues = run_qc([classes, stubs, str(extra)], checked=[str(extra)], workers=2)
+    assert issues == []
+
+
+def test_cli_changed_only_checks_sheets_changed_since_last_clean_qc(tmp_path, monkeypatch):
+    urls = all_export_urls()
+    bodies = {
+        urls["classes"]: (HEADER + "METPO:1000001\tphenotype\towl:Class\t\n").encode(),
+        urls["properties"]: (
+            HEADER + "METPO:2000001\thas phenotype\towl:ObjectProperty\t\n"
+        ).encode(),
+    }
+    monkeypatch.setattr(qc_metpo_sheets, "sync_sheets", partial(sync_sheets, fetch=bodies.get))
+    args = ["--download", "--changed-only", "--sheets-dir", str(tmp_path)]
+
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0, result.output
+    assert "Changed since the last clean QC: classes, properties" in result.output
+    assert "skipping" in CliRunner().invoke(main, args).output
+
+    bodies[urls["properties"]] += b"\tno id\towl:ObjectProperty\t\n"
+    for _ in range(2):  # a sheet with errors stays pending until it passes
+        result = CliRunner().invoke(main, args)
+        assert result.exit_code == 1
+        assert "Changed since the last clean QC: properties" in result.output
+        assert "MISSING_ID" in result.output
+
+
+def test_check_function_on_loaded_sheets(tmp_path):
+    sheet = SheetData(_write(tmp_path)[0])
+    sheet.load()
+    assert _categories(check_structural_issues([sheet])) == ["MISSING_ID"]
+
+
+class CountingRule(QCRule):
+    name = "counting"
+
+    def start_sheet(self, sheet):
+        return []
+
+    def check_row(self, state, sheet, row):
+        state.append(row.row_num)
+        return ()
+
+    def finish_sheet(self, state, sheet):
+        return [] if state == [r.row_num for r in sheet.records] else ["mismatch"]
+
+
+def test_custom_rule_sees_every_data_row(tmp_path):
+    _, issues = run_qc(_write(tmp_path), [CountingRule()])
+    assert issues == []
+
+
+def test_cli_rule_selection(tmp_path):
+    classes, stubs = _write(tmp_path)
+    result = CliRunner().invoke(
+        main, ["-m", classes, "-p", stubs, "--rule", "structural", "--workers", "2"]
+    )
+    assert result.exit_code == 1
+    assert "MISSING_ID" in result.output
+    assert "ID_CLASH" not in result.output
+
+
+FUZZY_CLASSES = (
+    "ID\tlabel\tTYPE\tparent\texact synonym\n"
+    "ID\tLABEL\tTYPE\tSC %\tA oboInOwl:hasExactSynonym SPLIT=|\n"
+    "METPO:1000001\tthermophilic growth\towl:Class\t\tspore|spore forming cell\n"
+    "METPO:1000002\tthermophillic growth\towl:Class\t\t\n"
+    "METPO:1000003\tGC content mid1\towl:Class\t\t\n"
+    "METPO:1000004\tGC content mid2\towl:Class\t\t\n"
+    "METPO:1000005\tobligately aerobic\towl:Class\t\t\n"
+    "METPO:1000006\tobligately anaerobic\towl:Class\t\t\n"
+    "METPO:1000007\tspore-forming cells\towl:Class\t\t\n"
+)
+FUZZY_PROPERTIES = (
+    "ID\tlabel\tTYPE\tsynonym property and value TUPLES\n"
+    "ID\tLABEL\tTYPE\tAP SPLIT=|\n"
+    "METPO:2000001\tferments\towl:ObjectProperty\toboInOwl:hasRelatedSynonym 'fermentaton of glucose'\n"
+    "METPO:2000002\tfermentation of glucose\towl:ObjectProperty\t\n"
+    "METPO:1000002\tthermophillic growth\towl:Class\tstub\n"
+)
+
+
+def test_fuzzy_clashes_across_sheets(tmp_path):
+    classes = tmp_path / "classes.tsv"
+    properties = tmp_path / "properties.tsv"
+    classes.write_text(FUZZY_CLASSES, encoding="utf-8")
+    properties.write_text(FUZZY_PROPERTIES, encoding="utf-8")
+    _, issues = run_qc([str(classes), str(properties)], [FuzzyClashRule()])
+    found = {(i.severity, i.category, i.message.split(" are ")[0]) for i in issues}
+    assert found == {
+        (
+            "WARNING",
+            "FUZZY_LABEL_CLASH",
+            "Label 'thermophilic growth' (METPO:1000001) and label 'thermophillic growth' (METPO:1000002)",
+        ),
+        (
+            "INFO",
+            "FUZZY_SYNONYM_CLASH",
+            "Synonym 'spore forming cell' (METPO:1000001) and label 'spore-forming cells' (METPO:1000007)",
+        ),
+        (
+            "INFO",
+            "FUZZY_SYNONYM_CLASH",
+            "Synonym 'fermentaton of glucose' (METPO:2000001) and label 'fermentation of glucose' (METPO:2000002)",
+        ),
+    }
+    by_text = {i.message.split("'")[1]: i for i in issues}
+    assert by_text["fermentaton of glucose"].location == f"{properties}: rows 3, 4"
+    assert by_text["thermophilic growth"].message.endswith("are 86% similar")
+
+    # Numbered series and negations are not typos, however similar
+    _, issues = run_qc([str(classes)], [FuzzyClashRule(threshold=0.5)])
+    messages = " ".join(i.message for i in issues)
+    assert "mid1" not in messages
+    assert "anaerobic" not in messages
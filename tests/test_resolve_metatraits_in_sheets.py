@@ -0,0 +1,108 @@
+"""Tests for cached, incremental MetaTraits in-sheet resolution."""
+
+import pytest
+
+from metpo.scripts.resolve_metatraits_in_sheets import (
+    ResolutionIndexes,
+    TraitCard,
+    load_indexes,
+    resolve_cards,
+    resolve_cards_incremental,
+)
+
+
+def _class_row(metpo_id, label, def_source=""):
+    row = [""] * 18
+    row[0], row[1], row[2], row[5] = metpo_id, label, "owl:Class", def_source
+    return "\t".join(row)
+
+
+def _write_templates(tmp_path, acidophilic_label="acidophilic"):
+    sheet = tmp_path / "metpo_sheet.tsv"
+    sheet.write_text(
+        "\n".join(
+            [
+                "ID\tlabel\tTYPE",
+                "ID\tLABEL\tTYPE",
+                _class_row("METPO:1003003", acidophilic_label, "OMP:0005009"),
+                _class_row("METPO:1003030", "yellow pigmented"),
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    props = tmp_path / "metpo-properties.tsv"
+    prop = [""] * 12
+    prop[0], prop[1], prop[2] = "METPO:2000011", "produces", "owl:ObjectProperty"
+    prop[9], prop[11] = "oboInOwl:hasRelatedSynonym 'produces'", "+"
+    props.write_text("ID\nID\n" + "\t".join(prop) + "\n", encoding="utf-8")
+    return sheet, props
+
+
+def _card(card_id, name, process=(), substrate=()):
+    base, _, sub = name.partition(": ")
+    return TraitCard(
+        card_id=card_id,
+        name=name,
+        trait_type="boolean",
+        description="",
+        base_category=base if sub else "",
+        substrate_label=sub,
+        is_composed=bool(sub),
+        process_curies=tuple(process),
+        substrate_curies=tuple(substrate),
+        trait_format="composed_boolean" if sub else "uncomposed_boolean",
+    )
+
+
+CARDS = [
+    _card("acidophilic", "acidophilic", process=["OMP:0005009"]),
+    _card("produces-ethanol", "produces: ethanol", substrate=["CHEBI:16236"]),
+    _card("yellow", "cell color: yellow pigmented"),
+]
+
+
+@pytest.fixture
+def indexes(tmp_path):
+    return ResolutionIndexes.build(*_write_templates(tmp_path))
+
+
+def test_json_round_trip(indexes):
+    assert ResolutionIndexes.from_json(indexes.to_json()) == indexes
+
+
+def test_incremental_matches_full_resolution(indexes):
+    full = resolve_cards(
+        CARDS,
+        indexes.category_map,
+        indexes.curie_to_metpo,
+        indexes.class_index,
+        indexes.dataprop_index,
+    )
+    rows, resolutions, reused = resolve_cards_incremental(CARDS, indexes, {})
+    assert rows == full
+    assert reused == 0
+
+    rows_again, _, reused_again = resolve_cards_incremental(CARDS, indexes, resolutions)
+    assert rows_again == full
+    assert reused_again == len(CARDS)
+
+
+def test_only_dependent_cards_are_re_resolved(tmp_path, indexes):
+    _, resolutions, _ = resolve_cards_incremental(CARDS, indexes, {})
+
+    changed = ResolutionIndexes.build(*_write_templates(tmp_path, "acid-loving"))
+    rows, _, reused = resolve_cards_incremental(CARDS, changed, resolutions)
+    assert reused == 2
+    assert rows[0]["matched_process_metpo"] == "METPO:1003003|acid-loving"
+
+
+def test_load_indexes_uses_cache_when_hashes_match(tmp_path, indexes):
+    sheet, props = _write_templates(tmp_path)
+    _, hashes, cached = load_indexes(sheet, props, {})
+    assert not cached
+
+    cache = {"template_hashes": hashes, "indexes": indexes.to_json()}
+    loaded, _, cached = load_indexes(sheet, props, cache)
+    assert cached
+    assert loaded == indexes
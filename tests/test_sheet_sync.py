@@ -0,0 +1,99 @@
+"""Tests for concurrent, change-detecting sheet sync."""
+
+import urllib.error
+
+import pytest
+
+from metpo.sheets_config import SHEET_FILENAMES, all_export_urls
+from metpo.utils.sheet_sync import (
+    MANIFEST_NAME,
+    changed_sheets,
+    load_manifest,
+    mark_checked,
+    sync_sheets,
+    synced_sheet_name,
+)
+
+
+class FakeSheets:
+    """Serve sheet exports from a dict keyed by sheet name."""
+
+    def __init__(self, bodies):
+        self.by_url = {all_export_urls()[name]: body for name, body in bodies.items()}
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        body = self.by_url[url]
+        if isinstance(body, Exception):
+            raise body
+        return body
+
+
+def test_sync_writes_new_then_skips_unchanged(tmp_path):
+    fetch = FakeSheets({"classes": b"a\tb\n", "properties": b"c\td\n"})
+    results = sync_sheets(tmp_path, ["classes", "properties"], fetch=fetch)
+    assert [r.status for r in results] == ["new", "new"]
+    assert (tmp_path / "classes.tsv").read_bytes() == b"a\tb\n"
+    assert changed_sheets("qc", tmp_path) == ["classes", "properties"]
+    mark_checked("qc", ["classes", "properties"], tmp_path)
+    assert changed_sheets("qc", tmp_path) == []
+
+    mtime = (tmp_path / "classes.tsv").stat().st_mtime_ns
+    fetch.by_url[all_export_urls()["properties"]] = b"c\tchanged\n"
+    results = sync_sheets(tmp_path, ["classes", "properties"], fetch=fetch)
+    assert [r.status for r in results] == ["unchanged", "updated"]
+    assert (tmp_path / "classes.tsv").stat().st_mtime_ns == mtime
+    assert changed_sheets("qc", tmp_path) == ["properties"]
+
+
+def test_changes_accumulate_until_each_consumer_checks_them(tmp_path):
+    fetch = FakeSheets({"classes": b"v1\n", "properties": b"p1\n"})
+    sync_sheets(tmp_path, ["classes", "properties"], fetch=fetch)
+    mark_checked("qc", ["classes", "properties"], tmp_path)
+    mark_checked("lint", ["classes", "properties"], tmp_path)
+
+    # Two single-sheet syncs, as diff-templates does: neither hides the other's change
+    fetch.by_url[all_export_urls()["classes"]] = b"v2\n"
+    sync_sheets(tmp_path, ["classes"], fetch=fetch)
+    fetch.by_url[all_export_urls()["properties"]] = b"p2\n"
+    sync_sheets(tmp_path, ["properties"], fetch=fetch)
+    assert changed_sheets("qc", tmp_path) == ["classes", "properties"]
+
+    mark_checked("qc", ["classes"], tmp_path)
+    assert changed_sheets("qc", tmp_path) == ["properties"]
+    assert changed_sheets("lint", tmp_path) == ["classes", "properties"]
+    assert synced_sheet_name(tmp_path / "classes.tsv") == "classes"
+    assert synced_sheet_name(tmp_path / "other.tsv") is None
+
+
+def test_existing_file_without_manifest_is_not_rewritten(tmp_path):
+    (tmp_path / "classes.tsv").write_bytes(b"same\n")
+    (result,) = sync_sheets(tmp_path, ["classes"], fetch=FakeSheets({"classes": b"same\n"}))
+    assert result.status == "unchanged"
+    assert load_manifest(tmp_path)["sheets"]["classes"]["size"] == 5
+
+
+def test_failed_download_keeps_previous_entry(tmp_path):
+    sync_sheets(tmp_path, ["classes"], fetch=FakeSheets({"classes": b"v1\n"}))
+    error = urllib.error.URLError("offline")
+    (result,) = sync_sheets(tmp_path, ["classes"], fetch=FakeSheets({"classes": error}))
+    assert result.status == "failed"
+    assert "offline" in result.error
+    assert (tmp_path / "classes.tsv").read_bytes() == b"v1\n"
+    assert load_manifest(tmp_path)["sheets"]["classes"]["size"] == 3
+    assert changed_sheets("qc", tmp_path) == ["classes"]
+
+
+def test_all_sheets_use_configured_filenames(tmp_path):
+    fetch = FakeSheets(dict.fromkeys(all_export_urls(), b"x\n"))
+    results = sync_sheets(tmp_path, fetch=fetch)
+    assert fetch.calls == len(all_export_urls())
+    assert {r.path.name for r in results} == set(SHEET_FILENAMES.values())
+    assert SHEET_FILENAMES["more_classes_inconsistent"] == "more_classes___inconsistent.tsv"
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_unknown_sheet(tmp_path):
+    with pytest.raises(ValueError, match="Unknown sheet"):
+        sync_sheets(tmp_path, ["nope"], fetch=FakeSheets({}))
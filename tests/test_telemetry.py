@@ -0,0 +1,113 @@
+"""Tests for run telemetry and the summarize-telemetry command."""
+
+import json
+
+import click
+from click.testing import CliRunner
+
+from metpo.benchmarks.stand_ins import StandInServer
+from metpo.cli_common import stage, telemetry_option
+from metpo.pipeline import cross_ontology_search
+from metpo.tools.summarize_telemetry import summarize_telemetry
+from metpo.utils import telemetry
+from metpo.utils.telemetry import Histogram, TelemetryRecorder, read_runs
+
+
+@click.command()
+@click.option("--fail", is_flag=True)
+@telemetry_option()
+def toy(fail):
+    for batch in (10, 20, 30):
+        with stage("insert batches", items=batch):
+            telemetry.observe("mongo.insert_many", batch / 1000)
+    telemetry.count("documents", 60)
+    if fail:
+        raise click.ClickException("boom")
+    click.echo("done")
+
+
+def test_metrics_are_noops_without_recorder():
+    assert telemetry.active() is None
+    with telemetry.timed("ignored"), stage("ignored"):
+        telemetry.count("ignored")
+        telemetry.observe("ignored", 1.0)
+    assert telemetry.active() is None
+
+
+def test_histogram_quantiles_within_a_bucket():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+    assert abs(histogram.quantile(0.5) - 0.050) / 0.050 < 0.1
+    assert abs(histogram.quantile(0.95) - 0.095) / 0.095 < 0.1
+    assert histogram.quantile(1.0) == histogram.max == 0.1
+    restored = Histogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+    assert restored.quantile(0.95) == histogram.quantile(0.95)
+
+
+def test_option_and_env_var_write_runs(tmp_path, monkeypatch):
+    path = tmp_path / "telemetry" / "runs.jsonl"
+    result = CliRunner().invoke(toy, ["--telemetry", str(path)])
+    assert result.exit_code == 0, result.output
+    monkeypatch.setenv(telemetry.ENV_VAR, str(path))
+    result = CliRunner().invoke(toy, ["--fail"])
+    assert result.exit_code == 1
+
+    with path.open() as f:
+        runs = list(read_runs(f).values())
+    assert [run["end"]["status"] for run in runs] == ["ok", "error"]
+    run = runs[0]
+    assert run["start"]["command"] == "toy"
+    assert run["counters"] == {"documents": 60}
+    assert run["histograms"]["mongo.insert_many"].count == 3
+    span = run["spans"]["insert batches"]
+    assert (span["calls"], span["items"]) == (3, 60)
+
+
+def test_recorder_flushes_cumulative_totals(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    with TelemetryRecorder(path, flush_interval=0) as recorder:
+        telemetry.observe("a", 0.01)
+        telemetry.observe("a", 0.02)
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["count"] for e in events if e["event"] == "histogram"] == [1, 2, 2]
+    assert {e["run"] for e in events} == {recorder.run_id}
+    assert read_runs(path.read_text().splitlines())[recorder.run_id]["histograms"]["a"].count == 2
+
+
+def test_read_runs_skips_a_truncated_last_line(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    with TelemetryRecorder(path, flush_interval=0) as recorder:
+        telemetry.count("documents", 5)
+    text = path.read_text()
+    killed = text + '{"event": "counter", "name": "documents", "val'
+    run = read_runs(killed.splitlines())[recorder.run_id]
+    assert run["counters"] == {"documents": 5}
+    assert run["end"]["status"] == "ok"
+
+
+def test_cross_ontology_search_telemetry_summary(tmp_path):
+    terms = tmp_path / "terms.tsv"
+    terms.write_text("ID\tlabel\nMETPO:1\taerobic growth\nMETPO:2\tmotile\n")
+    path = tmp_path / "runs.jsonl"
+    with StandInServer() as server:
+        args = ["-i", str(terms), "--ols-url", server.ols_search_url, "--rows", "5"]
+        args += ["--embed-url", server.embed_url, "--telemetry", str(path)]
+        result = CliRunner().invoke(cross_ontology_search.main, args)
+    assert result.exit_code == 0, result.output
+
+    result = CliRunner().invoke(summarize_telemetry, [str(path), "--json"])
+    assert result.exit_code == 0, result.output
+    [summary] = json.loads(result.stdout)
+    assert summary["status"] == "ok"
+    assert summary["histograms"]["ols.search"]["count"] == 2
+    assert summary["histograms"]["embedding.request"]["count"] > 2
+    stages = {s["name"]: s for s in summary["stages"]}
+    assert stages["OLS search"]["calls"] == 2
+    assert stages["OLS search"]["p95_s"] >= stages["OLS search"]["p50_s"] > 0
+
+    result = CliRunner().invoke(summarize_telemetry, [str(path)])
+    assert result.exit_code == 0, result.output
+    assert result.stdout.startswith(f"Run {summary['run']}: main ")
+    assert "ols.search" in result.stdout
+    assert "embedding.cache_misses" in result.stdout
@@ -0,0 +1,123 @@
+"""Tests for offline PageRank term importance and its use in definition enrichment."""
+
+import csv
+import json
+
+import numpy as np
+import requests
+from click.testing import CliRunner
+
+from metpo.scripts import bootstrap_definition_enrichment
+from metpo.utils.term_importance import TermGraph, TermImportance, pagerank
+
+SSSOM_HEADER = ["subject_id", "subject_label", "predicate_id", "object_id", "object_label"]
+SSSOM_HEADER += ["confidence", "object_source"]
+GO_TERM = "http://purl.obolibrary.org/obo/GO_0000003"
+DEFINITION = "The production of new individuals that contain genetic material from a parent."
+
+
+def _dense_pagerank(sources, targets, weights, n, damping=0.85):
+    matrix = np.zeros((n, n))
+    for s, t, w in zip(sources, targets, weights, strict=True):
+        matrix[t, s] += w
+    out = matrix.sum(axis=0)
+    matrix[:, out > 0] /= out[out > 0]
+    matrix[:, out == 0] = 1 / n
+    rank = np.full(n, 1 / n)
+    for _ in range(500):
+        rank = (1 - damping) / n + damping * matrix @ rank
+    return rank
+
+
+def test_pagerank_matches_dense_power_iteration():
+    rng = np.random.default_rng(0)
+    n = 30
+    sources = rng.integers(0, n - 3, 120)  # the last three nodes only receive links
+    targets = rng.integers(0, n, 120)
+    weights = rng.uniform(0.1, 1.0, 120)
+    rank = pagerank(sources, targets, weights, n)
+    assert abs(rank.sum() - 1) < 1e-9
+    np.testing.assert_allclose(rank, _dense_pagerank(sources, targets, weights, n), atol=1e-9)
+
+
+def _write_inputs(tmp_path):
+    mappings = tmp_path / "mappings"
+    mappings.mkdir()
+    rows = [
+        ("METPO:1", "reproduction", "skos:closeMatch", f"<{GO_TERM}>", "", "0.5", ""),
+        ("METPO:2", "growth", "skos:closeMatch", "<http://x.org/T1>", "", "0.5", ""),
+        (
+            "METPO:3",
+            "reproduction",
+            "skos:exactMatch",
+            f"<{GO_TERM}>",
+            f"GO; {DEFINITION}",
+            "0.9",
+            "go",
+        ),
+    ]
+    with (mappings / "a.sssom.tsv").open("w", newline="") as f:
+        f.write("# curie_map:\n")
+        writer = csv.writer(f, delimiter="\t")
+        writer.writerow(SSSOM_HEADER)
+        writer.writerows(rows)
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    for name in ("OMP", "MPO"):
+        (dumps / f"{name}.tsv").write_text(
+            f'?class\t?labels\n<{GO_TERM}>\t"reproduction"\n<http://x.org/{name}_1>\t"x"\n'
+        )
+    return mappings, dumps
+
+
+def test_importance_ranks_reused_terms_and_caches(tmp_path):
+    mappings, dumps = _write_inputs(tmp_path)
+    graph = TermGraph()
+    graph.add_mapping_set(mappings / "a.sssom.tsv")
+    assert "GO:0000003" in graph.positions
+    assert "ontology:go" in graph.positions
+
+    cache = tmp_path / "importance.npz"
+    sources = [mappings / "a.sssom.tsv"]
+    scores = TermImportance.load(sources, dumps.glob("*.tsv"), metpo_json=None, cache_path=cache)
+    # In the OMP and MPO dumps and found in GO
+    assert scores.usage_count(f"<{GO_TERM}>") == 3
+    assert scores.usage_count("http://x.org/OMP_1") == 1
+    assert scores.score(GO_TERM) > scores.score("http://x.org/T1") > 0
+    assert scores.top(1) == [("GO:0000003", scores.score(GO_TERM))]
+    assert scores.score("GO:9999999") == 0.0
+
+    assert TermImportance.is_current(cache, [*sources, *sorted(dumps.glob("*.tsv"))])
+    cached = TermImportance.load(sources, dumps.glob("*.tsv"), metpo_json=None, cache_path=cache)
+    assert cached.ids == scores.ids
+    np.testing.assert_array_equal(cached.pagerank, scores.pagerank)
+    built = TermImportance.build(iter(sources), dumps.glob("*.tsv"), metpo_json=None)
+    np.testing.assert_array_equal(built.pagerank, scores.pagerank)
+
+    (dumps / "OMP.tsv").write_text("?class\t?labels\n")
+    rebuilt = TermImportance.load(sources, dumps.glob("*.tsv"), metpo_json=None, cache_path=cache)
+    assert rebuilt.usage_count(GO_TERM) == 2
+
+
+def test_bootstrap_ranks_candidates_without_api_calls(tmp_path, monkeypatch):
+    mappings, dumps = _write_inputs(tmp_path)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("unexpected API call")
+
+    monkeypatch.setattr(requests, "get", no_network)
+    ontology = tmp_path / "metpo.json"
+    node = {"id": "https://w3id.org/metpo/3", "lbl": "reproduction", "type": "CLASS"}
+    ontology.write_text(json.dumps({"graphs": [{"nodes": [node], "edges": []}]}))
+    output = tmp_path / "out.tsv"
+    args = ["-m", str(mappings / "a.sssom.tsv"), "-o", str(output), "--no-fetch"]
+    args += ["--term-dumps", str(dumps), "--metpo-json", str(ontology)]
+    args += ["--importance-cache", str(tmp_path / "cache.npz")]
+    result = CliRunner().invoke(bootstrap_definition_enrichment.main, args)
+    assert result.exit_code == 0, result.output
+    with output.open() as f:
+        [row] = list(csv.DictReader(f, delimiter="\t"))
+    assert row["metpo_id"] == "METPO:3"
+    assert row["ontology_usage_count"] == "3"
+    assert float(row["importance"]) > 1
+    assert (tmp_path / "metpo.json.index.bin").exists()